@@ -8,72 +8,365 @@ Include logic: OR within parameter (comma-separated), AND between parameters.
 Exclude logic: OR within parameter (comma-separated), AND between parameters.
 
 Filter types auto-detected:
+  - Metadata predicates: size, mtime or age, an operator and a value
+    (e.g., 'size>50M', 'mtime>=2026-01-01', 'age<7d')
   - File extensions: start with '.' (e.g., '.pdf', '.txt')
   - MIME types: contain '/' (e.g., 'text/plain', 'image/*')
   - Glob patterns: everything else (e.g., '**/2024/**')
+
+Metadata predicates compare the file's size (bytes; k/M/G/T are binary
+multiples), modification time (ISO date or date and time, local time) or
+age (now minus mtime, with unit s/m/h/d/w; "now" is taken once when the
+plan is compiled). Operators are <, <=, >, >= and, for size, =. A
+predicate that does not parse is an error, not a glob.
+
+The criteria are compiled once into a FilterPlan: per parameter, extension
+criteria become one suffix lookup and glob criteria one combined regex
+(fnmatch semantics, '*' also matches '/'; '**/' at the start of a segment
+additionally matches no directory, while a trailing '/**' only matches
+paths below the directory) and metadata predicates one (field, operator,
+value) list evaluated from a single stat() per file, performed only when
+no cheaper criterion decided the group; the walker hands over the stat
+result of its directory entry. MIME criteria form a second stage that only runs for paths the path
+criteria leave undecided.
+`--explain` prints the compiled plan.
+
+With `--walk <dir>` the paths come from a directory walk (walk()) instead
+of stdin: the output equals `find <dir> -type f | filter.py ...`, but
+directories whose whole subtree is excluded are never opened.
+
+Input and output formats: newline-delimited paths (default); `--null`
+NUL-delimited paths, so names may contain newlines; `--ndjson` one JSON
+record per line. A record names its file as "path" (or "filePath") and may
+carry precomputed metadata the filter trusts instead of asking the file
+system: "size" (or "fileSize"), "mtime" (or "fileModified"; epoch seconds
+or ISO date-time), "mimeType", and the other stat plugin fields
+(RECORD_FIELDS). Passing records are written normalised to document
+context fields ({"filePath": ..., "fileSize": ..., "fileModified":
+"<UTC ISO>", ...}), which the process engines use to seed the context.
+With `--root <dir>`, input paths are resolved against <dir>; entries that
+are not regular files below <dir> are reported on stderr and skipped.
+
+With `--gate` each input line is a MIME type and one answer line is
+written per input line ("1" passes, "0" is rejected), flushed immediately:
+the bash engine keeps one such process per run as its MIME gate.
+
+MIME types are resolved with the batched detector in mime_detect.py: paths
+are read in batches and classified with one call per batch, and each file
+is classified at most once per run.
 """
 
 import argparse
+import collections
 import fnmatch
+import functools
+import itertools
+import json
+import operator
 import os
-import shutil
-import subprocess
+import re
+import stat
 import sys
+import time
+from datetime import datetime
+
+from mime_detect import MimeDetectorError, shared as _mime_detector
+
+# Paths read (and MIME-classified) per batch when MIME criteria are present
+_MIME_BATCH = 256
+
+# NDJSON record fields passed on as document context (see module docstring);
+# short aliases map onto them
+RECORD_FIELDS = ('mimeType', 'fileSize', 'fileModified', 'fileOwner',
+                 'fileCreated', 'fileMetadataChanged')
+_RECORD_ALIASES = {'path': 'filePath', 'size': 'fileSize', 'mtime': 'fileModified'}
+_TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# '**/' at the start of a segment (any directories, including none) and a
+# trailing '/**' (anything below the directory, not the directory itself);
+# elsewhere '**' is an ordinary fnmatch '*' ('a**/b' needs the '/')
+_DOUBLE_STAR = re.compile(r'(?:\A|(?<=/))\*\*/|/\*\*\Z')
+
+# Metadata predicate: field, operator, value (e.g. 'size>50M', 'age<7d')
+_PREDICATE = re.compile(r'(size|mtime|age)\s*(<=|>=|<|>|=)\s*(.*)\Z', re.S)
+_OPERATORS = {'<': operator.lt, '<=': operator.le, '>': operator.gt,
+              '>=': operator.ge, '=': operator.eq}
+_SIZE = re.compile(r'(\d+(?:\.\d+)?)\s*([kmgt]?)(?:i?b)?\Z', re.I)
+_SIZE_UNITS = {'': 1, 'k': 1 << 10, 'm': 1 << 20, 'g': 1 << 30, 't': 1 << 40}
+_AGE = re.compile(r'(\d+(?:\.\d+)?)\s*([smhdw])\Z')
+_AGE_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+
+def _is_predicate(criterion: str) -> bool:
+    """Metadata predicates start with size, mtime or age and an operator."""
+    return _PREDICATE.match(criterion.strip()) is not None
+
 
-# Cache the availability of the `file` command at module load time.
-_FILE_CMD = shutil.which('file')
+def _compile_predicate(criterion: str, now: float):
+    """Compile a metadata predicate to (stat attribute, operator, value, sign).
+
+    The stat attribute compared is ``sign * st.<attribute>``; age predicates
+    compare -mtime against -(now - age), so that all predicates are a single
+    comparison. Raises ValueError for values that do not parse.
+    """
+    field, op, value = _PREDICATE.match(criterion.strip()).groups()
+    value = value.strip()
+    if op == '=' and field != 'size':
+        raise ValueError(f"invalid metadata predicate '{criterion}': "
+                         "'=' is only supported for size")
+    if field == 'size':
+        match = _SIZE.match(value)
+        if match is None:
+            raise ValueError(f"invalid metadata predicate '{criterion}': "
+                             "expected a size such as 500k, 50M or 2G")
+        number, unit = match.groups()
+        return 'st_size', _OPERATORS[op], float(number) * _SIZE_UNITS[unit.lower()], 1
+    if field == 'mtime':
+        try:
+            stamp = datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            raise ValueError(f"invalid metadata predicate '{criterion}': "
+                             "expected an ISO date such as 2026-01-01") from None
+        return 'st_mtime', _OPERATORS[op], stamp, 1
+    match = _AGE.match(value)
+    if match is None:
+        raise ValueError(f"invalid metadata predicate '{criterion}': "
+                         "expected an age such as 30m, 12h or 7d")
+    number, unit = match.groups()
+    # age < N  <=>  now - mtime < N  <=>  -mtime < N - now
+    return 'st_mtime', _OPERATORS[op], float(number) * _AGE_UNITS[unit] - now, -1
+
+
+def _stat_once(file_path: str):
+    """Return a function performing os.stat(file_path) at most once."""
+    return functools.cache(lambda: os.stat(file_path))
+
+
+def _is_mime_criterion(criterion: str) -> bool:
+    """MIME criteria contain '/' but not '**' (ARC_0001 criterion routing)."""
+    criterion = criterion.strip()
+    return '/' in criterion and '**' not in criterion
 
 
 def _get_mime_type(file_path: str) -> str:
-    """Return the MIME type of file_path using the `file` command.
+    """Return the MIME type of file_path using the shared MIME detector.
 
-    Raises SystemExit with a non-zero code if `file` is not available.
-    Returns an empty string if the command fails for a specific file.
+    Raises SystemExit with a non-zero code if no detector is available.
+    Returns an empty string (with a warning) if the type cannot be determined.
     """
-    if _FILE_CMD is None:
+    try:
+        mime_type = _mime_detector().detect(file_path)
+    except MimeDetectorError:
         print(
             "error: 'file' command not found — required for MIME type filtering",
             file=sys.stderr,
         )
         sys.exit(1)
-    result = subprocess.run(
-        [_FILE_CMD, '--mime-type', '-b', file_path],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
+    if not mime_type:
         print(
-            f"warning: could not determine MIME type for '{file_path}': "
-            f"{result.stderr.strip()}",
+            f"warning: could not determine MIME type for '{file_path}'",
             file=sys.stderr,
         )
-        return ''
-    return result.stdout.strip()
+    return mime_type
 
 
-def matches_criterion(file_path: str, criterion: str) -> bool:
-    """Check if a file path matches a single filter criterion."""
-    criterion = criterion.strip()
-    if not criterion:
-        return False
+def _fnmatch_body(segment: str) -> str:
+    """fnmatch.translate() without its '(?s:...)\\Z' wrapper."""
+    return fnmatch.translate(segment)[4:-3] if segment else ''
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a glob to a regex body (see module docstring for semantics)."""
+    parts = []
+    pos = 0
+    for match in _DOUBLE_STAR.finditer(pattern):
+        parts.append(_fnmatch_body(pattern[pos:match.start()]))
+        parts.append('(?:.*/)?' if match.group() == '**/' else '/.*')
+        pos = match.end()
+    parts.append(_fnmatch_body(pattern[pos:]))
+    return ''.join(parts)
+
 
-    # Extension match: criterion starts with '.'
-    if criterion.startswith('.'):
-        return file_path.endswith(criterion)
+def _compile_globs(patterns: list[str]):
+    """Compile *patterns* into one anchored regex (None if empty)."""
+    if not patterns:
+        return None
+    body = '|'.join(f'(?:{_glob_to_regex(pattern)})' for pattern in patterns)
+    return re.compile(f'(?s:{body})\\Z')
 
-    # MIME type match: criterion contains '/' but not '**'
-    # (consistent with ARC_0001 criterion routing: MIME criteria have '/' but not '**')
-    if '/' in criterion and '**' not in criterion:
-        if os.path.isfile(file_path):
-            # Actual file path: resolve MIME type via `file` command and compare
-            mime_type = _get_mime_type(file_path)
-            return fnmatch.fnmatch(mime_type, criterion)
-        # MIME type string passed directly (e.g. from doc.doc.sh MIME gate):
-        # match the string itself against the criterion pattern
-        return fnmatch.fnmatch(file_path, criterion)
 
-    # Glob pattern match
-    return fnmatch.fnmatch(file_path, criterion)
+def _and3(values) -> bool | None:
+    """Three-valued AND: False wins over None (undecided) wins over True."""
+    result = True
+    for value in values:
+        if value is False:
+            return False
+        if value is None:
+            result = None
+    return result
+
+
+class _CriterionGroup:
+    """One --include/--exclude parameter: an OR of its criteria."""
+
+    def __init__(self, param: str, now: float):
+        criteria = [criterion.strip() for criterion in param.split(',')]
+        criteria = [criterion for criterion in criteria if criterion]
+        self.predicates = [c for c in criteria if _is_predicate(c)]
+        self._predicates = [_compile_predicate(c, now) for c in self.predicates]
+        criteria = [c for c in criteria if not _is_predicate(c)]
+        self.extensions = tuple(c for c in criteria if c.startswith('.'))
+        self.globs = [c for c in criteria
+                      if not c.startswith('.') and not _is_mime_criterion(c)]
+        self.mimes = [c for c in criteria
+                      if not c.startswith('.') and _is_mime_criterion(c)]
+        self._glob_re = _compile_globs(self.globs)
+        self._mime_re = _compile_globs(self.mimes)
+        # Globs that match every path below a matching directory; tested
+        # against "<dir>/": 'Q/**' as 'Q/', a trailing '*' as is
+        self.subtree_globs = [g for g in self.globs if g.endswith('*')]
+        self._subtree_re = None
+        if self.subtree_globs:
+            body = '|'.join(
+                f'(?:{_glob_to_regex(g[:-3])}/)' if g.endswith('/**')
+                else f'(?:{_glob_to_regex(g)})'
+                for g in self.subtree_globs)
+            self._subtree_re = re.compile(f'(?s:{body})\\Z')
+
+    def match(self, file_path: str, mime_of, stat_of=None) -> bool | None:
+        """True/False, or None when MIME criteria decide and *mime_of* is None.
+
+        *stat_of* returns the file's os.stat_result (see _stat_once()); a
+        file that cannot be stat'ed matches no metadata predicate.
+        """
+        if self.extensions and file_path.endswith(self.extensions):
+            return True
+        if self._glob_re is not None and self._glob_re.match(file_path):
+            return True
+        if self._predicates:
+            try:
+                st = (stat_of or _stat_once(file_path))()
+            except OSError:
+                st = None
+            if st is not None and any(
+                    compare(sign * getattr(st, attribute), value)
+                    for attribute, compare, value, sign in self._predicates):
+                return True
+        if self._mime_re is None:
+            return False
+        if mime_of is None:
+            return None
+        return self._mime_re.match(mime_of(file_path)) is not None
+
+    def covers_subtree(self, dir_path: str) -> bool:
+        """True if every path below *dir_path* matches this group."""
+        return (self._subtree_re is not None
+                and self._subtree_re.match(dir_path + '/') is not None)
+
+    def explain(self) -> list[str]:
+        lines = []
+        if self.predicates:
+            lines.append(f"metadata (one stat per file): {' '.join(self.predicates)}")
+        if self.extensions:
+            lines.append(f"extensions (suffix): {' '.join(self.extensions)}")
+        if self.globs:
+            lines.append(f"globs: {' '.join(self.globs)}")
+            lines.append(f"  regex: {self._glob_re.pattern}")
+        if self.subtree_globs:
+            lines.append(f"prunes subtrees: {' '.join(self.subtree_globs)}")
+        if self.mimes:
+            lines.append(f"MIME (stage 2): {' '.join(self.mimes)}")
+            lines.append(f"  regex: {self._mime_re.pattern}")
+        return lines or ["(no criteria: never matches)"]
+
+
+def _mime_subject(file_path: str) -> str:
+    """MIME type of a file; MIME type strings (MIME gate) match themselves."""
+    if os.path.isfile(file_path):
+        return _get_mime_type(file_path)
+    return file_path
+
+
+class FilterPlan:
+    """Include/exclude criteria compiled once (see module docstring)."""
+
+    def __init__(self, include_params: list[str], exclude_params: list[str]):
+        """Raises ValueError if a metadata predicate does not parse."""
+        now = time.time()
+        self.include = [_CriterionGroup(param, now) for param in include_params]
+        self.exclude = [_CriterionGroup(param, now) for param in exclude_params]
+        self.uses_mime = any(group.mimes for group in self.include + self.exclude)
+        self.uses_stat = any(group.predicates
+                             for group in self.include + self.exclude)
+
+    def decide(self, file_path: str, mime_of=_mime_subject,
+               stat_of=None) -> bool | None:
+        """Return whether *file_path* passes; None if MIME types must decide.
+
+        With ``mime_of=None`` only the path and metadata criteria are
+        evaluated. *stat_of* supplies the file's stat result (at most one
+        stat() is made per call when it is omitted).
+        """
+        if stat_of is None and self.uses_stat:
+            stat_of = _stat_once(file_path)
+        include_match = _and3(group.match(file_path, mime_of, stat_of)
+                              for group in self.include)
+        if include_match is False:
+            return False
+        if not self.exclude:
+            return include_match
+        exclude_match = _and3(group.match(file_path, mime_of, stat_of)
+                              for group in self.exclude)
+        if exclude_match is True:
+            return False
+        if include_match is None or exclude_match is None:
+            return None
+        return True
+
+    def matches(self, file_path: str, stat_of=None) -> bool:
+        return self.decide(file_path, stat_of=stat_of) is True
+
+    def passes_mime(self, mime_type: str) -> bool:
+        """MIME gate: whether a document of *mime_type* passes the criteria."""
+        return self.decide(mime_type, lambda subject: subject) is True
+
+    def prunes(self, dir_path: str) -> bool:
+        """True if every path below *dir_path* is excluded (see walk())."""
+        return bool(self.exclude) and all(
+            group.covers_subtree(dir_path) for group in self.exclude)
+
+    def explain(self) -> str:
+        lines = []
+        for title, groups in (("include", self.include), ("exclude", self.exclude)):
+            if not groups:
+                lines.append(f"{title}: (none)")
+                continue
+            lines.append(f"{title}: all of")
+            for index, group in enumerate(groups, 1):
+                lines.append(f"  [{index}] any of")
+                lines.extend(f"      {line}" for line in group.explain())
+        if self.uses_stat:
+            lines.append("metadata predicates: one stat per file, only when no "
+                         "path criterion decides (reused from --walk)")
+        pruning = bool(self.exclude) and all(g.subtree_globs for g in self.exclude)
+        lines.append("directory pruning: "
+                     + ("excluded subtrees are not traversed (--walk)"
+                        if pruning else "none"))
+        lines.append("MIME detection: "
+                     + ("batched, only for paths left undecided by stage 1"
+                        if self.uses_mime else "not needed"))
+        return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_plan(include_params: tuple, exclude_params: tuple) -> FilterPlan:
+    return FilterPlan(list(include_params), list(exclude_params))
+
+
+def matches_criterion(file_path: str, criterion: str) -> bool:
+    """Check if a file path matches a single filter criterion."""
+    return _CriterionGroup(criterion, time.time()).match(
+        file_path, _mime_subject) is True
 
 
 def should_process_file(
@@ -92,31 +385,239 @@ def should_process_file(
     Returns:
         True if file should be processed.
     """
-    # Include logic: AND between parameters, OR within each parameter
-    if not include_params:
-        include_match = True
-    else:
-        include_match = all(
-            any(
-                matches_criterion(file_path, criterion)
-                for criterion in param.split(',')
-            )
-            for param in include_params
-        )
+    return _cached_plan(tuple(include_params), tuple(exclude_params)).matches(file_path)
+
+
+def walk(root: str, plan: FilterPlan, follow_symlinks: bool = False,
+         one_file_system: bool = False):
+    """Yield the regular files below *root* like `find <root> -type f`."""
+    for entry in walk_entries(root, plan, follow_symlinks, one_file_system):
+        yield entry.path
+
+
+def walk_entries(root: str, plan: FilterPlan, follow_symlinks: bool = False,
+                 one_file_system: bool = False):
+    """Yield the os.DirEntry of each regular file below *root* (see walk()).
+
+    Directories the plan prunes are never opened. File types come from the
+    directory entries, so no stat() is needed unless symlinks are followed
+    (the target type, and loop detection) or *one_file_system* is set; a
+    DirEntry caches its stat result, so metadata predicates reuse it.
+    Unreadable directories are reported on stderr and skipped.
+    """
+    root_dev = os.stat(root).st_dev if one_file_system else None
+    need_stat = follow_symlinks or one_file_system
+
+    def open_dir(dir_path):
+        try:
+            return os.scandir(dir_path)
+        except OSError as exc:
+            print(f"warning: cannot read directory '{dir_path}': "
+                  f"{exc.strerror}", file=sys.stderr)
+            return None
+
+    root_key = None
+    if follow_symlinks:
+        st = os.stat(root)
+        root_key = (st.st_dev, st.st_ino)
+    # Directories being read, innermost last; their keys are the ancestors
+    # used for loop detection when following symlinks
+    stack = []
+    ancestors = set()
+    entries = open_dir(root)
+    if entries is not None:
+        stack.append((entries, root_key))
+        ancestors.add(root_key)
+    try:
+        while stack:
+            entries, key = stack[-1]
+            try:
+                entry = next(entries)
+            except (StopIteration, OSError):
+                entries.close()
+                stack.pop()
+                ancestors.discard(key)
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    if plan.prunes(entry.path):
+                        continue
+                    child_key = None
+                    if need_stat:
+                        st = entry.stat(follow_symlinks=follow_symlinks)
+                        if root_dev is not None and st.st_dev != root_dev:
+                            continue
+                        if follow_symlinks:
+                            child_key = (st.st_dev, st.st_ino)
+                            if child_key in ancestors:
+                                print("warning: file system loop detected at "
+                                      f"'{entry.path}'", file=sys.stderr)
+                                continue
+                    child = open_dir(entry.path)
+                    if child is not None:
+                        stack.append((child, child_key))
+                        ancestors.add(child_key)
+                elif entry.is_file(follow_symlinks=follow_symlinks):
+                    yield entry
+            except OSError:
+                continue  # vanished or dangling entry
+    finally:
+        for entries, _key in stack:
+            entries.close()
+
+
+# One input path: stat_of/mime_of override the file system lookups (None:
+# ask the file system), context is the normalised NDJSON record (or None)
+_Candidate = collections.namedtuple(
+    '_Candidate', ['path', 'stat_of', 'mime_of', 'context'])
+
+
+class _RecordStat:
+    """Stat result whose size/mtime come from an input record when present."""
+
+    __slots__ = ('st_size', 'st_mtime')
+
+    def __init__(self, size, mtime, stat_of):
+        if size is None or mtime is None:
+            st = stat_of()
+            size = st.st_size if size is None else size
+            mtime = st.st_mtime if mtime is None else mtime
+        self.st_size = size
+        self.st_mtime = mtime
+
+
+def _read_items(stream, null: bool):
+    """Yield the non-empty items of *stream*, NUL- or newline-delimited."""
+    if not null:
+        for line in stream:
+            line = line.rstrip('\n')
+            if line:
+                yield line
+        return
+    pending = ''
+    for chunk in iter(functools.partial(stream.read, 65536), ''):
+        items = (pending + chunk).split('\0')
+        pending = items.pop()
+        yield from (item for item in items if item)
+    if pending:
+        yield pending
+
+
+def _epoch(value) -> float:
+    """Epoch seconds of a record mtime (number or ISO date-time)."""
+    if isinstance(value, bool):
+        raise ValueError(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(str(value)).timestamp()
+
+
+def parse_record(line: str):
+    """Parse one NDJSON record into (path, context, size, mtime).
+
+    *context* holds filePath and the RECORD_FIELDS present (fileSize as an
+    int, fileModified as a UTC ISO string); *size*/*mtime* are the values
+    metadata predicates use (None when absent). Raises ValueError for lines
+    that are not a JSON object with a path; malformed optional fields are
+    dropped with a warning.
+    """
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError('not a JSON object')
+    record = {_RECORD_ALIASES.get(key, key): value for key, value in record.items()}
+    path = record.get('filePath')
+    if not isinstance(path, str) or not path:
+        raise ValueError('missing "path"')
+    context = {'filePath': path}
+    size = mtime = None
+    for field in RECORD_FIELDS:
+        value = record.get(field)
+        if value is None:
+            continue
+        try:
+            if field == 'fileSize':
+                if isinstance(value, bool) or int(value) != value or value < 0:
+                    raise ValueError(value)
+                value = size = int(value)
+            elif field == 'fileModified':
+                mtime = _epoch(value)
+                value = time.strftime(_TIME_FORMAT, time.gmtime(int(mtime)))
+            elif not isinstance(value, str):
+                raise ValueError(value)
+        except (TypeError, ValueError, OverflowError):
+            print(f"warning: ignoring invalid {field} for '{path}'", file=sys.stderr)
+            continue
+        context[field] = value
+    return path, context, size, mtime
+
+
+def _resolve(path: str, root: str, canonical_root: str):
+    """Return (path, stat) for a regular file below *root*, or None."""
+    path = os.path.normpath(os.path.join(root, path))
+    real = os.path.realpath(path)
+    if real != canonical_root and not real.startswith(canonical_root + os.sep):
+        print(f"warning: '{path}' is outside '{root}', skipped", file=sys.stderr)
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        print(f"warning: '{path}' is not a regular file, skipped", file=sys.stderr)
+        return None
+    return path, st
 
-    # Exclude logic: AND between parameters, OR within each parameter
-    if not exclude_params:
-        exclude_match = False
-    else:
-        exclude_match = all(
-            any(
-                matches_criterion(file_path, criterion)
-                for criterion in param.split(',')
-            )
-            for param in exclude_params
-        )
 
-    return include_match and not exclude_match
+def input_candidates(stream, plan: FilterPlan, null: bool = False,
+                     ndjson: bool = False, root: str | None = None):
+    """Yield a _Candidate per input path or NDJSON record of *stream*.
+
+    With *root* the paths are resolved against it and checked (_resolve());
+    the stat made for that check is reused by metadata predicates.
+    """
+    canonical_root = os.path.realpath(root) if root else None
+    for number, item in enumerate(_read_items(stream, null), 1):
+        context = None
+        size = mtime = None
+        path = item
+        if ndjson:
+            try:
+                path, context, size, mtime = parse_record(item)
+            except ValueError as exc:
+                print(f"warning: skipping invalid record on line {number}: {exc}",
+                      file=sys.stderr)
+                continue
+        stat_of = None
+        if root:
+            resolved = _resolve(path, root, canonical_root)
+            if resolved is None:
+                continue
+            path, st = resolved
+            stat_of = lambda st=st: st  # noqa: E731
+            if context is not None:
+                context['filePath'] = path
+        if plan.uses_stat:
+            stat_of = stat_of or _stat_once(path)
+            if size is not None or mtime is not None:
+                stat_of = functools.cache(
+                    functools.partial(_RecordStat, size, mtime, stat_of))
+        mime_of = None
+        if context is not None and 'mimeType' in context:
+            mime_of = lambda _path, mime=context['mimeType']: mime  # noqa: E731
+        yield _Candidate(path, stat_of, mime_of, context)
+
+
+def _prefetch_mime_types(plan: FilterPlan, candidates: list) -> None:
+    """Classify, with one detector call, the files only MIME criteria decide."""
+    files = [c.path for c in candidates
+             if c.mime_of is None and plan.decide(c.path, None, c.stat_of) is None
+             and os.path.isfile(c.path)]
+    if not files:
+        return
+    try:
+        _mime_detector().detect_many(files)
+    except MimeDetectorError:
+        pass  # reported by _get_mime_type on first use
 
 
 def main() -> int:
@@ -133,14 +634,102 @@ def main() -> int:
         help='Exclude criteria (comma-separated, repeatable). '
              'OR within parameter, AND between parameters.'
     )
+    parser.add_argument(
+        '--walk', metavar='DIR',
+        help='Walk DIR instead of reading paths from stdin; excluded '
+             'subtrees are not traversed.'
+    )
+    parser.add_argument(
+        '--follow-symlinks', action='store_true',
+        help='With --walk: follow symbolic links (like find -L).'
+    )
+    parser.add_argument(
+        '--one-file-system', action='store_true',
+        help='With --walk: do not descend into other file systems (like find -xdev).'
+    )
+    parser.add_argument(
+        '--null', action='store_true',
+        help='Paths are NUL-delimited on input and output (like find -print0).'
+    )
+    parser.add_argument(
+        '--ndjson', action='store_true',
+        help='Input is one JSON record per line ("path", optional "size", '
+             '"mtime", "mimeType", ...); passing records are written as '
+             'NDJSON document context.'
+    )
+    parser.add_argument(
+        '--root', metavar='DIR',
+        help='Resolve input paths against DIR and skip entries that are not '
+             'regular files below DIR.'
+    )
+    parser.add_argument(
+        '--gate', action='store_true',
+        help='Read MIME types from stdin and answer 1 (pass) or 0 (reject) '
+             'per line, flushing each answer.'
+    )
+    parser.add_argument(
+        '--explain', action='store_true',
+        help='Print the compiled filter plan and exit.'
+    )
     args = parser.parse_args()
+    if args.null and args.ndjson:
+        parser.error('--null and --ndjson are mutually exclusive')
 
-    for line in sys.stdin:
-        file_path = line.rstrip('\n')
-        if not file_path:
-            continue
-        if should_process_file(file_path, args.include, args.exclude):
-            print(file_path)
+    try:
+        plan = FilterPlan(args.include, args.exclude)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    if args.explain:
+        print(plan.explain())
+        return 0
+
+    if args.gate:
+        for line in sys.stdin:
+            passes = plan.passes_mime(line.rstrip('\n'))
+            sys.stdout.write('1\n' if passes else '0\n')
+            sys.stdout.flush()
+        return 0
+
+    if args.walk:
+        entries = walk_entries(args.walk.rstrip('/') or '/', plan,
+                               follow_symlinks=args.follow_symlinks,
+                               one_file_system=args.one_file_system)
+        stat_kwargs = {'follow_symlinks': args.follow_symlinks}
+        candidates = (
+            _Candidate(entry.path,
+                       functools.partial(entry.stat, **stat_kwargs)
+                       if plan.uses_stat else None,
+                       None,
+                       {'filePath': entry.path} if args.ndjson else None)
+            for entry in entries)
+    else:
+        candidates = input_candidates(sys.stdin, plan, null=args.null,
+                                      ndjson=args.ndjson, root=args.root)
+    end = '\0' if args.null else '\n'
+
+    def write(candidate):
+        if candidate.context is not None:
+            sys.stdout.write(json.dumps(candidate.context, ensure_ascii=False,
+                                        separators=(',', ':')) + '\n')
+        else:
+            sys.stdout.write(candidate.path + end)
+
+    if not plan.uses_mime:
+        for candidate in candidates:
+            if plan.decide(candidate.path, None, candidate.stat_of):
+                write(candidate)
+        return 0
+
+    while True:
+        batch = list(itertools.islice(candidates, _MIME_BATCH))
+        if not batch:
+            break
+        _prefetch_mime_types(plan, batch)
+        for candidate in batch:
+            if plan.decide(candidate.path, candidate.mime_of or _mime_subject,
+                           candidate.stat_of) is True:
+                write(candidate)
 
     return 0
 
@@ -0,0 +1,234 @@
+#!/bin/bash
+# index_commands.sh - Output database commands for doc.doc.md
+# Part of doc.doc.md architecture (Level 3: Bash Components)
+# Handles the commands that read the SQLite databases process leaves in the
+# output directory: the metadata and full-text index (process --index /
+# --fulltext, metadata_index.py) and the sidecar archive (process --sink
+# sqlite, sidecar_writer.py).
+# Contains NO process-pipeline logic (that belongs in doc.doc.sh and
+# python_engine.sh).
+#
+# Public Interface:
+#   cmd_query                     - Query the metadata index (process --index)
+#   cmd_search                    - Full-text search (process --fulltext)
+#   cmd_extract                   - Materialize sidecars from the archive
+#                                   (process --sink sqlite)
+
+_INDEX_COMMANDS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# --- Query command (FEATURE_0071) ---
+# Select documents from the metadata index written by process --index.
+cmd_query() {
+  local output_dir="" format="" fields="" sort="" limit="" count=false
+  local -a where=()
+  while [ $# -gt 0 ]; do
+    case "$1" in
+      -o|--output-dir)
+        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+        output_dir="$2"
+        shift 2
+        ;;
+      -w|--where)
+        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+        where+=("$2")
+        shift 2
+        ;;
+      --format)
+        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+        format="$2"
+        shift 2
+        ;;
+      --fields)
+        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+        fields="${2//[[:space:]]/}"
+        shift 2
+        ;;
+      --sort)
+        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+        sort="$2"
+        shift 2
+        ;;
+      --limit)
+        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+        limit="$2"
+        shift 2
+        ;;
+      --count)
+        count=true
+        shift
+        ;;
+      --help|-h)
+        ui_usage_query
+        exit 0
+        ;;
+      *)
+        log_error "Unknown option '$1'. Use --help for usage."
+        exit 1
+        ;;
+    esac
+  done
+
+  if [ -z "$output_dir" ]; then
+    log_error "Output directory is required (-o <dir>)"
+    exit 1
+  fi
+  case "${format:=paths}" in
+    paths|json|ndjson) : ;;
+    *)
+      log_error "Unknown format '$format' (expected 'paths', 'json' or 'ndjson')"
+      exit 1
+      ;;
+  esac
+  if [ -n "$fields" ] && ! [[ "$fields" =~ ^[A-Za-z_][A-Za-z0-9_]*(,[A-Za-z_][A-Za-z0-9_]*)*$ ]]; then
+    log_error "Invalid --fields '$fields' (expected comma-separated field names)"
+    exit 1
+  fi
+  if [ -n "$limit" ] && ! [[ "$limit" =~ ^[1-9][0-9]*$ ]]; then
+    log_error "--limit requires a positive integer, got '$limit'"
+    exit 1
+  fi
+
+  local -a query_args=(query --output-dir "$output_dir" --format "$format")
+  local _expr
+  for _expr in "${where[@]+"${where[@]}"}"; do
+    query_args+=("--where=$_expr")
+  done
+  [ -n "$fields" ] && query_args+=(--fields "$fields")
+  [ -n "$sort" ] && query_args+=("--sort=$sort")
+  [ -n "$limit" ] && query_args+=(--limit "$limit")
+  [ "$count" = true ] && query_args+=(--count)
+  python3 "$_INDEX_COMMANDS_DIR/metadata_index.py" "${query_args[@]}"
+}
+
+# --- Search command (FEATURE_0072) ---
+# Ranked full-text search over the index written by process --fulltext.
+cmd_search() {
+  local output_dir="" format="" limit=""
+  local -a where=() terms=()
+  while [ $# -gt 0 ]; do
+    case "$1" in
+      -o|--output-dir)
+        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+        output_dir="$2"
+        shift 2
+        ;;
+      -w|--where)
+        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+        where+=("$2")
+        shift 2
+        ;;
+      --format)
+        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+        format="$2"
+        shift 2
+        ;;
+      --limit)
+        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+        limit="$2"
+        shift 2
+        ;;
+      --help|-h)
+        ui_usage_search
+        exit 0
+        ;;
+      --)
+        shift
+        terms+=("$@")
+        break
+        ;;
+      -*)
+        log_error "Unknown option '$1'. Use --help for usage."
+        exit 1
+        ;;
+      *)
+        terms+=("$1")
+        shift
+        ;;
+    esac
+  done
+
+  if [ -z "$output_dir" ]; then
+    log_error "Output directory is required (-o <dir>)"
+    exit 1
+  fi
+  if [ ${#terms[@]} -eq 0 ]; then
+    log_error "search requires at least one term"
+    exit 1
+  fi
+  case "${format:=paths}" in
+    paths|ndjson) : ;;
+    *)
+      log_error "Unknown format '$format' (expected 'paths' or 'ndjson')"
+      exit 1
+      ;;
+  esac
+  if [ -n "$limit" ] && ! [[ "$limit" =~ ^[0-9]+$ ]]; then
+    log_error "--limit requires a non-negative integer, got '$limit'"
+    exit 1
+  fi
+
+  local -a search_args=(search --output-dir "$output_dir" --format "$format")
+  local _expr
+  for _expr in "${where[@]+"${where[@]}"}"; do
+    search_args+=("--where=$_expr")
+  done
+  [ -n "$limit" ] && search_args+=(--limit "$limit")
+  python3 "$_INDEX_COMMANDS_DIR/metadata_index.py" "${search_args[@]}" -- "${terms[@]}"
+}
+
+# --- Extract command (FEATURE_0073) ---
+# Materialize sidecars stored by process --sink sqlite.
+cmd_extract() {
+  local output_dir="" to="" list=false
+  local -a patterns=()
+  while [ $# -gt 0 ]; do
+    case "$1" in
+      -o|--output-dir)
+        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+        output_dir="$2"
+        shift 2
+        ;;
+      --to)
+        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+        to="$2"
+        shift 2
+        ;;
+      --list)
+        list=true
+        shift
+        ;;
+      --help|-h)
+        ui_usage_extract
+        exit 0
+        ;;
+      --)
+        shift
+        patterns+=("$@")
+        break
+        ;;
+      -*)
+        log_error "Unknown option '$1'. Use --help for usage."
+        exit 1
+        ;;
+      *)
+        patterns+=("$1")
+        shift
+        ;;
+    esac
+  done
+
+  if [ -z "$output_dir" ]; then
+    log_error "Output directory is required (-o <dir>)"
+    exit 1
+  fi
+  if [ "$list" = true ] && [ -n "$to" ]; then
+    log_error "--list cannot be combined with --to"
+    exit 1
+  fi
+
+  local -a extract_args=(extract --output-dir "$output_dir")
+  [ -n "$to" ] && extract_args+=("--to=$to")
+  [ "$list" = true ] && extract_args+=(--list)
+  python3 "$_INDEX_COMMANDS_DIR/sidecar_writer.py" "${extract_args[@]}" -- \
+    "${patterns[@]+"${patterns[@]}"}"
+}
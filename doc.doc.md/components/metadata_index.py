@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+# metadata_index.py - SQLite metadata index for doc.doc.md
+# Part of doc.doc.md architecture (Level 3: Python Components)
+# Keeps one row per processed document with its merged plugin fields, so that
+# questions like "all German PDFs over 10000 words modified this year" are
+# answered by `doc.doc.sh query` from an index instead of re-reading every
+# sidecar or re-running the pipeline. Optionally the extracted text is kept
+# in a full-text index for `doc.doc.sh search`.
+#
+# Location: <output_dir>/.doc.doc.md/index.sqlite (next to manifest.sqlite),
+# maintained by `process --index` / `process --fulltext` (python engine).
+#
+# Layout (table documents):
+#   _id       INTEGER PRIMARY KEY
+#   _path     TEXT UNIQUE        source path of the document
+#   _sidecar  TEXT               sidecar path relative to output_dir
+#   _indexed  TEXT               UTC time of the last (re)index
+#   _data     TEXT               full merged result as compact JSON
+#   <field>   (no type)          one indexed column per top-level result key
+#                                (mimeType, fileSize, languageCode, ...)
+#
+# Field columns are added (with an index) the first time a key appears.
+# SQLite column names are case-insensitive: a key differing only in case
+# from an existing column (MimeType next to mimeType) gets no column of its
+# own and is only kept in _data.
+# Numbers, strings and booleans are stored as they are, arrays and objects
+# as compact JSON; extracted text (*Text fields, see below) and strings
+# longer than COLUMN_TEXT_LIMIT characters are only kept in _data. Re-processing a document
+# replaces its row (upsert), so fields it no longer has become NULL. Rows
+# whose source file no longer exists are pruned at the end of each run.
+# An index of another INDEX_VERSION is dropped and rebuilt by the next run.
+#
+# Full text (table fulltext, SQLite FTS5, rowid = documents._id): the string
+# fields named *Text (documentText, ocrText, summaryText, ...) of each
+# document, tokenized with unicode61 and diacritics folded. The table is
+# created (and filled from the stored results) by the first --fulltext run
+# and from then on updated with every upsert, removal and prune. Searches
+# are ranked by BM25 and can be narrowed with the same predicates as query,
+# e.g. languageCode=de.
+#
+# Predicates (`query --where`): <field><op><value> with op one of
+#   =  !=  <  <=  >  >=   comparison; numeric values compare as numbers,
+#                         anything else as text (ISO dates sort correctly)
+#   ~                     glob match (*, ?, [...]), e.g. mimeType~image/*
+# An empty value tests for presence: "field=" (missing), "field!=" (present).
+# "true"/"false" compare against booleans. Several predicates are ANDed.
+#
+# Search terms (`search`): every term must occur; a term with spaces is a
+# phrase, a trailing * matches prefixes (report*).
+#
+# CLI Interface (invoked by doc.doc.sh query / search):
+#   python3 metadata_index.py query --output-dir <dir> [--where <predicate>]...
+#       [--format paths|json|ndjson] [--fields <key,...>]
+#       [--sort [-]<field>] [--limit <n>] [--count]
+#   python3 metadata_index.py search --output-dir <dir> [--where <predicate>]...
+#       [--format paths|ndjson] [--limit <n>] <term>...
+#   Default output: one source path per line (search: best match first).
+#
+# Exit codes: 0 on success, 1 on invalid predicates or a missing index.
+
+import argparse
+import datetime
+import json
+import os
+import re
+import sqlite3
+import sys
+
+INDEX_NAME = "index.sqlite"
+INDEX_VERSION = 2
+COLUMN_TEXT_LIMIT = 1024
+FULLTEXT_SUFFIX = "Text"
+FULLTEXT_TOKENIZER = "unicode61 remove_diacritics 2"
+DEFAULT_SEARCH_LIMIT = 20
+# Upserts per transaction; a crashed run keeps everything committed so far
+COMMIT_INTERVAL = 1000
+
+_FIELD = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
+_PREDICATE = re.compile(r"^([A-Za-z][A-Za-z0-9_]*)\s*(!=|>=|<=|=|<|>|~)\s*(.*)$", re.S)
+_NUMBER = re.compile(r"^-?\d+(\.\d+)?$")
+_WORD = re.compile(r"\w")
+_OPERATORS = {"=": "IS", "!=": "IS NOT", "<": "<", "<=": "<=", ">": ">",
+              ">=": ">=", "~": "GLOB"}
+
+
+class QueryError(Exception):
+    """A predicate or sort key cannot be applied to the index."""
+
+
+def index_path(output_dir):
+    return os.path.join(output_dir, ".doc.doc.md", INDEX_NAME)
+
+
+def _quote(name):
+    return '"' + name + '"'
+
+
+def _column_value(value):
+    """Return *value* as stored in a field column, or None if not indexed."""
+    if isinstance(value, bool) or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        return value if len(value) <= COLUMN_TEXT_LIMIT else None
+    if isinstance(value, (list, dict)):
+        text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        return text if len(text) <= COLUMN_TEXT_LIMIT else None
+    return None
+
+
+def parse_predicate(text):
+    """Split "<field><op><value>" into (field, op, value) with a typed value."""
+    match = _PREDICATE.match(text.strip())
+    if not match:
+        raise QueryError(
+            f"Invalid predicate '{text}' (expected <field><op><value>, "
+            "op one of = != < <= > >= ~)")
+    field, op, value = match.groups()
+    if value == "":
+        if op not in ("=", "!="):
+            raise QueryError(f"Invalid predicate '{text}': missing value")
+        return field, op, None
+    if _NUMBER.match(value):
+        value = float(value) if "." in value else int(value)
+    elif value in ("true", "false"):
+        value = value == "true"
+    return field, op, value
+
+
+def document_text(result):
+    """Return the full-text content of *result*: its *Text string fields."""
+    return "\n\n".join(
+        value for field, value in result.items()
+        if field.endswith(FULLTEXT_SUFFIX) and isinstance(value, str) and value)
+
+
+def match_expression(terms):
+    """Turn search *terms* into an FTS5 query: all terms, phrases quoted."""
+    parts = []
+    for term in terms:
+        prefix = term.endswith("*")
+        term = term.rstrip("*").strip()
+        if not _WORD.search(term):
+            continue
+        parts.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    if not parts:
+        raise QueryError("search requires at least one term")
+    return " AND ".join(parts)
+
+
+class MetadataIndex:
+    """The SQLite index of one output directory."""
+
+    def __init__(self, output_dir, readonly=False, fulltext=False):
+        self.output_dir = output_dir
+        self.path = index_path(output_dir)
+        if readonly:
+            if not os.path.isfile(self.path):
+                raise QueryError(
+                    f"No index in '{output_dir}' (run process --index first)")
+            self.db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            if self._version() != INDEX_VERSION:
+                raise QueryError(
+                    f"The index in '{output_dir}' was written by another "
+                    "version (run process --index to rebuild it)")
+        else:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.db = sqlite3.connect(self.path)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self._create()
+        self.columns = self._field_columns()
+        self._folded = {column.lower() for column in self.columns}
+        self.fulltext = self._has_table("fulltext")
+        if fulltext and not self.fulltext:
+            self._create_fulltext()
+        self.updated = 0
+        self._pending = 0
+
+    def _version(self):
+        try:
+            return self.db.execute("PRAGMA user_version").fetchone()[0]
+        except sqlite3.DatabaseError as exc:
+            raise QueryError(f"Cannot read index '{self.path}': {exc}") from exc
+
+    def _has_table(self, name):
+        return self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+    def _create(self):
+        with self.db:
+            if self._version() != INDEX_VERSION:
+                self.db.execute("DROP TABLE IF EXISTS fulltext")
+                self.db.execute("DROP TABLE IF EXISTS documents")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "_id INTEGER PRIMARY KEY, _path TEXT NOT NULL UNIQUE, "
+                "_sidecar TEXT, _indexed TEXT, _data TEXT NOT NULL)")
+            self.db.execute(f"PRAGMA user_version={INDEX_VERSION}")
+
+    def _create_fulltext(self):
+        """Create the full-text table and fill it from the stored results."""
+        with self.db:
+            self.db.execute(
+                "CREATE VIRTUAL TABLE fulltext USING fts5("
+                f"text, tokenize='{FULLTEXT_TOKENIZER}')")
+            rows = self.db.execute("SELECT _id, _data FROM documents").fetchall()
+            for doc_id, data in rows:
+                self._index_text(doc_id, json.loads(data))
+        self.fulltext = True
+
+    def _index_text(self, doc_id, result):
+        text = document_text(result)
+        if text:
+            self.db.execute(
+                "INSERT INTO fulltext (rowid, text) VALUES (?, ?)", (doc_id, text))
+
+    def _field_columns(self):
+        try:
+            rows = self.db.execute("PRAGMA table_info(documents)").fetchall()
+        except sqlite3.DatabaseError as exc:
+            raise QueryError(f"Cannot read index '{self.path}': {exc}") from exc
+        return [row[1] for row in rows if not row[1].startswith("_")]
+
+    def _add_column(self, field):
+        self.db.execute(f"ALTER TABLE documents ADD COLUMN {_quote(field)}")
+        self.db.execute(
+            f"CREATE INDEX IF NOT EXISTS {_quote('idx_' + field)} "
+            f"ON documents ({_quote(field)})")
+        self.columns.append(field)
+        self._folded.add(field.lower())
+
+    def upsert(self, source_path, sidecar_path, result):
+        """Insert or replace the row of *source_path* with *result*."""
+        values = {}
+        for field, value in result.items():
+            if not _FIELD.match(field) or field.endswith(FULLTEXT_SUFFIX):
+                continue
+            stored = _column_value(value)
+            if stored is None:
+                continue
+            if field not in self.columns:
+                if field.lower() in self._folded:
+                    continue
+                self._add_column(field)
+            values[field] = stored
+        names = ["_path", "_sidecar", "_indexed", "_data"] + self.columns
+        row = [
+            source_path,
+            os.path.relpath(sidecar_path, self.output_dir) if sidecar_path else None,
+            datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            json.dumps(result, ensure_ascii=False, separators=(",", ":")),
+        ] + [values.get(field) for field in self.columns]
+        quoted = [_quote(name) for name in names]
+        self.db.execute(
+            f"INSERT INTO documents ({', '.join(quoted)}) "
+            f"VALUES ({', '.join('?' * len(names))}) "
+            f"ON CONFLICT(_path) DO UPDATE SET "
+            + ", ".join(f"{name}=excluded.{name}" for name in quoted[1:]),
+            row)
+        if self.fulltext:
+            doc_id = self._doc_id(source_path)
+            self.db.execute("DELETE FROM fulltext WHERE rowid = ?", (doc_id,))
+            self._index_text(doc_id, result)
+        self.updated += 1
+        self._tick()
+
+    def _doc_id(self, source_path):
+        row = self.db.execute(
+            "SELECT _id FROM documents WHERE _path = ?", (source_path,)).fetchone()
+        return row[0] if row else None
+
+    def remove(self, source_path):
+        if self.fulltext:
+            self.db.execute("DELETE FROM fulltext WHERE rowid = ?",
+                            (self._doc_id(source_path),))
+        self.db.execute("DELETE FROM documents WHERE _path = ?", (source_path,))
+        self._tick()
+
+    def _tick(self):
+        self._pending += 1
+        if self._pending >= COMMIT_INTERVAL:
+            self.db.commit()
+            self._pending = 0
+
+    def prune(self):
+        """Drop rows whose source file no longer exists; return their count."""
+        gone = [(doc_id,) for doc_id, path
+                in self.db.execute("SELECT _id, _path FROM documents").fetchall()
+                if not os.path.exists(path)]
+        if self.fulltext:
+            self.db.executemany("DELETE FROM fulltext WHERE rowid = ?", gone)
+        self.db.executemany("DELETE FROM documents WHERE _id = ?", gone)
+        return len(gone)
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def _where(self, predicates, table="documents"):
+        clauses, params = [], []
+        for field, op, value in predicates:
+            if field not in self.columns:
+                raise QueryError(self._unknown(field))
+            if isinstance(value, bool):
+                value = int(value)
+            clauses.append(f"{table}.{_quote(field)} {_OPERATORS[op]} ?")
+            params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _unknown(self, field):
+        known = ", ".join(sorted(self.columns)) or "none"
+        return f"Unknown field '{field}' (indexed fields: {known})"
+
+    def select(self, predicates, sort=None, limit=None):
+        """Yield (source_path, result) for rows matching all *predicates*."""
+        where, params = self._where(predicates)
+        order = "_path"
+        if sort:
+            field = sort.lstrip("-")
+            if field not in self.columns:
+                raise QueryError(self._unknown(field))
+            direction = "DESC" if sort.startswith("-") else "ASC"
+            order = f"{_quote(field)} {direction}, _path"
+        sql = f"SELECT _path, _data FROM documents{where} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for path, data in self.db.execute(sql, params):
+            yield path, json.loads(data)
+
+    def count_matching(self, predicates):
+        where, params = self._where(predicates)
+        return self.db.execute(
+            f"SELECT COUNT(*) FROM documents{where}", params).fetchone()[0]
+
+    def search(self, terms, predicates=(), limit=DEFAULT_SEARCH_LIMIT):
+        """Yield (source_path, score, snippet) for documents containing all
+        *terms*, best match (highest BM25 score) first."""
+        if not self.fulltext:
+            raise QueryError(
+                f"No full-text index in '{self.output_dir}' "
+                "(run process --fulltext first)")
+        where, params = self._where(predicates)
+        where = where.replace(" WHERE ", " AND ", 1)
+        sql = ("SELECT documents._path, bm25(fulltext), "
+               "snippet(fulltext, 0, '[', ']', '...', 12) "
+               "FROM fulltext JOIN documents ON documents._id = fulltext.rowid "
+               f"WHERE fulltext MATCH ?{where} ORDER BY rank")
+        params.insert(0, match_expression(terms))
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        try:
+            for path, rank, snippet in self.db.execute(sql, params):
+                yield path, float(f"{-rank:.6g}"), snippet
+        except sqlite3.OperationalError as exc:
+            raise QueryError(f"Invalid search: {exc}") from exc
+
+
+def _project(result, fields):
+    if fields is None:
+        return result
+    return {key: value for key, value in result.items() if key in fields}
+
+
+def _run_query(args):
+    predicates = [parse_predicate(text) for text in args.where]
+    index = MetadataIndex(args.output_dir, readonly=True)
+    try:
+        if args.count:
+            print(index.count_matching(predicates))
+            return 0
+        rows = index.select(predicates, args.sort, args.limit)
+        out = sys.stdout
+        if args.format == "paths":
+            for path, _result in rows:
+                out.write(path + "\n")
+        elif args.format == "ndjson":
+            for _path, result in rows:
+                out.write(json.dumps(_project(result, args.fields),
+                                     ensure_ascii=False, separators=(",", ":")) + "\n")
+        else:
+            results = [_project(result, args.fields) for _path, result in rows]
+            out.write(json.dumps(results, indent=2, ensure_ascii=False) + "\n")
+    finally:
+        index.db.close()
+    return 0
+
+
+def _run_search(args):
+    predicates = [parse_predicate(text) for text in args.where]
+    match_expression(args.terms)
+    index = MetadataIndex(args.output_dir, readonly=True)
+    try:
+        out = sys.stdout
+        for path, score, snippet in index.search(args.terms, predicates, args.limit):
+            if args.format == "paths":
+                out.write(path + "\n")
+            else:
+                out.write(json.dumps(
+                    {"filePath": path, "score": score, "snippet": snippet},
+                    ensure_ascii=False, separators=(",", ":")) + "\n")
+    finally:
+        index.db.close()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Query or search the doc.doc.md metadata index.")
+    actions = parser.add_subparsers(dest="action", required=True)
+
+    query = actions.add_parser("query")
+    query.add_argument("--output-dir", required=True)
+    query.add_argument("--where", action="append", default=[])
+    query.add_argument("--format", choices=("paths", "json", "ndjson"),
+                       default="paths")
+    query.add_argument("--fields", default=None,
+                       type=lambda value: frozenset(value.split(",")))
+    query.add_argument("--sort", default=None)
+    query.add_argument("--limit", type=int, default=None)
+    query.add_argument("--count", action="store_true")
+
+    search = actions.add_parser("search")
+    search.add_argument("--output-dir", required=True)
+    search.add_argument("--where", action="append", default=[])
+    search.add_argument("--format", choices=("paths", "ndjson"), default="paths")
+    search.add_argument("--limit", type=int, default=DEFAULT_SEARCH_LIMIT)
+    search.add_argument("terms", nargs="+")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.action == "search":
+            return _run_search(args)
+        return _run_query(args)
+    except QueryError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# mime_detect.py - Batched MIME type detection for doc.doc.md
+# Part of doc.doc.md architecture (Level 3: Python Components)
+# Replaces one `file --mime-type -b <path>` process per document with a
+# detector that classifies many paths per call:
+#   - libmagic Python bindings (python-magic or file-magic), when importable
+#   - otherwise a single `file -n -b --mime-type -f -` coprocess that reads
+#     paths on stdin and answers one line per path
+#
+# Results are cached per path for the lifetime of the process, so the
+# filter engine (filter.py), the python process engine's MIME gate and the
+# file plugin's in-process entry point share one detection per file per run.
+# Use shared() to get the process-wide detector.
+#
+# detect() and detect_many() return "" for files whose type cannot be
+# determined; MimeDetectorError is raised when no backend is available.
+
+import shutil
+import subprocess
+import threading
+
+try:
+    import magic
+except ImportError:  # optional: libmagic bindings
+    magic = None
+
+# A coprocess batch stays below the pipe buffer in both directions
+_BATCH_PATHS = 256
+_BATCH_BYTES = 16384
+
+
+class MimeDetectorError(Exception):
+    """Neither libmagic bindings nor the `file` command are available."""
+
+
+def _magic_backend():
+    """Return a callable path -> MIME type using libmagic bindings, or None."""
+    if magic is None:
+        return None
+    if hasattr(magic, "Magic"):  # python-magic
+        try:
+            return magic.Magic(mime=True).from_file
+        except Exception:  # noqa: BLE001 - broken bindings: use `file`
+            return None
+    if hasattr(magic, "open"):  # file-magic (bindings shipped with file)
+        cookie = magic.open(magic.MAGIC_MIME_TYPE)
+        if cookie.load() != 0:
+            return None
+        return cookie.file
+    return None
+
+
+def _looks_like_mime(value):
+    """`file` reports errors ("cannot open ...") on stdout with status 0."""
+    return "/" in value and " " not in value
+
+
+class MimeDetector:
+    """Thread-safe, caching MIME type detector (see module header)."""
+
+    def __init__(self):
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._magic = _magic_backend()
+        self._file_cmd = shutil.which("file")
+        self._proc = None
+
+    @property
+    def available(self):
+        return self._magic is not None or self._file_cmd is not None
+
+    def detect(self, path):
+        """Return the MIME type of *path* ("" if it cannot be determined)."""
+        return self.detect_many([path])[path]
+
+    def detect_many(self, paths):
+        """Return {path: MIME type} for *paths*, classifying uncached ones."""
+        if not self.available:
+            raise MimeDetectorError(
+                "'file' command not found — required for MIME type detection")
+        with self._lock:
+            todo = [path for path in dict.fromkeys(paths)
+                    if path not in self._cache]
+            if todo:
+                self._cache.update(self._classify(todo))
+            return {path: self._cache[path] for path in paths}
+
+    def _classify(self, paths):
+        if self._magic is not None:
+            return {path: self._magic_type(path) for path in paths}
+        results = {}
+        batch, size = [], 0
+        for path in paths:
+            if "\n" in path:
+                # Not representable in the line protocol
+                results[path] = self._file_once(path)
+                continue
+            batch.append(path)
+            size += len(path.encode("utf-8", "surrogateescape")) + 1
+            if len(batch) >= _BATCH_PATHS or size >= _BATCH_BYTES:
+                results.update(self._file_batch(batch))
+                batch, size = [], 0
+        if batch:
+            results.update(self._file_batch(batch))
+        return results
+
+    def _magic_type(self, path):
+        try:
+            value = self._magic(path) or ""
+        except Exception:  # noqa: BLE001 - unreadable file
+            return ""
+        if isinstance(value, bytes):
+            value = value.decode("utf-8", "replace")
+        return value if _looks_like_mime(value) else ""
+
+    def _file_batch(self, paths):
+        """Classify *paths* with one request to the `file` coprocess."""
+        for _attempt in range(2):
+            proc = self._coprocess()
+            try:
+                proc.stdin.write(
+                    b"".join(path.encode("utf-8", "surrogateescape") + b"\n"
+                             for path in paths))
+                proc.stdin.flush()
+                lines = [proc.stdout.readline() for _ in paths]
+            except OSError:
+                lines = []
+            if len(lines) == len(paths) and all(lines):
+                return {path: self._parse(line) for path, line in zip(paths, lines)}
+            self._stop()
+        return {path: self._file_once(path) for path in paths}
+
+    def _coprocess(self):
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                [self._file_cmd, "-n", "-b", "--mime-type", "-f", "-"],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL)
+        return self._proc
+
+    def _file_once(self, path):
+        result = subprocess.run(
+            [self._file_cmd, "--mime-type", "-b", "--", path],
+            capture_output=True)
+        if result.returncode != 0:
+            return ""
+        return self._parse(result.stdout)
+
+    @staticmethod
+    def _parse(line):
+        value = line.decode("utf-8", "replace").strip()
+        return value if _looks_like_mime(value) else ""
+
+    def _stop(self):
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def close(self):
+        """Stop the `file` coprocess (if any)."""
+        with self._lock:
+            self._stop()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared():
+    """Return the process-wide MimeDetector."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = MimeDetector()
+        return _shared
@@ -2,48 +2,205 @@
 """Standalone Mustache template renderer for doc.doc.md.
 
 Usage: mustache_render.py <template_file> <json_string>
+       mustache_render.py --batch <template>... [--ack-fd <fd>] [--root <dir>]
+                          [--sink tree|sqlite]
+       mustache_render.py --names <template_file>...
 
 Renders the template using the full Mustache specification via the chevron
 library.  Derives ``fileName`` from ``filePath`` automatically so templates
 can use ``{{fileName}}`` without the caller having to provide it.
 
+Batch mode reads NUL-terminated (destination, json) pairs from stdin and
+writes each rendered document to its destination ("-" for stdout).  The
+template is read and tokenized once, and the JSON never travels on the
+command line, so large results cannot hit ARG_MAX.  File destinations are
+written by sidecar_writer.py: only when the content changed, atomically,
+with their directory created (and checked to lie inside ``--root``) once
+per run; with ``--sink sqlite`` they go into the single sidecar archive of
+``--root`` instead.  With ``--ack-fd`` one line is written to that descriptor after
+each record: ``written``, ``unchanged``, ``ok`` (stdout) or
+``error<TAB><message>``; the bash engine keeps one such process per run
+(see templates.sh).
+
+A ``<template>`` is ``<file>[:<suffix>]`` (``card.html:.html``, see
+parse_template_spec).  Every record is rendered with each template, to
+``<destination><suffix>``; the acknowledgement then lists one status per
+template, separated by spaces (``written unchanged``).  Without a suffix the
+destination is used as is.
+
+``--names`` prints the top-level context names the templates reference, one
+per line (``*`` when it includes partials, which may reference anything);
+the process command runs only the plugins that produce them.
+
 Exit codes:
-  0  Success – rendered content written to stdout.
+  0  Success – rendered content written to stdout (or the destinations).
   1  Error   – diagnostic written to stderr.
 """
 
+import argparse
+import functools
 import json
 import os
+import re
 import sys
 
+from sidecar_writer import SINKS, SidecarError, open_sink
 
-def main():
-    if len(sys.argv) != 3:
-        print("Usage: mustache_render.py <template_file> <json_string>", file=sys.stderr)
-        sys.exit(1)
+READ_CHUNK = 65536
+# <file>:<suffix> template specs (process -t card.html:.html)
+_SUFFIX_PATTERN = re.compile(r"^\.?[A-Za-z0-9][A-Za-z0-9._-]*$")
 
-    template_file = sys.argv[1]
-    json_string = sys.argv[2]
 
-    # --- Validate inputs ---
-    if not os.path.isfile(template_file):
-        print(f"Error: Template file not found: {template_file}", file=sys.stderr)
-        sys.exit(1)
+@functools.lru_cache(maxsize=32)
+def compile_template(template_content):
+    """Tokenize *template_content* once; chevron renders token lists as is."""
+    from chevron.tokenizer import tokenize
 
-    try:
-        data = json.loads(json_string)
-    except (json.JSONDecodeError, ValueError) as exc:
-        print(f"Error: Invalid JSON: {exc}", file=sys.stderr)
-        sys.exit(1)
+    return tuple(tokenize(template_content))
+
+
+def render_data(template_content, data):
+    """Render *template_content* with *data*, deriving ``fileName``.
+
+    Shared by the CLI below and the Python process engine so both produce
+    identical sidecar content.  The tokenized template is cached, so
+    rendering many documents with one template tokenizes it only once.
+    Raises ImportError if chevron is missing.
+    """
+    import chevron
 
-    # --- Derive fileName from filePath ---
     file_path = data.get("filePath", "")
     if file_path:
         data.setdefault("fileName", os.path.basename(file_path))
+    return chevron.render(list(compile_template(template_content)), data)
+
+
+def parse_template_spec(spec):
+    """Split ``<file>[:<suffix>]`` into (file, suffix).
+
+    The suffix gets a leading dot (``html`` -> ``.html``) and is "" when the
+    spec has none.  An existing file named like the whole spec wins, so
+    template paths containing colons still work.
+    """
+    if os.path.isfile(spec) or ":" not in spec:
+        return spec, ""
+    template_file, suffix = spec.rsplit(":", 1)
+    if not template_file or not _SUFFIX_PATTERN.match(suffix):
+        return spec, ""
+    return template_file, suffix if suffix.startswith(".") else "." + suffix
+
+
+_NAME_TAGS = ("variable", "no escape", "section", "inverted section")
+
+
+def template_fields(template_content):
+    """Return the sorted top-level names *template_content* references.
+
+    ``{{a.b}}`` references ``a``; names inside sections are included as
+    well, since they may resolve against the top-level context.  Returns
+    None when the template includes partials.
+    """
+    names = set()
+    for tag, key in compile_template(template_content):
+        if tag == "partial":
+            return None
+        if tag in _NAME_TAGS and key != ".":
+            names.add(key.split(".", 1)[0])
+    return sorted(names)
+
+
+def _read_records(fd):
+    """Yield (destination, json bytes) pairs of NUL-terminated fields.
+
+    Reads with os.read so each record is answered as soon as it is complete
+    (the bash engine waits for the acknowledgement before sending the next).
+    """
+    pending = b""
+    fields = []
+    while True:
+        chunk = os.read(fd, READ_CHUNK)
+        if not chunk:
+            break
+        pending += chunk
+        *complete, pending = pending.split(b"\0")
+        for field in complete:
+            fields.append(field)
+            if len(fields) == 2:
+                yield os.fsdecode(fields[0]), fields[1]
+                fields = []
+
+
+def _render_record(templates, destination, json_bytes, writer):
+    """Render one batch record with every (content, suffix) template."""
+    try:
+        data = json.loads(json_bytes)
+    except (json.JSONDecodeError, ValueError) as exc:
+        return f"error\tInvalid JSON: {exc}"
+    if not isinstance(data, dict):
+        return "error\tInvalid JSON: expected an object"
+    replies = []
+    for template_content, suffix in templates:
+        rendered = render_data(template_content, data)
+        if destination == "-":
+            sys.stdout.write(rendered)
+            sys.stdout.flush()
+            replies.append("ok")
+            continue
+        path = destination + suffix
+        try:
+            replies.append("written" if writer.write(path, rendered) else "unchanged")
+        except SidecarError as exc:
+            return f"error\t{exc}"
+        except OSError as exc:
+            return f"error\tCannot write {path}: {exc}"
+    return " ".join(replies)
+
+
+def run_batch(templates, ack_fd=None, root=None, sink="tree"):
+    """Render every stdin record; return the process exit code.
+
+    *templates* is a template's content, or a list of (content, suffix).
+    """
+    from chevron.tokenizer import ChevronError
+
+    if isinstance(templates, str):
+        templates = [(templates, "")]
+    try:
+        for template_content, _suffix in templates:
+            compile_template(template_content)
+    except ChevronError as exc:
+        print(f"Error: Invalid template: {exc}", file=sys.stderr)
+        return 1
+    if sink != "tree" and not root:
+        print(f"Error: --sink {sink} requires --root", file=sys.stderr)
+        return 1
+    writer = open_sink(sink, root)
+    status = 0
+    try:
+        for destination, json_bytes in _read_records(sys.stdin.fileno()):
+            reply = _render_record(templates, destination, json_bytes, writer)
+            if reply.startswith("error\t"):
+                status = 1
+                message = " ".join(reply[6:].split())
+                reply = "error\t" + message
+                if ack_fd is None:
+                    print(f"Error: {message}", file=sys.stderr)
+            if ack_fd is not None:
+                os.write(ack_fd, (reply + "\n").encode("utf-8", "surrogateescape"))
+    finally:
+        writer.close()
+    return status
+
+
+def _load_template(template_file):
+    """Read *template_file* after checking chevron; exit 1 on failure."""
+    if not os.path.isfile(template_file):
+        print(f"Error: Template file not found: {template_file}", file=sys.stderr)
+        sys.exit(1)
 
     # --- Load chevron ---
     try:
-        import chevron
+        import chevron  # noqa: F401
     except ImportError:
         print("Error: chevron library not installed (pip install chevron)", file=sys.stderr)
         sys.exit(1)
@@ -51,13 +208,67 @@ def main():
     # --- Read template ---
     try:
         with open(template_file, "r", encoding="utf-8") as fh:
-            template_content = fh.read()
+            return fh.read()
     except OSError as exc:
         print(f"Error: Cannot read template: {exc}", file=sys.stderr)
         sys.exit(1)
 
-    # --- Render ---
-    rendered = chevron.render(template_content, data)
+
+def main():
+    if sys.argv[1:2] == ["--batch"]:
+        parser = argparse.ArgumentParser(
+            prog="mustache_render.py --batch",
+            description="Render (destination, json) records from stdin.")
+        parser.add_argument("templates", nargs="+", metavar="template")
+        parser.add_argument("--ack-fd", type=int)
+        parser.add_argument("--root")
+        parser.add_argument("--sink", choices=SINKS, default="tree")
+        args = parser.parse_args(sys.argv[2:])
+        templates = []
+        for spec in args.templates:
+            template_file, suffix = parse_template_spec(spec)
+            templates.append((_load_template(template_file), suffix))
+        sys.exit(run_batch(templates, args.ack_fd, args.root, args.sink))
+
+    if sys.argv[1:2] == ["--names"] and len(sys.argv) >= 3:
+        from chevron.tokenizer import ChevronError
+
+        names = set()
+        for template_file in sys.argv[2:]:
+            try:
+                referenced = template_fields(_load_template(template_file))
+            except ChevronError as exc:
+                print(f"Error: Invalid template: {exc}", file=sys.stderr)
+                sys.exit(1)
+            if referenced is None:
+                print("*")
+                sys.exit(0)
+            names.update(referenced)
+        print("\n".join(sorted(names)))
+        sys.exit(0)
+
+    if len(sys.argv) != 3:
+        print("Usage: mustache_render.py <template_file> <json_string>", file=sys.stderr)
+        sys.exit(1)
+
+    template_file = sys.argv[1]
+    json_string = sys.argv[2]
+
+    # --- Validate inputs ---
+    if not os.path.isfile(template_file):
+        print(f"Error: Template file not found: {template_file}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        data = json.loads(json_string)
+    except (json.JSONDecodeError, ValueError) as exc:
+        print(f"Error: Invalid JSON: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    template_content = _load_template(template_file)
+
+    # --- Render (derives fileName from filePath) ---
+    rendered = render_data(template_content, data)
     sys.stdout.write(rendered)
 
 
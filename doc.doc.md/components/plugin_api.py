@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# plugin_api.py - Shared Python plugin API for doc.doc.md
+# Part of doc.doc.md architecture (Level 3: Python Components)
+# Python counterpart of plugin_input.sh for plugins implemented in Python.
+# Complies with REQ_SEC_005 (path traversal prevention) and REQ_SEC_009
+# (input size limit), and maps exceptions to ADR-004 exit codes.
+#
+# Public Interface:
+#   PluginSkip(message)        - raise to skip the document (ADR-004: 65)
+#   PluginError(message)       - raise to report a failure (ADR-004: 1)
+#   get_field(data, field)     - string value of a field ("" when absent)
+#   get_text(data, field)      - text field, read from <field>File when the
+#                                engine passed it out-of-band
+#   validate_filepath(data)    - canonical, validated filePath (raises PluginError)
+#   call(handler, data)        - run handler on one request, return the response
+#   serve(handler)             - run the persistent worker protocol loop
+#
+# In-process entry points (descriptor commands.process.entrypoint):
+#   "module:function" names <plugin_dir>/<module>.py and a handler with the
+#   same contract as serve(): handler(dict) -> dict, raising PluginSkip or
+#   PluginError. The python process engine imports the module once per run
+#   and calls the handler via call(), so the plugin runs without forking.
+#   A module that fails to import (e.g. a library only present in the
+#   plugin's venv) falls back to the server or one-shot command.
+#
+# Persistent worker protocol (descriptor commands.process.server):
+#   The engine starts the server command once per run and writes one JSON
+#   request per line to its stdin: the same object a one-shot process
+#   command receives. The worker answers each request with one line:
+#     {"status": "ok", "output": {...}}          exit code 0 equivalent
+#     {"status": "skip", "message": "..."}       exit code 65 equivalent
+#     {"status": "error", "message": "..."}      any other exit code
+#   The worker exits when stdin is closed. A worker that dies or answers
+#   with an unparsable line is restarted by the engine.
+
+import json
+import os
+import re
+import sys
+
+EXIT_SKIP = 65
+
+# Limit JSON input to 1MB per REQ_SEC_009 (same as plugin_read_input)
+MAX_INPUT_BYTES = 1048576
+
+# Out-of-band text ("<field>File") is only read from the blob directory the
+# python process engine exports (see text_blobs.py)
+BLOB_DIR_ENV = "DOC_DOC_MD_BLOB_DIR"
+
+# Restricted system directories (defense-in-depth per REQ_SEC_005)
+_RESTRICTED_PATH_PATTERN = re.compile(r"^/(proc|dev|sys|etc)(/|$)")
+
+
+class PluginSkip(Exception):
+    """The plugin does not apply to this document (ADR-004 exit code 65)."""
+
+
+class PluginError(Exception):
+    """The plugin failed for this document (ADR-004 exit code 1)."""
+
+
+def get_field(data, field):
+    """Return *field* as a string, "" when absent/null (like plugin_get_field)."""
+    value = data.get(field)
+    if value is None or value is False:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value)
+
+
+def get_text(data, field):
+    """Return text *field*, reading "<field>File" if the engine spilled it.
+
+    Same rules as plugin_get_text: the reference must resolve to a readable
+    regular file inside the engine's blob directory (DOC_DOC_MD_BLOB_DIR),
+    else the inline value is used.
+    """
+    ref = get_field(data, field + "File")
+    blob_dir = os.environ.get(BLOB_DIR_ENV)
+    if ref and blob_dir:
+        canonical = os.path.realpath(ref)
+        if (canonical.startswith(os.path.realpath(blob_dir) + os.sep)
+                and os.path.isfile(canonical) and os.access(canonical, os.R_OK)):
+            with open(canonical, "r", encoding="utf-8", errors="replace",
+                      newline="") as fh:
+                return fh.read()
+    return get_field(data, field)
+
+
+def validate_filepath(data):
+    """Validate and resolve filePath; return the canonical path.
+
+    Mirrors plugin_validate_filepath: symlinks are resolved, restricted
+    system directories are rejected and the file must be a readable
+    regular file.
+    """
+    raw_path = get_field(data, "filePath")
+    if not raw_path:
+        raise PluginError("Missing or invalid 'filePath' in JSON input")
+
+    canonical = os.path.realpath(raw_path)
+    if _RESTRICTED_PATH_PATTERN.match(canonical):
+        raise PluginError("Access to restricted path denied")
+    if not os.path.isfile(canonical) or not os.access(canonical, os.R_OK):
+        raise PluginError("Cannot access the specified file")
+    return canonical
+
+
+def call(handler, data):
+    """Run *handler* on one request dict; return the protocol response dict.
+
+    Applies the 1MB input limit to the request's JSON encoding and maps
+    PluginSkip/PluginError (and any other exception) to skip/error.
+    """
+    try:
+        size = len(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+    except (TypeError, ValueError):
+        return {"status": "error", "message": "Invalid JSON input"}
+    if size > MAX_INPUT_BYTES:
+        return {"status": "error", "message": "Input exceeds 1MB limit"}
+    return _dispatch(handler, data)
+
+
+def _dispatch(handler, data):
+    try:
+        if not isinstance(data, dict):
+            raise PluginError("Invalid JSON input")
+        output = handler(data)
+        if not isinstance(output, dict):
+            raise PluginError("Plugin returned no JSON object")
+    except PluginSkip as exc:
+        return {"status": "skip", "message": str(exc)}
+    except PluginError as exc:
+        return {"status": "error", "message": str(exc)}
+    except Exception as exc:  # noqa: BLE001 - never let one document kill the worker
+        return {"status": "error", "message": f"{type(exc).__name__}: {exc}"}
+    return {"status": "ok", "output": output}
+
+
+def _handle_request(handler, raw):
+    if len(raw) > MAX_INPUT_BYTES:
+        return {"status": "error", "message": "Input exceeds 1MB limit"}
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return {"status": "error", "message": "Invalid JSON input"}
+    return _dispatch(handler, data)
+
+
+def serve(handler, stdin=None, stdout=None):
+    """Answer NDJSON requests with *handler(dict) -> dict* until EOF."""
+    stdin = stdin if stdin is not None else sys.stdin.buffer
+    stdout = stdout if stdout is not None else sys.stdout
+    for raw in stdin:
+        if not raw.strip():
+            continue
+        response = _handle_request(handler, raw)
+        stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+        stdout.flush()
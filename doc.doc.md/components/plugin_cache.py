@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# plugin_cache.py - Content-addressed plugin result cache for doc.doc.md
+# Part of doc.doc.md architecture (Level 3: Python Components)
+# Stores the JSON output of successful plugin runs so that the same document
+# content is never converted/OCRed twice, regardless of its path, input tree
+# or output directory.
+#
+# Cache key: SHA-256 over
+#   - the SHA-256 of the document content
+#   - the plugin name and its descriptor "version"
+#   - the values of the plugin's declared commands.process.input fields
+#     (filePath and pluginStorage excluded: they are location, not content)
+#
+# Layout: <cache_dir>/<plugin>/<key[:2]>/<key>.json  (plugin output object)
+# Eviction: least recently used first; a hit refreshes the entry's mtime.
+#
+# Plugins opt out with "cacheable": false in descriptor.json (results that
+# depend on pluginStorage state or on file metadata rather than content).
+# Only exit code 0 results are cached (ADR-004); skips and errors are not.
+#
+# CLI Interface (invoked by doc.doc.sh cache):
+#   python3 plugin_cache.py stats --cache-dir <dir>
+#   python3 plugin_cache.py prune --cache-dir <dir> [--max-size <size>]
+#   <size>: bytes or a number with K, M, G or T suffix (powers of 1024)
+#
+# Exit codes: 0 on success, 1 on invalid arguments or unreadable cache.
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+
+DEFAULT_MAX_SIZE = "1G"
+_LOCATION_FIELDS = ("filePath", "pluginStorage")
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+
+def parse_size(text):
+    """Parse '512', '100M', '2G' ... into bytes. Raises ValueError."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*", str(text),
+                         re.IGNORECASE)
+    if not match:
+        raise ValueError(f"invalid size '{text}'")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(num_bytes):
+    """Format *num_bytes* for humans (1024-based)."""
+    size = float(num_bytes)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class PluginCache:
+    """On-disk cache of plugin outputs, safe for concurrent writers."""
+
+    def __init__(self, cache_dir, plugin_dir=None):
+        self.cache_dir = cache_dir
+        self.plugin_dir = plugin_dir
+        self._descriptors = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    def _descriptor_info(self, name):
+        """Return (cacheable, version, input_fields) for plugin *name*."""
+        if name not in self._descriptors:
+            descriptor = os.path.join(self.plugin_dir, name, "descriptor.json")
+            try:
+                with open(descriptor, "r", encoding="utf-8") as fh:
+                    data = json.load(fh)
+                inputs = (data.get("commands", {}).get("process", {})
+                          .get("input") or {})
+                info = (data.get("cacheable", True) is not False,
+                        str(data.get("version") or ""),
+                        sorted(f for f in inputs if f not in _LOCATION_FIELDS))
+            except (OSError, ValueError, AttributeError):
+                info = (False, "", [])
+            self._descriptors[name] = info
+        return self._descriptors[name]
+
+    def is_cacheable(self, name):
+        return self._descriptor_info(name)[0]
+
+    def key(self, name, content_digest, context):
+        """Return the cache key for running *name* on *context*, or None."""
+        cacheable, version, fields = self._descriptor_info(name)
+        if not cacheable or not content_digest:
+            return None
+        material = {
+            "content": content_digest,
+            "plugin": name,
+            "version": version,
+            "inputs": {f: context[f] for f in fields if f in context},
+        }
+        # default=str inlines out-of-band text (text_blobs.TextBlob), so a
+        # spilled field yields the same key as the inline string
+        encoded = json.dumps(material, sort_keys=True, ensure_ascii=False,
+                             default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, name, key):
+        return os.path.join(self.cache_dir, name, key[:2], f"{key}.json")
+
+    def get(self, name, key):
+        """Return the cached output dict, or None on a miss."""
+        path = self._entry_path(name, key)
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                output = json.load(fh)
+            os.utime(path)
+        except (OSError, ValueError):
+            output = None
+        if not isinstance(output, dict):
+            output = None
+        with self._lock:
+            if output is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return output
+
+    def put(self, name, key, output):
+        """Store *output* atomically; cache write failures are not fatal."""
+        path = self._entry_path(name, key)
+        tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(output, fh, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self.stored += 1
+
+    def entries(self):
+        """Yield (path, plugin, size, mtime) for every cache entry."""
+        try:
+            plugins = sorted(os.listdir(self.cache_dir))
+        except OSError:
+            return
+        for plugin in plugins:
+            plugin_path = os.path.join(self.cache_dir, plugin)
+            if not os.path.isdir(plugin_path):
+                continue
+            for root, _dirs, files in os.walk(plugin_path):
+                for file_name in files:
+                    if not file_name.endswith(".json"):
+                        continue
+                    path = os.path.join(root, file_name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, plugin, st.st_size, st.st_mtime
+
+    def stats(self):
+        """Return {"entries", "bytes", "plugins": {name: [entries, bytes]}}."""
+        result = {"entries": 0, "bytes": 0, "plugins": {}}
+        for _path, plugin, size, _mtime in self.entries():
+            result["entries"] += 1
+            result["bytes"] += size
+            per_plugin = result["plugins"].setdefault(plugin, [0, 0])
+            per_plugin[0] += 1
+            per_plugin[1] += size
+        return result
+
+    def prune(self, max_bytes):
+        """Evict least recently used entries until the cache fits *max_bytes*.
+
+        Returns (removed_entries, freed_bytes).
+        """
+        entries = sorted(self.entries(), key=lambda e: e[3])
+        total = sum(e[2] for e in entries)
+        removed = freed = 0
+        for path, _plugin, size, _mtime in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+            freed += size
+        return removed, freed
+
+
+def _cmd_stats(cache):
+    stats = cache.stats()
+    print(f"Cache directory: {cache.cache_dir}")
+    print(f"Entries: {stats['entries']}")
+    print(f"Size: {format_size(stats['bytes'])}")
+    for plugin, (count, size) in sorted(stats["plugins"].items()):
+        print(f"  {plugin:<16} {count:>8} entries  {format_size(size):>10}")
+    return 0
+
+
+def _cmd_prune(cache, max_size):
+    try:
+        max_bytes = parse_size(max_size)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    removed, freed = cache.prune(max_bytes)
+    print(f"Removed {removed} entries ({format_size(freed)}); "
+          f"cache size now {format_size(cache.stats()['bytes'])}.")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Inspect or prune the doc.doc.md plugin result cache.")
+    parser.add_argument("action", choices=["stats", "prune"])
+    parser.add_argument("--cache-dir", required=True)
+    parser.add_argument("--max-size", default=DEFAULT_MAX_SIZE)
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.cache_dir):
+        print(f"Error: Cache directory does not exist: {args.cache_dir}",
+              file=sys.stderr)
+        return 1
+    cache = PluginCache(args.cache_dir)
+    if args.action == "stats":
+        return _cmd_stats(cache)
+    return _cmd_prune(cache, args.max_size)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
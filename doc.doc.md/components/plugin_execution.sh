@@ -10,9 +10,28 @@
 #   run_plugin <name> <file_path> <plugin_base_dir> <output_dir> [context_json]
 #       - Invoke a plugin's process command with JSON I/O
 #       - If output_dir is non-empty, creates .doc.doc.md/<name>/ and injects pluginStorage
+#       - The context is projected to the plugin's declared input keys plus
+#         filePath; descriptors without inputs or with "fullContext": true
+#         receive the whole context
 #       - Returns the plugin's exit code (0 success, 65 skip, other = error)
-#   process_file <file_path> <output_dir> <plugin...>
+#   process_file <file_path> <output_dir> [--context <json>] <plugin...>
 #       - Run a file through a sequence of plugins, merging JSON output
+#       - --context seeds the document context with an input record
+#         (process --files-from --ndjson); a plugin whose declared outputs
+#         are all supplied by it is trusted and not run
+#   mime_gate_start / mime_gate_stop
+#       - Start/stop the per-run MIME gate coprocess (filter.py --gate) that
+#         process_file consults after the file plugin; without it each
+#         check runs a one-shot filter.py
+#   mime_gate_check <mime_type>
+#       - Returns 0 if the MIME type passes the MIME criteria, 1 otherwise
+#   plugin_applicability_load <plugin...>
+#       - Read the plugins' commands.process.accepts.mimeTypes,
+#         requires.anyOf and output keys once per run (consulted by
+#         process_file)
+#   plugin_applies <name> <mime_type> <context_json>
+#       - Returns 0 if the plugin applies to the document, 1 if it is to be
+#         skipped without being started
 
 # --- Plugin execution ---
 
@@ -39,11 +58,17 @@ run_plugin() {
     return 1
   fi
 
-  # Build JSON input: start with filePath, then merge any accumulated context
+  # Build JSON input: start with filePath, then merge the accumulated context
+  # projected to the plugin's declared inputs (null keys = full context)
   local json_input
   json_input=$(jq -n --arg filePath "$file_path" '{filePath: $filePath}')
   if [ -n "$context_json" ]; then
-    json_input=$(printf '%s\n%s' "$json_input" "$context_json" | jq -s '.[0] * .[1]')
+    local input_keys
+    input_keys=$(jq -c '.commands.process
+      | if .fullContext == true or ((.input // {}) | length) == 0 then null
+        else (.input | keys) end' "$descriptor")
+    json_input=$(printf '%s\n%s' "$json_input" "$context_json" | jq -s --argjson keys "$input_keys" '
+      .[0] * (.[1] | if $keys == null then . else with_entries(select(.key | IN($keys[]))) end)')
   fi
 
   # Inject pluginStorage if output directory is provided (REQ_0029)
@@ -85,23 +110,168 @@ run_plugin() {
   echo "$plugin_output"
 }
 
+# --- MIME filter gate ---
+# The MIME criteria are compiled once per run by a filter.py --gate
+# coprocess that answers one line ("1" pass / "0" reject) per MIME type.
+# Its file descriptors stay usable inside the command substitutions that
+# run process_file; elsewhere mime_gate_check falls back to a one-shot
+# filter.py --gate.
+
+_mime_gate_args() {
+  local _inc _exc
+  for _inc in "${_MIME_INCLUDE_ARGS[@]+"${_MIME_INCLUDE_ARGS[@]}"}"; do
+    printf '%s\0%s\0' "--include" "$_inc"
+  done
+  for _exc in "${_MIME_EXCLUDE_ARGS[@]+"${_MIME_EXCLUDE_ARGS[@]}"}"; do
+    printf '%s\0%s\0' "--exclude" "$_exc"
+  done
+}
+
+mime_gate_start() {
+  [ ${#_MIME_INCLUDE_ARGS[@]} -gt 0 ] || [ ${#_MIME_EXCLUDE_ARGS[@]} -gt 0 ] || return 0
+  [ -z "${_MIME_GATE_PROC_PID:-}" ] || return 0
+  local -a gate_args
+  mapfile -d '' -t gate_args < <(_mime_gate_args)
+  coproc _MIME_GATE_PROC {
+    exec python3 "$FILTER_SCRIPT" --gate "${gate_args[@]}" 2>/dev/null
+  }
+}
+
+mime_gate_stop() {
+  [ -n "${_MIME_GATE_PROC_PID:-}" ] || return 0
+  local _pid="$_MIME_GATE_PROC_PID" _fd="${_MIME_GATE_PROC[1]:-}"
+  [ -n "$_fd" ] && exec {_fd}>&-
+  wait "$_pid" 2>/dev/null
+  unset _MIME_GATE_PROC _MIME_GATE_PROC_PID
+  return 0
+}
+
+mime_gate_check() {
+  local mime_type="$1" answer=""
+  # Pipeline subshells do not inherit the coprocess descriptors
+  if [ -n "${_MIME_GATE_PROC[1]:-}" ] && \
+     { printf '%s\n' "$mime_type" >&"${_MIME_GATE_PROC[1]}"; } 2>/dev/null && \
+     IFS= read -r answer <&"${_MIME_GATE_PROC[0]}"; then
+    [ "$answer" = "1" ]
+    return
+  fi
+  # No (or a dead) gate coprocess: evaluate with a one-shot filter.py
+  local -a gate_args
+  mapfile -d '' -t gate_args < <(_mime_gate_args)
+  answer=$(printf '%s\n' "$mime_type" | python3 "$FILTER_SCRIPT" --gate "${gate_args[@]}")
+  [ "$answer" = "1" ]
+}
+
+# --- Plugin applicability ---
+# Plugins whose declared accepts.mimeTypes do not match a document's
+# mimeType, or whose requires.anyOf fields are all empty, are skipped like
+# an exit 65 without being started. An unknown mimeType is accepted.
+
+declare -A _PLUGIN_ACCEPTS=()
+declare -A _PLUGIN_REQUIRES=()
+declare -A _PLUGIN_OUTPUTS=()
+
+plugin_applicability_load() {
+  local name accepts requires outputs
+  for name in "$@"; do
+    accepts="" requires="" outputs=""
+    {
+      IFS= read -r accepts
+      IFS= read -r requires
+      IFS= read -r outputs
+    } < <(jq -r '.commands.process
+      | ((.accepts.mimeTypes // []) | join(" ")),
+        ((.requires.anyOf // []) | join(" ")),
+        ((.output // {}) | keys_unsorted | join(" "))' \
+      "$PLUGIN_DIR/$name/descriptor.json" 2>/dev/null)
+    [ -z "$accepts" ] || _PLUGIN_ACCEPTS[$name]="$accepts"
+    [ -z "$requires" ] || _PLUGIN_REQUIRES[$name]="$requires"
+    [ -z "$outputs" ] || _PLUGIN_OUTPUTS[$name]="$outputs"
+  done
+}
+
+# Returns 0 if every declared output of plugin <name> is among <keys>
+# (space-separated context keys supplied by the input record)
+_plugin_outputs_supplied() {
+  local outputs="${_PLUGIN_OUTPUTS[$1]:-}" keys=" $2 " key
+  [ -n "$outputs" ] || return 1
+  for key in $outputs; do
+    [[ "$keys" == *" $key "* ]] || return 1
+  done
+  return 0
+}
+
+plugin_applies() {
+  local name="$1" mime_type="$2" context_json="$3"
+  local accepts="${_PLUGIN_ACCEPTS[$name]:-}" requires="${_PLUGIN_REQUIRES[$name]:-}"
+
+  if [ -n "$accepts" ] && [ -n "$mime_type" ]; then
+    local -a patterns
+    local pattern accepted=false
+    read -ra patterns <<< "$accepts"
+    for pattern in "${patterns[@]}"; do
+      # shellcheck disable=SC2053 # unquoted: glob match
+      if [[ "$mime_type" == $pattern ]]; then
+        accepted=true
+        break
+      fi
+    done
+    [ "$accepted" = true ] || return 1
+  fi
+
+  if [ -n "$requires" ]; then
+    printf '%s' "$context_json" | jq -e --arg keys "$requires" \
+      'any(($keys | split(" "))[] as $k | .[$k]; . != null and . != "")' >/dev/null 2>&1 || return 1
+  fi
+  return 0
+}
+
 # --- Main processing ---
 
 process_file() {
   local file_path="$1"
   local output_dir="$2"
   shift 2
+  local context_json=""
+  if [ "${1:-}" = "--context" ]; then
+    context_json="$2"
+    shift 2
+  fi
   local plugins=("$@")
 
-  local combined_result
-  combined_result=$(jq -n --arg filePath "$file_path" '{filePath: $filePath}')
+  local combined_result supplied_keys=""
+  if [ -n "$context_json" ]; then
+    {
+      IFS= read -r combined_result
+      IFS= read -r supplied_keys
+    } < <(printf '%s' "$context_json" | jq -c -r --arg filePath "$file_path" \
+      '({filePath: $filePath} + del(.filePath)) | tojson, (keys_unsorted - ["filePath"] | join(" "))')
+  else
+    combined_result=$(jq -n --arg filePath "$file_path" '{filePath: $filePath}')
+  fi
+  local doc_mime=""
 
   for plugin_name in "${plugins[@]}"; do
-    local plugin_output
+    if [ -n "${_PLUGIN_ACCEPTS[$plugin_name]:-}${_PLUGIN_REQUIRES[$plugin_name]:-}" ] && \
+       ! plugin_applies "$plugin_name" "$doc_mime" "$combined_result"; then
+      # Declared not applicable: same as an ADR-004 skip, without the fork
+      continue
+    fi
+
+    local plugin_output=""
     local plugin_rc=0
-    plugin_output=$(run_plugin "$plugin_name" "$file_path" "$PLUGIN_DIR" "$output_dir" "$combined_result") || plugin_rc=$?
+    if [ -n "$supplied_keys" ] && _plugin_outputs_supplied "$plugin_name" "$supplied_keys"; then
+      # Every declared output came with the input record: trusted, not run
+      plugin_output="{}"
+    else
+      plugin_output=$(run_plugin "$plugin_name" "$file_path" "$PLUGIN_DIR" "$output_dir" "$combined_result") || plugin_rc=$?
+    fi
 
-    if [ "$plugin_rc" -eq 0 ]; then
+    if [ "$plugin_rc" -eq 0 ] && [ -n "$supplied_keys" ]; then
+      # Success: merge plugin output; fields of the input record take precedence
+      combined_result=$(echo "$combined_result" "$plugin_output" | jq -s --arg keys "$supplied_keys" \
+        '($keys | split(" ")) as $supplied | .[0] * (.[1] | with_entries(select(.key | IN($supplied[]) | not)))')
+    elif [ "$plugin_rc" -eq 0 ]; then
       # Success: merge plugin output into combined result
       combined_result=$(echo "$combined_result" "$plugin_output" | jq -s '.[0] * .[1]')
     elif [ "$plugin_rc" -eq 65 ]; then
@@ -125,22 +295,13 @@ process_file() {
       local _has_mime_criteria=false
       [ ${#_MIME_INCLUDE_ARGS[@]} -gt 0 ] && _has_mime_criteria=true
       [ ${#_MIME_EXCLUDE_ARGS[@]} -gt 0 ] && _has_mime_criteria=true
-      if [ "$_has_mime_criteria" = true ]; then
-        local mime_type
-        mime_type=$(echo "$combined_result" | jq -r '.mimeType // empty')
-        if [ -n "$mime_type" ]; then
-          local mime_filter_args=()
-          for _inc in "${_MIME_INCLUDE_ARGS[@]+"${_MIME_INCLUDE_ARGS[@]}"}"; do
-            mime_filter_args+=("--include" "$_inc")
-          done
-          for _exc in "${_MIME_EXCLUDE_ARGS[@]+"${_MIME_EXCLUDE_ARGS[@]}"}"; do
-            mime_filter_args+=("--exclude" "$_exc")
-          done
-          local mime_check
-          mime_check=$(echo "$mime_type" | python3 "$FILTER_SCRIPT" "${mime_filter_args[@]+"${mime_filter_args[@]}"}")
-          # Empty result means MIME filter rejected this file — skip it silently
-          [ -n "$mime_check" ] || return 0
-        fi
+      if [ "$_has_mime_criteria" = true ] || [ ${#_PLUGIN_ACCEPTS[@]} -gt 0 ]; then
+        doc_mime=$(echo "$combined_result" | jq -r '.mimeType // empty')
+      fi
+      # Rejected by the MIME criteria: skip this file silently
+      if [ "$_has_mime_criteria" = true ] && [ -n "$doc_mime" ] && \
+         ! mime_gate_check "$doc_mime"; then
+        return 0
       fi
     fi
   done
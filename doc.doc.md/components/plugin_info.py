@@ -12,13 +12,29 @@
 #   python3 plugin_info.py table
 #       - Read TSV data from stdin, output column-aligned table to stdout
 #       - Exit 0 on success, 1 on error (malformed input)
+#   python3 plugin_info.py needs <plugins_dir> <fields> <plugin>...
+#       - Print the plugins of the ordered <plugin> list needed to produce
+#         the comma-separated <fields> (see required_plugins), one per line
+#
+# Python Interface:
+#   dependency_levels(plugins_dir, plugin_names)
+#       - Group an ordered plugin list into levels that can run concurrently
+#         (used by process_engine.py)
+#   required_plugins(plugins_dir, plugin_names, fields)
+#       - The subset of an ordered plugin list that produces *fields*,
+#         including upstream dependencies (process prunes its pipeline with it)
+#   Applicability(process_spec)
+#       - A plugin's declared applicability (commands.process.accepts and
+#         commands.process.requires), evaluated before the plugin is run
 #
 # Stdout contract:
 #   tree: ASCII tree lines with ANSI color codes
 #   table: space-padded columns matching input tab-separated columns
 
+import fnmatch
 import json
 import os
+import re
 import sys
 
 # ANSI color codes
@@ -51,12 +67,17 @@ def _read_plugin(plugins_dir, plugin_name):
     process_cmd = d.get("commands", {}).get("process") or {}
     inputs = list((process_cmd.get("input") or {}).keys())
     outputs = list((process_cmd.get("output") or {}).keys())
+    # Applicability conditions read context fields just like inputs do
+    implied = [key for key in Applicability(process_cmd).fields if key not in inputs]
 
     return {
         "name": plugin_name,
         "active": active,
         "inputs": inputs,
+        "dependency_inputs": inputs + implied,
         "outputs": outputs,
+        # Receives the whole accumulated context (see run_plugin)
+        "full_context": process_cmd.get("fullContext") is True or not inputs,
     }
 
 
@@ -64,22 +85,67 @@ def _build_deps(plugin_info, all_plugins):
     """Build a dependency map from plugin input/output declarations.
 
     Plugin A depends on plugin B if any of B's declared output keys is also
-    one of A's declared input keys.
+    one of A's declared input keys, or if A declares "<key>File" (the
+    out-of-band form of a large text field, see text_blobs.py). Fields read
+    by A's applicability conditions count as inputs.
     """
     plugin_outputs = {name: set(plugin_info[name]["outputs"]) for name in all_plugins}
     deps = {}
     for name in all_plugins:
         plugin_deps = []
-        for input_param in plugin_info[name]["inputs"]:
+        info = plugin_info[name]
+        for input_param in info.get("dependency_inputs", info["inputs"]):
             for other in all_plugins:
                 if other == name:
                     continue
-                if input_param in plugin_outputs[other] and other not in plugin_deps:
+                if _provides(plugin_outputs[other], input_param) and other not in plugin_deps:
                     plugin_deps.append(other)
         deps[name] = plugin_deps
     return deps
 
 
+def _provides(outputs, field):
+    """True when a plugin with *outputs* produces *field* (or its <key>File form)."""
+    return field in outputs or (
+        field.endswith("File") and field[:-len("File")] in outputs)
+
+
+class Applicability:
+    """A plugin's declared applicability to a document.
+
+    commands.process.accepts.mimeTypes lists fnmatch patterns the document's
+    mimeType must match; commands.process.requires.anyOf lists context
+    fields of which at least one must be non-empty. Undeclared conditions
+    always hold, and an unknown (empty) mimeType is accepted so the plugin
+    can decide itself.
+    """
+
+    def __init__(self, process_spec):
+        accepts = process_spec.get("accepts")
+        requires = process_spec.get("requires")
+        patterns = accepts.get("mimeTypes") if isinstance(accepts, dict) else None
+        any_of = requires.get("anyOf") if isinstance(requires, dict) else None
+        self.mime_types = tuple(p for p in patterns or () if isinstance(p, str))
+        self.any_of = tuple(k for k in any_of or () if isinstance(k, str))
+        self._mime_re = None
+        if self.mime_types:
+            self._mime_re = re.compile(
+                "|".join(fnmatch.translate(p) for p in self.mime_types))
+
+    @property
+    def fields(self):
+        """Context fields the conditions read."""
+        return (("mimeType",) if self.mime_types else ()) + self.any_of
+
+    def accepts_mime(self, mime_type):
+        return self._mime_re is None or not mime_type or bool(
+            self._mime_re.match(mime_type))
+
+    def satisfied_by(self, context):
+        return not self.any_of or any(
+            context.get(key) not in (None, "") for key in self.any_of)
+
+
 def _detect_cycle(plugin, deps, visited, in_stack):
     """DFS cycle detection. Returns True if a cycle is detected."""
     visited.add(plugin)
@@ -124,6 +190,70 @@ def _topo_sort(all_plugins, deps):
     return result
 
 
+def dependency_levels(plugins_dir, plugin_names):
+    """Group *plugin_names* (dependencies first) into dependency levels.
+
+    A plugin's level is one more than the highest level of the plugins it
+    depends on (see _build_deps), so plugins of one level only need outputs
+    of earlier levels and can run concurrently. Order within a level follows
+    *plugin_names*. Dependencies listed later (or not at all) are ignored,
+    exactly as when the list is run serially. Plugins that receive the full
+    context (no declared inputs or "fullContext": true) depend on every
+    plugin listed before them.
+    """
+    names = list(plugin_names)
+    plugin_info = {}
+    for name in names:
+        info = _read_plugin(plugins_dir, name)
+        plugin_info[name] = info or {"name": name, "active": True, "inputs": [],
+                                     "outputs": [], "full_context": False}
+    deps = _build_deps(plugin_info, names)
+
+    level = {}
+    for name in names:
+        if plugin_info[name]["full_context"]:
+            earlier = list(level.values())
+        else:
+            earlier = [level[dep] for dep in deps[name] if dep in level]
+        level[name] = max(earlier) + 1 if earlier else 0
+
+    levels = [[] for _ in range(max(level.values(), default=-1) + 1)]
+    for name in names:
+        levels[level[name]].append(name)
+    return levels
+
+
+def required_plugins(plugins_dir, plugin_names, fields):
+    """Return the plugins of *plugin_names* needed to produce *fields*.
+
+    A plugin is needed when it outputs one of *fields* or when a needed
+    plugin depends on it (see _build_deps). A needed plugin that receives
+    the full context needs every plugin listed before it. Order follows
+    *plugin_names*.
+    """
+    names = list(plugin_names)
+    plugin_info = {}
+    for name in names:
+        info = _read_plugin(plugins_dir, name)
+        plugin_info[name] = info or {"name": name, "active": True, "inputs": [],
+                                     "outputs": [], "full_context": False}
+    deps = _build_deps(plugin_info, names)
+
+    pending = [name for name in names
+               if any(_provides(plugin_info[name]["outputs"], field) for field in fields)]
+    needed = set()
+    while pending:
+        name = pending.pop()
+        if name in needed:
+            continue
+        needed.add(name)
+        if plugin_info[name]["full_context"]:
+            pending.extend(names[:names.index(name)])
+        else:
+            pending.extend(deps[name])
+    return [name for name in names if name in needed]
+
+
 def _render_label(name, active):
     """Return ANSI-colored plugin name: green for active, red for inactive."""
     color = _GREEN if active else _RED
@@ -299,6 +429,7 @@ def main():
         print("Usage: plugin_info.py tree <plugins_dir>", file=sys.stderr)
         print("       plugin_info.py table", file=sys.stderr)
         print("       plugin_info.py topo <plugins_dir>", file=sys.stderr)
+        print("       plugin_info.py needs <plugins_dir> <fields> <plugin>...", file=sys.stderr)
         sys.exit(1)
 
     mode = sys.argv[1]
@@ -315,8 +446,16 @@ def main():
             print("Error: topo mode requires <plugins_dir>", file=sys.stderr)
             sys.exit(1)
         sys.exit(run_topo(sys.argv[2]))
+    elif mode == "needs":
+        if len(sys.argv) < 4:
+            print("Error: needs mode requires <plugins_dir> <fields>", file=sys.stderr)
+            sys.exit(1)
+        fields = [field for field in sys.argv[3].split(",") if field]
+        for name in required_plugins(sys.argv[2], sys.argv[4:], fields):
+            print(name)
+        sys.exit(0)
     else:
-        print(f"Error: Unknown mode '{mode}'. Use 'tree', 'table', or 'topo'.", file=sys.stderr)
+        print(f"Error: Unknown mode '{mode}'. Use 'tree', 'table', 'topo', or 'needs'.", file=sys.stderr)
         sys.exit(1)
 
 
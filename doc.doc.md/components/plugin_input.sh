@@ -7,6 +7,8 @@
 # Usage:  source "$(dirname "${BASH_SOURCE[0]}")/../../components/plugin_input.sh"
 #         plugin_read_input          # reads stdin, sets PLUGIN_INPUT_JSON
 #         plugin_validate_filepath   # validates and resolves filePath, sets PLUGIN_FILEPATH
+#         plugin_get_text <field>    # text field, read from <field>File when the
+#                                    # engine passed it out-of-band
 #
 # After calling both:
 #   PLUGIN_INPUT_JSON  — raw JSON string from stdin
@@ -34,6 +36,27 @@ plugin_get_field() {
   echo "$val"
 }
 
+# Print a text field that the python engine may pass out-of-band: when
+# "<field>File" names a readable regular file inside the engine's blob
+# directory (DOC_DOC_MD_BLOB_DIR) its content is printed, otherwise the
+# inline "<field>" value. References anywhere else are ignored: the value
+# may come from an upstream plugin or an input record.
+plugin_get_text() {
+  local field="$1"
+  local ref blob_dir
+  ref=$(plugin_get_field "${field}File")
+  if [ -n "$ref" ] && [ -n "${DOC_DOC_MD_BLOB_DIR:-}" ]; then
+    ref=$(readlink -f "$ref" 2>/dev/null) || ref=""
+    blob_dir=$(readlink -f "$DOC_DOC_MD_BLOB_DIR" 2>/dev/null) || blob_dir=""
+    if [ -n "$ref" ] && [ -n "$blob_dir" ] && [[ "$ref" == "$blob_dir"/* ]] \
+        && [ -f "$ref" ] && [ -r "$ref" ]; then
+      cat "$ref"
+      return 0
+    fi
+  fi
+  plugin_get_field "$field"
+}
+
 # Validate and resolve the filePath from PLUGIN_INPUT_JSON.
 # Sets PLUGIN_FILEPATH to the canonical path.
 plugin_validate_filepath() {
@@ -12,6 +12,8 @@
 #   discover_plugins <plugin_dir>            - Discover active plugins with valid descriptors
 #   discover_all_plugins <plugin_dir>        - Discover all plugins (active + inactive), sorted
 #   get_plugin_active_status <descriptor>    - Get activation status from descriptor.json
+#   resolve_uninstalled_plugins <plugin>...  - Handle active-but-uninstalled plugins
+#                                              (sets RESOLVED_PLUGINS)
 #   cmd_activate                             - Activate a plugin by name
 #   cmd_deactivate                           - Deactivate a plugin by name
 #   cmd_install                              - Install a plugin or all plugins
@@ -413,6 +415,78 @@ cmd_tree() {
   return $?
 }
 
+# --- Installation-state resolution for the process command ---
+
+# resolve_uninstalled_plugins <plugin>...
+# Checks installed.sh of each plugin. Non-interactive runs abort when any is
+# missing; interactive runs prompt to continue without it, abort or install.
+# Sets RESOLVED_PLUGINS to the plugins that remain in the chain.
+resolve_uninstalled_plugins() {
+  local -a plugins=("$@")
+  local -a _uninstalled_plugins=()
+  for p in "${plugins[@]}"; do
+    local p_installed_sh="$PLUGIN_DIR/$p/installed.sh"
+    if [ -x "$p_installed_sh" ]; then
+      local install_check
+      install_check=$(bash "$p_installed_sh" 2>/dev/null | jq -r 'if .installed == false then "false" else "true" end' 2>/dev/null) || install_check="false"
+      if [ "$install_check" = "false" ]; then
+        _uninstalled_plugins+=("$p")
+      fi
+    fi
+  done
+
+  if [ ${#_uninstalled_plugins[@]} -gt 0 ]; then
+    if ! [ -t 0 ]; then
+      log_error "The following active plugin(s) are not installed: ${_uninstalled_plugins[*]}"
+      echo "Run: ./doc.doc.sh install --plugin <name>  or  ./doc.doc.sh setup" >&2
+      exit 1
+    fi
+
+    local -a _skip_plugins=()
+    for _up in "${_uninstalled_plugins[@]}"; do
+      printf "Plugin '%s' is not installed.\n" "$_up" >&2
+      printf "  [c] Continue without this plugin\n" >&2
+      printf "  [a] Abort\n" >&2
+      printf "  [i] Install now\n" >&2
+      printf "Choice [c/a/i]: " >&2
+      local _choice=""
+      read -r _choice </dev/tty 2>/dev/null || _choice="a"
+      case "$_choice" in
+        c|C)
+          _skip_plugins+=("$_up")
+          ;;
+        i|I)
+          local _up_install_sh="$PLUGIN_DIR/$_up/install.sh"
+          if [ -x "$_up_install_sh" ] && bash "$_up_install_sh"; then
+            log_success "Plugin '$_up' installed successfully."
+          else
+            log_error "Installation failed for plugin '$_up'"
+            echo "Tip: sudo ./doc.doc.sh install --plugin $_up" >&2
+            exit 1
+          fi
+          ;;
+        *)
+          exit 1
+          ;;
+      esac
+    done
+
+    if [ ${#_skip_plugins[@]} -gt 0 ]; then
+      local -a _remaining_plugins=()
+      for p in "${plugins[@]}"; do
+        local _is_skipped=false
+        for _sp in "${_skip_plugins[@]}"; do
+          [ "$p" = "$_sp" ] && _is_skipped=true && break
+        done
+        [ "$_is_skipped" = false ] && _remaining_plugins+=("$p")
+      done
+      plugins=("${_remaining_plugins[@]}")
+    fi
+  fi
+
+  RESOLVED_PLUGINS=("${plugins[@]}")
+}
+
 # --- _list_plugins helper ---
 
 _list_plugins() {
@@ -1199,10 +1273,10 @@ cmd_loop() {
     filter_args+=("--exclude" "$_exc")
   done
 
+  # NUL-delimited, so file names may contain newlines
   local -a file_list
-  mapfile -t file_list < <(
-    find "$docs_dir" -type f | \
-    python3 "$FILTER_SCRIPT" "${filter_args[@]+"${filter_args[@]}"}"
+  mapfile -d '' -t file_list < <(
+    python3 "$FILTER_SCRIPT" --walk "$docs_dir" --null "${filter_args[@]+"${filter_args[@]}"}"
   )
 
   # --- Process each file ---
@@ -0,0 +1,1247 @@
+#!/usr/bin/env python3
+# process_engine.py - Python process engine for doc.doc.md
+# Part of doc.doc.md architecture (Level 3: Python Components)
+# Drives every discovered document through the active plugin chain while
+# keeping the accumulated context as an in-memory dict. Only the plugin
+# executables are spawned; JSON merging, pluginStorage injection, the MIME
+# filter gate, template rendering and sidecar writing happen in-process.
+#
+# Output-compatible with the bash pipeline (_run_process_pipeline in
+# doc.doc.sh and process_file/run_plugin in plugin_execution.sh):
+#   - stdout JSON array (same layout, one jq-style pretty object per file),
+#     or with --format ndjson one compact object per line (jq -c layout);
+#     --fields keeps only the listed keys of each object
+#   - sidecar files under <output_dir>/<relative_path>.md, or with
+#     --sink sqlite rows of <output_dir>/sidecars.sqlite (sidecar_writer.py);
+#     every further --template <file>:<suffix> adds <relative_path><suffix>
+#   - MIME gate after the file plugin (fail-closed when the file plugin fails)
+#   - ADR-004 exit codes: 0 = success (merge), 65 = skip (discard), other = error
+#   - each plugin receives only its declared input keys plus filePath (and
+#     pluginStorage) unless its descriptor opts into the full context
+#
+# CLI Interface (invoked by doc.doc.sh process --engine python):
+#   python3 process_engine.py --plugin-dir <dir> --input-dir <canonical_in>
+#       --template <file>[:<suffix>]... [--output-dir <canonical_out>] [--echo]
+#       [--suppress-json] [--base-path <dir>]
+#       [--mime-include <criteria>]... [--mime-exclude <criteria>]...
+#       [--events-fd <fd>] [--jobs <n>] [--incremental [--checksum]]
+#       [--cache-dir <dir> [--cache-max-size <size>]] [--index] [--fulltext]
+#       [--blob-threshold <size>] [--input-format lines|null|ndjson]
+#       [--format json|ndjson] [--fields <key,...>] [--sink tree|sqlite]
+#       <plugin>...
+#   stdin: the output of filter.py (--walk, or --root for --files-from):
+#   file paths one per line ("lines"), NUL-delimited ("null", the default
+#   of doc.doc.sh) or NDJSON document context records ("ndjson")
+#
+# Streaming discovery: stdin is read by a background thread into a bounded
+# queue (DISCOVERY_QUEUE paths), so documents are processed while the scan
+# is still running and memory stays flat however large the tree is. The
+# "found"/"total" progress fields grow as paths arrive (at most every
+# DISCOVERY_EVENT_INTERVAL seconds) and are final once the scan has ended.
+#
+# Input records (--input-format ndjson): each record's fields (mimeType,
+# fileSize, fileModified, ...; see filter.RECORD_FIELDS) seed the document
+# context. A plugin whose declared outputs are all supplied by the record is
+# trusted and not run (e.g. the file plugin when mimeType is given), and
+# record fields take precedence over the outputs of plugins that do run.
+# The MIME gate still applies to the supplied mimeType.
+#
+# Event stream contract (--events-fd): tab-separated lines that doc.doc.sh
+# forwards to the UI module, so all rendering stays in ui.sh:
+#   progress<TAB><key><TAB><value>   -> ui_progress_update <key> <value>
+#   processed<TAB><src><TAB><dst>    -> log_processed <src> <dst>
+#   error<TAB><message>              -> log_error <message>
+#   empty                            -> no documents found
+#   finish<TAB><count>               -> final summary
+#   info<TAB><message>               -> log_info <message>
+# Without --events-fd, errors and the summary are written to stderr.
+#
+# Parallelism (--jobs, default: half the CPUs, at most 4): documents are handled by a
+# bounded thread pool (plugins are subprocesses, so threads suffice).
+# Results are emitted in input order; each worker only writes its own
+# sidecar and pluginStorage directories are created with exist_ok, so
+# concurrent documents never race on shared paths.
+#
+# Several templates (--template <file>:<suffix>, repeatable; the suffix of
+# the first defaults to .md): each document's result is rendered with every
+# template after one plugin run. The first template's output is the
+# document's sidecar (progress, index, manifest); the others are written next
+# to it and pruned with it. Tokenized templates are cached by mustache_render.
+#
+# Incremental runs (--incremental, requires --output-dir): unchanged
+# documents are skipped using <output_dir>/.doc.doc.md/manifest.sqlite
+# (see run_manifest.py); the manifest is only updated by the main thread,
+# committed as the run goes and on exit (including Ctrl-C and SIGTERM), so
+# an interrupted run keeps the state of the documents it finished.
+#
+# Metadata index (--index, requires --output-dir): every document with a
+# sidecar is upserted into <output_dir>/.doc.doc.md/index.sqlite (see
+# metadata_index.py) by the main thread; rows of vanished sources are pruned.
+# --fulltext (implies --index) also keeps the documents' *Text fields in the
+# index's full-text table.
+#
+# Plugin scheduling: the plugin list is grouped into dependency levels
+# (plugin_info.dependency_levels). Plugins of one level run concurrently on
+# the same document and see the context of all earlier levels; outputs are
+# merged in list (topological) order so the JSON is deterministic. With MIME
+# criteria the file plugin runs alone first so the gate still applies before
+# any other plugin.
+#
+# Result cache (--cache-dir): successful plugin outputs are stored by content
+# hash (see plugin_cache.py) and reused across runs and output directories.
+#
+# Persistent workers: plugins declaring commands.process.server are started
+# once per run (at most --jobs instances each) and fed one NDJSON request
+# per document (protocol: plugin_api.py); all others run once per document.
+# Plugins declaring commands.process.entrypoint ("module:function") are
+# imported once and called in-process instead, without forking.
+#
+# Large text (--blob-threshold, default 256K characters, 0 disables): plugin
+# output strings above the threshold are spilled to files and kept in the
+# context as TextBlobs (see text_blobs.py); plugins declaring "<field>File"
+# receive the file path, JSON output and templates read the text lazily.
+# The blob directory is exported as DOC_DOC_MD_BLOB_DIR; plugins ignore
+# "<field>File" references outside it.
+#
+# Applicability: plugins declaring commands.process.accepts.mimeTypes or
+# commands.process.requires.anyOf (plugin_info.Applicability) are skipped
+# like an exit 65 without being started when they do not apply. The set of
+# plugins accepting a MIME type is computed once per type and run.
+#
+# MIME detection: when the file plugin runs in-process, input paths are
+# classified ahead in batches of MIME_BATCH with the shared detector
+# (mime_detect.py); the plugin's entry point then reads the cached type.
+#
+# Exit codes: 0 on success, 1 on setup errors (missing template, chevron).
+
+import argparse
+import collections
+import importlib.util
+import json
+import os
+import queue
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+_COMPONENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if _COMPONENTS_DIR not in sys.path:
+    sys.path.insert(0, _COMPONENTS_DIR)
+
+import filter as filter_engine  # noqa: E402
+import metadata_index  # noqa: E402
+import mime_detect  # noqa: E402
+import mustache_render  # noqa: E402
+import plugin_api  # noqa: E402
+import plugin_cache  # noqa: E402
+import plugin_info  # noqa: E402
+import run_manifest  # noqa: E402
+import sidecar_writer  # noqa: E402
+import text_blobs  # noqa: E402
+
+# ADR-004 exit codes
+EXIT_SKIP = 65
+
+# Persistent workers: a request is retried once on a fresh worker if the
+# worker dies; idle workers get this long to exit after stdin is closed.
+WORKER_ATTEMPTS = 2
+WORKER_SHUTDOWN_TIMEOUT = 5
+
+# Paths classified per shared MIME detector call (see _prefetched)
+MIME_BATCH = 256
+
+# Documents in flight without --jobs: half the CPUs, at most four, so a run
+# leaves the machine usable; --jobs <n> asks for more
+DEFAULT_JOBS = max(1, min(4, (os.cpu_count() or 1) // 2))
+
+# Streaming discovery: paths buffered ahead of processing, and the minimum
+# seconds between "found"/"total" progress events while the scan runs
+DISCOVERY_QUEUE = 4096
+DISCOVERY_EVENT_INTERVAL = 0.2
+
+# In-process entry points: "module:function", module relative to the plugin dir
+_ENTRYPOINT_PATTERN = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*):([A-Za-z_][A-Za-z0-9_]*)$")
+
+# Outcome status: "processed" (plugins ran), "rerendered" (stored result,
+# new sidecar) or "unchanged" (stored result, sidecar left as is).
+# manifest_entry is what the incremental manifest should keep for the
+# document (None drops it, e.g. after plugin errors).
+DocumentOutcome = collections.namedtuple(
+    "DocumentOutcome",
+    ["file_path", "relative_path", "result", "rendered", "sidecar_path",
+     "status", "manifest_entry"],
+    defaults=("processed", None))
+
+
+def deep_merge(base, update):
+    """Merge *update* into a copy of *base* with jq ``.[0] * .[1]`` semantics.
+
+    Objects are merged recursively; any other value on the right wins.
+    Key order follows jq: existing keys keep their position, new keys are
+    appended.
+    """
+    merged = dict(base)
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def to_json(data):
+    """Serialise *data* the way ``jq`` pretty-prints it (2-space indent, UTF-8).
+
+    Out-of-band text (TextBlob) is inlined.
+    """
+    return json.dumps(data, indent=2, ensure_ascii=False,
+                      default=text_blobs.json_default)
+
+
+def to_json_line(data):
+    """Serialise *data* the way ``jq -c`` prints it (one line, UTF-8)."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"),
+                      default=text_blobs.json_default)
+
+
+def project(result, fields):
+    """Keep only the *fields* keys of *result* (in result order)."""
+    if fields is None:
+        return result
+    return {key: value for key, value in result.items() if key in fields}
+
+
+class EventSink:
+    """Emits progress/log events for doc.doc.sh, or plain stderr messages."""
+
+    def __init__(self, fd=None):
+        self._stream = os.fdopen(fd, "w", buffering=1) if fd is not None else None
+        # Worker threads emit concurrently; keep each event line atomic.
+        self._lock = threading.Lock()
+
+    def _emit(self, *fields):
+        line = "\t".join(
+            str(f).replace("\t", " ").replace("\n", " ") for f in fields)
+        with self._lock:
+            self._stream.write(line + "\n")
+
+    def progress(self, key, value):
+        if self._stream:
+            self._emit("progress", key, value)
+
+    def processed(self, src, dst):
+        if self._stream:
+            self._emit("processed", src, dst)
+
+    def error(self, message):
+        if self._stream:
+            self._emit("error", message)
+        else:
+            print(f"Error: {message}", file=sys.stderr)
+
+    def empty(self):
+        if self._stream:
+            self._emit("empty")
+
+    def finish(self, count):
+        if self._stream:
+            self._emit("finish", count)
+        else:
+            print(f"Processed {count} documents.", file=sys.stderr)
+
+    def info(self, message):
+        if self._stream:
+            self._emit("info", message)
+        else:
+            print(message, file=sys.stderr)
+
+
+class PathStream:
+    """Iterates the paths read from *stream* by a background thread.
+
+    The thread stops reading while DISCOVERY_QUEUE paths are waiting, which
+    in turn blocks the producer (filter.py --walk) on the full pipe. Truth
+    testing blocks until the first path (or the end of the scan) arrives.
+    *input_format* is "lines", "null" or "ndjson"; NDJSON records are kept
+    in ``contexts`` (path -> seed context) until the engine takes them.
+    """
+
+    _EOF = object()
+
+    def __init__(self, stream, events, maxsize=DISCOVERY_QUEUE,
+                 input_format="lines"):
+        self.events = events
+        self.input_format = input_format
+        self.contexts = {}
+        self.found = 0
+        self._queue = queue.Queue(maxsize)
+        self._head = collections.deque()
+        self._done = False
+        self._last_report = None
+        self._thread = threading.Thread(
+            target=self._read, args=(stream,), daemon=True)
+        self._thread.start()
+
+    def _paths(self, stream):
+        """Yield the paths of *stream*, recording NDJSON contexts."""
+        if self.input_format == "null":
+            # os.read returns what the pipe holds, so paths are not held back
+            fd = stream.fileno()
+            pending = b""
+            while True:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                items = (pending + chunk).split(b"\0")
+                pending = items.pop()
+                yield from (os.fsdecode(item) for item in items if item)
+            if pending:
+                yield os.fsdecode(pending)
+            return
+        for line in stream:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            if self.input_format != "ndjson":
+                yield line
+                continue
+            try:
+                context = json.loads(line)
+                path = context["filePath"]
+            except (ValueError, TypeError, KeyError):
+                continue  # filter.py only writes valid records
+            self.contexts[path] = context
+            yield path
+
+    def _read(self, stream):
+        try:
+            for path in self._paths(stream):
+                self._queue.put(path)
+                self.found += 1
+                now = time.monotonic()
+                if (self._last_report is None
+                        or now - self._last_report >= DISCOVERY_EVENT_INTERVAL):
+                    self._report(now)
+        finally:
+            if self.found:
+                self._report(time.monotonic())
+            self._queue.put(self._EOF)
+
+    def _report(self, now):
+        self._last_report = now
+        self.events.progress("found", self.found)
+        self.events.progress("total", self.found)
+
+    def _get(self, block=True):
+        """Return the next path; None at the end (or if none is waiting)."""
+        if self._head:
+            return self._head.popleft()
+        if self._done:
+            return None
+        try:
+            path = self._queue.get(block)
+        except queue.Empty:
+            return None
+        if path is self._EOF:
+            self._done = True
+            return None
+        return path
+
+    def __bool__(self):
+        path = self._get()
+        if path is None:
+            return False
+        self._head.appendleft(path)
+        return True
+
+    def __iter__(self):
+        while True:
+            path = self._get()
+            if path is None:
+                return
+            yield path
+
+    def batches(self, size):
+        """Yield lists of up to *size* paths without waiting for full batches."""
+        while True:
+            path = self._get()
+            if path is None:
+                return
+            batch = [path]
+            while len(batch) < size:
+                path = self._get(block=False)
+                if path is None:
+                    break
+                batch.append(path)
+            yield batch
+
+
+class PluginWorker:
+    """One long-lived plugin server process (protocol: see plugin_api.py)."""
+
+    def __init__(self, command):
+        self.proc = subprocess.Popen(
+            [command],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def request(self, line):
+        """Send one request line; return the response dict, or None if dead."""
+        try:
+            self.proc.stdin.write(line)
+            self.proc.stdin.flush()
+            response = self.proc.stdout.readline()
+        except (OSError, ValueError):
+            return None
+        if not response:
+            return None
+        try:
+            response = json.loads(response)
+        except ValueError:
+            return None
+        return response if isinstance(response, dict) else None
+
+    def close(self, kill=False):
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        if kill:
+            self.proc.kill()
+        try:
+            self.proc.wait(timeout=WORKER_SHUTDOWN_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+class WorkerPool:
+    """Up to *max_workers* PluginWorkers for one plugin, started on demand."""
+
+    def __init__(self, command, max_workers):
+        self.command = command
+        self.max_workers = max(1, max_workers)
+        self._idle = []
+        self._started = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while not self._idle and self._started >= self.max_workers:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._started += 1
+        try:
+            return PluginWorker(self.command)
+        except OSError:
+            with self._cond:
+                self._started -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, worker, alive):
+        """Return *worker* to the pool, or discard it so a fresh one starts."""
+        if not alive:
+            worker.close(kill=True)
+        with self._cond:
+            if alive:
+                self._idle.append(worker)
+            else:
+                self._started -= 1
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.close()
+
+
+class PluginRunner:
+    """Resolves plugin process commands once per run and invokes them.
+
+    Plugins whose descriptor declares commands.process.entrypoint are
+    called in-process, those declaring commands.process.server are driven
+    through persistent workers; all others are executed once per document.
+    """
+
+    def __init__(self, plugin_dir, events, max_workers=1):
+        self.plugin_dir = plugin_dir
+        self.events = events
+        self.max_workers = max_workers
+        self._specs = {}
+        self._commands = {}
+        self._pools = {}
+        self._entrypoints = {}
+        self._applicability = {}
+        self._lock = threading.Lock()
+
+    def _process_spec(self, name):
+        """Return the descriptor's commands.process object (read once)."""
+        if name not in self._specs:
+            descriptor = os.path.join(self.plugin_dir, name, "descriptor.json")
+            try:
+                with open(descriptor, "r", encoding="utf-8") as fh:
+                    spec = json.load(fh).get("commands", {}).get("process", {})
+            except (OSError, ValueError, AttributeError):
+                spec = {}
+            self._specs[name] = spec if isinstance(spec, dict) else {}
+        return self._specs[name]
+
+    def _input_keys(self, name):
+        """Return the context keys *name* receives, or None for the full context.
+
+        filePath is always passed and pluginStorage is injected separately.
+        Descriptors without inputs or with "fullContext": true opt out.
+        """
+        spec = self._process_spec(name)
+        inputs = spec.get("input")
+        if spec.get("fullContext") is True or not isinstance(inputs, dict) or not inputs:
+            return None
+        return frozenset(inputs)
+
+    def output_keys(self, name):
+        """Return the context keys *name* declares as outputs."""
+        outputs = self._process_spec(name).get("output")
+        return frozenset(outputs) if isinstance(outputs, dict) else frozenset()
+
+    def _command_path(self, name):
+        """Return (executable, error) for *name*'s process command.
+
+        Descriptors are read once per run; the error (if any) is re-reported
+        on every call, matching run_plugin in plugin_execution.sh.
+        """
+        if name not in self._commands:
+            command = self._process_spec(name).get("command") or ""
+            candidate = os.path.join(self.plugin_dir, name, command)
+            if not command:
+                entry = (None, f"No process command defined for plugin '{name}'")
+            elif os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                entry = (candidate, None)
+            else:
+                entry = (None, "Plugin script not found or not executable: "
+                               f"{name}/{command}")
+            self._commands[name] = entry
+        return self._commands[name]
+
+    def _storage_dir(self, name, output_dir):
+        """Create .doc.doc.md/<name> under *output_dir*; return it if contained."""
+        storage_dir = os.path.join(output_dir, ".doc.doc.md", name)
+        os.makedirs(storage_dir, exist_ok=True)
+        canonical_storage = os.path.realpath(storage_dir)
+        canonical_out = os.path.realpath(output_dir)
+        # Security: verify storage path is under output directory
+        if canonical_storage.startswith(canonical_out + os.sep):
+            return canonical_storage
+        return None
+
+    def _server_pool(self, name):
+        """Return the WorkerPool for *name*, or None for one-shot plugins.
+
+        A declared server that is not executable falls back to one-shot.
+        """
+        with self._lock:
+            if name not in self._pools:
+                server = self._process_spec(name).get("server") or ""
+                candidate = os.path.join(self.plugin_dir, name, server)
+                if server and os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                    self._pools[name] = WorkerPool(candidate, self.max_workers)
+                else:
+                    self._pools[name] = None
+            return self._pools[name]
+
+    def _entrypoint(self, name):
+        """Return the in-process handler for *name*, or None.
+
+        The module is imported once per run; an invalid spec or a module
+        that fails to import falls back to the server or one-shot command.
+        """
+        with self._lock:
+            if name not in self._entrypoints:
+                self._entrypoints[name] = self._load_entrypoint(name)
+            return self._entrypoints[name]
+
+    def _load_entrypoint(self, name):
+        match = _ENTRYPOINT_PATTERN.match(
+            self._process_spec(name).get("entrypoint") or "")
+        if not match:
+            return None
+        module_name, function_name = match.groups()
+        module_path = os.path.join(self.plugin_dir, name, module_name + ".py")
+        if not os.path.isfile(module_path):
+            return None
+        spec = importlib.util.spec_from_file_location(
+            f"doc_doc_md_plugin_{name.replace('-', '_')}_{module_name}", module_path)
+        try:
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except Exception:  # noqa: BLE001 - any import failure means "not here"
+            return None
+        handler = getattr(module, function_name, None)
+        return handler if callable(handler) else None
+
+    def in_process(self, name):
+        """True if *name* runs through its in-process entry point."""
+        return self._entrypoint(name) is not None
+
+    def applicability(self, name):
+        """Return *name*'s plugin_info.Applicability (read once)."""
+        with self._lock:
+            if name not in self._applicability:
+                self._applicability[name] = plugin_info.Applicability(
+                    self._process_spec(name))
+            return self._applicability[name]
+
+    def close(self):
+        """Stop all persistent workers (stdin EOF, then wait)."""
+        with self._lock:
+            pools = [pool for pool in self._pools.values() if pool is not None]
+        for pool in pools:
+            pool.close()
+
+    def _run_server(self, pool, name, json_input, file_name):
+        """Send one document to a persistent worker; restart it once if it dies."""
+        line = (json.dumps(json_input, ensure_ascii=False) + "\n").encode("utf-8")
+        response = None
+        for _attempt in range(WORKER_ATTEMPTS):
+            try:
+                worker = pool.acquire()
+            except OSError:
+                break
+            response = worker.request(line)
+            pool.release(worker, alive=response is not None)
+            if response is not None:
+                break
+        if response is None:
+            self.events.error(f"Plugin '{name}' worker died for file: {file_name}")
+            return 1, None
+        return self._response_result(name, response, file_name)
+
+    def _response_result(self, name, response, file_name):
+        """Map a protocol response to (exit_code, output) per ADR-004."""
+        status = response.get("status")
+        if status == "skip":
+            return EXIT_SKIP, None
+        if status != "ok":
+            self.events.error(f"Plugin '{name}' failed for file: {file_name}")
+            return 1, None
+        output = response.get("output")
+        if not isinstance(output, dict):
+            self.events.error(
+                f"Plugin '{name}' returned invalid JSON for file: {file_name}")
+            return 1, None
+        return 0, output
+
+    def run(self, name, file_path, output_dir, context):
+        """Run one plugin. Returns (exit_code, output_dict_or_None)."""
+        handler = self._entrypoint(name)
+        if handler is None:
+            script_path, error = self._command_path(name)
+            if script_path is None:
+                self.events.error(error)
+                return 1, None
+
+        keys = self._input_keys(name)
+        if keys is not None:
+            context = {key: value for key, value in context.items()
+                       if key in keys or key + text_blobs.FILE_SUFFIX in keys}
+        json_input = text_blobs.resolve(
+            deep_merge({"filePath": file_path}, context), keys)
+        if output_dir:
+            storage = self._storage_dir(name, output_dir)
+            if storage is not None:
+                json_input["pluginStorage"] = storage
+
+        if handler is not None:
+            return self._response_result(
+                name, plugin_api.call(handler, json_input),
+                os.path.basename(file_path))
+
+        pool = self._server_pool(name)
+        if pool is not None:
+            return self._run_server(
+                pool, name, json_input, os.path.basename(file_path))
+
+        proc = subprocess.run(
+            [script_path],
+            input=(to_json(json_input) + "\n").encode("utf-8"),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        if proc.returncode == EXIT_SKIP:
+            return EXIT_SKIP, None
+
+        file_name = os.path.basename(file_path)
+        if proc.returncode != 0:
+            self.events.error(f"Plugin '{name}' failed for file: {file_name}")
+            return 1, None
+
+        try:
+            output = json.loads(proc.stdout.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            output = None
+        if not isinstance(output, dict):
+            self.events.error(
+                f"Plugin '{name}' returned invalid JSON for file: {file_name}")
+            return 1, None
+        return 0, output
+
+
+class ProcessEngine:
+    """In-memory equivalent of process_file + the per-file pipeline loop."""
+
+    def __init__(self, args, events):
+        self.args = args
+        self.events = events
+        self.plugins = args.plugins
+        self.runner = PluginRunner(args.plugin_dir, events, args.jobs)
+        self.canonical_in = args.input_dir
+        self.canonical_out = args.output_dir or ""
+        self.mime_include = args.mime_include
+        self.mime_exclude = args.mime_exclude
+        self.mime_plan = filter_engine.FilterPlan(self.mime_include, self.mime_exclude)
+        self.stages = self._plugin_stages()
+        self._execution_plans = {}
+        # Seed contexts of NDJSON input records (PathStream.contexts)
+        self._contexts = {}
+        widest = max(len(stage) for stage in self.stages)
+        self._stage_pool = None
+        if widest > 1:
+            # The first plugin of a stage runs on the document's own thread
+            self._stage_pool = ThreadPoolExecutor(
+                max_workers=max(1, args.jobs) * (widest - 1))
+        # (content, suffix) per --template; the first one names the sidecar
+        self.templates = []
+        for spec in args.template:
+            template_file, suffix = mustache_render.parse_template_spec(spec)
+            with open(template_file, "r", encoding="utf-8") as fh:
+                self.templates.append((fh.read(), suffix or ".md"))
+        self.suffix = self.templates[0][1]
+        self.blobs = text_blobs.BlobStore(args.blob_threshold)
+        # Plugins (subprocesses and in-process handlers) only follow
+        # "<field>File" references into this directory
+        if self.blobs.directory:
+            os.environ[text_blobs.BLOB_DIR_ENV] = self.blobs.directory
+        else:
+            os.environ.pop(text_blobs.BLOB_DIR_ENV, None)
+        self.sidecars = sidecar_writer.open_sink(
+            args.sink if self.canonical_out else "tree", self.canonical_out or None)
+        self.cache = None
+        if args.cache_dir:
+            self.cache = plugin_cache.PluginCache(args.cache_dir, args.plugin_dir)
+        self.manifest = None
+        if args.incremental and self.canonical_out:
+            self.manifest = run_manifest.RunManifest(
+                self.canonical_out,
+                run_manifest.pipeline_signature(
+                    args.plugin_dir, self.plugins, self.templates,
+                    args.base_path),
+                checksum=args.checksum)
+        self.index = None
+        if (args.index or args.fulltext) and self.canonical_out:
+            self.index = metadata_index.MetadataIndex(
+                self.canonical_out, fulltext=args.fulltext)
+
+    def _plugin_stages(self):
+        """Return the plugin list as dependency levels (see module header)."""
+        stages = []
+        for level in plugin_info.dependency_levels(
+                self.args.plugin_dir, self.plugins):
+            if "file" in level and self.has_mime_criteria and len(level) > 1:
+                stages.append(["file"])
+                level = [name for name in level if name != "file"]
+            stages.append(level)
+        return stages
+
+    def close(self):
+        """Commit the manifest; stop pools, workers and the MIME detector;
+        remove blobs; commit the index."""
+        if self.manifest is not None:
+            self.manifest.close()
+        if self._stage_pool is not None:
+            self._stage_pool.shutdown()
+        self.runner.close()
+        self.blobs.close()
+        os.environ.pop(text_blobs.BLOB_DIR_ENV, None)
+        self.sidecars.close()
+        mime_detect.shared().close()
+        if self.index is not None:
+            self.index.close()
+
+    @property
+    def has_mime_criteria(self):
+        return bool(self.mime_include or self.mime_exclude)
+
+    def passes_mime_gate(self, context):
+        """Apply the MIME criteria to *context*'s mimeType (if any)."""
+        if not self.has_mime_criteria:
+            return True
+        mime_type = context.get("mimeType") or ""
+        return not mime_type or self.mime_plan.passes_mime(mime_type)
+
+    def _execution_plan(self, mime_type):
+        """Return the plugins whose accepts.mimeTypes admit *mime_type*."""
+        plan = self._execution_plans.get(mime_type)
+        if plan is None:
+            plan = frozenset(
+                name for name in self.plugins
+                if self.runner.applicability(name).accepts_mime(mime_type))
+            self._execution_plans[mime_type] = plan
+        return plan
+
+    def applies(self, name, context):
+        """Whether plugin *name* applies to a document with *context*."""
+        if name not in self._execution_plan(context.get("mimeType") or ""):
+            return False
+        return self.runner.applicability(name).satisfied_by(context)
+
+    def _run_plugin(self, name, file_path, combined, digest, supplied=frozenset()):
+        """Run one plugin, consulting the result cache when enabled.
+
+        *digest* is a one-element list holding the document's content hash,
+        computed on first use so uncached chains never read the file twice.
+        Plugins that do not apply are skipped (EXIT_SKIP) without running;
+        plugins whose outputs are all in *supplied* (the keys of the input
+        record) succeed without running, and record fields take precedence
+        over the outputs of plugins that do run.
+        """
+        if not self.applies(name, combined):
+            return EXIT_SKIP, None
+        outputs = self.runner.output_keys(name)
+        if supplied and outputs and outputs <= supplied:
+            return 0, {}
+        rc, output = self._execute_plugin(name, file_path, combined, digest)
+        if rc == 0 and supplied:
+            output = {key: value for key, value in output.items()
+                      if key not in supplied}
+        return rc, output
+
+    def _execute_plugin(self, name, file_path, combined, digest):
+        """Run one applicable plugin through the result cache (if enabled)."""
+        key = None
+        if self.cache is not None and self.cache.is_cacheable(name):
+            if digest[0] is None:
+                try:
+                    digest[0] = run_manifest.file_digest(file_path)
+                except OSError:
+                    digest[0] = ""
+            key = self.cache.key(name, digest[0], combined)
+            if key is not None:
+                output = self.cache.get(name, key)
+                if output is not None:
+                    return 0, self.blobs.spill(file_path, output)
+
+        rc, output = self.runner.run(
+            name, file_path, self.canonical_out, combined)
+        if rc == 0:
+            if key is not None:
+                self.cache.put(name, key, output)
+            output = self.blobs.spill(file_path, output)
+        return rc, output
+
+    def process_file(self, file_path, content_digest=None, context=None):
+        """Run *file_path* through the plugin chain.
+
+        *context* is the document's input record (see module header).
+        Returns (context, clean): the merged context, or None when the MIME
+        gate rejects the file, and whether every plugin exited 0 or 65.
+        """
+        combined = {"filePath": file_path}
+        if context:
+            combined.update(
+                (key, value) for key, value in context.items() if key != "filePath")
+        supplied = frozenset(combined) - {"filePath"}
+        clean = True
+        digest = [content_digest]
+        for stage in self.stages:
+            results = self._run_stage(stage, file_path, combined, digest, supplied)
+            for name, (rc, output) in zip(stage, results):
+                if rc == 0:
+                    combined = deep_merge(combined, output)
+                elif rc == EXIT_SKIP:
+                    # ADR-004 intentional skip: silently discard
+                    continue
+                else:
+                    clean = False
+                    # Fail closed: file plugin failure + MIME criteria skips the file
+                    if name == "file" and self.has_mime_criteria:
+                        return None, clean
+                    continue
+
+                # MIME filter gate right after the file plugin
+                if name == "file" and not self.passes_mime_gate(combined):
+                    return None, clean
+        return combined, clean
+
+    def _run_stage(self, stage, file_path, combined, digest, supplied):
+        """Run one dependency level on *combined*; results in stage order."""
+        futures = [
+            self._stage_pool.submit(
+                self._run_plugin, name, file_path, combined, digest, supplied)
+            for name in stage[1:]
+        ]
+        results = [self._run_plugin(stage[0], file_path, combined, digest, supplied)]
+        results.extend(future.result() for future in futures)
+        return results
+
+    def _relative_path(self, file_path):
+        canonical_file = os.path.realpath(file_path)
+        prefix = self.canonical_in + "/"
+        if canonical_file.startswith(prefix):
+            return canonical_file[len(prefix):]
+        return canonical_file
+
+    def _render_data(self, file_path, result):
+        if not self.args.base_path:
+            return dict(result)
+        render_data = dict(result)
+        render_data["filePath"] = os.path.relpath(file_path, self.args.base_path)
+        return render_data
+
+    def _render(self, file_path, result):
+        """Render *result* with every template; return the texts in order."""
+        data = self._render_data(file_path, result)
+        return [mustache_render.render_data(template, data)
+                for template, _suffix in self.templates]
+
+    def _sidecar_path(self, file_path, relative_path):
+        """Create the sidecar directory and return the sidecar path, or None."""
+        sidecar_path = f"{self.canonical_out}/{relative_path}{self.suffix}"
+        try:
+            self.sidecars.prepare(sidecar_path)
+        except sidecar_writer.SidecarError as exc:
+            self.events.error(f"{exc} for '{file_path}'")
+            return None
+        return sidecar_path
+
+    def handle_document(self, file_path):
+        """Process, render and write one document (runs in a worker thread).
+
+        Returns a DocumentOutcome; ``result`` is None when the MIME gate
+        rejected the file, ``sidecar_path`` is None when nothing was written.
+        """
+        relative_path = self._relative_path(file_path)
+        context = self._contexts.pop(file_path, None)
+        self.events.progress("step", "Execute plugins")
+        self.events.progress("file", relative_path)
+
+        fingerprint = None
+        if self.manifest is not None:
+            fingerprint = self.manifest.fingerprint(file_path)
+            stored = self.manifest.lookup(file_path, fingerprint)
+            if stored is not None:
+                return self._handle_stored(
+                    file_path, relative_path, dict(stored, **fingerprint))
+
+        result, clean = self.process_file(
+            file_path, (fingerprint or {}).get("sha256"), context)
+        if result is None:
+            return DocumentOutcome(file_path, relative_path, None, None, None)
+        rendered = self._render(file_path, result)
+        if self.args.echo:
+            return DocumentOutcome(file_path, relative_path, result, rendered, None)
+
+        sidecar_path = self._sidecar_path(file_path, relative_path)
+        entry = None
+        if sidecar_path is not None:
+            self._write_sidecar(sidecar_path, rendered)
+            # Documents with plugin errors are not recorded so that the
+            # next incremental run retries them.
+            if fingerprint is not None and clean:
+                entry = self.manifest.make_entry(
+                    fingerprint, sidecar_path, text_blobs.materialize(result),
+                    self._outputs(sidecar_path)[1:])
+        return DocumentOutcome(file_path, relative_path, result, rendered,
+                               sidecar_path, "processed", entry)
+
+    def _handle_stored(self, file_path, relative_path, entry):
+        """Reuse the manifest result of an unchanged document."""
+        # The entry is recorded without its result (the stored one is kept);
+        # large stored text goes out-of-band again, like fresh plugin output
+        stored = entry.pop("result")
+        result = self.blobs.spill(file_path, stored)
+        if not self.passes_mime_gate(result):
+            return DocumentOutcome(file_path, relative_path, None, None, None,
+                                   "unchanged", entry)
+        sidecar_path = self._sidecar_path(file_path, relative_path)
+        if sidecar_path is None:
+            return DocumentOutcome(file_path, relative_path, result, None, None,
+                                   "unchanged", entry)
+        outputs = self._outputs(sidecar_path)
+        if (not self.manifest.needs_render(entry)
+                and all(self.sidecars.exists(path) for path in outputs)):
+            return DocumentOutcome(file_path, relative_path, result, None,
+                                   sidecar_path, "unchanged", entry)
+        rendered = self._render(file_path, result)
+        self._write_sidecar(sidecar_path, rendered)
+        entry = self.manifest.make_entry(entry, sidecar_path, stored, outputs[1:])
+        return DocumentOutcome(file_path, relative_path, result, rendered,
+                               sidecar_path, "rerendered", entry)
+
+    def _outputs(self, sidecar_path):
+        """Paths of every template's output for *sidecar_path*, in order."""
+        base = sidecar_path[:len(sidecar_path) - len(self.suffix)]
+        return [base + suffix for _template, suffix in self.templates]
+
+    def _write_sidecar(self, sidecar_path, rendered):
+        """Write each template's output if its content changed (atomically)."""
+        self.events.progress("step", "Write output")
+        for path, text in zip(self._outputs(sidecar_path), rendered):
+            self.sidecars.write(path, text)
+
+    def _outcomes(self, file_list):
+        """Yield DocumentOutcomes in input order using up to ``jobs`` workers.
+
+        At most ``2 * jobs`` documents are in flight, so results for early
+        files are emitted while later files are still being processed. A
+        document's blob files are removed once the caller has consumed it.
+        """
+        jobs = self.args.jobs
+        file_list = self._prefetched(file_list)
+        if jobs <= 1:
+            for file_path in file_list:
+                yield self.handle_document(file_path)
+                self.blobs.discard(file_path)
+            return
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            pending = collections.deque()
+            for file_path in file_list:
+                pending.append(
+                    (file_path, pool.submit(self.handle_document, file_path)))
+                if len(pending) >= 2 * jobs:
+                    done_path, future = pending.popleft()
+                    yield future.result()
+                    self.blobs.discard(done_path)
+            while pending:
+                done_path, future = pending.popleft()
+                yield future.result()
+                self.blobs.discard(done_path)
+
+    def _prefetched(self, file_list):
+        """Yield *file_list*, classifying MIME types MIME_BATCH paths ahead.
+
+        Only done when the file plugin runs in-process; otherwise it detects
+        the type itself and a prefetch would be wasted.
+        """
+        if "file" not in self.plugins or not self.runner.in_process("file"):
+            yield from file_list
+            return
+        detector = mime_detect.shared()
+        if isinstance(file_list, PathStream):
+            batches = file_list.batches(MIME_BATCH)
+        else:
+            batches = (file_list[start:start + MIME_BATCH]
+                       for start in range(0, len(file_list), MIME_BATCH))
+        for batch in batches:
+            # Types supplied by input records need no detection
+            files = [os.path.realpath(path) for path in batch
+                     if "mimeType" not in self._contexts.get(path, ())]
+            try:
+                detector.detect_many([path for path in files if os.path.isfile(path)])
+            except mime_detect.MimeDetectorError:
+                pass  # reported by the file plugin
+            yield from batch
+
+    def _finish_manifest(self, statuses):
+        """Prune vanished sources, persist the manifest and report counts."""
+        if self.manifest is None:
+            return
+        pruned = self.manifest.prune(self.sidecars.remove)
+        self.manifest.save()
+        self.events.info(
+            f"Incremental: {statuses['processed']} processed, "
+            f"{statuses['rerendered']} re-rendered, "
+            f"{statuses['unchanged']} unchanged, {pruned} pruned.")
+
+    def _finish_cache(self):
+        """Enforce the cache size cap (LRU) and report hit/miss counts."""
+        if self.cache is None:
+            return
+        evicted, _freed = self.cache.prune(self.args.cache_max_size)
+        self.events.info(
+            f"Cache: {self.cache.hits} hits, {self.cache.misses} misses, "
+            f"{self.cache.stored} stored, {evicted} evicted.")
+
+    def _finish_index(self):
+        """Prune vanished sources from the metadata index and report it."""
+        if self.index is None:
+            return
+        pruned = self.index.prune()
+        self.events.info(
+            f"Index: {self.index.count()} documents, "
+            f"{self.index.updated} updated, {pruned} pruned.")
+        self.index.close()
+        self.index = None
+
+    def run(self, file_list):
+        """Process every path of *file_list* (a list or a PathStream).
+
+        "found"/"total" progress is reported here for lists; a PathStream
+        reports its own counts while discovery continues.
+        """
+        events = self.events
+        out = sys.stdout
+        echo_mode = self.args.echo
+        suppress_json = self.args.suppress_json
+        ndjson = self.args.format == "ndjson"
+        fields = self.args.fields
+        if isinstance(file_list, PathStream):
+            self._contexts = file_list.contexts
+
+        if not file_list:
+            events.empty()
+            if not suppress_json and not ndjson:
+                out.write("[]\n")
+            self._finish_manifest(collections.Counter())
+            self._finish_cache()
+            self._finish_index()
+            return 0
+
+        events.progress("step", "Apply include/exclude filters")
+        if not isinstance(file_list, PathStream):
+            events.progress("found", len(file_list))
+            events.progress("total", len(file_list))
+        events.progress("phase", "Process documents")
+
+        first = True
+        printed_bracket = False
+        processed_count = 0
+        statuses = collections.Counter()
+        for outcome in self._outcomes(file_list):
+            if self.manifest is not None:
+                if outcome.manifest_entry is not None:
+                    self.manifest.record(outcome.file_path, outcome.manifest_entry)
+                else:
+                    self.manifest.forget(outcome.file_path)
+            if self.index is not None:
+                if outcome.result is None:
+                    self.index.remove(outcome.file_path)
+                elif outcome.sidecar_path is not None:
+                    self.index.upsert(outcome.file_path, outcome.sidecar_path,
+                                      text_blobs.materialize(outcome.result))
+            if outcome.result is None:
+                continue
+
+            if echo_mode:
+                if first:
+                    first = False
+                else:
+                    out.write("\n")
+                out.write(f"=== {outcome.relative_path} ===\n")
+                out.write("".join(outcome.rendered))
+                out.write("\n")
+                out.flush()
+                processed_count += 1
+                continue
+
+            if not suppress_json and ndjson:
+                out.write(to_json_line(project(outcome.result, fields)) + "\n")
+                out.flush()
+            elif not suppress_json:
+                if not printed_bracket:
+                    out.write("[\n")
+                    printed_bracket = True
+                if first:
+                    first = False
+                else:
+                    out.write(",\n")
+                out.write(to_json(project(outcome.result, fields)) + "\n")
+                out.flush()
+            else:
+                printed_bracket = True
+                first = False
+
+            if outcome.sidecar_path is None:
+                continue
+            processed_count += 1
+            statuses[outcome.status] += 1
+            events.progress("done", processed_count)
+            if outcome.status != "unchanged":
+                events.processed(outcome.file_path,
+                                 self.sidecars.location(outcome.sidecar_path))
+
+        if self.sidecars.written or self.sidecars.unchanged:
+            events.info(self.sidecars.summary())
+        events.finish(processed_count)
+        self._finish_manifest(statuses)
+        self._finish_cache()
+        self._finish_index()
+
+        if not suppress_json and not ndjson:
+            if not printed_bracket:
+                out.write("[]\n")
+            else:
+                out.write("\n]\n")
+        return 0
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Process documents through the active plugin chain.")
+    parser.add_argument("--plugin-dir", required=True)
+    parser.add_argument("--input-dir", required=True)
+    parser.add_argument("--output-dir", default="")
+    parser.add_argument("--template", action="append", required=True)
+    parser.add_argument("--echo", action="store_true")
+    parser.add_argument("--suppress-json", action="store_true")
+    parser.add_argument("--base-path", default="")
+    parser.add_argument("--mime-include", action="append", default=[])
+    parser.add_argument("--mime-exclude", action="append", default=[])
+    parser.add_argument("--events-fd", type=int, default=None)
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS)
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--checksum", action="store_true")
+    parser.add_argument("--cache-dir", default="")
+    parser.add_argument("--cache-max-size", type=plugin_cache.parse_size,
+                        default=plugin_cache.DEFAULT_MAX_SIZE)
+    parser.add_argument("--index", action="store_true")
+    parser.add_argument("--fulltext", action="store_true")
+    parser.add_argument("--blob-threshold", type=plugin_cache.parse_size,
+                        default=text_blobs.DEFAULT_THRESHOLD)
+    parser.add_argument("--input-format", choices=("lines", "null", "ndjson"),
+                        default="lines")
+    parser.add_argument("--format", choices=("json", "ndjson"), default="json")
+    parser.add_argument("--fields", default=None,
+                        type=lambda value: frozenset(value.split(",")))
+    parser.add_argument("--sink", choices=sidecar_writer.SINKS, default="tree")
+    parser.add_argument("plugins", nargs="+")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    events = EventSink(args.events_fd)
+
+    try:
+        import chevron  # noqa: F401
+    except ImportError:
+        events.error("chevron library not installed (pip install chevron)")
+        return 1
+
+    try:
+        engine = ProcessEngine(args, events)
+    except OSError as exc:
+        events.error(f"Cannot read template: {exc.strerror}")
+        return 1
+
+    # SIGTERM unwinds like Ctrl-C, so close() still commits the manifest
+    signal.signal(signal.SIGTERM, lambda _signum, _frame: sys.exit(143))
+    events.progress("phase", "Scan directory")
+    events.progress("step", "Reading directory tree")
+    try:
+        return engine.run(PathStream(
+            sys.stdin, events, input_format=args.input_format))
+    finally:
+        engine.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
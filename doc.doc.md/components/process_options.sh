@@ -0,0 +1,357 @@
+#!/bin/bash
+# process_options.sh - Document source and output options of process
+# Part of doc.doc.md architecture (Level 3: Bash Components)
+# Owns the process options that choose the documents (-i, -e, --files-from,
+# --null, --ndjson, --follow-symlinks, --one-file-system), shape what is written
+# (-t <file>[:<suffix>], --format, --fields, --sink) and prune the plugin
+# chain (--all-plugins), together with the helpers the process pipeline in
+# doc.doc.sh uses for them.
+#
+# Public Interface:
+#   options_reset                  - Reset option state before parsing
+#   options_parse_option <args...> - Consume one option; sets
+#                                    _OPTIONS_OPT_SHIFT, returns 1 if not ours
+#   options_validate               - Validate options; resolve the templates
+#                                    and the discovery format
+#   options_split_filter_criteria  - Split -i/-e into MIME and path criteria
+#   options_json_suppressed        - True when no JSON is written to stdout
+#   options_prune_plugins <plugin>...
+#                                  - Set _OPTIONS_PLUGINS to the plugins whose
+#                                    outputs the run consumes
+#   run_discovery <filter args...> - Run filter.py as the document source
+#   emit_result <json>             - Write one result in the --format layout
+
+_PROCESS_OPTIONS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# MIME filter criteria (consumed by process_file in plugin_execution.sh)
+_MIME_INCLUDE_ARGS=()
+_MIME_EXCLUDE_ARGS=()
+# Option state (consumed by doc.doc.sh and run_python_engine)
+_PROC_INCLUDE_ARGS=()
+_PROC_EXCLUDE_ARGS=()
+_PROC_PATH_INCLUDE_ARGS=()
+_PROC_PATH_EXCLUDE_ARGS=()
+_PROC_TEMPLATE_FILE=""
+_PROC_TEMPLATE_ARGS=()
+_PROC_TEMPLATES=()
+_PROC_TEMPLATE_SPECS=""
+_PROC_WALK_ARGS=()
+_PROC_FILES_FROM=""
+_PROC_LIST_FORMAT=""
+_PROC_DISCOVERY_FORMAT="null"
+_PROC_OUTPUT_FORMAT="json"
+_PROC_FIELDS=""
+_PROC_SINK="tree"
+_PROC_ALL_PLUGINS=false
+_OPTIONS_PLUGINS=()
+_OPTIONS_OPT_SHIFT=0
+
+options_reset() {
+  _PROC_TEMPLATE_FILE="$DEFAULT_TEMPLATE"
+  _PROC_TEMPLATE_ARGS=()
+  _PROC_INCLUDE_ARGS=()
+  _PROC_EXCLUDE_ARGS=()
+  _PROC_WALK_ARGS=()
+  _PROC_FILES_FROM=""
+  _PROC_LIST_FORMAT=""
+  _PROC_OUTPUT_FORMAT=""
+  _PROC_FIELDS=""
+  _PROC_SINK=""
+  _PROC_ALL_PLUGINS=false
+}
+
+# --- Option parsing ---
+
+options_parse_option() {
+  case "$1" in
+    -t|--template)
+      [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+      _PROC_TEMPLATE_ARGS+=("$2")
+      _OPTIONS_OPT_SHIFT=2
+      ;;
+    -i)
+      [ $# -ge 2 ] || { log_error "-i requires an argument"; exit 1; }
+      _PROC_INCLUDE_ARGS+=("$2")
+      _OPTIONS_OPT_SHIFT=2
+      ;;
+    -e)
+      [ $# -ge 2 ] || { log_error "-e requires an argument"; exit 1; }
+      _PROC_EXCLUDE_ARGS+=("$2")
+      _OPTIONS_OPT_SHIFT=2
+      ;;
+    --follow-symlinks|--one-file-system)
+      _PROC_WALK_ARGS+=("$1")
+      _OPTIONS_OPT_SHIFT=1
+      ;;
+    --files-from)
+      [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+      _PROC_FILES_FROM="$2"
+      _OPTIONS_OPT_SHIFT=2
+      ;;
+    --null|--ndjson)
+      if [ -n "$_PROC_LIST_FORMAT" ] && [ "$_PROC_LIST_FORMAT" != "${1#--}" ]; then
+        log_error "--null and --ndjson are mutually exclusive"
+        exit 1
+      fi
+      _PROC_LIST_FORMAT="${1#--}"
+      _OPTIONS_OPT_SHIFT=1
+      ;;
+    --format)
+      [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+      _PROC_OUTPUT_FORMAT="$2"
+      _OPTIONS_OPT_SHIFT=2
+      ;;
+    --fields)
+      [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+      _PROC_FIELDS="$2"
+      _OPTIONS_OPT_SHIFT=2
+      ;;
+    --sink)
+      [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+      _PROC_SINK="$2"
+      _OPTIONS_OPT_SHIFT=2
+      ;;
+    --all-plugins)
+      _PROC_ALL_PLUGINS=true
+      _OPTIONS_OPT_SHIFT=1
+      ;;
+    *)
+      return 1
+      ;;
+  esac
+  return 0
+}
+
+options_validate() {
+  _options_resolve_templates
+
+  # Discovery: walk -d (NUL-delimited), or filter the --files-from list
+  _PROC_DISCOVERY_FORMAT="null"
+  if [ -n "$_PROC_FILES_FROM" ]; then
+    if [ "$_PROC_FILES_FROM" != "-" ] && [ ! -r "$_PROC_FILES_FROM" ]; then
+      log_error "File list not found or not readable: $_PROC_FILES_FROM"
+      exit 1
+    fi
+    if [ ${#_PROC_WALK_ARGS[@]} -gt 0 ]; then
+      log_error "${_PROC_WALK_ARGS[0]} cannot be combined with --files-from"
+      exit 1
+    fi
+    _PROC_DISCOVERY_FORMAT="${_PROC_LIST_FORMAT:-lines}"
+  elif [ -n "$_PROC_LIST_FORMAT" ]; then
+    log_error "--$_PROC_LIST_FORMAT requires --files-from"
+    exit 1
+  fi
+
+  # JSON output: array (default) or one compact object per line, optionally
+  # projected to --fields
+  if [ "$_PROC_ECHO_MODE" = true ] && { [ -n "$_PROC_OUTPUT_FORMAT" ] || [ -n "$_PROC_FIELDS" ]; }; then
+    log_error "--format and --fields cannot be combined with --echo"
+    exit 1
+  fi
+  case "${_PROC_OUTPUT_FORMAT:=json}" in
+    json|ndjson) : ;;
+    *)
+      log_error "Unknown format '$_PROC_OUTPUT_FORMAT' (expected 'json' or 'ndjson')"
+      exit 1
+      ;;
+  esac
+  _PROC_FIELDS="${_PROC_FIELDS//[[:space:]]/}"
+  if [ -n "$_PROC_FIELDS" ] && ! [[ "$_PROC_FIELDS" =~ ^[A-Za-z_][A-Za-z0-9_]*(,[A-Za-z_][A-Za-z0-9_]*)*$ ]]; then
+    log_error "Invalid --fields '$_PROC_FIELDS' (comma-separated field names, e.g. filePath,mimeType)"
+    exit 1
+  fi
+
+  # Sidecar sink: mirrored tree (default) or one archive (sidecar_writer.py)
+  if [ "$_PROC_ECHO_MODE" = true ] && [ -n "$_PROC_SINK" ]; then
+    log_error "--sink cannot be combined with --echo"
+    exit 1
+  fi
+  case "${_PROC_SINK:=tree}" in
+    tree|sqlite) : ;;
+    *)
+      log_error "Unknown sink '$_PROC_SINK' (expected 'tree' or 'sqlite')"
+      exit 1
+      ;;
+  esac
+}
+
+# Split the -t <file>[:<suffix>] arguments like
+# mustache_render.parse_template_spec into _PROC_TEMPLATES (<file>:<suffix>,
+# the suffix defaulting to .md) and the newline-separated
+# _PROC_TEMPLATE_SPECS the renderer takes. _PROC_TEMPLATE_FILE is the first
+# template, whose output is the document's sidecar.
+_options_resolve_templates() {
+  local -a args=("${_PROC_TEMPLATE_ARGS[@]+"${_PROC_TEMPLATE_ARGS[@]}"}")
+  [ ${#args[@]} -gt 0 ] || args=("$DEFAULT_TEMPLATE")
+  if [ "$_PROC_ECHO_MODE" = true ] && [ ${#args[@]} -gt 1 ]; then
+    log_error "--echo renders a single template"
+    exit 1
+  fi
+
+  local spec file suffix used=" "
+  _PROC_TEMPLATES=()
+  for spec in "${args[@]}"; do
+    file="$spec"
+    suffix=""
+    if [ ! -f "$spec" ] && [[ "$spec" == ?*:* ]] && \
+       [[ "${spec##*:}" =~ ^\.?[A-Za-z0-9][A-Za-z0-9._-]*$ ]]; then
+      file="${spec%:*}"
+      suffix="${spec##*:}"
+    fi
+    if [ ! -f "$file" ]; then
+      log_error "Template file not found: $file"
+      exit 1
+    fi
+    suffix="${suffix:-.md}"
+    [[ "$suffix" == .* ]] || suffix=".$suffix"
+    if [[ "$used" == *" $suffix "* ]]; then
+      log_error "Templates need distinct suffixes ('$suffix' is used twice; use -t <file>:<suffix>)"
+      exit 1
+    fi
+    used+="$suffix "
+    _PROC_TEMPLATES+=("$file:$suffix")
+  done
+  _PROC_TEMPLATE_FILE="${_PROC_TEMPLATES[0]%:*}"
+  _PROC_TEMPLATE_SPECS="$(printf '%s\n' "${_PROC_TEMPLATES[@]}")"
+}
+
+# True when no JSON result is written to stdout: --echo, or stdout is a
+# terminal (the result is only meaningful for pipelines).
+options_json_suppressed() {
+  [ "$_PROC_ECHO_MODE" = true ] || [ -t 1 ]
+}
+
+# Split the -i/-e criteria into MIME types (type/subtype without '**', gated
+# per document by process_file) and path/predicate criteria (applied by the
+# walker); malformed metadata predicates abort the run.
+options_split_filter_criteria() {
+  local -a mime_include_args=()
+  local -a mime_exclude_args=()
+  _PROC_PATH_INCLUDE_ARGS=()
+  _PROC_PATH_EXCLUDE_ARGS=()
+
+  for inc in "${_PROC_INCLUDE_ARGS[@]+"${_PROC_INCLUDE_ARGS[@]}"}"; do
+    if [[ "$inc" == *"/"* ]] && [[ "$inc" != *"**"* ]]; then
+      mime_include_args+=("$inc")
+    else
+      _PROC_PATH_INCLUDE_ARGS+=("$inc")
+    fi
+  done
+  for exc in "${_PROC_EXCLUDE_ARGS[@]+"${_PROC_EXCLUDE_ARGS[@]}"}"; do
+    if [[ "$exc" == *"/"* ]] && [[ "$exc" != *"**"* ]]; then
+      mime_exclude_args+=("$exc")
+    else
+      _PROC_PATH_EXCLUDE_ARGS+=("$exc")
+    fi
+  done
+
+  _MIME_INCLUDE_ARGS=("${mime_include_args[@]+"${mime_include_args[@]}"}")
+  _MIME_EXCLUDE_ARGS=("${mime_exclude_args[@]+"${mime_exclude_args[@]}"}")
+
+  # Metadata predicates (size>50M, mtime>2026-01-01, age<7d) are evaluated
+  # by the walker; reject malformed ones before any plugin runs
+  local -a predicate_args=()
+  for inc in "${_PROC_PATH_INCLUDE_ARGS[@]+"${_PROC_PATH_INCLUDE_ARGS[@]}"}"; do
+    predicate_args+=("--include" "$inc")
+  done
+  for exc in "${_PROC_PATH_EXCLUDE_ARGS[@]+"${_PROC_PATH_EXCLUDE_ARGS[@]}"}"; do
+    predicate_args+=("--exclude" "$exc")
+  done
+  if [[ "${predicate_args[*]+"${predicate_args[*]}"}" =~ (^|[[:space:],])(size|mtime|age)[[:space:]]*[\<\>=] ]]; then
+    python3 "$FILTER_SCRIPT" --explain "${predicate_args[@]}" > /dev/null || exit 1
+  fi
+}
+
+# --- Pipeline pruning (FEATURE_0074) ---
+
+# Print the comma-separated fields the run consumes: the names the templates
+# reference, the --fields of the JSON output (when <json_output> is true)
+# and mimeType (MIME gate). Fails when every field is consumed (full JSON
+# output, --index, a template with partials, --all-plugins), i.e. no plugin
+# may be skipped.
+_options_demanded_fields() {
+  local json_output="$1"
+  [ "$_PROC_ALL_PLUGINS" = false ] && [ "$_PROC_INDEX" = false ] || return 1
+  local -a fields=(mimeType)
+  if [ "$json_output" = true ]; then
+    [ -n "$_PROC_FIELDS" ] || return 1
+    fields+=("$_PROC_FIELDS")
+  fi
+  local names spec
+  local -a template_files=()
+  for spec in "${_PROC_TEMPLATES[@]}"; do
+    template_files+=("${spec%:*}")
+  done
+  names="$(python3 "$_PROCESS_OPTIONS_DIR/mustache_render.py" \
+    --names "${template_files[@]}" 2>/dev/null)" || return 1
+  [ "$names" != "*" ] || return 1
+  local -a referenced
+  mapfile -t referenced <<< "$names"
+  fields+=("${referenced[@]}")
+  local IFS=","
+  echo "${fields[*]}"
+}
+
+# Set _OPTIONS_PLUGINS to the plugins (of the ordered list given) that
+# produce a consumed field, plus their dependencies; skipped plugins are
+# reported. Without pruning every plugin is kept.
+options_prune_plugins() {
+  _OPTIONS_PLUGINS=("$@")
+  local fields json_output=true
+  options_json_suppressed && json_output=false
+  fields="$(_options_demanded_fields "$json_output")" || return 0
+
+  local -a needed skipped=()
+  mapfile -t needed < <(
+    python3 "$_PROCESS_OPTIONS_DIR/plugin_info.py" needs "$PLUGIN_DIR" "$fields" "$@" 2>/dev/null
+  )
+  [ ${#needed[@]} -gt 0 ] || return 0
+  local p
+  for p in "$@"; do
+    [[ " ${needed[*]} " == *" $p "* ]] || skipped+=("$p")
+  done
+  if [ ${#skipped[@]} -gt 0 ] && [ "$_PROC_ECHO_MODE" = false ]; then
+    local list
+    list="$(printf '%s, ' "${skipped[@]}")"
+    log_info "Skipping plugins not used by the template or output: ${list%, }"
+  fi
+  _OPTIONS_PLUGINS=("${needed[@]}")
+}
+
+# --- Discovery and output (FEATURE_0067, FEATURE_0070) ---
+
+# Run filter.py as the document source: a walk of the input directory, or
+# the --files-from list resolved against it. Output format:
+# _PROC_DISCOVERY_FORMAT (null, lines or ndjson).
+run_discovery() {
+  if [ -z "$_PROC_FILES_FROM" ]; then
+    python3 "$FILTER_SCRIPT" --walk "$_PROC_CANONICAL_IN" --null "$@"
+    return
+  fi
+  local -a list_args=(--root "$_PROC_CANONICAL_IN")
+  [ -z "$_PROC_LIST_FORMAT" ] || list_args+=("--$_PROC_LIST_FORMAT")
+  if [ "$_PROC_FILES_FROM" = "-" ]; then
+    python3 "$FILTER_SCRIPT" "${list_args[@]}" "$@"
+  else
+    python3 "$FILTER_SCRIPT" "${list_args[@]}" "$@" < "$_PROC_FILES_FROM"
+  fi
+}
+
+# Write one document result to stdout in the --format/--fields layout:
+# pretty-printed as is (json), or one compact line per document (ndjson),
+# keeping only the --fields keys when given.
+emit_result() {
+  local result="$1"
+  if [ -z "$_PROC_FIELDS" ] && [ "$_PROC_OUTPUT_FORMAT" = "json" ]; then
+    echo "$result"
+    return
+  fi
+  local -a jq_args=()
+  [ "$_PROC_OUTPUT_FORMAT" = "ndjson" ] && jq_args+=(-c)
+  if [ -n "$_PROC_FIELDS" ]; then
+    printf '%s\n' "$result" | jq "${jq_args[@]}" --arg fields "$_PROC_FIELDS" \
+      '($fields | split(",")) as $keep | with_entries(select(.key | IN($keep[])))'
+  else
+    printf '%s\n' "$result" | jq "${jq_args[@]}" .
+  fi
+}
@@ -0,0 +1,307 @@
+#!/bin/bash
+# python_engine.sh - Python process engine bridge for doc.doc.md
+# Part of doc.doc.md architecture (Level 3: Bash Components)
+# Owns the process options that select or configure the Python process
+# engine (process_engine.py) and connects its event stream to ui.sh.
+# The bash pipeline in doc.doc.sh stays the default engine.
+#
+# Public Interface:
+#   engine_reset_options          - Reset engine option state before parsing
+#   engine_parse_option <args...> - Consume one engine option; sets
+#                                   _ENGINE_OPT_SHIFT, returns 1 if not ours
+#   engine_validate_options       - Validate options and resolve _PROC_ENGINE
+#   run_python_engine <show_progress> <suppress_json>
+#                                 - Run process_engine.py on the discovery
+#                                   output (filter.py) read from stdin
+#   cmd_cache                     - Inspect or prune the plugin result cache
+
+_PYTHON_ENGINE_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Engine option state (consumed by doc.doc.sh and run_python_engine)
+_PROC_ENGINE="bash"
+_PROC_JOBS=""
+_PROC_INCREMENTAL=false
+_PROC_CHECKSUM=false
+_PROC_CACHE_DIR=""
+_PROC_CACHE_MAX_SIZE=""
+_PROC_INDEX=false
+_PROC_FULLTEXT=false
+_ENGINE_OPT_SHIFT=0
+
+engine_reset_options() {
+  _PROC_ENGINE=""
+  _PROC_JOBS=""
+  _PROC_INCREMENTAL=false
+  _PROC_CHECKSUM=false
+  _PROC_CACHE_DIR=""
+  _PROC_CACHE_MAX_SIZE=""
+  _PROC_INDEX=false
+  _PROC_FULLTEXT=false
+}
+
+# --- Option parsing (FEATURE_0051 - FEATURE_0054) ---
+
+engine_parse_option() {
+  case "$1" in
+    --engine)
+      [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+      _PROC_ENGINE="$2"
+      _ENGINE_OPT_SHIFT=2
+      ;;
+    -j|--jobs)
+      [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+      _PROC_JOBS="$2"
+      _ENGINE_OPT_SHIFT=2
+      ;;
+    --incremental)
+      _PROC_INCREMENTAL=true
+      _ENGINE_OPT_SHIFT=1
+      ;;
+    --checksum)
+      _PROC_INCREMENTAL=true
+      _PROC_CHECKSUM=true
+      _ENGINE_OPT_SHIFT=1
+      ;;
+    --cache-dir)
+      [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+      _PROC_CACHE_DIR="$2"
+      _ENGINE_OPT_SHIFT=2
+      ;;
+    --cache-max-size)
+      [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+      _PROC_CACHE_MAX_SIZE="$2"
+      _ENGINE_OPT_SHIFT=2
+      ;;
+    --index)
+      _PROC_INDEX=true
+      _ENGINE_OPT_SHIFT=1
+      ;;
+    --fulltext)
+      _PROC_INDEX=true
+      _PROC_FULLTEXT=true
+      _ENGINE_OPT_SHIFT=1
+      ;;
+    *)
+      return 1
+      ;;
+  esac
+  return 0
+}
+
+engine_validate_options() {
+  case "$_PROC_ENGINE" in
+    bash|python|"") : ;;
+    *)
+      log_error "Unknown engine '$_PROC_ENGINE' (expected 'bash' or 'python')"
+      exit 1
+      ;;
+  esac
+
+  if [ -n "$_PROC_JOBS" ] && ! [[ "$_PROC_JOBS" =~ ^[1-9][0-9]*$ ]]; then
+    log_error "--jobs requires a positive integer, got '$_PROC_JOBS'"
+    exit 1
+  fi
+
+  if [ -n "$_PROC_CACHE_MAX_SIZE" ]; then
+    if [ -z "$_PROC_CACHE_DIR" ]; then
+      log_error "--cache-max-size requires --cache-dir"
+      exit 1
+    fi
+    if ! [[ "$_PROC_CACHE_MAX_SIZE" =~ ^[0-9]+[KMGTkmgt]?$ ]]; then
+      log_error "Invalid --cache-max-size '$_PROC_CACHE_MAX_SIZE' (e.g. 500M, 2G)"
+      exit 1
+    fi
+  fi
+
+  if [ -n "$_PROC_CACHE_DIR" ]; then
+    mkdir -p "$_PROC_CACHE_DIR" 2>/dev/null || {
+      log_error "Cannot create cache directory: $_PROC_CACHE_DIR"
+      exit 1
+    }
+    if [ ! -w "$_PROC_CACHE_DIR" ]; then
+      log_error "Cache directory is not writable: $_PROC_CACHE_DIR"
+      exit 1
+    fi
+  fi
+
+  if [ "$_PROC_INCREMENTAL" = true ] && [ "$_PROC_ECHO_MODE" = true ]; then
+    log_error "--incremental requires -o (not available with --echo)"
+    exit 1
+  fi
+  if [ "$_PROC_INDEX" = true ] && [ "$_PROC_ECHO_MODE" = true ]; then
+    if [ "$_PROC_FULLTEXT" = true ]; then
+      log_error "--fulltext requires -o (not available with --echo)"
+      exit 1
+    fi
+    log_error "--index requires -o (not available with --echo)"
+    exit 1
+  fi
+
+  # Parallel (--jobs), incremental, cached and indexed runs are python engine
+  # features; they select that engine unless another one was requested
+  # explicitly, and say so: the bash engine stays sequential.
+  local _python_opt=""
+  [ -n "$_PROC_JOBS" ] && _python_opt="--jobs"
+  [ -n "$_PROC_CACHE_DIR" ] && _python_opt="--cache-dir"
+  [ "$_PROC_INCREMENTAL" = true ] && _python_opt="--incremental"
+  [ "$_PROC_INDEX" = true ] && _python_opt="--index"
+  [ "$_PROC_FULLTEXT" = true ] && _python_opt="--fulltext"
+  [ "$_PROC_CHECKSUM" = true ] && _python_opt="--checksum"
+  if [ -n "$_python_opt" ]; then
+    if [ "$_PROC_ENGINE" = "bash" ]; then
+      log_error "$_python_opt requires --engine python"
+      exit 1
+    fi
+    [ -z "$_PROC_ENGINE" ] && log_info "$_python_opt: using the python engine."
+    _PROC_ENGINE="python"
+  fi
+  [ -n "$_PROC_ENGINE" ] || _PROC_ENGINE="bash"
+}
+
+# --- Engine execution ---
+
+# Consume the Python engine's event stream (see process_engine.py) and forward
+# each event to the UI module. Runs in its own pipeline subshell, so the
+# progress display is initialised and finished here.
+_process_engine_events() {
+  local show_progress="$1"
+  local _event _key _value
+  if [ "$show_progress" = true ]; then
+    ui_progress_init 0
+  fi
+  while IFS=$'\t' read -r _event _key _value; do
+    case "$_event" in
+      progress)
+        [ "$show_progress" = true ] && ui_progress_update "$_key" "$_value"
+        ;;
+      processed)
+        [ "$show_progress" = true ] || log_processed "$_key" "$_value"
+        ;;
+      error)
+        log_error "$_key"
+        ;;
+      info)
+        log_info "$_key"
+        ;;
+      empty)
+        [ "$show_progress" = true ] && ui_progress_done 0
+        ;;
+      finish)
+        if [ "$show_progress" = true ]; then
+          ui_progress_update phase "Done"
+          ui_progress_update step ""
+          ui_progress_done "$_key"
+        else
+          echo "Processed $_key documents." >&2
+        fi
+        ;;
+    esac
+  done
+  return 0
+}
+
+# Run the Python process engine on the discovery output (filter.py, in
+# _PROC_DISCOVERY_FORMAT) arriving on stdin.
+# Engine stdout stays on our stdout (fd 4); its events travel over fd 3.
+run_python_engine() {
+  local show_progress="$1" suppress_json="$2"
+
+  local -a engine_args=(
+    --plugin-dir "$PLUGIN_DIR"
+    --input-dir "$_PROC_CANONICAL_IN"
+    --input-format "${_PROC_DISCOVERY_FORMAT:-lines}"
+    --events-fd 3
+  )
+  local _spec
+  for _spec in "${_PROC_TEMPLATES[@]}"; do
+    engine_args+=(--template "$_spec")
+  done
+  [ -n "$_PROC_CANONICAL_OUT" ] && engine_args+=(--output-dir "$_PROC_CANONICAL_OUT")
+  [ "$_PROC_ECHO_MODE" = true ] && engine_args+=(--echo)
+  [ "$suppress_json" = true ] && engine_args+=(--suppress-json)
+  [ -n "$_PROC_BASE_PATH_RESOLVED" ] && engine_args+=(--base-path "$_PROC_BASE_PATH_RESOLVED")
+  [ "${_PROC_OUTPUT_FORMAT:-json}" = "json" ] || engine_args+=(--format "$_PROC_OUTPUT_FORMAT")
+  [ -n "${_PROC_FIELDS:-}" ] && engine_args+=(--fields "$_PROC_FIELDS")
+  [ "${_PROC_SINK:-tree}" = "tree" ] || engine_args+=(--sink "$_PROC_SINK")
+  [ -n "$_PROC_JOBS" ] && engine_args+=(--jobs "$_PROC_JOBS")
+  [ "$_PROC_INCREMENTAL" = true ] && engine_args+=(--incremental)
+  [ "$_PROC_CHECKSUM" = true ] && engine_args+=(--checksum)
+  [ "$_PROC_INDEX" = true ] && engine_args+=(--index)
+  [ "$_PROC_FULLTEXT" = true ] && engine_args+=(--fulltext)
+  if [ -n "$_PROC_CACHE_DIR" ]; then
+    engine_args+=(--cache-dir "$(readlink -f "$_PROC_CACHE_DIR")")
+    [ -n "$_PROC_CACHE_MAX_SIZE" ] && engine_args+=(--cache-max-size "$_PROC_CACHE_MAX_SIZE")
+  fi
+  local _crit
+  for _crit in "${_MIME_INCLUDE_ARGS[@]+"${_MIME_INCLUDE_ARGS[@]}"}"; do
+    engine_args+=(--mime-include "$_crit")
+  done
+  for _crit in "${_MIME_EXCLUDE_ARGS[@]+"${_MIME_EXCLUDE_ARGS[@]}"}"; do
+    engine_args+=(--mime-exclude "$_crit")
+  done
+
+  {
+    python3 "$_PYTHON_ENGINE_DIR/process_engine.py" "${engine_args[@]}" "${_PROC_PLUGINS[@]}" 3>&1 1>&4 | \
+    _process_engine_events "$show_progress"
+  } 4>&1
+}
+
+# --- Cache command (FEATURE_0054) ---
+# Inspect or prune the plugin result cache used by process --cache-dir.
+cmd_cache() {
+  local action="${1:-}"
+  case "$action" in
+    stats|prune) shift ;;
+    --help|-h) ui_usage_cache; exit 0 ;;
+    "")
+      log_error "cache requires an action (stats or prune)"
+      ui_usage_cache >&2
+      exit 1
+      ;;
+    *)
+      log_error "Unknown cache action '$action'. Use --help for usage."
+      exit 1
+      ;;
+  esac
+
+  local cache_dir="" max_size=""
+  while [ $# -gt 0 ]; do
+    case "$1" in
+      -c|--cache-dir)
+        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+        cache_dir="$2"
+        shift 2
+        ;;
+      --max-size)
+        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
+        max_size="$2"
+        shift 2
+        ;;
+      --help)
+        ui_usage_cache
+        exit 0
+        ;;
+      *)
+        log_error "Unknown option '$1'. Use --help for usage."
+        exit 1
+        ;;
+    esac
+  done
+
+  if [ -z "$cache_dir" ]; then
+    log_error "Cache directory is required (--cache-dir <dir>)"
+    exit 1
+  fi
+  if [ -n "$max_size" ] && [ "$action" != "prune" ]; then
+    log_error "--max-size is only valid for 'cache prune'"
+    exit 1
+  fi
+  if [ -n "$max_size" ] && ! [[ "$max_size" =~ ^[0-9]+[KMGTkmgt]?$ ]]; then
+    log_error "Invalid --max-size '$max_size' (e.g. 500M, 2G)"
+    exit 1
+  fi
+
+  local -a cache_args=(--cache-dir "$cache_dir")
+  [ -n "$max_size" ] && cache_args+=(--max-size "$max_size")
+  python3 "$_PYTHON_ENGINE_DIR/plugin_cache.py" "$action" "${cache_args[@]}"
+}
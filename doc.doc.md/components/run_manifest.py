@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# run_manifest.py - Incremental run manifest for doc.doc.md
+# Part of doc.doc.md architecture (Level 3: Python Components)
+# Records what the last `process --incremental` run produced so that the next
+# run can skip documents whose source and pipeline are unchanged.
+#
+# Location: <output_dir>/.doc.doc.md/manifest.sqlite (next to pluginStorage)
+#
+# Layout (SQLite, PRAGMA user_version = MANIFEST_VERSION):
+#   table meta(key, value)
+#     "pipeline": {
+#       "plugins": [["file", "1.0.0"], ...],   # chain order + descriptor version
+#       "template": "<sha256 of the template(s) and their suffixes>",
+#       "basePath": "<resolved -b value or empty>"
+#     }
+#   table files(source PRIMARY KEY, entry, result)
+#     source  canonical source path
+#     entry   {"size": 123, "mtimeNs": 1700000000000000000, "inode": 42,
+#              "sha256": "...",                   # only with --checksum
+#              "sidecar": "<path relative to output_dir>",
+#              "outputs": ["<path>", ...],        # further templates (-t f:sfx)
+#              "plugins": "<digest of pipeline.plugins>",
+#              "render": "<digest of pipeline.template + basePath>"}
+#     result  the merged plugin output (compact JSON)
+#
+# Nothing is loaded up front: a document's row is read when the document is
+# looked up, and its result (which may hold large extracted text) is only
+# decoded when the entry is current. Entries are written as the run goes and
+# committed every COMMIT_INTERVAL entries or COMMIT_SECONDS, and by close(),
+# so an interrupted run keeps the state of the documents it finished.
+# A manifest of another MANIFEST_VERSION is dropped (every document is
+# re-processed once).
+#
+# Each entry carries digests of the pipeline it was produced with, so entries
+# not visited by a run (e.g. excluded by -i/-e) never look current later.
+#
+# Decisions per document:
+#   - plugin set/versions changed        -> every document is re-processed
+#   - fingerprint changed or no entry    -> document is re-processed
+#   - only template/base path changed    -> re-rendered from the stored result
+#   - nothing changed and sidecar exists -> skipped; stored result is emitted
+# Entries whose source file no longer exists are pruned together with their
+# sidecar (removed through the run's sidecar sink, see sidecar_writer.py).
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+MANIFEST_VERSION = 2
+MANIFEST_NAME = "manifest.sqlite"
+# Entries per transaction, and the longest time an entry stays uncommitted
+COMMIT_INTERVAL = 100
+COMMIT_SECONDS = 5
+_HASH_CHUNK = 1024 * 1024
+
+
+def file_digest(path):
+    """Return the hex SHA-256 of *path*'s content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def plugin_versions(plugin_dir, plugins):
+    """Return [[name, version], ...] for *plugins* in chain order."""
+    versions = []
+    for name in plugins:
+        descriptor = os.path.join(plugin_dir, name, "descriptor.json")
+        try:
+            with open(descriptor, "r", encoding="utf-8") as fh:
+                version = json.load(fh).get("version") or ""
+        except (OSError, ValueError, AttributeError):
+            version = ""
+        versions.append([name, str(version)])
+    return versions
+
+
+def pipeline_signature(plugin_dir, plugins, templates, base_path):
+    """Describe everything besides the source file that shapes a sidecar.
+
+    *templates* is the list of (content, suffix) pairs rendered per document.
+    """
+    if len(templates) == 1 and templates[0][1] == ".md":
+        # A plain single-template run keeps the digest of earlier manifests
+        template_text = templates[0][0]
+    else:
+        template_text = json.dumps([[suffix, content] for content, suffix in templates])
+    return {
+        "plugins": plugin_versions(plugin_dir, plugins),
+        "template": hashlib.sha256(template_text.encode("utf-8")).hexdigest(),
+        "basePath": base_path or "",
+    }
+
+
+def _digest(value):
+    encoded = json.dumps(value, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def manifest_path(output_dir):
+    return os.path.join(output_dir, ".doc.doc.md", MANIFEST_NAME)
+
+
+def _compact(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class RunManifest:
+    """Manifest of the previous runs plus the entries recorded by this run.
+
+    Lookups may come from the engine's worker threads; entries are only
+    recorded by the main thread.
+    """
+
+    def __init__(self, output_dir, pipeline, checksum=False):
+        self.output_dir = output_dir
+        self.path = manifest_path(output_dir)
+        self.pipeline = pipeline
+        self.checksum = checksum
+
+        self.plugins_digest = _digest(pipeline["plugins"])
+        self.render_digest = _digest(
+            [pipeline["template"], pipeline["basePath"]])
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._committed_at = time.monotonic()
+        self._create()
+
+    def _create(self):
+        with self.db:
+            if self.db.execute("PRAGMA user_version").fetchone()[0] != MANIFEST_VERSION:
+                self.db.execute("DROP TABLE IF EXISTS files")
+                self.db.execute("DROP TABLE IF EXISTS meta")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS files (source TEXT PRIMARY KEY, "
+                "entry TEXT NOT NULL, result TEXT NOT NULL)")
+            self.db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('pipeline', ?)",
+                (_compact(self.pipeline),))
+            self.db.execute(f"PRAGMA user_version={MANIFEST_VERSION}")
+
+    def fingerprint(self, file_path):
+        """Return the fingerprint dict for *file_path*, or None if unreadable."""
+        try:
+            st = os.stat(file_path)
+            fingerprint = {
+                "size": st.st_size,
+                "mtimeNs": st.st_mtime_ns,
+                "inode": st.st_ino,
+            }
+            if self.checksum:
+                fingerprint["sha256"] = file_digest(file_path)
+        except OSError:
+            return None
+        return fingerprint
+
+    def lookup(self, file_path, fingerprint):
+        """Return the stored entry (with "result") if *file_path* is unchanged."""
+        if fingerprint is None:
+            return None
+        with self._lock:
+            row = self.db.execute(
+                "SELECT entry, result FROM files WHERE source = ?",
+                (file_path,)).fetchone()
+        if row is None:
+            return None
+        try:
+            entry = json.loads(row[0])
+        except ValueError:
+            return None
+        if not isinstance(entry, dict) or entry.get("plugins") != self.plugins_digest:
+            return None
+        if entry.get("size") != fingerprint["size"]:
+            return None
+        # With --checksum the content hash decides (touched files stay
+        # unchanged); otherwise mtime and inode must both match.
+        if "sha256" in fingerprint and "sha256" in entry:
+            if entry["sha256"] != fingerprint["sha256"]:
+                return None
+        elif (entry.get("mtimeNs") != fingerprint["mtimeNs"]
+                or entry.get("inode") != fingerprint["inode"]):
+            return None
+        try:
+            result = json.loads(row[1])
+        except ValueError:
+            return None
+        if not isinstance(result, dict):
+            return None
+        entry["result"] = result
+        return entry
+
+    def needs_render(self, entry):
+        """True when *entry*'s sidecar was rendered with another template."""
+        return entry.get("render") != self.render_digest
+
+    def make_entry(self, fingerprint, sidecar_path, result, outputs=()):
+        """Entry for a document rendered to *sidecar_path* (and *outputs*)."""
+        entry = dict(fingerprint)
+        entry.pop("outputs", None)
+        entry["sidecar"] = os.path.relpath(sidecar_path, self.output_dir)
+        if outputs:
+            entry["outputs"] = [os.path.relpath(path, self.output_dir) for path in outputs]
+        entry["plugins"] = self.plugins_digest
+        entry["render"] = self.render_digest
+        entry["result"] = result
+        return entry
+
+    def record(self, file_path, entry):
+        """Store *entry*; without "result" the stored result is kept."""
+        entry = dict(entry)
+        result = entry.pop("result", None)
+        with self._lock:
+            if result is None:
+                self.db.execute("UPDATE files SET entry = ? WHERE source = ?",
+                                (_compact(entry), file_path))
+            else:
+                self.db.execute(
+                    "INSERT INTO files (source, entry, result) VALUES (?, ?, ?) "
+                    "ON CONFLICT(source) DO UPDATE SET entry=excluded.entry, "
+                    "result=excluded.result",
+                    (file_path, _compact(entry), _compact(result)))
+            self._tick()
+
+    def forget(self, file_path):
+        with self._lock:
+            self.db.execute("DELETE FROM files WHERE source = ?", (file_path,))
+            self._tick()
+
+    def _tick(self):
+        self._pending += 1
+        if (self._pending >= COMMIT_INTERVAL
+                or time.monotonic() - self._committed_at >= COMMIT_SECONDS):
+            self._commit()
+
+    def _commit(self):
+        self.db.commit()
+        self._pending = 0
+        self._committed_at = time.monotonic()
+
+    def prune(self, remove_sidecar):
+        """Drop entries whose source is gone and delete their sidecars.
+
+        *remove_sidecar* is called with each sidecar path (the sink's
+        remove()), including the outputs of further templates. Returns the
+        number of pruned entries.
+        """
+        with self._lock:
+            sources = [source for (source,) in
+                       self.db.execute("SELECT source FROM files").fetchall()]
+        pruned = 0
+        for source in sources:
+            if os.path.exists(source):
+                continue
+            with self._lock:
+                row = self.db.execute(
+                    "SELECT entry FROM files WHERE source = ?", (source,)).fetchone()
+                self.db.execute("DELETE FROM files WHERE source = ?", (source,))
+            pruned += 1
+            try:
+                entry = json.loads(row[0]) if row else {}
+            except ValueError:
+                entry = {}
+            for sidecar in [entry.get("sidecar")] + list(entry.get("outputs") or ()):
+                if sidecar:
+                    remove_sidecar(os.path.join(self.output_dir, sidecar))
+        return pruned
+
+    def save(self):
+        """Commit every recorded entry."""
+        with self._lock:
+            self._commit()
+
+    def close(self):
+        """Commit and close; safe to call more than once."""
+        with self._lock:
+            if self.db is None:
+                return
+            self._commit()
+            self.db.close()
+            self.db = None
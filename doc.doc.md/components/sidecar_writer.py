@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# sidecar_writer.py - Write-if-changed, atomic sidecar output for doc.doc.md
+# Part of doc.doc.md architecture (Level 3: Python Components)
+# Writes rendered sidecars (<output_dir>/<relative_path>.md) for both
+# engines: the python process engine calls it in-process, the bash engine
+# through the mustache_render.py --batch renderer coprocess.
+#
+#   - A sidecar whose current content equals the rendered content is left
+#     untouched (no new inode, no new mtime), so rsync, static site builds
+#     and search indexers only see real changes. The existing file is only
+#     read when its size matches.
+#   - A changed sidecar is written to a temporary file in the same
+#     directory and renamed over the old one, so an interrupted run never
+#     leaves a truncated sidecar. The old file's permissions are kept; new
+#     sidecars get the usual 0666 & ~umask.
+#   - Sidecar directories are created and checked against the output root
+#     (path traversal) once per directory and run, not once per file.
+#
+# Counts of written and unchanged sidecars are kept for the run summary.
+#
+# Sinks (process --sink): where the sidecars go.
+#   tree    one file per sidecar in a tree mirroring the input (SidecarWriter,
+#           the default)
+#   sqlite  one archive file <output_dir>/sidecars.sqlite (SidecarArchive):
+#           table sidecars(path, content, digest, modified), keyed by the
+#           sidecar path relative to the output directory. Every sidecar is
+#           committed when written (WAL), so an interrupted run keeps all
+#           acknowledged sidecars; unchanged content (same SHA-256) is not
+#           rewritten. `doc.doc.sh extract` materializes selected sidecars.
+# Both sinks offer prepare/write/exists/remove/summary/close; open_sink()
+# returns the one for a sink name.
+#
+# CLI Interface (invoked by doc.doc.sh extract):
+#   python3 sidecar_writer.py extract --output-dir <dir> [--to <dir>|-]
+#       [--list] [<pattern>...]
+#   <pattern>: glob over the sidecar path or the source path relative to the
+#   output directory (sub/*.pdf, reports/*); default: every sidecar.
+#
+# Exit codes: 0 on success, 1 on a missing or unreadable archive.
+
+import argparse
+import datetime
+import hashlib
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+
+TEMP_SUFFIX = ".tmp"
+SINKS = ("tree", "sqlite")
+ARCHIVE_NAME = "sidecars.sqlite"
+SIDECAR_SUFFIX = ".md"
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class SidecarError(Exception):
+    """The sidecar directory cannot be created or lies outside the root."""
+
+
+def same_content(path, data):
+    """True when the regular file at *path* holds exactly *data* (bytes)."""
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, "rb") as fh:
+            return fh.read() == data
+    except OSError:
+        return False
+
+
+def write_atomic(path, data):
+    """Replace *path* with *data* via a temporary file and a rename."""
+    directory, name = os.path.split(path)
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except OSError:
+        mode = 0o666 & ~_UMASK
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{name}.", suffix=TEMP_SUFFIX, dir=directory or ".")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _remove_empty_parents(directory, stop):
+    """Remove empty directories from *directory* up to (excluding) *stop*."""
+    while directory.startswith(stop + os.sep):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            return
+        directory = os.path.dirname(directory)
+
+
+class SidecarWriter:
+    """Write sidecars below *output_root* only when their content changed.
+
+    Safe to share between the worker threads of the process engine.
+    """
+
+    def __init__(self, output_root=None):
+        self.output_root = os.path.realpath(output_root) if output_root else None
+        self.written = 0
+        self.unchanged = 0
+        self._dirs = set()
+        self._lock = threading.Lock()
+
+    def prepare(self, sidecar_path):
+        """Create the directory of *sidecar_path* once and check the root.
+
+        Raises SidecarError when the directory cannot be created or
+        resolves outside the output root.
+        """
+        directory = os.path.dirname(sidecar_path)
+        if directory in self._dirs:
+            return
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as exc:
+            raise SidecarError("Cannot resolve sidecar path") from exc
+        if self.output_root is not None:
+            canonical = os.path.realpath(directory)
+            if (canonical != self.output_root
+                    and not canonical.startswith(self.output_root + os.sep)):
+                raise SidecarError("path traversal detected")
+        with self._lock:
+            self._dirs.add(directory)
+
+    def write(self, sidecar_path, rendered):
+        """Write *rendered* to *sidecar_path*; return False if unchanged."""
+        self.prepare(sidecar_path)
+        data = rendered.encode("utf-8")
+        changed = not same_content(sidecar_path, data)
+        if changed:
+            write_atomic(sidecar_path, data)
+        with self._lock:
+            if changed:
+                self.written += 1
+            else:
+                self.unchanged += 1
+        return changed
+
+    def exists(self, sidecar_path):
+        return os.path.isfile(sidecar_path)
+
+    def remove(self, sidecar_path):
+        """Delete a sidecar and its emptied directories (inside the root only)."""
+        if self.output_root is None:
+            return
+        sidecar_path = os.path.realpath(sidecar_path)
+        if (sidecar_path.startswith(self.output_root + os.sep)
+                and os.path.isfile(sidecar_path)):
+            os.remove(sidecar_path)
+            _remove_empty_parents(os.path.dirname(sidecar_path), self.output_root)
+
+    def location(self, sidecar_path):
+        """Where *sidecar_path* is stored, for progress messages."""
+        return sidecar_path
+
+    def summary(self):
+        """One-line run summary, e.g. 'Sidecars: 3 written, 97 unchanged.'"""
+        return f"Sidecars: {self.written} written, {self.unchanged} unchanged."
+
+    def close(self):
+        pass
+
+
+def archive_path(output_root):
+    return os.path.join(output_root, ARCHIVE_NAME)
+
+
+class SidecarArchive(SidecarWriter):
+    """Write sidecars into the single SQLite archive of *output_root*."""
+
+    def __init__(self, output_root, readonly=False):
+        super().__init__(output_root)
+        self.path = archive_path(self.output_root)
+        if readonly:
+            if not os.path.isfile(self.path):
+                raise SidecarError(f"No sidecar archive in '{output_root}'")
+            self.db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True,
+                                      check_same_thread=False)
+            return
+        os.makedirs(self.output_root, exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS sidecars ("
+                "path TEXT PRIMARY KEY, content BLOB NOT NULL, "
+                "digest TEXT NOT NULL, modified TEXT NOT NULL)")
+
+    def _key(self, sidecar_path):
+        """Return *sidecar_path* relative to the root, the archive key."""
+        relative = os.path.relpath(os.path.normpath(sidecar_path), self.output_root)
+        if relative == os.curdir or relative.split(os.sep)[0] == os.pardir:
+            raise SidecarError("path traversal detected")
+        return relative
+
+    def prepare(self, sidecar_path):
+        self._key(sidecar_path)
+
+    def write(self, sidecar_path, rendered):
+        key = self._key(sidecar_path)
+        data = rendered.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            row = self.db.execute(
+                "SELECT digest FROM sidecars WHERE path = ?", (key,)).fetchone()
+            changed = row is None or row[0] != digest
+            if changed:
+                with self.db:
+                    self.db.execute(
+                        "INSERT INTO sidecars (path, content, digest, modified) "
+                        "VALUES (?, ?, ?, ?) ON CONFLICT(path) DO UPDATE SET "
+                        "content=excluded.content, digest=excluded.digest, "
+                        "modified=excluded.modified",
+                        (key, data, digest, datetime.datetime.now(
+                            datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")))
+                self.written += 1
+            else:
+                self.unchanged += 1
+        return changed
+
+    def exists(self, sidecar_path):
+        with self._lock:
+            return self.db.execute(
+                "SELECT 1 FROM sidecars WHERE path = ?",
+                (self._key(sidecar_path),)).fetchone() is not None
+
+    def remove(self, sidecar_path):
+        with self._lock, self.db:
+            self.db.execute("DELETE FROM sidecars WHERE path = ?",
+                            (self._key(sidecar_path),))
+
+    def location(self, sidecar_path):
+        return f"{self.path}:{self._key(sidecar_path)}"
+
+    def members(self, patterns=()):
+        """Yield (path, content) of the sidecars matching any glob *pattern*."""
+        sql = "SELECT path, content FROM sidecars"
+        params = []
+        if patterns:
+            sql += " WHERE " + " OR ".join(
+                "path GLOB ? OR substr(path, 1, length(path) - ?) GLOB ?"
+                for _pattern in patterns)
+            for pattern in patterns:
+                params += [pattern, len(SIDECAR_SUFFIX), pattern]
+        for path, content in self.db.execute(sql + " ORDER BY path", params):
+            yield path, content
+
+    def close(self):
+        self.db.close()
+
+
+def open_sink(sink, output_root=None):
+    """Return the sidecar sink called *sink* (see SINKS) for *output_root*."""
+    if sink == "sqlite":
+        return SidecarArchive(output_root)
+    return SidecarWriter(output_root)
+
+
+def _extract(args):
+    archive = SidecarArchive(args.output_dir, readonly=True)
+    target = None if args.to == "-" else SidecarWriter(args.to or args.output_dir)
+    count = 0
+    try:
+        for path, content in archive.members(args.patterns):
+            count += 1
+            if args.list:
+                print(path)
+            elif target is None:
+                sys.stdout.buffer.write(content)
+                sys.stdout.flush()
+            else:
+                target.write(os.path.join(target.output_root, path),
+                             content.decode("utf-8"))
+    finally:
+        archive.close()
+    if target is not None and not args.list:
+        print(f"Extracted {count} sidecars to {target.output_root} "
+              f"({target.written} written, {target.unchanged} unchanged).",
+              file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Materialize sidecars from a doc.doc.md sidecar archive.")
+    actions = parser.add_subparsers(dest="action", required=True)
+    extract = actions.add_parser("extract")
+    extract.add_argument("--output-dir", required=True)
+    extract.add_argument("--to", default="")
+    extract.add_argument("--list", action="store_true")
+    extract.add_argument("patterns", nargs="*")
+    args = parser.parse_args(argv)
+
+    try:
+        return _extract(args)
+    except (SidecarError, sqlite3.DatabaseError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
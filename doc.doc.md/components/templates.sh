@@ -10,15 +10,101 @@
 #         with values from the provided JSON string.
 #       - Derives {{fileName}} from the filePath key.
 #       - Uses full Mustache rendering via mustache_render.py (FEATURE_0040).
+#   template_renderer_start <templates> [<output_root>] [<sink>] / template_renderer_stop
+#       - Start/stop the per-run renderer coprocess (mustache_render.py
+#         --batch) that keeps the tokenized templates in memory; sidecars
+#         must lie inside <output_root>. <sink> is tree (default) or
+#         sqlite (one archive in <output_root>, see sidecar_writer.py)
+#       - <templates> is a template file, or several <file>:<suffix>
+#         specs separated by newlines (process -t card.html:.html)
+#   render_template_to <templates> <result_json> <destination>
+#       - Render into <destination> (a sidecar path, or "-" for stdout);
+#         with <file>:<suffix> specs into <destination><suffix> for each.
+#         A sidecar is only rewritten when its content changed, atomically
+#         (see sidecar_writer.py); its directory is created on demand.
+#       - Returns 0 and sets _TEMPLATE_RENDER_STATUS (written, unchanged or
+#         ok for "-"; one per template, space-separated), or returns 1 and
+#         sets _TEMPLATE_RENDER_ERROR
 
 # --- Template rendering (FEATURE_0019, FEATURE_0040) ---
 
 # render_template_json renders a template file using the Mustache specification
-# via the companion Python script mustache_render.py.
+# via the companion Python script mustache_render.py. The JSON is passed on
+# stdin (batch mode), so large results cannot exceed ARG_MAX.
 render_template_json() {
   local template="$1"
   local result_json="$2"
-  python3 "$(dirname "${BASH_SOURCE[0]}")/mustache_render.py" "$template" "$result_json"
+  printf '%s\0%s\0' "-" "$result_json" | \
+    python3 "$(dirname "${BASH_SOURCE[0]}")/mustache_render.py" --batch "$template"
+}
+
+# --- Long-lived renderer (FEATURE_0068) ---
+# One mustache_render.py --batch coprocess per run reads (destination, json)
+# records and writes the sidecars itself, so chevron is imported and the
+# templates read and tokenized once instead of once per document. Its stdout
+# is the shell's stdout at start time (for "-" destinations); one
+# acknowledgement line per record comes back over the coprocess pipe.
+# Without it (or in subshells, which do not inherit the coprocess
+# descriptors, or "-" in a command substitution) render_template_to falls
+# back to a one-shot batch render.
+
+template_renderer_start() {
+  local template="$1"
+  [ -z "${_TEMPLATE_RENDERER_PROC_PID:-}" ] || return 0
+  local -a specs
+  mapfile -t specs <<< "$template"
+  _TEMPLATE_RENDERER_ROOT="${2:-}"
+  _TEMPLATE_RENDERER_SINK="${3:-tree}"
+  exec {_TEMPLATE_RENDERER_OUT}>&1
+  # The group redirect silences bash's warning when another coprocess (the
+  # MIME gate) is running; the renderer reports errors on its ack line.
+  { coproc _TEMPLATE_RENDERER_PROC {
+      exec python3 "$(dirname "${BASH_SOURCE[0]}")/mustache_render.py" --batch "${specs[@]}" \
+        ${_TEMPLATE_RENDERER_ROOT:+--root "$_TEMPLATE_RENDERER_ROOT"} \
+        --sink "$_TEMPLATE_RENDERER_SINK" --ack-fd 3 \
+        3>&1 1>&"$_TEMPLATE_RENDERER_OUT" 2>/dev/null
+    }; } 2>/dev/null
+  _TEMPLATE_RENDERER_FILE="$template"
+  _TEMPLATE_RENDERER_SHELL="$BASHPID"
+}
+
+template_renderer_stop() {
+  [ -n "${_TEMPLATE_RENDERER_PROC_PID:-}" ] || return 0
+  local _pid="$_TEMPLATE_RENDERER_PROC_PID" _fd="${_TEMPLATE_RENDERER_PROC[1]:-}"
+  [ -n "$_fd" ] && exec {_fd}>&-
+  wait "$_pid" 2>/dev/null
+  exec {_TEMPLATE_RENDERER_OUT}>&-
+  unset _TEMPLATE_RENDERER_PROC _TEMPLATE_RENDERER_PROC_PID _TEMPLATE_RENDERER_OUT
+  unset _TEMPLATE_RENDERER_FILE _TEMPLATE_RENDERER_SHELL _TEMPLATE_RENDERER_ROOT
+  unset _TEMPLATE_RENDERER_SINK
+  return 0
+}
+
+render_template_to() {
+  local template="$1" result_json="$2" destination="$3" answer=""
+  _TEMPLATE_RENDER_STATUS=""
+  _TEMPLATE_RENDER_ERROR=""
+  # "-" is the renderer's stdout, which command substitutions do not capture
+  if ! { [ -n "${_TEMPLATE_RENDERER_PROC[1]:-}" ] && \
+         [ "$template" = "${_TEMPLATE_RENDERER_FILE:-}" ] && \
+         { [ "$destination" != "-" ] || [ "$BASHPID" = "$_TEMPLATE_RENDERER_SHELL" ]; } && \
+         { printf '%s\0%s\0' "$destination" "$result_json" >&"${_TEMPLATE_RENDERER_PROC[1]}"; } 2>/dev/null && \
+         IFS= read -r answer <&"${_TEMPLATE_RENDERER_PROC[0]}"; }; then
+    # No (or a dead) renderer coprocess: render this record one-shot
+    local -a specs
+    mapfile -t specs <<< "$template"
+    { answer=$(printf '%s\0%s\0' "$destination" "$result_json" | \
+        python3 "$(dirname "${BASH_SOURCE[0]}")/mustache_render.py" --batch "${specs[@]}" \
+          ${_TEMPLATE_RENDERER_ROOT:+--root "$_TEMPLATE_RENDERER_ROOT"} \
+          --sink "${_TEMPLATE_RENDERER_SINK:-tree}" --ack-fd 3 3>&1 1>&4); } 4>&1
+  fi
+  if [ -n "$answer" ] && [[ "$answer " =~ ^((written|unchanged|ok)\ )+$ ]]; then
+    _TEMPLATE_RENDER_STATUS="$answer"
+    return 0
+  fi
+  _TEMPLATE_RENDER_ERROR="${answer#error$'\t'}"
+  [ -n "$_TEMPLATE_RENDER_ERROR" ] || _TEMPLATE_RENDER_ERROR="Template rendering failed"
+  return 1
 }
 
 # templates_required_python_libs outputs the Python library names required by
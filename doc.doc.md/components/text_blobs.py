@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# text_blobs.py - Out-of-band storage for large text fields in doc.doc.md
+# Part of doc.doc.md architecture (Level 3: Python Components)
+# Keeps large extracted text (documentText from markitdown, ocrText from
+# ocrmypdf, ...) out of the in-memory context of the python process engine.
+#
+# A plugin output string longer than the threshold is written once to a file
+# under the run's blob directory (in the system temp directory) and replaced
+# by a TextBlob in the context. The engine exports the directory as
+# DOC_DOC_MD_BLOB_DIR; plugin_get_text/get_text only follow "<field>File"
+# references that resolve inside it, so an upstream output or an NDJSON
+# record cannot make a plugin read arbitrary files. The text is read back only where it is needed:
+#   - plugins that declare "<field>File" as input receive the blob path in
+#     that field instead of the inline text (no 1MB stdin ceiling)
+#   - plugins that only declare "<field>" receive the inline text as before
+#   - templates render a TextBlob like a string (chevron calls str())
+#   - to_json/json_default and materialize() inline it for stdout, the
+#     result cache and the incremental manifest
+#
+# Blob files are owned by one document and removed by discard() once the
+# document's output has been emitted; close() removes the blob directory.
+
+import os
+import shutil
+import tempfile
+import threading
+
+DEFAULT_THRESHOLD = "256K"
+FILE_SUFFIX = "File"
+BLOB_DIR_ENV = "DOC_DOC_MD_BLOB_DIR"
+
+
+class TextBlob:
+    """A large string stored in a file; str() reads it back."""
+
+    __slots__ = ("path", "length")
+
+    def __init__(self, path, length):
+        self.path = path
+        self.length = length
+
+    def read(self):
+        with open(self.path, "r", encoding="utf-8", newline="") as fh:
+            return fh.read()
+
+    def __str__(self):
+        return self.read()
+
+    def __bool__(self):
+        return self.length > 0
+
+    def __repr__(self):
+        return f"TextBlob({self.path!r}, {self.length})"
+
+
+def json_default(value):
+    """``json.dumps`` default hook that inlines TextBlobs."""
+    if isinstance(value, TextBlob):
+        return value.read()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def materialize(value):
+    """Return *value* with every TextBlob replaced by its text."""
+    if isinstance(value, TextBlob):
+        return value.read()
+    if isinstance(value, dict):
+        return {key: materialize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [materialize(item) for item in value]
+    return value
+
+
+def resolve(json_input, input_keys):
+    """Prepare *json_input* for one plugin.
+
+    TextBlobs become "<field>File" references when *input_keys* declares
+    that field, and inline text otherwise (including for the full context,
+    *input_keys* None).
+    """
+    resolved = {}
+    for key, value in json_input.items():
+        if not isinstance(value, TextBlob):
+            resolved[key] = value
+        elif input_keys is not None and key + FILE_SUFFIX in input_keys:
+            resolved[key + FILE_SUFFIX] = value.path
+        else:
+            resolved[key] = value.read()
+    return resolved
+
+
+class BlobStore:
+    """Spills large plugin output strings to files, grouped by document."""
+
+    def __init__(self, threshold, root=None):
+        self.threshold = threshold
+        self._dir = None
+        if threshold:
+            self._dir = tempfile.mkdtemp(prefix="doc.doc.md-blobs-", dir=root)
+        self._owned = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self):
+        """The blob directory (created up front), None when spilling is off."""
+        return self._dir
+
+    def spill(self, owner, output):
+        """Return *output* with strings above the threshold stored as TextBlobs."""
+        if not self.threshold:
+            return output
+        large = [key for key, value in output.items()
+                 if isinstance(value, str) and len(value) > self.threshold]
+        if not large:
+            return output
+
+        spilled = dict(output)
+        for key in large:
+            with self._lock:
+                self._counter += 1
+                path = os.path.join(self._dir, f"{self._counter}.txt")
+                self._owned.setdefault(owner, []).append(path)
+            with open(path, "w", encoding="utf-8", newline="") as fh:
+                fh.write(output[key])
+            spilled[key] = TextBlob(path, len(output[key]))
+        return spilled
+
+    def discard(self, owner):
+        """Remove every blob file written for *owner*."""
+        with self._lock:
+            paths = self._owned.pop(owner, [])
+        for path in paths:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def close(self):
+        """Remove the blob directory and everything left in it."""
+        with self._lock:
+            blob_dir, self._dir = self._dir, None
+            self._owned.clear()
+        if blob_dir is not None:
+            shutil.rmtree(blob_dir, ignore_errors=True)
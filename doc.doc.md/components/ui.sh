@@ -11,6 +11,10 @@
 #   ui_usage_install()            - Print install sub-command help
 #   ui_usage_installed()          - Print installed sub-command help
 #   ui_usage_tree()               - Print tree sub-command help
+#   ui_usage_cache()              - Print cache sub-command help
+#   ui_usage_query()              - Print query sub-command help
+#   ui_usage_search()             - Print search sub-command help
+#   ui_usage_extract()            - Print extract sub-command help
 #   log_info <msg>             - Print informational message to stderr
 #   log_warn <msg>             - Print warning message (red) to stderr
 #   log_error <msg>            - Print error message (red) to stderr
@@ -69,6 +73,10 @@ Commands:
   installed    Check if a plugin is installed
   tree         Display a dependency tree of all plugins
   setup        Verify dependencies and configure plugins interactively
+  cache        Inspect or prune the plugin result cache
+  query        Select documents from the metadata index (process --index)
+  search       Full-text search over extracted text (process --fulltext)
+  extract      Materialize sidecars from the sidecar archive (process --sink sqlite)
 
 Examples:
   ./doc.doc.sh process -d /path/to/documents -o /path/to/output
@@ -94,18 +102,85 @@ Options:
                  Input directory to process (required)
   -o <dir>, --output-directory <dir>
                  Output directory for sidecar .md files (required unless --echo)
-  -t <file>, --template <file>
+  -t <file>[:<suffix>], --template <file>[:<suffix>]
                  Markdown template file (optional, defaults to doc.doc.md/templates/default.md)
+                  Repeatable: every document is rendered with each template
+                  after one plugin run, to <path><suffix> (default suffix:
+                  .md; e.g. -t page.md -t card.html:html -t api.json:json)
   -i <criteria>  Include filter criteria (repeatable)
                   Comma-separated values are ORed; multiple -i flags are ANDed
                   Examples: -i ".pdf,.txt" -i "**/2024/**"
   -e <criteria>  Exclude filter criteria (repeatable)
                   Comma-separated values are ORed; multiple -e flags are ANDed
                   Examples: -e ".log" -e "**/temp/**"
+                  Metadata predicates: size>50M, mtime>=2026-01-01, age<7d
+                  (e.g. -e 'size>50M' -i 'age<7d')
   --echo         Print rendered markdown to stdout instead of writing files (dry-run)
                   Mutually exclusive with -o
   -b <dir>, --base-path <dir>
                  Base path for computing relative file references in rendered output
+  --follow-symlinks
+                 Follow symbolic links while scanning the input directory
+                  (like find -L; loops are detected and skipped)
+  --one-file-system
+                 Do not descend into directories on other file systems
+  --files-from <file|->
+                 Process the files listed in <file> (- = stdin) instead of
+                  walking -d; relative paths are resolved against -d and
+                  entries outside it are skipped
+  --null         The --files-from list is NUL-delimited (find -print0)
+  --ndjson       The --files-from list holds one JSON record per line:
+                  {"path": ..., "size": ..., "mtime": ..., "mimeType": ...};
+                  the metadata is trusted by filters and plugins
+  --format <json|ndjson>
+                 Layout of the JSON written to stdout (default: json, one
+                  array). ndjson writes one compact object per line as soon
+                  as each document is done, for streaming consumers
+  --fields <key,...>
+                 Only write these keys of each document to stdout
+                  (e.g. --fields filePath,mimeType,fileSize); sidecars and
+                  templates still see the full result
+  --sink <tree|sqlite>
+                 Where sidecars are written: tree mirrors the input directory
+                  with one .md file per document (default); sqlite stores
+                  all of them in <out>/sidecars.sqlite (one file, indexed by
+                  path; use the extract command to materialize them)
+  --all-plugins  Run every active plugin. By default plugins whose outputs
+                  neither the template nor the JSON output uses are skipped
+                  (full JSON output and --index use every output)
+  --engine <bash|python>
+                 Processing engine (default: bash). The python engine keeps the
+                  per-document context in memory and only spawns plugin
+                  executables; output is identical to the bash engine
+  -j <n>, --jobs <n>
+                 Process up to <n> documents in parallel. Only the python
+                  engine runs in parallel, so --jobs switches to it (the bash
+                  engine is sequential; --engine bash --jobs is an error).
+                  Default in the python engine: half the CPUs, at most 4.
+                  JSON output keeps the input order
+  --incremental  Skip documents unchanged since the last run (python engine;
+                  requires -o). A manifest in <out>/.doc.doc.md/manifest.sqlite
+                  records size, mtime, inode, plugin versions and template
+                  hash; template-only changes re-render from stored results
+                  and sidecars of deleted sources are pruned. An interrupted
+                  run keeps the documents it finished
+  --checksum     Like --incremental, but compare content hashes (SHA-256)
+                  instead of mtime/inode
+  --cache-dir <dir>
+                 Reuse plugin results across runs and output directories,
+                  keyed by document content hash, plugin version and plugin
+                  inputs (python engine). Plugins with "cacheable": false in
+                  descriptor.json are never cached
+  --cache-max-size <size>
+                 Cache size cap enforced after the run by evicting least
+                  recently used entries (default: 1G; e.g. 500M, 2G)
+  --index        Maintain a SQLite metadata index of all processed documents
+                  in <out>/.doc.doc.md/index.sqlite (python engine; requires
+                  -o). One row per document with the merged plugin fields;
+                  search it with the query command
+  --fulltext     Like --index, and also index the extracted text (*Text
+                  fields such as documentText and ocrText) for the search
+                  command
   --progress     Force progress display even when stdout is not a TTY
   --no-progress  Suppress progress display even on a TTY
   --help         Show this help message
@@ -114,6 +189,8 @@ Output:
   When stdout is piped or redirected:
     A JSON array is streamed to stdout — one object per processed file (Unix
     pipeline behaviour; backward-compatible).
+    With --format ndjson each processed file is one line of compact JSON
+    instead (no surrounding array).
   When stdout is an interactive TTY and -o is given:
     The JSON array is suppressed; only the "Processed N documents." summary
     is printed to stderr.  Pipe stdout (e.g. | jq .) to receive JSON in a
@@ -124,8 +201,17 @@ Examples:
   ./doc.doc.sh process -d /path/to/documents -o /path/to/output -i ".pdf,.txt"
   ./doc.doc.sh process -d /path/to/documents -o /path/to/output -i ".pdf" -e "**/temp/**"
   ./doc.doc.sh process -d /path/to/documents -o /path/to/output -t /path/to/template.md
+  ./doc.doc.sh process -d /path/to/documents -o /path/to/output -t page.md -t card.html:html
   ./doc.doc.sh process -d /path/to/documents --echo
   ./doc.doc.sh process -d /path/to/documents -o /path/to/output -b /path/to/base
+  ./doc.doc.sh process -d /path/to/documents -o /path/to/output --engine python
+  ./doc.doc.sh process -d /path/to/documents -o /path/to/output --jobs 8
+  ./doc.doc.sh process -d /path/to/documents -o /path/to/output --incremental
+  ./doc.doc.sh process -d /path/to/documents -o /path/to/output --cache-dir ~/.cache/doc.doc.md
+  ./doc.doc.sh process -d /path/to/documents -o /path/to/output --format ndjson --fields filePath,mimeType
+  ./doc.doc.sh process -d /path/to/documents -o /path/to/output --index
+  ./doc.doc.sh process -d /path/to/documents -o /path/to/output --fulltext
+  ./doc.doc.sh process -d /path/to/documents -o /path/to/output --sink sqlite
 EOF
 }
 
@@ -304,6 +390,121 @@ Examples:
 EOF
 }
 
+ui_usage_cache() {
+  ui_show_help_banner
+  cat <<'EOF'
+Inspect or prune the plugin result cache used by 'process --cache-dir'.
+
+Usage: ./doc.doc.sh cache <stats|prune> --cache-dir <dir> [OPTIONS]
+
+Actions:
+  stats          Show number of entries and size, per plugin
+  prune          Evict least recently used entries until the cache fits
+                  --max-size
+
+Options:
+  -c <dir>, --cache-dir <dir>
+                 Cache directory (required)
+  --max-size <size>
+                 Size cap for prune (default: 1G; 0 empties the cache)
+  --help         Show this help message
+
+Examples:
+  ./doc.doc.sh cache stats --cache-dir ~/.cache/doc.doc.md
+  ./doc.doc.sh cache prune --cache-dir ~/.cache/doc.doc.md --max-size 500M
+EOF
+}
+
+ui_usage_query() {
+  ui_show_help_banner
+  cat <<'EOF'
+Select documents from the metadata index written by 'process --index'.
+
+Usage: ./doc.doc.sh query -o <dir> [-w <predicate>]... [OPTIONS]
+
+Options:
+  -o <dir>, --output-dir <dir>
+                 Output directory of the indexed process run (required)
+  -w <predicate>, --where <predicate>
+                 <field><op><value>; op is = != < <= > >= or ~ (glob).
+                  Numbers compare numerically, other values as text (ISO
+                  dates sort correctly). "field=" matches documents without
+                  the field, "field!=" documents with it. Repeat to AND
+  --format <paths|json|ndjson>
+                 paths: one source path per line (default); json: an array
+                  of the stored results; ndjson: one result per line
+  --fields <key,...>
+                 Keep only these keys of each result (json/ndjson)
+  --sort [-]<field>
+                 Order by a field (prefix - for descending; default: path)
+  --limit <n>    Return at most n documents
+  --count        Print the number of matching documents only
+  --help         Show this help message
+
+Examples:
+  ./doc.doc.sh query -o /path/to/output -w 'mimeType=application/pdf' -w 'languageCode=de'
+  ./doc.doc.sh query -o /path/to/output -w 'wordCount>10000' -w 'fileModified>=2026-01-01'
+  ./doc.doc.sh query -o /path/to/output -w 'mimeType~image/*' --sort -fileSize --limit 10 --format ndjson
+EOF
+}
+
+ui_usage_search() {
+  ui_show_help_banner
+  cat <<'EOF'
+Full-text search over the text indexed by 'process --fulltext'.
+
+Usage: ./doc.doc.sh search -o <dir> [OPTIONS] <term>...
+
+Every term must occur in a document. Quote a term with spaces to search for
+a phrase; a trailing * matches word prefixes (report*). Matching ignores
+case and diacritics. Results are ranked by relevance (BM25).
+
+Options:
+  -o <dir>, --output-dir <dir>
+                 Output directory of the indexed process run (required)
+  -w <predicate>, --where <predicate>
+                 Only documents matching a metadata predicate, as in query
+                  (e.g. languageCode=de, mimeType=application/pdf). Repeat
+                  to AND
+  --format <paths|ndjson>
+                 paths: one source path per line, best match first
+                  (default); ndjson: filePath, score and a text snippet
+  --limit <n>    Return at most n documents (default: 20; 0 for all)
+  --help         Show this help message
+
+Examples:
+  ./doc.doc.sh search -o /path/to/output invoice 2026
+  ./doc.doc.sh search -o /path/to/output "annual report" -w languageCode=en
+  ./doc.doc.sh search -o /path/to/output vertrag* --format ndjson --limit 5
+EOF
+}
+
+ui_usage_extract() {
+  ui_show_help_banner
+  cat <<'EOF'
+Materialize sidecars stored in the archive written by 'process --sink sqlite'.
+
+Usage: ./doc.doc.sh extract -o <dir> [OPTIONS] [<pattern>...]
+
+A pattern is a glob over the sidecar path or the source path relative to
+the input directory (reports/*.pdf, */2026/*); without patterns every
+sidecar is selected. Extracted files are only rewritten when changed.
+
+Options:
+  -o <dir>, --output-dir <dir>
+                 Output directory of the process run (required)
+  --to <dir|->   Write the sidecars below <dir> (default: the output
+                  directory), or print their content to stdout with -
+  --list         Only list the matching sidecar paths
+  --help         Show this help message
+
+Examples:
+  ./doc.doc.sh extract -o /path/to/output --list
+  ./doc.doc.sh extract -o /path/to/output 'reports/*.pdf' --to /tmp/reports
+  ./doc.doc.sh extract -o /path/to/output notes/todo.txt --to -
+EOF
+}
+
 ui_usage_setup() {
   ui_show_help_banner
   cat <<'EOF'
@@ -14,9 +14,9 @@ plugin_read_input
 plugin_validate_filepath
 
 PLUGIN_STORAGE=$(plugin_get_field "pluginStorage")
-TEXT_CONTENT=$(plugin_get_field "textContent")
-DOCUMENT_TEXT=$(plugin_get_field "documentText")
-OCR_TEXT=$(plugin_get_field "ocrText")
+TEXT_CONTENT=$(plugin_get_text "textContent")
+DOCUMENT_TEXT=$(plugin_get_text "documentText")
+OCR_TEXT=$(plugin_get_text "ocrText")
 
 # Validate pluginStorage is provided
 if [ -z "$PLUGIN_STORAGE" ]; then
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# file plugin - in-process entry point (commands.process.entrypoint)
+# Same contract as main.sh: validates filePath like plugin_validate_filepath
+# and returns the MIME type as mimeType. Detection goes through the shared
+# batched detector (components/mime_detect.py), so the python process engine
+# classifies each file once per run instead of forking `file` per document.
+
+import os
+import sys
+
+_COMPONENTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "..", "..", "components")
+if _COMPONENTS_DIR not in sys.path:
+    sys.path.insert(0, _COMPONENTS_DIR)
+
+import mime_detect  # noqa: E402
+from plugin_api import PluginError, validate_filepath  # noqa: E402
+
+
+def process(data):
+    file_path = validate_filepath(data)
+    try:
+        mime_type = mime_detect.shared().detect(file_path)
+    except mime_detect.MimeDetectorError as exc:
+        raise PluginError(str(exc)) from exc
+    return {"mimeType": mime_type}
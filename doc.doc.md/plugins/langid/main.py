@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# langid plugin - in-process entry point (commands.process.entrypoint)
+# Same contract as main.sh: selects documentText → ocrText → textContent
+# (first non-empty) and returns languageCode and languageConfidence; skips
+# (ADR-004: 65) when no text is available or classification fails.
+# Importing this module fails when langid is not installed for the current
+# interpreter, so the engine falls back to server.sh (plugin venv).
+
+import os
+import sys
+
+_COMPONENTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "..", "..", "components")
+if _COMPONENTS_DIR not in sys.path:
+    sys.path.insert(0, _COMPONENTS_DIR)
+
+import langid  # noqa: E402
+
+from plugin_api import PluginSkip, get_text  # noqa: E402
+
+
+def select_text(data):
+    """Return the first non-empty text field, or raise PluginSkip."""
+    for field in ("documentText", "ocrText", "textContent"):
+        # main.sh reads fields via command substitution (trailing newlines dropped)
+        text = get_text(data, field).rstrip("\n")
+        if text:
+            return text
+    raise PluginSkip("No text content available for language identification")
+
+
+def process(data):
+    text = select_text(data)
+    try:
+        code, conf = langid.classify(text)
+    except Exception as exc:  # noqa: BLE001
+        raise PluginSkip("langid classification failed") from exc
+    return {"languageCode": code, "languageConfidence": conf}
@@ -20,9 +20,9 @@ fi
 plugin_read_input
 
 # Select text using priority order: documentText → ocrText → textContent
-DOCUMENT_TEXT=$(plugin_get_field "documentText")
-OCR_TEXT=$(plugin_get_field "ocrText")
-TEXT_CONTENT=$(plugin_get_field "textContent")
+DOCUMENT_TEXT=$(plugin_get_text "documentText")
+OCR_TEXT=$(plugin_get_text "ocrText")
+TEXT_CONTENT=$(plugin_get_text "textContent")
 
 TEXT="${DOCUMENT_TEXT:-}"
 if [ -z "$TEXT" ]; then
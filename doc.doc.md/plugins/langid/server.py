@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# langid plugin - persistent process server
+# Same contract as main.sh: selects documentText → ocrText → textContent
+# (first non-empty) and returns languageCode and languageConfidence; skips
+# (ADR-004: 65) when no text is available or classification fails.
+# The handler is shared with the in-process entry point (main.py).
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "..", "components"))
+
+from plugin_api import PluginSkip, serve  # noqa: E402
+
+try:
+    from main import process
+except ImportError:
+    # langid is not installed for this interpreter: main.sh exits 65 when
+    # the classifier cannot run, so every request is skipped.
+    def process(data):
+        raise PluginSkip("langid classification failed")
+
+
+if __name__ == "__main__":
+    serve(process)
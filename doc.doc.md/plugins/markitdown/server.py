@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# markitdown plugin - persistent process server
+# Same contract as main.sh: converts supported MS Office documents to
+# markdown and returns documentText; unsupported MIME types are skipped
+# (ADR-004: 65). Falls back to the markitdown CLI when the module cannot be
+# imported by the server's interpreter.
+
+import os
+import shutil
+import subprocess
+import sys
+
+PLUGIN_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(PLUGIN_DIR, "..", "..", "components"))
+
+from plugin_api import PluginError, PluginSkip, get_field, serve, validate_filepath  # noqa: E402
+
+SUPPORTED_MIME_TYPES = {
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    "application/msword",
+    "application/vnd.ms-excel",
+    "application/vnd.ms-powerpoint",
+}
+
+try:
+    from markitdown import MarkItDown
+    _converter = MarkItDown()
+except ImportError:
+    _converter = None
+
+
+def _markitdown_bin():
+    candidate = os.path.join(PLUGIN_DIR, ".venv", "bin", "markitdown")
+    if os.access(candidate, os.X_OK):
+        return candidate
+    return shutil.which("markitdown")
+
+
+def _convert(file_path):
+    if _converter is not None:
+        try:
+            return _converter.convert(file_path).text_content or ""
+        except Exception as exc:  # noqa: BLE001
+            raise PluginError(f"markitdown conversion failed: {exc}") from exc
+
+    markitdown_bin = _markitdown_bin()
+    if not markitdown_bin:
+        raise PluginError(
+            "markitdown not installed. Run: doc.doc.sh install --plugin markitdown")
+    proc = subprocess.run([markitdown_bin, file_path], stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, check=False)
+    if proc.returncode != 0:
+        raise PluginError("markitdown conversion failed: "
+                          + proc.stderr.decode("utf-8", "replace").strip())
+    return proc.stdout.decode("utf-8", "replace")
+
+
+def process(data):
+    file_path = validate_filepath(data)
+    mime_type = get_field(data, "mimeType")
+    if not mime_type:
+        raise PluginError("mimeType is required")
+    if mime_type not in SUPPORTED_MIME_TYPES:
+        raise PluginSkip(f"skipped: unsupported MIME type {mime_type}")
+    # main.sh captures the CLI output via command substitution
+    return {"documentText": _convert(file_path).rstrip("\n")}
+
+
+if __name__ == "__main__":
+    serve(process)
@@ -0,0 +1,17 @@
+#!/bin/bash
+# markitdown plugin - persistent process server (commands.process.server)
+# Started once per `process` run by the python engine; imports markitdown once
+# and answers one NDJSON request per line (protocol: plugin_api.py).
+
+set -euo pipefail
+
+PLUGIN_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Use venv python if available, otherwise fall back to system python3
+if [ -x "$PLUGIN_DIR/.venv/bin/python3" ]; then
+  PYTHON_BIN="$PLUGIN_DIR/.venv/bin/python3"
+else
+  PYTHON_BIN="python3"
+fi
+
+exec "$PYTHON_BIN" "$PLUGIN_DIR/server.py"
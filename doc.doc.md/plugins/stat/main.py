@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# stat plugin - in-process entry point (commands.process.entrypoint)
+# Same contract as main.sh: validates filePath like plugin_validate_filepath
+# and returns fileSize, fileOwner and the creation, modification and
+# metadata-change times as UTC ISO-8601 strings (fileCreated is "" when the
+# filesystem does not record a birth time).
+
+import ctypes
+import ctypes.util
+import os
+import pwd
+import struct
+import sys
+import time
+
+_COMPONENTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "..", "..", "components")
+if _COMPONENTS_DIR not in sys.path:
+    sys.path.insert(0, _COMPONENTS_DIR)
+
+from plugin_api import validate_filepath  # noqa: E402
+
+_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# statx(2) layout, used on Linux where os.stat() has no st_birthtime
+_AT_FDCWD = -100
+_STATX_BTIME = 0x800
+_STATX_SIZE = 256
+_STATX_MASK_OFFSET = 0
+_STATX_BTIME_OFFSET = 80
+
+_libc_statx = None
+if sys.platform.startswith("linux"):
+    try:
+        _libc_statx = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True).statx
+    except (OSError, AttributeError):
+        _libc_statx = None
+
+
+def _birth_epoch(path, st):
+    """Return the birth time in whole seconds, or 0 when unknown (like %W)."""
+    birthtime = getattr(st, "st_birthtime", None)
+    if birthtime is not None:
+        return int(birthtime)
+    if _libc_statx is None:
+        return 0
+    buf = ctypes.create_string_buffer(_STATX_SIZE)
+    if _libc_statx(_AT_FDCWD, os.fsencode(path), 0, _STATX_BTIME, buf) != 0:
+        return 0
+    (mask,) = struct.unpack_from("=I", buf, _STATX_MASK_OFFSET)
+    if not mask & _STATX_BTIME:
+        return 0
+    (seconds,) = struct.unpack_from("=q", buf, _STATX_BTIME_OFFSET)
+    return seconds
+
+
+def _utc(epoch):
+    return time.strftime(_TIME_FORMAT, time.gmtime(int(epoch)))
+
+
+def _owner(uid):
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return "UNKNOWN"
+
+
+def process(data):
+    file_path = validate_filepath(data)
+    st = os.stat(file_path)
+    birth = _birth_epoch(file_path, st)
+    return {
+        "fileSize": st.st_size,
+        "fileOwner": _owner(st.st_uid),
+        "fileCreated": _utc(birth) if birth > 0 else "",
+        "fileModified": _utc(st.st_mtime),
+        "fileMetadataChanged": _utc(st.st_ctime),
+    }
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# wc plugin - in-process entry point (commands.process.entrypoint)
+# Same contract as main.sh: selects textContent → ocrText → documentText
+# (first non-empty) and returns lineCount, wordCount and charCount with
+# `wc -l -w -m` semantics; skips (ADR-004: 65) when no text is available.
+
+import os
+import re
+import sys
+
+_COMPONENTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "..", "..", "components")
+if _COMPONENTS_DIR not in sys.path:
+    sys.path.insert(0, _COMPONENTS_DIR)
+
+from plugin_api import PluginSkip, get_text  # noqa: E402
+
+# Words are runs of characters GNU wc does not treat as separators in a
+# UTF-8 locale: ASCII blanks plus the Unicode (incl. non-breaking) spaces.
+_WORD_PATTERN = re.compile(
+    "[^\t\n\v\f\r \xa0\u1680\u2000-\u200a\u202f\u205f\u3000]+")
+
+
+def process(data):
+    text = ""
+    for field in ("textContent", "ocrText", "documentText"):
+        # main.sh reads fields via command substitution (trailing newlines dropped)
+        text = get_text(data, field).rstrip("\n")
+        if text:
+            break
+    if not text:
+        raise PluginSkip("No text content available for word counting")
+    return {
+        "lineCount": text.count("\n"),
+        "wordCount": len(_WORD_PATTERN.findall(text)),
+        "charCount": len(text),
+    }
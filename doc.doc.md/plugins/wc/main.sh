@@ -12,9 +12,9 @@ source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/../../components/plugin_in
 plugin_read_input
 
 # Select text using priority order: textContent → ocrText → documentText
-TEXT_CONTENT=$(plugin_get_field "textContent")
-OCR_TEXT=$(plugin_get_field "ocrText")
-DOCUMENT_TEXT=$(plugin_get_field "documentText")
+TEXT_CONTENT=$(plugin_get_text "textContent")
+OCR_TEXT=$(plugin_get_text "ocrText")
+DOCUMENT_TEXT=$(plugin_get_text "documentText")
 
 TEXT="${TEXT_CONTENT:-}"
 if [ -z "$TEXT" ]; then
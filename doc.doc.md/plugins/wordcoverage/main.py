@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# wordcoverage plugin - in-process entry point (commands.process.entrypoint)
+# Same contract as main.sh: extracts wordCount (required) and maxWords
+# (optional, default 100) and returns the coverage percentage; skips
+# (ADR-004: 65) when wordCount is absent or not a positive integer.
+
+import os
+import re
+import sys
+
+_COMPONENTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "..", "..", "components")
+if _COMPONENTS_DIR not in sys.path:
+    sys.path.insert(0, _COMPONENTS_DIR)
+
+from plugin_api import PluginSkip, get_field  # noqa: E402
+
+DEFAULT_MAX_WORDS = 100
+
+_POSITIVE_INTEGER = re.compile(r"^[0-9]+$")
+
+
+def _positive_int(value):
+    """Return *value* as int if it is a positive decimal integer, else None."""
+    if _POSITIVE_INTEGER.match(value) and int(value) > 0:
+        return int(value)
+    return None
+
+
+def process(data):
+    word_count_raw = get_field(data, "wordCount")
+    if not word_count_raw:
+        raise PluginSkip("wordCount is absent from pipeline context")
+    word_count = _positive_int(word_count_raw)
+    if word_count is None:
+        raise PluginSkip(f"wordCount is not a positive integer: {word_count_raw}")
+
+    max_words = _positive_int(get_field(data, "maxWords")) or DEFAULT_MAX_WORDS
+
+    if word_count <= max_words:
+        coverage = 100
+    else:
+        # main.sh formats with awk "%.2f" and jq drops trailing zeros
+        coverage = float(f"{max_words / word_count * 100:.2f}")
+        if coverage.is_integer():
+            coverage = int(coverage)
+    return {"summaryMaxWords": max_words, "summaryCoveragePercent": coverage}
@@ -12,6 +12,9 @@ PLUGIN_MGMT_COMPONENT="$SCRIPT_DIR/doc.doc.md/components/plugin_management.sh"
 PLUGIN_EXEC_COMPONENT="$SCRIPT_DIR/doc.doc.md/components/plugin_execution.sh"
 UI_COMPONENT="$SCRIPT_DIR/doc.doc.md/components/ui.sh"
 TEMPLATES_COMPONENT="$SCRIPT_DIR/doc.doc.md/components/templates.sh"
+PYTHON_ENGINE_COMPONENT="$SCRIPT_DIR/doc.doc.md/components/python_engine.sh"
+PROCESS_OPTIONS_COMPONENT="$SCRIPT_DIR/doc.doc.md/components/process_options.sh"
+INDEX_COMMANDS_COMPONENT="$SCRIPT_DIR/doc.doc.md/components/index_commands.sh"
 DEFAULT_TEMPLATE="$SCRIPT_DIR/doc.doc.md/templates/default.md"
 
 # Source components
@@ -19,15 +22,12 @@ source "$PLUGIN_MGMT_COMPONENT"
 source "$PLUGIN_EXEC_COMPONENT"
 source "$UI_COMPONENT"
 source "$TEMPLATES_COMPONENT"
-# Global MIME filter criteria (consumed by process_file in plugin_execution.sh)
-_MIME_INCLUDE_ARGS=()
-_MIME_EXCLUDE_ARGS=()
+source "$PYTHON_ENGINE_COMPONENT"
+source "$PROCESS_OPTIONS_COMPONENT"
+source "$INDEX_COMMANDS_COMPONENT"
 # Process command state (declared here for visibility; initialized by pipeline functions)
 _PROC_INPUT_DIR=""
 _PROC_OUTPUT_DIR=""
-_PROC_TEMPLATE_FILE=""
-_PROC_INCLUDE_ARGS=()
-_PROC_EXCLUDE_ARGS=()
 _PROC_PROGRESS_FLAG=""
 _PROC_ECHO_MODE=false
 _PROC_BASE_PATH=""
@@ -35,18 +35,15 @@ _PROC_BASE_PATH_RESOLVED=""
 _PROC_CANONICAL_OUT=""
 _PROC_CANONICAL_IN=""
 _PROC_PLUGINS=()
-_PROC_PATH_INCLUDE_ARGS=()
-_PROC_PATH_EXCLUDE_ARGS=()
 
 _parse_process_args() {
   _PROC_INPUT_DIR=""
   _PROC_OUTPUT_DIR=""
-  _PROC_TEMPLATE_FILE="$DEFAULT_TEMPLATE"
-  _PROC_INCLUDE_ARGS=()
-  _PROC_EXCLUDE_ARGS=()
   _PROC_PROGRESS_FLAG=""
   _PROC_ECHO_MODE=false
   _PROC_BASE_PATH=""
+  options_reset
+  engine_reset_options
 
   while [ $# -gt 0 ]; do
     case "$1" in
@@ -60,21 +57,6 @@ _parse_process_args() {
         _PROC_OUTPUT_DIR="$2"
         shift 2
         ;;
-      -t|--template)
-        [ $# -ge 2 ] || { log_error "$1 requires an argument"; exit 1; }
-        _PROC_TEMPLATE_FILE="$2"
-        shift 2
-        ;;
-      -i)
-        [ $# -ge 2 ] || { log_error "-i requires an argument"; exit 1; }
-        _PROC_INCLUDE_ARGS+=("$2")
-        shift 2
-        ;;
-      -e)
-        [ $# -ge 2 ] || { log_error "-e requires an argument"; exit 1; }
-        _PROC_EXCLUDE_ARGS+=("$2")
-        shift 2
-        ;;
       --progress)
         _PROC_PROGRESS_FLAG="on"
         shift
@@ -97,6 +79,14 @@ _parse_process_args() {
         exit 0
         ;;
       *)
+        if options_parse_option "$@"; then
+          shift "$_OPTIONS_OPT_SHIFT"
+          continue
+        fi
+        if engine_parse_option "$@"; then
+          shift "$_ENGINE_OPT_SHIFT"
+          continue
+        fi
         log_error "Unknown option '$1'. Use --help for usage."
         exit 1
         ;;
@@ -134,10 +124,8 @@ _validate_process_inputs() {
     exit 1
   fi
 
-  if [ ! -f "$_PROC_TEMPLATE_FILE" ]; then
-    log_error "Template file not found: $_PROC_TEMPLATE_FILE"
-    exit 1
-  fi
+  options_validate
+  engine_validate_options
 
   _PROC_BASE_PATH_RESOLVED=""
   if [ -n "$_PROC_BASE_PATH" ]; then
@@ -183,93 +171,12 @@ _prepare_plugins() {
     exit 1
   fi
 
-  local -a _uninstalled_plugins=()
-  for p in "${plugins[@]}"; do
-    local p_installed_sh="$PLUGIN_DIR/$p/installed.sh"
-    if [ -x "$p_installed_sh" ]; then
-      local install_check
-      install_check=$(bash "$p_installed_sh" 2>/dev/null | jq -r 'if .installed == false then "false" else "true" end' 2>/dev/null) || install_check="false"
-      if [ "$install_check" = "false" ]; then
-        _uninstalled_plugins+=("$p")
-      fi
-    fi
-  done
-
-  if [ ${#_uninstalled_plugins[@]} -gt 0 ]; then
-    if ! [ -t 0 ]; then
-      log_error "The following active plugin(s) are not installed: ${_uninstalled_plugins[*]}"
-      echo "Run: ./doc.doc.sh install --plugin <name>  or  ./doc.doc.sh setup" >&2
-      exit 1
-    fi
-
-    local -a _skip_plugins=()
-    for _up in "${_uninstalled_plugins[@]}"; do
-      printf "Plugin '%s' is not installed.\n" "$_up" >&2
-      printf "  [c] Continue without this plugin\n" >&2
-      printf "  [a] Abort\n" >&2
-      printf "  [i] Install now\n" >&2
-      printf "Choice [c/a/i]: " >&2
-      local _choice=""
-      read -r _choice </dev/tty 2>/dev/null || _choice="a"
-      case "$_choice" in
-        c|C)
-          _skip_plugins+=("$_up")
-          ;;
-        i|I)
-          local _up_install_sh="$PLUGIN_DIR/$_up/install.sh"
-          if [ -x "$_up_install_sh" ] && bash "$_up_install_sh"; then
-            log_success "Plugin '$_up' installed successfully."
-          else
-            log_error "Installation failed for plugin '$_up'"
-            echo "Tip: sudo ./doc.doc.sh install --plugin $_up" >&2
-            exit 1
-          fi
-          ;;
-        *)
-          exit 1
-          ;;
-      esac
-    done
-
-    if [ ${#_skip_plugins[@]} -gt 0 ]; then
-      local -a _remaining_plugins=()
-      for p in "${plugins[@]}"; do
-        local _is_skipped=false
-        for _sp in "${_skip_plugins[@]}"; do
-          [ "$p" = "$_sp" ] && _is_skipped=true && break
-        done
-        [ "$_is_skipped" = false ] && _remaining_plugins+=("$p")
-      done
-      plugins=("${_remaining_plugins[@]}")
-    fi
-  fi
-
-  _PROC_PLUGINS=("${plugins[@]}")
-}
-
-_split_filter_criteria() {
-  local -a mime_include_args=()
-  local -a mime_exclude_args=()
-  _PROC_PATH_INCLUDE_ARGS=()
-  _PROC_PATH_EXCLUDE_ARGS=()
-
-  for inc in "${_PROC_INCLUDE_ARGS[@]+"${_PROC_INCLUDE_ARGS[@]}"}"; do
-    if [[ "$inc" == *"/"* ]] && [[ "$inc" != *"**"* ]]; then
-      mime_include_args+=("$inc")
-    else
-      _PROC_PATH_INCLUDE_ARGS+=("$inc")
-    fi
-  done
-  for exc in "${_PROC_EXCLUDE_ARGS[@]+"${_PROC_EXCLUDE_ARGS[@]}"}"; do
-    if [[ "$exc" == *"/"* ]] && [[ "$exc" != *"**"* ]]; then
-      mime_exclude_args+=("$exc")
-    else
-      _PROC_PATH_EXCLUDE_ARGS+=("$exc")
-    fi
-  done
+  # Run only the plugins whose outputs are consumed (and their dependencies)
+  options_prune_plugins "${plugins[@]}"
 
-  _MIME_INCLUDE_ARGS=("${mime_include_args[@]+"${mime_include_args[@]}"}")
-  _MIME_EXCLUDE_ARGS=("${mime_exclude_args[@]+"${mime_exclude_args[@]}"}")
+  # Prompts (or aborts when non-interactive) for active-but-uninstalled plugins
+  resolve_uninstalled_plugins "${_OPTIONS_PLUGINS[@]}"
+  _PROC_PLUGINS=("${RESOLVED_PLUGINS[@]}")
 }
 
 _run_process_pipeline() {
@@ -286,9 +193,7 @@ _run_process_pipeline() {
 
   # Suppress JSON when stdout is a TTY — JSON is only meaningful for pipelines
   local suppress_json=false
-  if [ "$_PROC_ECHO_MODE" = true ]; then
-    suppress_json=true
-  elif [ -t 1 ]; then
+  if options_json_suppressed; then
     suppress_json=true
   fi
 
@@ -299,43 +204,57 @@ _run_process_pipeline() {
   for exc in "${_PROC_PATH_EXCLUDE_ARGS[@]+"${_PROC_PATH_EXCLUDE_ARGS[@]}"}"; do
     filter_args+=("--exclude" "$exc")
   done
+  filter_args+=("${_PROC_WALK_ARGS[@]+"${_PROC_WALK_ARGS[@]}"}")
 
   if [ "$show_progress" = true ] && [ "$_PROC_ECHO_MODE" = false ]; then
     ui_show_banner
   fi
 
+  if [ "$_PROC_ENGINE" = "python" ]; then
+    run_discovery "${filter_args[@]+"${filter_args[@]}"}" | \
+      run_python_engine "$show_progress" "$suppress_json"
+    return
+  fi
+
+  # MIME criteria, plugin applicability and the template are read once for
+  # the whole run
+  mime_gate_start
+  plugin_applicability_load "${_PROC_PLUGINS[@]}"
+  template_renderer_start "$_PROC_TEMPLATE_SPECS" "$_PROC_CANONICAL_OUT" "$_PROC_SINK"
+
   if [ "$show_progress" = true ]; then
     ui_progress_init 0
     ui_progress_update phase "Scan directory"
     ui_progress_update step "Reading directory tree"
   fi
 
-  local -a file_list
-  mapfile -t file_list < <(
-    find "$_PROC_CANONICAL_IN" -type f | \
-    python3 "$FILTER_SCRIPT" "${filter_args[@]+"${filter_args[@]}"}"
-  )
+  # Discovery streams straight into processing: the walker runs ahead of the
+  # loop by at most a pipe buffer of paths, so no path list is held in memory.
+  # found/total grow as paths arrive and are final once the walk has ended.
+  # NDJSON records are document context seeds for process_file.
+  local first=true printed_bracket=false processed_count=0 found_count=0
+  local written_count=0 unchanged_count=0
+  local record file_path read_delim=""
+  local -a context_args=()
+  [ "$_PROC_DISCOVERY_FORMAT" = "null" ] || read_delim=$'\n'
+  while IFS= read -r -d "$read_delim" -u 5 record; do
+    [ -n "$record" ] || continue
+    file_path="$record"
+    context_args=()
+    if [ "$_PROC_DISCOVERY_FORMAT" = "ndjson" ]; then
+      file_path=$(printf '%s' "$record" | jq -j '.filePath')
+      context_args=(--context "$record")
+    fi
+    found_count=$((found_count + 1))
 
-  if [ ${#file_list[@]} -eq 0 ]; then
     if [ "$show_progress" = true ]; then
-      ui_progress_done 0
-    fi
-    if [ "$suppress_json" = false ]; then
-      echo "[]"
+      if [ "$found_count" -eq 1 ]; then
+        ui_progress_update step "Apply include/exclude filters"
+        ui_progress_update phase "Process documents"
+      fi
+      ui_progress_update found "$found_count"
+      ui_progress_update total "$found_count"
     fi
-    exit 0
-  fi
-
-  if [ "$show_progress" = true ]; then
-    ui_progress_update step "Apply include/exclude filters"
-    ui_progress_update found "${#file_list[@]}"
-    ui_progress_update total "${#file_list[@]}"
-    ui_progress_update phase "Process documents"
-  fi
-
-  local first=true printed_bracket=false processed_count=0
-  for file_path in "${file_list[@]}"; do
-    [ -n "$file_path" ] || continue
 
     local canonical_file
     canonical_file="$(readlink -f "$file_path")"
@@ -347,7 +266,8 @@ _run_process_pipeline() {
     fi
 
     local result
-    result=$(process_file "$file_path" "$_PROC_CANONICAL_OUT" "${_PROC_PLUGINS[@]}")
+    result=$(process_file "$file_path" "$_PROC_CANONICAL_OUT" \
+      "${context_args[@]+"${context_args[@]}"}" "${_PROC_PLUGINS[@]}")
     [ -n "$result" ] || continue
 
     local render_json="$result"
@@ -364,13 +284,15 @@ _run_process_pipeline() {
         echo ""
       fi
       echo "=== $relative_path ==="
-      render_template_json "$_PROC_TEMPLATE_FILE" "$render_json"
+      render_template_to "$_PROC_TEMPLATE_SPECS" "$render_json" -
       echo ""
       processed_count=$((processed_count + 1))
       continue
     fi
 
-    if [ "$suppress_json" = false ]; then
+    if [ "$suppress_json" = false ] && [ "$_PROC_OUTPUT_FORMAT" = "ndjson" ]; then
+      emit_result "$result"
+    elif [ "$suppress_json" = false ]; then
       if [ "$printed_bracket" = false ]; then
         echo "["
         printed_bracket=true
@@ -380,43 +302,64 @@ _run_process_pipeline() {
       else
         echo ","
       fi
-      echo "$result"
+      emit_result "$result"
     else
       printed_bracket=true
       first=false
     fi
 
-    local sidecar_path="${_PROC_CANONICAL_OUT}/${relative_path}.md"
-    local sidecar_dir
-    sidecar_dir="$(dirname "$sidecar_path")"
-
-    mkdir -p "$sidecar_dir"
-    local canonical_sidecar
-    canonical_sidecar="$(readlink -f "$sidecar_dir" 2>/dev/null)"
-    if [ -z "$canonical_sidecar" ]; then
-      log_error "Cannot resolve sidecar path for '$file_path'"
-      continue
-    fi
-
-    if [[ "$canonical_sidecar" != "${_PROC_CANONICAL_OUT}" && "$canonical_sidecar" != "${_PROC_CANONICAL_OUT}/"* ]]; then
-      log_error "path traversal detected for '$file_path'"
-      continue
-    fi
+    # The first template's output is the sidecar; further templates write
+    # <relative_path><suffix> next to it from the same result
+    local sidecar_base="${_PROC_CANONICAL_OUT}/${relative_path}"
+    local sidecar_path="${sidecar_base}${_PROC_TEMPLATES[0]##*:}"
 
     if [ "$show_progress" = true ]; then
       ui_progress_update step "Write output"
     fi
 
-    render_template_json "$_PROC_TEMPLATE_FILE" "$render_json" > "$sidecar_path"
+    # The renderer creates the sidecar directory (once per directory), checks
+    # it against the output root and only rewrites changed sidecars (or
+    # stores them in the sidecar archive with --sink sqlite).
+    if ! render_template_to "$_PROC_TEMPLATE_SPECS" "$render_json" "$sidecar_base"; then
+      log_error "$_TEMPLATE_RENDER_ERROR for '$file_path'"
+      continue
+    fi
+    local status
+    for status in $_TEMPLATE_RENDER_STATUS; do
+      if [ "$status" = "unchanged" ]; then
+        unchanged_count=$((unchanged_count + 1))
+      else
+        written_count=$((written_count + 1))
+      fi
+    done
     processed_count=$((processed_count + 1))
 
     if [ "$show_progress" = true ]; then
       ui_progress_update done "$processed_count"
     else
-      log_processed "$file_path" "$sidecar_path"
+      if [ "$_PROC_SINK" = "sqlite" ]; then
+        log_processed "$file_path" "$_PROC_CANONICAL_OUT/sidecars.sqlite:${sidecar_path#"$_PROC_CANONICAL_OUT/"}"
+      else
+        log_processed "$file_path" "$sidecar_path"
+      fi
     fi
-  done
+  done 5< <(run_discovery "${filter_args[@]+"${filter_args[@]}"}")
+  template_renderer_stop
+  mime_gate_stop
+
+  if [ "$found_count" -eq 0 ]; then
+    if [ "$show_progress" = true ]; then
+      ui_progress_done 0
+    fi
+    if [ "$suppress_json" = false ] && [ "$_PROC_OUTPUT_FORMAT" = "json" ]; then
+      echo "[]"
+    fi
+    exit 0
+  fi
 
+  if [ "$_PROC_ECHO_MODE" = false ] && [ "$processed_count" -gt 0 ]; then
+    log_info "Sidecars: $written_count written, $unchanged_count unchanged."
+  fi
   if [ "$show_progress" = true ]; then
     ui_progress_update phase "Done"
     ui_progress_update step ""
@@ -425,7 +368,7 @@ _run_process_pipeline() {
     echo "Processed $processed_count documents." >&2
   fi
 
-  if [ "$suppress_json" = false ]; then
+  if [ "$suppress_json" = false ] && [ "$_PROC_OUTPUT_FORMAT" = "json" ]; then
     if [ "$printed_bracket" = false ]; then
       echo "[]"
     else
@@ -485,6 +428,22 @@ main() {
       cmd_setup "$@"
       exit $?
       ;;
+    cache)
+      cmd_cache "$@"
+      exit $?
+      ;;
+    query)
+      cmd_query "$@"
+      exit $?
+      ;;
+    search)
+      cmd_search "$@"
+      exit $?
+      ;;
+    extract)
+      cmd_extract "$@"
+      exit $?
+      ;;
     *)
       log_error "Unknown command '$command'. Use --help for usage."
       exit 1
@@ -494,7 +453,7 @@ main() {
   _parse_process_args "$@"
   _validate_process_inputs
   _prepare_plugins
-  _split_filter_criteria
+  options_split_filter_criteria
   _run_process_pipeline
 }
 main "$@"
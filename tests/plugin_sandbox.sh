@@ -0,0 +1,55 @@
+#!/bin/bash
+# plugin_sandbox.sh - Shared helper for tests that run 'process'
+# Builds a temporary doc.doc.md install whose components, templates and
+# plugins link to the repository, except that active plugins whose
+# dependencies are not installed get a deactivated copy of their
+# descriptor.json. 'process' then runs non-interactively without touching
+# the tracked descriptors.
+#
+# Usage (after REPO_ROOT is set):
+#   source "$SCRIPT_DIR/plugin_sandbox.sh"
+#   sandbox_install     # sets SANDBOX_DIR, SANDBOX_DOC_DOC_SH, SANDBOX_PLUGIN_DIR
+#   sandbox_cleanup     # removes the sandbox (call from the test's cleanup)
+
+SANDBOX_DIR=""
+SANDBOX_DOC_DOC_SH=""
+SANDBOX_PLUGIN_DIR=""
+
+sandbox_install() {
+  local repo_plugins="$REPO_ROOT/doc.doc.md/plugins"
+  SANDBOX_DIR="$(mktemp -d)"
+  SANDBOX_DOC_DOC_SH="$SANDBOX_DIR/doc.doc.sh"
+  SANDBOX_PLUGIN_DIR="$SANDBOX_DIR/doc.doc.md/plugins"
+  mkdir -p "$SANDBOX_PLUGIN_DIR"
+  ln -s "$REPO_ROOT/doc.doc.sh" "$SANDBOX_DOC_DOC_SH"
+  ln -s "$REPO_ROOT/doc.doc.md/components" "$SANDBOX_DIR/doc.doc.md/components"
+  ln -s "$REPO_ROOT/doc.doc.md/templates" "$SANDBOX_DIR/doc.doc.md/templates"
+
+  local plugin_dir name installed entry
+  for plugin_dir in "$repo_plugins"/*/; do
+    plugin_dir="${plugin_dir%/}"
+    name="$(basename "$plugin_dir")"
+    installed=true
+    if [ -x "$plugin_dir/installed.sh" ] && \
+       [ "$(jq -r '.active' "$plugin_dir/descriptor.json" 2>/dev/null)" = "true" ]; then
+      installed=$(bash "$plugin_dir/installed.sh" 2>/dev/null | \
+        jq -r 'if .installed == false then "false" else "true" end' 2>/dev/null) || installed=false
+    fi
+    if [ "$installed" = "true" ]; then
+      ln -s "$plugin_dir" "$SANDBOX_PLUGIN_DIR/$name"
+      continue
+    fi
+    mkdir "$SANDBOX_PLUGIN_DIR/$name"
+    for entry in "$plugin_dir"/* "$plugin_dir"/.[!.]*; do
+      [ -e "$entry" ] || continue
+      [ "$(basename "$entry")" = "descriptor.json" ] && continue
+      ln -s "$entry" "$SANDBOX_PLUGIN_DIR/$name/"
+    done
+    jq '.active = false' "$plugin_dir/descriptor.json" > "$SANDBOX_PLUGIN_DIR/$name/descriptor.json"
+  done
+}
+
+sandbox_cleanup() {
+  [ -n "$SANDBOX_DIR" ] && [ -d "$SANDBOX_DIR" ] && rm -rf "$SANDBOX_DIR"
+  SANDBOX_DIR=""
+}
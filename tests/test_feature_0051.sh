@@ -0,0 +1,166 @@
+#!/bin/bash
+# Test suite for FEATURE_0051: Python process engine (process --engine python)
+# Verifies the Python engine is output-compatible with the bash pipeline.
+# Run from repository root: bash tests/test_feature_0051.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+ENGINE_PY="$REPO_ROOT/doc.doc.md/components/process_engine.py"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_same_file() {
+  local test_name="$1" expected_file="$2" actual_file="$3"
+  TOTAL=$((TOTAL + 1))
+  if cmp -s "$expected_file" "$actual_file"; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    diff "$expected_file" "$actual_file" | head -5 | sed 's/^/    /'
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0051: Python process engine"
+echo "============================================"
+echo ""
+
+TMPDIR_TEST=$(mktemp -d)
+INPUT="$TMPDIR_TEST/input"
+mkdir -p "$INPUT/sub"
+echo "alpha beta gamma" > "$INPUT/one.txt"
+echo "nested document" > "$INPUT/sub/two.txt"
+printf '\x89PNG\r\n\x1a\n' > "$INPUT/sub/image.png"
+
+# run_both <label> <args...> — run bash and python engines with identical args
+run_both() {
+  local label="$1"
+  shift
+  local out_b="$TMPDIR_TEST/$label.bash" out_p="$TMPDIR_TEST/$label.python"
+  local rc_b=0 rc_p=0
+  bash "$DOC_DOC_SH" process -d "$INPUT" "$@" --no-progress \
+    > "$out_b.stdout" 2> "$out_b.stderr" || rc_b=$?
+  bash "$DOC_DOC_SH" process -d "$INPUT" "$@" --no-progress --engine python \
+    > "$out_p.stdout" 2> "$out_p.stderr" || rc_p=$?
+  assert_eq "$label: exit codes match" "$rc_b" "$rc_p"
+  assert_same_file "$label: stdout is byte-identical" "$out_b.stdout" "$out_p.stdout"
+}
+
+# =========================================
+# Group 1: engine component
+# =========================================
+echo "--- Group 1: engine component ---"
+
+TOTAL=$((TOTAL + 1))
+if [ -f "$ENGINE_PY" ]; then
+  echo "  PASS: process_engine.py exists"
+  PASS=$((PASS + 1))
+else
+  echo "  FAIL: process_engine.py not found"
+  FAIL=$((FAIL + 1))
+fi
+
+rc=0
+bash "$DOC_DOC_SH" process -d "$INPUT" --echo --engine perl >/dev/null 2>&1 || rc=$?
+assert_eq "unknown engine is rejected" "1" "$rc"
+
+help_out=$(bash "$DOC_DOC_SH" process --help 2>&1)
+TOTAL=$((TOTAL + 1))
+if echo "$help_out" | grep -q -- "--engine"; then
+  echo "  PASS: process --help documents --engine"
+  PASS=$((PASS + 1))
+else
+  echo "  FAIL: process --help does not document --engine"
+  FAIL=$((FAIL + 1))
+fi
+
+# =========================================
+# Group 2: JSON output and sidecars
+# =========================================
+echo ""
+echo "--- Group 2: JSON output and sidecars ---"
+
+run_both "json" -o "$TMPDIR_TEST/out_json"
+
+bash "$DOC_DOC_SH" process -d "$INPUT" -o "$TMPDIR_TEST/out_b" --no-progress >/dev/null 2>&1
+bash "$DOC_DOC_SH" process -d "$INPUT" -o "$TMPDIR_TEST/out_p" --no-progress --engine python >/dev/null 2>&1
+for rel in one.txt.md sub/two.txt.md sub/image.png.md; do
+  assert_same_file "sidecar $rel is identical" "$TMPDIR_TEST/out_b/$rel" "$TMPDIR_TEST/out_p/$rel"
+done
+
+TOTAL=$((TOTAL + 1))
+if [ -d "$TMPDIR_TEST/out_p/.doc.doc.md/file" ]; then
+  echo "  PASS: pluginStorage directory created by python engine"
+  PASS=$((PASS + 1))
+else
+  echo "  FAIL: pluginStorage directory missing for python engine"
+  FAIL=$((FAIL + 1))
+fi
+
+stderr_py=$(bash "$DOC_DOC_SH" process -d "$INPUT" -o "$TMPDIR_TEST/out_p2" --no-progress --engine python 2>&1 >/dev/null)
+TOTAL=$((TOTAL + 1))
+if echo "$stderr_py" | grep -q "Processed 3 documents."; then
+  echo "  PASS: python engine reports processed count"
+  PASS=$((PASS + 1))
+else
+  echo "  FAIL: python engine summary missing"
+  FAIL=$((FAIL + 1))
+fi
+
+# =========================================
+# Group 3: echo mode, base path, MIME gate
+# =========================================
+echo ""
+echo "--- Group 3: echo mode, base path, MIME gate ---"
+
+run_both "echo" --echo
+run_both "echo_base" --echo -b "$TMPDIR_TEST"
+run_both "mime_include" -o "$TMPDIR_TEST/mi" -i "text/plain"
+run_both "mime_exclude" -o "$TMPDIR_TEST/me" -e "text/*"
+run_both "no_match" -o "$TMPDIR_TEST/nm" -i ".nomatch"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
@@ -0,0 +1,184 @@
+#!/bin/bash
+# Test suite for FEATURE_0052: Parallel document processing (process --jobs N)
+# Verifies parallel runs keep input order and match the sequential output.
+# Run from repository root: bash tests/test_feature_0052.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_same_file() {
+  local test_name="$1" expected_file="$2" actual_file="$3"
+  TOTAL=$((TOTAL + 1))
+  if cmp -s "$expected_file" "$actual_file"; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    diff "$expected_file" "$actual_file" | head -5 | sed 's/^/    /'
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0052: Parallel processing (--jobs)"
+echo "============================================"
+echo ""
+
+TMPDIR_TEST=$(mktemp -d)
+INPUT="$TMPDIR_TEST/input"
+mkdir -p "$INPUT/a/b" "$INPUT/c"
+for i in 01 02 03 04 05 06; do
+  echo "document $i with some words" > "$INPUT/doc_$i.txt"
+  echo "nested $i" > "$INPUT/a/b/nested_$i.txt"
+done
+printf '\x89PNG\r\n\x1a\n' > "$INPUT/c/image.png"
+TOTAL_FILES=13
+
+# =========================================
+# Group 1: option handling
+# =========================================
+echo "--- Group 1: option handling ---"
+
+rc=0
+bash "$DOC_DOC_SH" process -d "$INPUT" --echo --jobs 0 >/dev/null 2>&1 || rc=$?
+assert_eq "--jobs 0 is rejected" "1" "$rc"
+
+rc=0
+bash "$DOC_DOC_SH" process -d "$INPUT" --echo --jobs many >/dev/null 2>&1 || rc=$?
+assert_eq "non-numeric --jobs is rejected" "1" "$rc"
+
+rc=0
+err=$(bash "$DOC_DOC_SH" process -d "$INPUT" --echo --engine bash --jobs 2 2>&1 >/dev/null) || rc=$?
+assert_eq "--jobs with --engine bash is rejected" "1" "$rc"
+TOTAL=$((TOTAL + 1))
+if echo "$err" | grep -q -- "--jobs requires --engine python"; then
+  echo "  PASS: error explains the engine requirement"
+  PASS=$((PASS + 1))
+else
+  echo "  FAIL: unexpected error message: $err"
+  FAIL=$((FAIL + 1))
+fi
+
+help_out=$(bash "$DOC_DOC_SH" process --help 2>&1)
+TOTAL=$((TOTAL + 1))
+if echo "$help_out" | grep -q -- "--jobs"; then
+  echo "  PASS: process --help documents --jobs"
+  PASS=$((PASS + 1))
+else
+  echo "  FAIL: process --help does not document --jobs"
+  FAIL=$((FAIL + 1))
+fi
+
+err=$(bash "$DOC_DOC_SH" process -d "$INPUT" --echo --jobs 2 2>&1 >/dev/null)
+TOTAL=$((TOTAL + 1))
+if echo "$err" | grep -q -- "--jobs: using the python engine"; then
+  echo "  PASS: the implied engine switch is reported"
+  PASS=$((PASS + 1))
+else
+  echo "  FAIL: engine switch not reported: $err"
+  FAIL=$((FAIL + 1))
+fi
+
+default_jobs=$(python3 -c "import sys; sys.path.insert(0, '$REPO_ROOT/doc.doc.md/components'); import os, process_engine; print(process_engine.DEFAULT_JOBS <= min(4, os.cpu_count() or 1))")
+assert_eq "the python engine defaults to at most 4 workers" "True" "$default_jobs"
+
+# =========================================
+# Group 2: ordering and output equivalence
+# =========================================
+echo ""
+echo "--- Group 2: ordering and output equivalence ---"
+
+bash "$DOC_DOC_SH" process -d "$INPUT" -o "$TMPDIR_TEST/out_seq" --no-progress \
+  > "$TMPDIR_TEST/seq.stdout" 2> "$TMPDIR_TEST/seq.stderr"
+rc=0
+bash "$DOC_DOC_SH" process -d "$INPUT" -o "$TMPDIR_TEST/out_par" --no-progress --jobs 4 \
+  > "$TMPDIR_TEST/par.stdout" 2> "$TMPDIR_TEST/par.stderr" || rc=$?
+assert_eq "--jobs 4 exits 0" "0" "$rc"
+assert_same_file "JSON array matches sequential bash run (same order)" \
+  "$TMPDIR_TEST/seq.stdout" "$TMPDIR_TEST/par.stdout"
+assert_eq "summary counts every document" "Processed $TOTAL_FILES documents." \
+  "$(tail -n 1 "$TMPDIR_TEST/par.stderr")"
+
+seq_sidecars=$(cd "$TMPDIR_TEST/out_seq" && find . -name '*.md' -type f | sort)
+par_sidecars=$(cd "$TMPDIR_TEST/out_par" && find . -name '*.md' -type f | sort)
+assert_eq "same set of sidecars" "$seq_sidecars" "$par_sidecars"
+assert_eq "one sidecar per document" "$TOTAL_FILES" "$(echo "$par_sidecars" | wc -l | tr -d ' ')"
+
+mismatch=0
+while IFS= read -r rel; do
+  cmp -s "$TMPDIR_TEST/out_seq/$rel" "$TMPDIR_TEST/out_par/$rel" || mismatch=$((mismatch + 1))
+done <<< "$par_sidecars"
+assert_eq "sidecar contents identical" "0" "$mismatch"
+
+bash "$DOC_DOC_SH" process -d "$INPUT" --echo --no-progress > "$TMPDIR_TEST/echo_seq" 2>/dev/null
+bash "$DOC_DOC_SH" process -d "$INPUT" --echo --no-progress -j 8 > "$TMPDIR_TEST/echo_par" 2>/dev/null
+assert_same_file "echo output keeps input order" "$TMPDIR_TEST/echo_seq" "$TMPDIR_TEST/echo_par"
+
+bash "$DOC_DOC_SH" process -d "$INPUT" -o "$TMPDIR_TEST/out_mime" --no-progress -j 4 -i "text/plain" \
+  > "$TMPDIR_TEST/mime.stdout" 2>/dev/null
+assert_eq "MIME gate applies under --jobs" "12" "$(jq 'length' "$TMPDIR_TEST/mime.stdout")"
+
+# =========================================
+# Group 3: progress events
+# =========================================
+echo ""
+echo "--- Group 3: progress events ---"
+
+bash "$DOC_DOC_SH" process -d "$INPUT" -o "$TMPDIR_TEST/out_prog" --progress -j 4 \
+  > /dev/null 2> "$TMPDIR_TEST/prog.stderr"
+TOTAL=$((TOTAL + 1))
+if grep -q "Processed $TOTAL_FILES documents" "$TMPDIR_TEST/prog.stderr" \
+   || grep -q "$TOTAL_FILES/$TOTAL_FILES" "$TMPDIR_TEST/prog.stderr"; then
+  echo "  PASS: progress counts every document"
+  PASS=$((PASS + 1))
+else
+  echo "  FAIL: progress did not reach $TOTAL_FILES"
+  tail -c 300 "$TMPDIR_TEST/prog.stderr" | sed 's/^/    /'
+  FAIL=$((FAIL + 1))
+fi
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
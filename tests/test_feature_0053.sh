@@ -0,0 +1,265 @@
+#!/bin/bash
+# Test suite for FEATURE_0053: Incremental re-processing (process --incremental)
+# Verifies the run manifest skips, re-renders, re-processes and prunes correctly,
+# stores results per document and survives an interrupted run.
+# Run from repository root: bash tests/test_feature_0053.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_same_file() {
+  local test_name="$1" expected_file="$2" actual_file="$3"
+  TOTAL=$((TOTAL + 1))
+  if cmp -s "$expected_file" "$actual_file"; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    diff "$expected_file" "$actual_file" | head -5 | sed 's/^/    /'
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" needle="$2" haystack="$3"
+  TOTAL=$((TOTAL + 1))
+  if echo "$haystack" | grep -qF -- "$needle"; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $needle"
+    echo "    Actual: $haystack"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0053: Incremental re-processing"
+echo "============================================"
+echo ""
+
+TMPDIR_TEST=$(mktemp -d)
+INPUT="$TMPDIR_TEST/input"
+OUT="$TMPDIR_TEST/out"
+MANIFEST="$OUT/.doc.doc.md/manifest.sqlite"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+mkdir -p "$INPUT/sub"
+echo "alpha beta gamma" > "$INPUT/one.txt"
+echo "nested document" > "$INPUT/sub/two.txt"
+echo "third file" > "$INPUT/three.txt"
+
+# run_inc <label> [extra args...] — incremental run; stdout/stderr kept per label
+run_inc() {
+  local label="$1"
+  shift
+  bash "$DOC_DOC_SH" process -d "$INPUT" -o "$OUT" --no-progress --incremental "$@" \
+    > "$TMPDIR_TEST/$label.stdout" 2> "$TMPDIR_TEST/$label.stderr"
+}
+
+summary() { grep "^Incremental:" "$TMPDIR_TEST/$1.stderr"; }
+
+# manifest_sql <manifest> <sql> — run a statement, print its rows one per line
+manifest_sql() {
+  python3 -c 'import sqlite3, sys
+db = sqlite3.connect(sys.argv[1])
+for row in db.execute(sys.argv[2]).fetchall():
+    print("|".join(str(value) for value in row))
+db.commit()' "$1" "$2"
+}
+
+# =========================================
+# Group 1: option handling
+# =========================================
+echo "--- Group 1: option handling ---"
+
+rc=0
+bash "$DOC_DOC_SH" process -d "$INPUT" --echo --incremental >/dev/null 2>&1 || rc=$?
+assert_eq "--incremental with --echo is rejected" "1" "$rc"
+
+rc=0
+bash "$DOC_DOC_SH" process -d "$INPUT" -o "$OUT" --engine bash --incremental >/dev/null 2>&1 || rc=$?
+assert_eq "--incremental with --engine bash is rejected" "1" "$rc"
+
+help_out=$(bash "$DOC_DOC_SH" process --help 2>&1)
+assert_contains "process --help documents --incremental" "--incremental" "$help_out"
+assert_contains "process --help documents --checksum" "--checksum" "$help_out"
+
+# =========================================
+# Group 2: skip unchanged documents
+# =========================================
+echo ""
+echo "--- Group 2: skip unchanged documents ---"
+
+run_inc first
+assert_eq "first run processes everything" \
+  "Incremental: 3 processed, 0 re-rendered, 0 unchanged, 0 pruned." "$(summary first)"
+TOTAL=$((TOTAL + 1))
+if [ -f "$MANIFEST" ] && [ "$(manifest_sql "$MANIFEST" "SELECT COUNT(*) FROM files")" = "3" ]; then
+  echo "  PASS: manifest records every document"
+  PASS=$((PASS + 1))
+else
+  echo "  FAIL: manifest missing or incomplete"
+  FAIL=$((FAIL + 1))
+fi
+assert_eq "manifest records plugin versions" "true" \
+  "$(manifest_sql "$MANIFEST" "SELECT value FROM meta WHERE key = 'pipeline'" \
+    | jq '.plugins | map(.[0]) | index("file") != null')"
+
+run_inc second
+assert_eq "unchanged run skips everything" \
+  "Incremental: 0 processed, 0 re-rendered, 3 unchanged, 0 pruned." "$(summary second)"
+assert_same_file "skipped documents emit the stored JSON" \
+  "$TMPDIR_TEST/first.stdout" "$TMPDIR_TEST/second.stdout"
+assert_contains "summary still counts every document" "Processed 3 documents." \
+  "$(cat "$TMPDIR_TEST/second.stderr")"
+
+# =========================================
+# Group 3: changes, template and pruning
+# =========================================
+echo ""
+echo "--- Group 3: changes, template and pruning ---"
+
+echo "more words" >> "$INPUT/one.txt"
+run_inc changed
+assert_eq "modified document is re-processed" \
+  "Incremental: 1 processed, 0 re-rendered, 2 unchanged, 0 pruned." "$(summary changed)"
+
+touch -d "2001-01-01" "$INPUT/three.txt"
+run_inc touched
+assert_eq "mtime change re-processes without --checksum" \
+  "Incremental: 1 processed, 0 re-rendered, 2 unchanged, 0 pruned." "$(summary touched)"
+
+run_inc checksum_seed --checksum
+touch "$INPUT/three.txt"
+run_inc checksum --checksum
+assert_eq "--checksum ignores touched but identical files" \
+  "Incremental: 0 processed, 0 re-rendered, 3 unchanged, 0 pruned." "$(summary checksum)"
+
+cp "$REPO_ROOT/doc.doc.md/templates/default.md" "$TMPDIR_TEST/template.md"
+echo "INCREMENTAL-MARKER" >> "$TMPDIR_TEST/template.md"
+run_inc template -t "$TMPDIR_TEST/template.md"
+assert_eq "template change only re-renders" \
+  "Incremental: 0 processed, 3 re-rendered, 0 unchanged, 0 pruned." "$(summary template)"
+assert_contains "re-rendered sidecar uses the new template" "INCREMENTAL-MARKER" \
+  "$(cat "$OUT/one.txt.md")"
+
+manifest_sql "$MANIFEST" "UPDATE files SET entry = json_set(entry, '\$.plugins', 'stale')"
+run_inc plugins -t "$TMPDIR_TEST/template.md"
+assert_eq "plugin set/version change re-processes everything" \
+  "Incremental: 3 processed, 0 re-rendered, 0 unchanged, 0 pruned." "$(summary plugins)"
+
+rm "$INPUT/sub/two.txt"
+run_inc pruned -t "$TMPDIR_TEST/template.md"
+assert_eq "vanished source is pruned" \
+  "Incremental: 0 processed, 0 re-rendered, 2 unchanged, 1 pruned." "$(summary pruned)"
+assert_eq "pruned sidecar is deleted" "false" \
+  "$([ -e "$OUT/sub/two.txt.md" ] && echo true || echo false)"
+assert_eq "empty sidecar directory is removed" "false" \
+  "$([ -d "$OUT/sub" ] && echo true || echo false)"
+assert_eq "manifest forgets pruned source" "2" "$(manifest_sql "$MANIFEST" "SELECT COUNT(*) FROM files")"
+
+rm "$OUT/one.txt.md"
+run_inc missing_sidecar -t "$TMPDIR_TEST/template.md"
+assert_eq "missing sidecar is re-rendered" \
+  "Incremental: 0 processed, 1 re-rendered, 1 unchanged, 0 pruned." "$(summary missing_sidecar)"
+
+# =========================================
+# Group 4: storage and interrupted runs
+# =========================================
+echo ""
+echo "--- Group 4: storage and interrupted runs ---"
+
+assert_eq "results are stored per document" "2" \
+  "$(manifest_sql "$MANIFEST" "SELECT COUNT(*) FROM files WHERE json_extract(result, '\$.filePath') IS NOT NULL")"
+assert_eq "no JSON manifest is written" "false" \
+  "$([ -e "$OUT/.doc.doc.md/manifest.json" ] && echo true || echo false)"
+
+# A plugin that hangs on z.txt while $SLOW_FLAG exists; the run is stopped
+# with SIGTERM once a.txt and b.txt are done.
+SLOW_PLUGINS="$TMPDIR_TEST/plugins"
+SLOW_FLAG="$TMPDIR_TEST/slow"
+SLOW_IN="$TMPDIR_TEST/slow_in"
+SLOW_OUT="$TMPDIR_TEST/slow_out"
+mkdir -p "$SLOW_PLUGINS/slow" "$SLOW_IN"
+cat > "$SLOW_PLUGINS/slow/descriptor.json" <<'JSON'
+{"name": "slow", "version": "1.0.0", "active": true,
+ "commands": {"process": {"command": "main.sh", "input": {"filePath": {}},
+                          "output": {"slow": {}}}}}
+JSON
+cat > "$SLOW_PLUGINS/slow/main.sh" <<SH
+#!/bin/bash
+grep -q 'z.txt' && [ -f "$SLOW_FLAG" ] && exec sleep 30
+echo '{"slow": 1}'
+SH
+chmod +x "$SLOW_PLUGINS/slow/main.sh"
+printf '# {{fileName}}\n' > "$TMPDIR_TEST/slow.md"
+for name in a b z; do echo "$name" > "$SLOW_IN/$name.txt"; done
+printf '%s\n' "$SLOW_IN/a.txt" "$SLOW_IN/b.txt" "$SLOW_IN/z.txt" > "$TMPDIR_TEST/slow.list"
+SLOW_ARGS=("$COMPONENTS_DIR/process_engine.py" --plugin-dir "$SLOW_PLUGINS"
+  --input-dir "$SLOW_IN" --output-dir "$SLOW_OUT" --input-format lines
+  --template "$TMPDIR_TEST/slow.md" --incremental --jobs 1 --suppress-json slow)
+
+touch "$SLOW_FLAG"
+python3 "${SLOW_ARGS[@]}" < "$TMPDIR_TEST/slow.list" 2>/dev/null &
+slow_pid=$!
+for _ in $(seq 100); do
+  [ -f "$SLOW_OUT/b.txt.md" ] && break
+  sleep 0.1
+done
+sleep 0.5
+kill -TERM "$slow_pid"
+wait "$slow_pid" 2>/dev/null
+assert_eq "an interrupted run keeps the finished documents" "a.txt b.txt" \
+  "$(manifest_sql "$SLOW_OUT/.doc.doc.md/manifest.sqlite" \
+      "SELECT source FROM files ORDER BY source" | xargs -n1 basename | paste -sd' ')"
+rm "$SLOW_FLAG"
+assert_contains "the next run only processes the rest" \
+  "Incremental: 1 processed, 0 re-rendered, 2 unchanged, 0 pruned." \
+  "$(python3 "${SLOW_ARGS[@]}" < "$TMPDIR_TEST/slow.list" 2>&1)"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
@@ -0,0 +1,185 @@
+#!/bin/bash
+# Test suite for FEATURE_0054: Content-addressed plugin result cache
+# Verifies process --cache-dir reuse, descriptor opt-out and cache stats/prune.
+# Run from repository root: bash tests/test_feature_0054.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_same_file() {
+  local test_name="$1" expected_file="$2" actual_file="$3"
+  TOTAL=$((TOTAL + 1))
+  if cmp -s "$expected_file" "$actual_file"; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    diff "$expected_file" "$actual_file" | head -5 | sed 's/^/    /'
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0054: Plugin result cache"
+echo "============================================"
+echo ""
+
+TMPDIR_TEST=$(mktemp -d)
+INPUT="$TMPDIR_TEST/input"
+INPUT2="$TMPDIR_TEST/input2"
+CACHE="$TMPDIR_TEST/cache"
+mkdir -p "$INPUT/sub" "$INPUT2"
+echo "alpha beta gamma" > "$INPUT/one.txt"
+echo "nested document" > "$INPUT/sub/two.txt"
+cp "$INPUT/one.txt" "$INPUT2/copy-of-one.txt"
+
+cache_line() { grep "^Cache:" "$1"; }
+
+# =========================================
+# Group 1: option handling
+# =========================================
+echo "--- Group 1: option handling ---"
+
+rc=0
+bash "$DOC_DOC_SH" process -d "$INPUT" --echo --engine bash --cache-dir "$CACHE" >/dev/null 2>&1 || rc=$?
+assert_eq "--cache-dir with --engine bash is rejected" "1" "$rc"
+
+rc=0
+bash "$DOC_DOC_SH" process -d "$INPUT" --echo --cache-dir "$CACHE" --cache-max-size lots >/dev/null 2>&1 || rc=$?
+assert_eq "invalid --cache-max-size is rejected" "1" "$rc"
+
+rc=0
+bash "$DOC_DOC_SH" process -d "$INPUT" --echo --cache-max-size 1G >/dev/null 2>&1 || rc=$?
+assert_eq "--cache-max-size without --cache-dir is rejected" "1" "$rc"
+
+rc=0
+bash "$DOC_DOC_SH" cache >/dev/null 2>&1 || rc=$?
+assert_eq "cache without action exits 1" "1" "$rc"
+
+rc=0
+bash "$DOC_DOC_SH" cache stats >/dev/null 2>&1 || rc=$?
+assert_eq "cache stats without --cache-dir exits 1" "1" "$rc"
+
+rc=0
+bash "$DOC_DOC_SH" cache --help >/dev/null 2>&1 || rc=$?
+assert_eq "cache --help exits 0" "0" "$rc"
+
+assert_eq "stat plugin opts out of caching" "false" \
+  "$(jq -r '.cacheable' "$BUILTIN_PLUGIN_DIR/stat/descriptor.json")"
+assert_eq "crm114 plugin opts out of caching" "false" \
+  "$(jq -r '.cacheable' "$BUILTIN_PLUGIN_DIR/crm114/descriptor.json")"
+
+# =========================================
+# Group 2: cache reuse
+# =========================================
+echo ""
+echo "--- Group 2: cache reuse ---"
+
+bash "$DOC_DOC_SH" process -d "$INPUT" -o "$TMPDIR_TEST/plain" --no-progress \
+  > "$TMPDIR_TEST/plain.stdout" 2>/dev/null
+bash "$DOC_DOC_SH" process -d "$INPUT" -o "$TMPDIR_TEST/out1" --no-progress --cache-dir "$CACHE" \
+  > "$TMPDIR_TEST/run1.stdout" 2> "$TMPDIR_TEST/run1.stderr"
+bash "$DOC_DOC_SH" process -d "$INPUT" -o "$TMPDIR_TEST/out2" --no-progress --cache-dir "$CACHE" \
+  > "$TMPDIR_TEST/run2.stdout" 2> "$TMPDIR_TEST/run2.stderr"
+
+assert_same_file "cached run output matches an uncached run" \
+  "$TMPDIR_TEST/plain.stdout" "$TMPDIR_TEST/run1.stdout"
+assert_same_file "run into a new -o directory reuses cache with identical output" \
+  "$TMPDIR_TEST/run1.stdout" "$TMPDIR_TEST/run2.stdout"
+assert_eq "first run starts without hits" "0" \
+  "$(cache_line "$TMPDIR_TEST/run1.stderr" | sed -E 's/^Cache: ([0-9]+) hits.*/\1/')"
+assert_eq "second run hits the file plugin for both documents" "2" \
+  "$(cache_line "$TMPDIR_TEST/run2.stderr" | sed -E 's/^Cache: ([0-9]+) hits.*/\1/')"
+assert_eq "opted-out stat plugin has no cache entries" "false" \
+  "$([ -d "$CACHE/stat" ] && echo true || echo false)"
+
+# Same content under another path and tree: served from the cache
+entry=$(find "$CACHE/file" -name '*.json' | head -n 1)
+for e in $(find "$CACHE/file" -name '*.json'); do
+  echo '{"mimeType":"application/x-from-cache"}' > "$e"
+done
+bash "$DOC_DOC_SH" process -d "$INPUT2" --echo --no-progress --cache-dir "$CACHE" \
+  > "$TMPDIR_TEST/copy.stdout" 2>/dev/null
+TOTAL=$((TOTAL + 1))
+if grep -q "application/x-from-cache" "$TMPDIR_TEST/copy.stdout"; then
+  echo "  PASS: identical content in another tree is served from the cache"
+  PASS=$((PASS + 1))
+else
+  echo "  FAIL: cache entry was not used for identical content"
+  FAIL=$((FAIL + 1))
+fi
+
+# =========================================
+# Group 3: stats and pruning
+# =========================================
+echo ""
+echo "--- Group 3: stats and pruning ---"
+
+stats=$(bash "$DOC_DOC_SH" cache stats --cache-dir "$CACHE" 2>&1)
+TOTAL=$((TOTAL + 1))
+if echo "$stats" | grep -q "^Entries: 2$" && echo "$stats" | grep -qE '^  file +2 entries'; then
+  echo "  PASS: cache stats reports entries per plugin"
+  PASS=$((PASS + 1))
+else
+  echo "  FAIL: unexpected cache stats output"
+  echo "$stats" | sed 's/^/    /'
+  FAIL=$((FAIL + 1))
+fi
+
+touch -d "2001-01-01" "$entry"
+bash "$DOC_DOC_SH" cache prune --cache-dir "$CACHE" --max-size 40 >/dev/null 2>&1
+assert_eq "prune evicts the least recently used entry first" "false" \
+  "$([ -f "$entry" ] && echo true || echo false)"
+assert_eq "prune keeps entries within the cap" "1" \
+  "$(find "$CACHE" -name '*.json' | wc -l | tr -d ' ')"
+
+bash "$DOC_DOC_SH" process -d "$INPUT" --echo --no-progress --cache-dir "$CACHE" \
+  --cache-max-size 0 > /dev/null 2> "$TMPDIR_TEST/cap.stderr"
+assert_eq "--cache-max-size is enforced after the run" "0" \
+  "$(find "$CACHE" -name '*.json' | wc -l | tr -d ' ')"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
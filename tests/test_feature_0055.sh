@@ -0,0 +1,189 @@
+#!/bin/bash
+# Test suite for FEATURE_0055: Persistent plugin worker protocol
+# Verifies that commands.process.server workers are started once per run,
+# map skip/error responses to ADR-004 semantics, are restarted after a crash,
+# and that plugins without a usable server fall back to the one-shot command.
+# Run from repository root: bash tests/test_feature_0055.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+PROCESS_ENGINE="$COMPONENTS_DIR/process_engine.py"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+cleanup() {
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" needle="$2" haystack="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$haystack" == *"$needle"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $needle"
+    echo "    Actual: $haystack"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0055: Persistent plugin workers"
+echo "============================================"
+echo ""
+
+TMPDIR_TEST=$(mktemp -d)
+INPUT="$TMPDIR_TEST/input"
+PLUGINS="$TMPDIR_TEST/plugins"
+STARTS="$TMPDIR_TEST/starts.log"
+TEMPLATE="$TMPDIR_TEST/template.md"
+mkdir -p "$INPUT" "$PLUGINS/worker" "$PLUGINS/oneshot"
+echo "{{fileName}}" > "$TEMPLATE"
+for f in a b c skip-me error-me crash-me d; do echo "$f" > "$INPUT/$f.txt"; done
+
+# Worker plugin: logs every start, answers according to the file name and
+# dies on crash-me.txt.
+cat > "$PLUGINS/worker/descriptor.json" <<'JSON'
+{"name": "worker", "version": "1.0.0", "active": true,
+ "commands": {"process": {"command": "main.sh", "server": "server.sh",
+  "input": {"filePath": {"type": "string", "required": true}},
+  "output": {"via": {"type": "string"}}}}}
+JSON
+cat > "$PLUGINS/worker/main.sh" <<'SH'
+#!/bin/bash
+jq -c '{via: "oneshot", name: (.filePath | split("/") | last)}'
+SH
+cat > "$PLUGINS/worker/server.sh" <<SH
+#!/bin/bash
+echo "start" >> "$STARTS"
+while IFS= read -r line; do
+  name=\$(printf '%s' "\$line" | jq -r '.filePath | split("/") | last')
+  case "\$name" in
+    skip-me.txt)  echo '{"status":"skip","message":"not for me"}' ;;
+    error-me.txt) echo '{"status":"error","message":"broken"}' ;;
+    crash-me.txt) exit 3 ;;
+    *) jq -cn --arg n "\$name" '{status: "ok", output: {via: "server", name: \$n}}' ;;
+  esac
+done
+SH
+cp "$PLUGINS/worker/main.sh" "$PLUGINS/oneshot/main.sh"
+jq '.name = "oneshot" | .commands.process.server = "missing.sh"' \
+  "$PLUGINS/worker/descriptor.json" > "$PLUGINS/oneshot/descriptor.json"
+chmod +x "$PLUGINS"/*/*.sh
+
+run_engine() {
+  local plugin="$1"; shift
+  find "$INPUT" -type f -name '*.txt' | sort | python3 "$PROCESS_ENGINE" \
+    --plugin-dir "$PLUGINS" --input-dir "$INPUT" --template "$TEMPLATE" "$@" "$plugin"
+}
+
+# =========================================
+# Group 1: server mode
+# =========================================
+echo "--- Group 1: server mode ---"
+
+: > "$STARTS"
+(cd "$INPUT" && rm -f crash-me.txt)
+run_engine worker --jobs 1 > "$TMPDIR_TEST/server.json" 2> "$TMPDIR_TEST/server.stderr"
+assert_eq "worker is started once for the whole run" "1" "$(wc -l < "$STARTS" | tr -d ' ')"
+assert_eq "ok responses are merged" "a.txt b.txt c.txt d.txt" \
+  "$(jq -r '[.[] | select(.via == "server") | .name] | join(" ")' "$TMPDIR_TEST/server.json")"
+assert_eq "skip response merges nothing" "0" \
+  "$(jq '[.[] | select(.name == "skip-me.txt")] | length' "$TMPDIR_TEST/server.json")"
+assert_contains "error response is reported as plugin failure" \
+  "Plugin 'worker' failed for file: error-me.txt" "$(cat "$TMPDIR_TEST/server.stderr")"
+assert_eq "skip response prints no error" "" \
+  "$(grep 'skip-me' "$TMPDIR_TEST/server.stderr")"
+
+: > "$STARTS"
+run_engine worker --jobs 3 > "$TMPDIR_TEST/jobs.json" 2>/dev/null
+assert_eq "--jobs bounds the number of workers" "true" \
+  "$([ "$(wc -l < "$STARTS")" -le 3 ] && echo true || echo false)"
+assert_eq "output with several workers matches a single worker" \
+  "$(cat "$TMPDIR_TEST/server.json")" "$(cat "$TMPDIR_TEST/jobs.json")"
+
+# =========================================
+# Group 2: crash recovery
+# =========================================
+echo ""
+echo "--- Group 2: crash recovery ---"
+
+: > "$STARTS"
+echo "crash-me" > "$INPUT/crash-me.txt"
+run_engine worker --jobs 1 > "$TMPDIR_TEST/crash.json" 2> "$TMPDIR_TEST/crash.stderr"
+assert_contains "a document that kills its worker is reported" \
+  "Plugin 'worker' worker died for file: crash-me.txt" "$(cat "$TMPDIR_TEST/crash.stderr")"
+assert_eq "worker is restarted (initial + retry + replacement)" "3" \
+  "$(wc -l < "$STARTS" | tr -d ' ')"
+assert_eq "documents after the crash are still processed" "true" \
+  "$(jq '[.[] | .name] | index("d.txt") != null' "$TMPDIR_TEST/crash.json")"
+rm -f "$INPUT/crash-me.txt"
+
+# =========================================
+# Group 3: one-shot fallback
+# =========================================
+echo ""
+echo "--- Group 3: one-shot fallback ---"
+
+run_engine oneshot --jobs 1 > "$TMPDIR_TEST/oneshot.json" 2>/dev/null
+assert_eq "missing server falls back to the process command" "oneshot" \
+  "$(jq -r '[.[] | .via] | unique | join(" ")' "$TMPDIR_TEST/oneshot.json")"
+assert_eq "fallback processes every document" "6" \
+  "$(jq 'length' "$TMPDIR_TEST/oneshot.json")"
+
+# =========================================
+# Group 4: built-in plugin servers
+# =========================================
+echo ""
+echo "--- Group 4: built-in plugin servers ---"
+
+assert_eq "langid declares a server" "server.sh" \
+  "$(jq -r '.commands.process.server' "$BUILTIN_PLUGIN_DIR/langid/descriptor.json")"
+assert_eq "markitdown declares a server" "server.sh" \
+  "$(jq -r '.commands.process.server' "$BUILTIN_PLUGIN_DIR/markitdown/descriptor.json")"
+
+response=$(printf '%s\n' '{"filePath":"/etc/passwd","mimeType":"application/msword"}' \
+  | python3 "$BUILTIN_PLUGIN_DIR/markitdown/server.py")
+assert_eq "markitdown server rejects restricted paths" "error" "$(echo "$response" | jq -r '.status')"
+
+response=$(printf '%s\n' "{\"filePath\":\"$INPUT/a.txt\",\"mimeType\":\"text/plain\"}" \
+  | python3 "$BUILTIN_PLUGIN_DIR/markitdown/server.py")
+assert_eq "markitdown server skips unsupported MIME types" "skip" \
+  "$(echo "$response" | jq -r '.status')"
+
+response=$(printf '%s\n%s\n' "{\"filePath\":\"$INPUT/a.txt\"}" "{\"filePath\":\"$INPUT/b.txt\"}" \
+  | python3 "$BUILTIN_PLUGIN_DIR/langid/server.py")
+assert_eq "langid server answers every request and skips without text" "skip skip" \
+  "$(echo "$response" | jq -rs '[.[] | .status] | join(" ")')"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
@@ -0,0 +1,215 @@
+#!/bin/bash
+# Test suite for FEATURE_0056: In-process Python plugin entry points
+# Verifies that commands.process.entrypoint handlers are called in-process,
+# map PluginSkip/PluginError to ADR-004 semantics, fall back to the process
+# command when the module cannot be loaded, and that the built-in entry
+# points produce the same output as their main.sh.
+# Run from repository root: bash tests/test_feature_0056.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+PROCESS_ENGINE="$COMPONENTS_DIR/process_engine.py"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+cleanup() {
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" needle="$2" haystack="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$haystack" == *"$needle"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $needle"
+    echo "    Actual: $haystack"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0056: In-process plugin entry points"
+echo "============================================"
+echo ""
+
+TMPDIR_TEST=$(mktemp -d)
+INPUT="$TMPDIR_TEST/input"
+PLUGINS="$TMPDIR_TEST/plugins"
+TEMPLATE="$TMPDIR_TEST/template.md"
+mkdir -p "$INPUT" "$PLUGINS/inproc" "$PLUGINS/broken"
+echo "{{fileName}}" > "$TEMPLATE"
+for f in a skip-me error-me raise-me; do echo "$f" > "$INPUT/$f.txt"; done
+
+# In-process plugin: the one-shot command and the entry point report
+# different "via" values; the entry point writes its pid so the test can
+# check it ran inside the engine process.
+cat > "$PLUGINS/inproc/descriptor.json" <<'JSON'
+{"name": "inproc", "version": "1.0.0", "active": true,
+ "commands": {"process": {"command": "main.sh", "entrypoint": "entry:process",
+  "input": {"filePath": {"type": "string", "required": true}},
+  "output": {"via": {"type": "string"}}}}}
+JSON
+cat > "$PLUGINS/inproc/main.sh" <<'SH'
+#!/bin/bash
+jq -c '{via: "oneshot", name: (.filePath | split("/") | last)}'
+SH
+cat > "$PLUGINS/inproc/entry.py" <<'PY'
+import os
+from plugin_api import PluginError, PluginSkip
+
+def process(data):
+    name = os.path.basename(data["filePath"])
+    if name == "skip-me.txt":
+        raise PluginSkip("not for me")
+    if name == "error-me.txt":
+        raise PluginError("broken")
+    if name == "raise-me.txt":
+        raise RuntimeError("unexpected")
+    return {"via": "entrypoint", "name": name, "pid": os.getpid()}
+PY
+# Broken plugin: the entry point module fails to import
+cp "$PLUGINS/inproc/main.sh" "$PLUGINS/broken/main.sh"
+echo "import module_that_does_not_exist" > "$PLUGINS/broken/entry.py"
+jq '.name = "broken"' "$PLUGINS/inproc/descriptor.json" > "$PLUGINS/broken/descriptor.json"
+chmod +x "$PLUGINS"/*/main.sh
+
+run_engine() {
+  find "$INPUT" -type f -name '*.txt' | sort | python3 "$PROCESS_ENGINE" \
+    --plugin-dir "$PLUGINS" --input-dir "$INPUT" --template "$TEMPLATE" "$@"
+}
+
+# =========================================
+# Group 1: entry point dispatch
+# =========================================
+echo "--- Group 1: entry point dispatch ---"
+
+run_engine --jobs 1 inproc > "$TMPDIR_TEST/inproc.json" 2> "$TMPDIR_TEST/inproc.stderr"
+assert_eq "entry point output is merged" "entrypoint" \
+  "$(jq -r '.[] | select(.name == "a.txt") | .via' "$TMPDIR_TEST/inproc.json")"
+assert_eq "entry point runs without forking" "1" \
+  "$(jq '[.[] | .pid | select(. != null)] | unique | length' "$TMPDIR_TEST/inproc.json")"
+assert_eq "PluginSkip merges nothing" "0" \
+  "$(jq '[.[] | select(.name == "skip-me.txt")] | length' "$TMPDIR_TEST/inproc.json")"
+assert_eq "PluginSkip prints no error" "" "$(grep 'skip-me' "$TMPDIR_TEST/inproc.stderr")"
+assert_contains "PluginError is reported as plugin failure" \
+  "Plugin 'inproc' failed for file: error-me.txt" "$(cat "$TMPDIR_TEST/inproc.stderr")"
+assert_contains "unexpected exceptions are reported as plugin failure" \
+  "Plugin 'inproc' failed for file: raise-me.txt" "$(cat "$TMPDIR_TEST/inproc.stderr")"
+assert_eq "every document is still emitted" "4" "$(jq 'length' "$TMPDIR_TEST/inproc.json")"
+
+# =========================================
+# Group 2: fallback to the process command
+# =========================================
+echo ""
+echo "--- Group 2: fallback ---"
+
+run_engine --jobs 1 broken > "$TMPDIR_TEST/broken.json" 2>/dev/null
+assert_eq "import failure falls back to the process command" "oneshot" \
+  "$(jq -r '[.[] | .via] | unique | join(" ")' "$TMPDIR_TEST/broken.json")"
+
+jq '.commands.process.entrypoint = "../inproc/entry:process"' "$PLUGINS/broken/descriptor.json" \
+  > "$TMPDIR_TEST/d.json" && mv "$TMPDIR_TEST/d.json" "$PLUGINS/broken/descriptor.json"
+run_engine --jobs 1 broken > "$TMPDIR_TEST/traversal.json" 2>/dev/null
+assert_eq "entry points outside the plugin directory are ignored" "oneshot" \
+  "$(jq -r '[.[] | .via] | unique | join(" ")' "$TMPDIR_TEST/traversal.json")"
+
+# =========================================
+# Group 3: plugin_api input validation
+# =========================================
+echo ""
+echo "--- Group 3: plugin_api validation ---"
+
+# Runs the stat entry point on the JSON read from stdin; prints the response
+call_stat() {
+  python3 -c "
+import json, sys
+sys.path[:0] = ['$COMPONENTS_DIR', '$BUILTIN_PLUGIN_DIR/stat']
+import plugin_api, main
+print(json.dumps(plugin_api.call(main.process, json.load(sys.stdin))))"
+}
+assert_eq "restricted paths are rejected" "error" \
+  "$(echo '{"filePath":"/etc/passwd"}' | call_stat | jq -r '.status')"
+assert_eq "missing filePath is rejected" "error" "$(echo '{}' | call_stat | jq -r '.status')"
+assert_eq "oversized input is rejected" "Input exceeds 1MB limit" \
+  "$(head -c 1100000 /dev/zero | tr '\0' x | jq -Rs --arg f "$INPUT/a.txt" '{filePath: $f, pad: .}' \
+     | call_stat | jq -r '.message')"
+
+# =========================================
+# Group 4: built-in entry points match main.sh
+# =========================================
+echo ""
+echo "--- Group 4: built-in entry points ---"
+
+for p in wc wordcoverage stat langid; do
+  assert_eq "$p declares an entry point" "main:process" \
+    "$(jq -r '.commands.process.entrypoint' "$BUILTIN_PLUGIN_DIR/$p/descriptor.json")"
+done
+
+# Runs one built-in plugin via main.sh and via its entry point on the same
+# input; both sides print the compact output JSON (if any) and "rc=<code>".
+# main.sh runs in a UTF-8 locale, as under the python engine (PEP 538).
+run_main_sh() {
+  local out rc
+  out=$(LC_ALL=C.UTF-8 "$BUILTIN_PLUGIN_DIR/$1/main.sh" 2>/dev/null); rc=$?
+  [ "$rc" -eq 0 ] && echo "$out" | jq -c .
+  echo "rc=$rc"
+}
+run_entrypoint() {
+  python3 -c "
+import json, sys
+sys.path[:0] = ['$COMPONENTS_DIR', '$BUILTIN_PLUGIN_DIR/$1']
+import plugin_api, main
+response = plugin_api.call(main.process, json.load(sys.stdin))
+if response['status'] == 'ok':
+    print(json.dumps(response['output'], separators=(',', ':')))
+print('rc=' + {'ok': '0', 'skip': '65'}.get(response['status'], '1'))"
+}
+compare_plugin() {
+  local plugin="$1" input="$2" test_name="$3"
+  assert_eq "$plugin: $test_name" \
+    "$(echo "$input" | run_main_sh "$plugin")" "$(echo "$input" | run_entrypoint "$plugin")"
+}
+
+TEXT_INPUT=$(jq -cn '{textContent: "Hello world\nfoo  bar baz  x y\n\n"}')
+compare_plugin wc "$TEXT_INPUT" "counts match (incl. Unicode spaces)"
+compare_plugin wc '{"ocrText":"","documentText":"one two"}' "text priority matches"
+compare_plugin wc '{"filePath":"x"}' "skip without text matches"
+compare_plugin wordcoverage '{"wordCount":300}' "fractional coverage matches"
+compare_plugin wordcoverage '{"wordCount":200,"maxWords":"50"}' "integral coverage matches"
+compare_plugin wordcoverage '{"wordCount":40}' "full coverage matches"
+compare_plugin wordcoverage '{"wordCount":"abc"}' "invalid wordCount skip matches"
+compare_plugin stat "{\"filePath\":\"$INPUT/a.txt\"}" "file statistics match"
+compare_plugin stat '{"filePath":"/etc/passwd"}' "restricted path error matches"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
@@ -0,0 +1,160 @@
+#!/bin/bash
+# Test suite for FEATURE_0057: Concurrent plugins within a document
+# Verifies that plugins of one dependency level run concurrently, that
+# dependent plugins see the outputs of earlier levels, that the merged JSON
+# keeps the serial (topological) order, and that the MIME gate still runs
+# before any other plugin.
+# Run from repository root: bash tests/test_feature_0057.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+PROCESS_ENGINE="$COMPONENTS_DIR/process_engine.py"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+cleanup() {
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" needle="$2" haystack="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$haystack" == *"$needle"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $needle"
+    echo "    Actual: $haystack"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0057: Concurrent plugins per document"
+echo "============================================"
+echo ""
+
+TMPDIR_TEST=$(mktemp -d)
+INPUT="$TMPDIR_TEST/input"
+PLUGINS="$TMPDIR_TEST/plugins"
+MARKS="$TMPDIR_TEST/marks"
+TEMPLATE="$TMPDIR_TEST/template.md"
+mkdir -p "$INPUT" "$MARKS"
+echo "{{fileName}}" > "$TEMPLATE"
+echo "hello" > "$INPUT/doc.txt"
+
+# make_plugin <name> <inputs-json> <outputs-json> <script body>
+make_plugin() {
+  mkdir -p "$PLUGINS/$1"
+  jq -n --arg n "$1" --argjson in "$2" --argjson out "$3" \
+    '{name: $n, version: "1.0.0", active: true,
+      commands: {process: {command: "main.sh", input: $in, output: $out}}}' \
+    > "$PLUGINS/$1/descriptor.json"
+  printf '#!/bin/bash\n%s\n' "$4" > "$PLUGINS/$1/main.sh"
+  chmod +x "$PLUGINS/$1/main.sh"
+}
+
+# alpha and beta have no dependencies: each marks its start and waits (up to
+# 5s) for the other, so they only both report "true" when run concurrently.
+# waiting_script <self> <other> <output field>
+waiting_script() {
+  cat <<SH
+touch "$MARKS/$1.started"
+for _ in \$(seq 50); do [ -e "$MARKS/$2.started" ] && break; sleep 0.1; done
+seen=false; [ -e "$MARKS/$2.started" ] && seen=true
+jq -cn --argjson s "\$seen" '{$3: \$s}'
+SH
+}
+make_plugin file '{"filePath":{}}' '{"mimeType":{}}' "echo '{\"mimeType\":\"text/plain\"}'"
+make_plugin alpha '{"filePath":{}}' '{"alphaSawBeta":{}}' "$(waiting_script alpha beta alphaSawBeta)"
+make_plugin beta '{"filePath":{}}' '{"betaSawAlpha":{}}' "$(waiting_script beta alpha betaSawAlpha)"
+make_plugin gamma '{"filePath":{},"alphaSawBeta":{}}' '{"gammaInput":{}}' \
+  'jq -c "{gammaInput: (.alphaSawBeta != null)}"'
+
+run_engine() {
+  rm -f "$MARKS"/*
+  find "$INPUT" -type f | python3 "$PROCESS_ENGINE" --plugin-dir "$PLUGINS" \
+    --input-dir "$INPUT" --template "$TEMPLATE" --jobs 1 "$@"
+}
+
+# =========================================
+# Group 1: dependency levels
+# =========================================
+echo "--- Group 1: dependency levels ---"
+
+levels=$(python3 -c "
+import json, sys
+sys.path.insert(0, '$COMPONENTS_DIR')
+import plugin_info
+print(json.dumps(plugin_info.dependency_levels('$PLUGINS', ['file', 'alpha', 'beta', 'gamma'])))")
+assert_eq "independent plugins share a level" '[["file", "alpha", "beta"], ["gamma"]]' "$levels"
+
+levels=$(python3 -c "
+import json, sys
+sys.path.insert(0, '$COMPONENTS_DIR')
+import plugin_info
+print(json.dumps(plugin_info.dependency_levels('$BUILTIN_PLUGIN_DIR',
+    ['file', 'stat', 'markitdown', 'ocrmypdf', 'langid', 'wc', 'wordcoverage'])))")
+assert_eq "built-in plugins are grouped by inputs/outputs" \
+  '[["file", "stat"], ["markitdown", "ocrmypdf"], ["langid", "wc"], ["wordcoverage"]]' "$levels"
+
+# =========================================
+# Group 2: concurrent execution
+# =========================================
+echo ""
+echo "--- Group 2: concurrent execution ---"
+
+result=$(run_engine file alpha beta gamma 2>/dev/null)
+assert_eq "plugins of one level run concurrently" "true true" \
+  "$(echo "$result" | jq -r '.[0] | "\(.alphaSawBeta) \(.betaSawAlpha)"')"
+assert_eq "dependent plugin sees the earlier level's output" "true" \
+  "$(echo "$result" | jq -r '.[0].gammaInput')"
+assert_eq "outputs are merged in plugin list order" \
+  "filePath mimeType alphaSawBeta betaSawAlpha gammaInput" \
+  "$(echo "$result" | jq -r '.[0] | keys_unsorted | join(" ")')"
+
+# =========================================
+# Group 3: MIME gate
+# =========================================
+echo ""
+echo "--- Group 3: MIME gate ---"
+
+result=$(run_engine --mime-include "application/pdf" file alpha 2>/dev/null)
+assert_eq "rejected document is not emitted" "[]" "$(echo "$result" | jq -c '.')"
+assert_eq "no plugin runs before the gate" "false" \
+  "$([ -e "$MARKS/alpha.started" ] && echo true || echo false)"
+
+result=$(run_engine --mime-include "text/plain" file gamma 2>/dev/null)
+assert_eq "accepted document runs the remaining plugins" "false" \
+  "$(echo "$result" | jq -r '.[0].gammaInput')"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
@@ -0,0 +1,130 @@
+#!/bin/bash
+# Test suite for FEATURE_0058: Projected plugin input
+# Verifies that both engines pass each plugin only its declared input keys
+# (plus filePath and pluginStorage), and that descriptors without inputs or
+# with "fullContext": true still receive the whole accumulated context.
+# Run from repository root: bash tests/test_feature_0058.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+PROCESS_ENGINE="$COMPONENTS_DIR/process_engine.py"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+cleanup() {
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" needle="$2" haystack="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$haystack" == *"$needle"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $needle"
+    echo "    Actual: $haystack"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0058: Projected plugin input"
+echo "============================================"
+echo ""
+
+TMPDIR_TEST=$(mktemp -d)
+INPUT="$TMPDIR_TEST/input"
+OUTPUT="$TMPDIR_TEST/output"
+PLUGINS="$TMPDIR_TEST/plugins"
+TEMPLATE="$TMPDIR_TEST/template.md"
+mkdir -p "$INPUT" "$OUTPUT"
+echo "{{fileName}}" > "$TEMPLATE"
+echo "hello" > "$INPUT/doc.txt"
+
+# make_plugin <name> <process-json> <script body>
+make_plugin() {
+  mkdir -p "$PLUGINS/$1"
+  jq -n --arg n "$1" --argjson p "$2" \
+    '{name: $n, version: "1.0.0", active: true, commands: {process: ({command: "main.sh"} + $p)}}' \
+    > "$PLUGINS/$1/descriptor.json"
+  printf '#!/bin/bash\n%s\n' "$3" > "$PLUGINS/$1/main.sh"
+  chmod +x "$PLUGINS/$1/main.sh"
+}
+
+make_plugin produce '{"input": {"filePath": {}}, "output": {"big": {}, "small": {}}}' \
+  "jq -c '{big: (\"x\" * 2000000), small: \"s\"}'"
+make_plugin narrow '{"input": {"filePath": {}, "small": {}}, "output": {"narrowSeen": {}}}' \
+  "jq -c '{narrowSeen: (keys | join(\" \"))}'"
+make_plugin noinput '{"output": {"noinputSeen": {}}}' \
+  "jq -c '{noinputSeen: (keys | join(\" \"))}'"
+make_plugin full '{"fullContext": true, "input": {"small": {}}, "output": {"fullSeen": {}}}' \
+  "jq -c '{fullSeen: (keys | join(\" \"))}'"
+
+# =========================================
+# Group 1: python engine
+# =========================================
+echo "--- Group 1: python engine ---"
+
+result=$(find "$INPUT" -type f | python3 "$PROCESS_ENGINE" --plugin-dir "$PLUGINS" \
+  --input-dir "$INPUT" --output-dir "$OUTPUT" --template "$TEMPLATE" --jobs 1 \
+  produce narrow noinput full 2> "$TMPDIR_TEST/engine.stderr")
+assert_eq "declared inputs only (plus filePath, pluginStorage)" "filePath pluginStorage small" \
+  "$(echo "$result" | jq -r '.[0].narrowSeen')"
+assert_eq "a plugin without inputs gets the full context (after all earlier plugins)" "big filePath narrowSeen pluginStorage small" \
+  "$(echo "$result" | jq -r '.[0].noinputSeen')"
+assert_eq "fullContext opts out of the projection" \
+  "big filePath narrowSeen noinputSeen pluginStorage small" \
+  "$(echo "$result" | jq -r '.[0].fullSeen')"
+assert_eq "large upstream fields do not break downstream plugins" "" \
+  "$(grep "Plugin 'narrow'" "$TMPDIR_TEST/engine.stderr")"
+
+# =========================================
+# Group 2: bash engine (run_plugin)
+# =========================================
+echo ""
+echo "--- Group 2: bash engine ---"
+
+log_error() { echo "Error: $*" >&2; }
+# shellcheck source=/dev/null
+source "$COMPONENTS_DIR/plugin_execution.sh"
+CONTEXT='{"filePath":"'"$INPUT/doc.txt"'","big":"b","small":"s","other":1}'
+
+assert_eq "run_plugin passes declared inputs only" "filePath small" \
+  "$(run_plugin narrow "$INPUT/doc.txt" "$PLUGINS" "" "$CONTEXT" | jq -r '.narrowSeen')"
+assert_eq "run_plugin keeps pluginStorage" "filePath pluginStorage small" \
+  "$(run_plugin narrow "$INPUT/doc.txt" "$PLUGINS" "$OUTPUT" "$CONTEXT" | jq -r '.narrowSeen')"
+assert_eq "run_plugin passes the full context without inputs" "big filePath other small" \
+  "$(run_plugin noinput "$INPUT/doc.txt" "$PLUGINS" "" "$CONTEXT" | jq -r '.noinputSeen')"
+assert_eq "run_plugin honours fullContext" "big filePath other small" \
+  "$(run_plugin full "$INPUT/doc.txt" "$PLUGINS" "" "$CONTEXT" | jq -r '.fullSeen')"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
@@ -0,0 +1,202 @@
+#!/bin/bash
+# Test suite for FEATURE_0059: Out-of-band text blobs
+# Verifies that the python engine spills large plugin output strings to blob
+# files, hands them to plugins declaring "<field>File" as a path, inlines them
+# for everything else (plugins, stdout JSON, templates) and removes the blob
+# files after the run; and that plugin_get_text/get_text read such references
+# only inside the engine's blob directory.
+# Run from repository root: bash tests/test_feature_0059.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+PROCESS_ENGINE="$COMPONENTS_DIR/process_engine.py"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+cleanup() {
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" needle="$2" haystack="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$haystack" == *"$needle"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $needle"
+    echo "    Actual: $haystack"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0059: Out-of-band text blobs"
+echo "============================================"
+echo ""
+
+TMPDIR_TEST=$(mktemp -d)
+INPUT="$TMPDIR_TEST/input"
+OUTPUT="$TMPDIR_TEST/output"
+PLUGINS="$TMPDIR_TEST/plugins"
+TEMPLATE="$TMPDIR_TEST/template.md"
+BLOB_TMP="$TMPDIR_TEST/tmp"
+mkdir -p "$INPUT" "$OUTPUT" "$BLOB_TMP"
+echo "{{big}}" > "$TEMPLATE"
+echo "hello" > "$INPUT/doc.txt"
+
+# make_plugin <name> <process-json> <script body>
+make_plugin() {
+  mkdir -p "$PLUGINS/$1"
+  jq -n --arg n "$1" --argjson p "$2" \
+    '{name: $n, version: "1.0.0", active: true, commands: {process: ({command: "main.sh"} + $p)}}' \
+    > "$PLUGINS/$1/descriptor.json"
+  printf '#!/bin/bash\n%s\n' "$3" > "$PLUGINS/$1/main.sh"
+  chmod +x "$PLUGINS/$1/main.sh"
+}
+
+make_plugin produce '{"input": {"filePath": {}}, "output": {"big": {}, "small": {}}}' \
+  "jq -c '{big: (\"ab\" * 1500), small: \"s\"}'"
+make_plugin byfile '{"input": {"filePath": {}, "bigFile": {}}, "output": {"fileSeen": {}, "fileLength": {}}}' \
+  "input=\$(cat)
+ref=\$(echo \"\$input\" | jq -r '.bigFile // empty')
+echo \"\$ref\" > '$TMPDIR_TEST/ref'
+length=\$([ -n \"\$ref\" ] && wc -c < \"\$ref\" || echo 0)
+echo \"\$input\" | jq -c --argjson n \"\$length\" '{fileSeen: (keys | join(\" \")), fileLength: \$n}'"
+make_plugin inline '{"input": {"filePath": {}, "big": {}}, "output": {"inlineLength": {}}}' \
+  "jq -c '{inlineLength: (.big | length)}'"
+
+run_engine() {
+  find "$INPUT" -type f | TMPDIR="$BLOB_TMP" python3 "$PROCESS_ENGINE" \
+    --plugin-dir "$PLUGINS" --input-dir "$INPUT" --output-dir "$OUTPUT" \
+    --template "$TEMPLATE" --jobs 1 "$@" 2> "$TMPDIR_TEST/engine.stderr"
+}
+
+# =========================================
+# Group 1: spilled fields
+# =========================================
+echo "--- Group 1: spilled fields ---"
+
+result=$(run_engine --blob-threshold 1K produce byfile inline)
+assert_eq "a plugin declaring bigFile receives a path instead of the text" \
+  "bigFile filePath pluginStorage" "$(echo "$result" | jq -r '.[0].fileSeen')"
+assert_eq "the blob file holds the full text" "3000" \
+  "$(echo "$result" | jq -r '.[0].fileLength')"
+assert_eq "a plugin declaring big receives the inline text" "3000" \
+  "$(echo "$result" | jq -r '.[0].inlineLength')"
+assert_eq "stdout JSON contains the full text" "3000" \
+  "$(echo "$result" | jq -r '.[0].big | length')"
+assert_eq "the template renders the full text" "3000" \
+  "$(tr -d '\n' < "$OUTPUT/doc.txt.md" | wc -c)"
+assert_eq "blob files are removed after the run" "no" \
+  "$([ -e "$(cat "$TMPDIR_TEST/ref")" ] && echo yes || echo no)"
+assert_eq "the blob directory is removed after the run" "" \
+  "$(find "$BLOB_TMP" -name 'doc.doc.md-blobs-*')"
+
+# =========================================
+# Group 2: threshold
+# =========================================
+echo ""
+echo "--- Group 2: threshold ---"
+
+result=$(run_engine --blob-threshold 0 produce byfile inline)
+assert_eq "--blob-threshold 0 keeps text inline" "big filePath pluginStorage" \
+  "$(echo "$result" | jq -r '.[0].fileSeen')"
+result=$(run_engine produce byfile inline)
+assert_eq "text below the default threshold stays inline" "big filePath pluginStorage" \
+  "$(echo "$result" | jq -r '.[0].fileSeen')"
+assert_eq "small fields are never spilled" "s" "$(echo "$result" | jq -r '.[0].small')"
+
+# =========================================
+# Group 3: text beyond the 1MB stdin limit (wc plugin)
+# =========================================
+echo ""
+echo "--- Group 3: text beyond the 1MB stdin limit ---"
+
+TREE="$TMPDIR_TEST/tree"
+cp -r "$REPO_ROOT/doc.doc.md" "$TREE"
+mkdir -p "$TREE/plugins/bigtext"
+jq -n '{name: "bigtext", version: "1.0.0", active: true,
+  commands: {process: {command: "main.sh", input: {filePath: {}},
+  output: {documentText: {}}}}}' > "$TREE/plugins/bigtext/descriptor.json"
+printf '#!/bin/bash\njq -c %s\n' "'{documentText: (\"word \" * 400000)}'" \
+  > "$TREE/plugins/bigtext/main.sh"
+chmod +x "$TREE/plugins/bigtext/main.sh"
+
+echo "{{wordCount}}" > "$TEMPLATE"
+result=$(find "$INPUT" -type f | TMPDIR="$BLOB_TMP" python3 "$TREE/components/process_engine.py" \
+  --plugin-dir "$TREE/plugins" --input-dir "$INPUT" --template "$TEMPLATE" \
+  --jobs 1 --echo bigtext wc 2> "$TMPDIR_TEST/engine.stderr")
+assert_contains "wc counts a 2MB documentText passed out-of-band" "400000" "$result"
+
+# =========================================
+# Group 4: plugin_get_text / get_text
+# =========================================
+echo ""
+echo "--- Group 4: plugin_get_text / get_text ---"
+
+BLOBS="$TMPDIR_TEST/blobs"
+mkdir -p "$BLOBS"
+printf 'from file\n' > "$BLOBS/text.txt"
+printf 'secret\n' > "$TMPDIR_TEST/secret.txt"
+ln -s "$TMPDIR_TEST/secret.txt" "$BLOBS/link.txt"
+get_text_sh() {
+  DOC_DOC_MD_BLOB_DIR="$BLOBS" bash -c \
+    'source "$1/plugin_input.sh"; PLUGIN_INPUT_JSON=$2; plugin_get_text "$3"' \
+    _ "$COMPONENTS_DIR" "$1" "$2"
+}
+get_text_py() {
+  DOC_DOC_MD_BLOB_DIR="$BLOBS" python3 -c 'import json, sys; sys.path.insert(0, sys.argv[1])
+from plugin_api import get_text
+print(get_text(json.loads(sys.argv[2]), sys.argv[3]), end="")' "$COMPONENTS_DIR" "$1" "$2"
+}
+
+for impl in sh py; do
+  assert_eq "$impl: reads <field>File in the blob directory" "from file" \
+    "$(get_text_$impl '{"textFile":"'"$BLOBS/text.txt"'","text":"inline"}' text)"
+  assert_eq "$impl: falls back to the inline field" "inline" \
+    "$(get_text_$impl '{"text":"inline"}' text)"
+  assert_eq "$impl: rejects restricted paths" "inline" \
+    "$(get_text_$impl '{"textFile":"/etc/passwd","text":"inline"}' text)"
+  assert_eq "$impl: ignores missing files" "inline" \
+    "$(get_text_$impl '{"textFile":"'"$BLOBS/missing"'","text":"inline"}' text)"
+  assert_eq "$impl: ignores files outside the blob directory" "inline" \
+    "$(get_text_$impl '{"textFile":"'"$TMPDIR_TEST/secret.txt"'","text":"inline"}' text)"
+  assert_eq "$impl: ignores references escaping it" "inline" \
+    "$(get_text_$impl '{"textFile":"'"$BLOBS/../secret.txt"'","text":"inline"}' text)"
+  assert_eq "$impl: ignores symlinks leading out of it" "inline" \
+    "$(get_text_$impl '{"textFile":"'"$BLOBS/link.txt"'","text":"inline"}' text)"
+done
+assert_eq "without a blob directory references are ignored" "inline" \
+  "$(bash -c 'unset DOC_DOC_MD_BLOB_DIR; source "$1/plugin_input.sh"; PLUGIN_INPUT_JSON=$2; plugin_get_text text' \
+    _ "$COMPONENTS_DIR" '{"textFile":"'"$BLOBS/text.txt"'","text":"inline"}')"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
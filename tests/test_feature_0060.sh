@@ -0,0 +1,186 @@
+#!/bin/bash
+# Test suite for FEATURE_0060: Batched MIME detection
+# Verifies that mime_detect.py agrees with `file --mime-type -b`, that
+# filter.py and the python engine's file plugin classify many paths per
+# `file` process (one coprocess per run instead of one process per path),
+# and that each path is classified once even with several MIME criteria.
+# Run from repository root: bash tests/test_feature_0060.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+FILTER_PY="$COMPONENTS_DIR/filter.py"
+PROCESS_ENGINE="$COMPONENTS_DIR/process_engine.py"
+PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+cleanup() {
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" needle="$2" haystack="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$haystack" == *"$needle"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $needle"
+    echo "    Actual: $haystack"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0060: Batched MIME detection"
+echo "============================================"
+echo ""
+
+TMPDIR_TEST=$(mktemp -d)
+INPUT="$TMPDIR_TEST/input"
+BIN="$TMPDIR_TEST/bin"
+CALLS="$TMPDIR_TEST/file_calls"
+mkdir -p "$INPUT" "$BIN"
+
+for i in $(seq 1 40); do echo "text $i" > "$INPUT/doc$i.txt"; done
+for i in $(seq 1 10); do echo '{"n": '"$i"'}' > "$INPUT/data$i.json"; done
+printf '%%PDF-1.4\n' > "$INPUT/report.pdf"
+echo "odd name" > "$INPUT/line
+break.txt"
+
+# `file` wrapper that records each invocation
+REAL_FILE=$(command -v file)
+printf '#!/bin/bash\necho x >> %q\nexec %q "$@"\n' "$CALLS" "$REAL_FILE" > "$BIN/file"
+chmod +x "$BIN/file"
+file_calls() { [ -f "$CALLS" ] && wc -l < "$CALLS" | tr -d ' ' || echo 0; }
+
+# Libmagic bindings bypass `file` altogether
+HAS_MAGIC=false
+python3 -c 'import magic' 2>/dev/null && HAS_MAGIC=true
+
+# =========================================
+# Group 1: mime_detect.py
+# =========================================
+echo "--- Group 1: mime_detect ---"
+
+detect() {
+  python3 -c 'import sys; sys.path.insert(0, sys.argv[1])
+import mime_detect
+d = mime_detect.MimeDetector()
+for path, mime in d.detect_many(sys.argv[2:]).items():
+    print(mime)' "$COMPONENTS_DIR" "$@"
+}
+
+expected=$(for f in "$INPUT/doc1.txt" "$INPUT/data1.json" "$INPUT/report.pdf"; do
+  file --mime-type -b "$f"; done)
+assert_eq "detect_many agrees with file --mime-type -b" "$expected" \
+  "$(detect "$INPUT/doc1.txt" "$INPUT/data1.json" "$INPUT/report.pdf")"
+assert_eq "unreadable paths yield an empty type" "" "$(detect "$INPUT/missing.txt")"
+assert_eq "paths containing a newline are classified" "text/plain" \
+  "$(detect "$INPUT/line
+break.txt")"
+
+rm -f "$CALLS"
+PATH="$BIN:$PATH" detect "$INPUT"/doc*.txt "$INPUT"/data*.json > /dev/null
+if [ "$HAS_MAGIC" = true ]; then
+  assert_eq "50 paths need no file process (libmagic bindings)" "0" "$(file_calls)"
+else
+  assert_eq "50 paths are classified by one file process" "1" "$(file_calls)"
+fi
+
+# =========================================
+# Group 2: filter.py
+# =========================================
+echo ""
+echo "--- Group 2: filter.py ---"
+
+rm -f "$CALLS"
+result=$(find "$INPUT" -type f | PATH="$BIN:$PATH" python3 "$FILTER_PY" \
+  --include "application/json" | wc -l | tr -d ' ')
+assert_eq "MIME include selects the JSON files" "10" "$result"
+if [ "$HAS_MAGIC" = false ]; then
+  assert_eq "filter.py starts one file process for the whole tree" "1" "$(file_calls)"
+fi
+
+rm -f "$CALLS"
+result=$(find "$INPUT" -type f | PATH="$BIN:$PATH" python3 "$FILTER_PY" \
+  --include "text/*,application/json" --exclude "application/json" \
+  --exclude ".json" | sort)
+assert_eq "include and exclude MIME criteria combine as before" "40" \
+  "$(echo "$result" | grep -c 'doc[0-9]*\.txt$')"
+if [ "$HAS_MAGIC" = false ]; then
+  assert_eq "several MIME criteria still classify each file once" "1" "$(file_calls)"
+fi
+
+assert_eq "MIME type strings are still matched directly (MIME gate)" "text/plain" \
+  "$(echo "text/plain" | python3 "$FILTER_PY" --include "text/*")"
+
+rm -f "$CALLS"
+find "$INPUT" -type f | PATH="$BIN:$PATH" python3 "$FILTER_PY" --include ".txt" > /dev/null
+assert_eq "path-only criteria never run file" "0" "$(file_calls)"
+
+if [ "$HAS_MAGIC" = false ]; then
+  mkdir -p "$TMPDIR_TEST/nofile"
+  # PATH is emptied inside the interpreter (python3 itself may be a wrapper)
+  err=$(echo "$INPUT/doc1.txt" | python3 -c 'import os, runpy, sys
+os.environ["PATH"] = sys.argv[1]
+sys.path.insert(0, os.path.dirname(sys.argv[2]))
+sys.argv = sys.argv[2:]
+runpy.run_path(sys.argv[0], run_name="__main__")' \
+    "$TMPDIR_TEST/nofile" "$FILTER_PY" --include "text/plain" 2>&1 >/dev/null)
+  assert_contains "a missing file command is reported" "'file' command not found" "$err"
+fi
+
+# =========================================
+# Group 3: file plugin
+# =========================================
+echo ""
+echo "--- Group 3: file plugin ---"
+
+entry=$(python3 -c 'import json, sys; sys.path.insert(0, sys.argv[1])
+import main
+print(main.process({"filePath": sys.argv[2]})["mimeType"])' \
+  "$PLUGIN_DIR/file" "$INPUT/data1.json")
+script=$(jq -n --arg f "$INPUT/data1.json" '{filePath: $f}' | bash "$PLUGIN_DIR/file/main.sh" | jq -r '.mimeType')
+assert_eq "entry point and main.sh agree" "$script" "$entry"
+
+echo "{{mimeType}}" > "$TMPDIR_TEST/template.md"
+rm -f "$CALLS"
+result=$(find "$INPUT" -type f -name 'doc*' | PATH="$BIN:$PATH" python3 "$PROCESS_ENGINE" \
+  --plugin-dir "$PLUGIN_DIR" --input-dir "$INPUT" --template "$TMPDIR_TEST/template.md" \
+  --jobs 4 --mime-include "text/plain" file 2> /dev/null)
+assert_eq "python engine: all documents get a mimeType" "40" \
+  "$(echo "$result" | jq '[.[] | select(.mimeType == "text/plain")] | length')"
+if [ "$HAS_MAGIC" = false ]; then
+  assert_eq "python engine: one file process for 40 documents" "1" "$(file_calls)"
+fi
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
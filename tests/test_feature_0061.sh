@@ -0,0 +1,177 @@
+#!/bin/bash
+# Test suite for FEATURE_0061: Compiled filter plans
+# Verifies that filter.py compiles its criteria once into a FilterPlan with
+# unchanged include/exclude results, '**' matching zero or more directories,
+# MIME detection only for paths the path criteria leave undecided, and a
+# --explain mode that prints the compiled plan.
+# Run from repository root: bash tests/test_feature_0061.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+FILTER_PY="$COMPONENTS_DIR/filter.py"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+cleanup() {
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" needle="$2" haystack="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$haystack" == *"$needle"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $needle"
+    echo "    Actual: $haystack"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+filter() { python3 "$FILTER_PY" "$@" | tr '\n' ' ' | sed 's/ $//'; }
+
+echo "============================================"
+echo "  FEATURE_0061: Compiled filter plans"
+echo "============================================"
+echo ""
+
+TMPDIR_TEST=$(mktemp -d)
+
+# =========================================
+# Group 1: results match fnmatch semantics
+# =========================================
+echo "--- Group 1: fnmatch equivalence ---"
+
+result=$(python3 - "$COMPONENTS_DIR" <<'PY'
+import fnmatch, random, sys
+sys.path.insert(0, sys.argv[1])
+import filter as filter_engine
+random.seed(61)
+mismatches = 0
+for _ in range(20000):
+    pattern = "".join(random.choice("ab/.*?[]!-x") for _ in range(random.randint(1, 6)))
+    if "**" in pattern or filter_engine._is_mime_criterion(pattern) or pattern.startswith("."):
+        continue
+    path = "".join(random.choice("ab/.x-]![") for _ in range(random.randint(0, 8)))
+    if fnmatch.fnmatch(path, pattern) != filter_engine.matches_criterion(path, pattern):
+        mismatches += 1
+print(mismatches)
+PY
+)
+assert_eq "compiled globs agree with fnmatch" "0" "$result"
+
+PATHS=$'/p/a.txt\n/p/b.pdf\n/p/c.log\n/p/2024/d.txt\n/p/temp/e.txt\n/p/x.tar.gz'
+assert_eq "extensions are OR-ed" "/p/a.txt /p/b.pdf /p/2024/d.txt /p/temp/e.txt" \
+  "$(echo "$PATHS" | filter --include " .txt , .pdf ")"
+assert_eq "multi-part extensions" "/p/x.tar.gz" "$(echo "$PATHS" | filter --include ".tar.gz")"
+assert_eq "parameters are AND-ed" "/p/2024/d.txt" \
+  "$(echo "$PATHS" | filter --include ".txt" --include "**/2024/**")"
+assert_eq "exclude parameters are AND-ed" "/p/a.txt /p/b.pdf /p/c.log /p/2024/d.txt /p/x.tar.gz" \
+  "$(echo "$PATHS" | filter --exclude ".txt,.log" --exclude "**/temp/**")"
+assert_eq "an empty parameter never matches" "" "$(echo "$PATHS" | filter --include ",")"
+
+# =========================================
+# Group 2: '**' semantics
+# =========================================
+echo ""
+echo "--- Group 2: ** semantics ---"
+
+assert_eq "'**/' matches no directory" "2024/a.txt" \
+  "$(printf '2024/a.txt\nx2024/a.txt\n' | filter --include "**/2024/**")"
+assert_eq "trailing '/**' only matches below the directory" "/p/2024/a" \
+  "$(printf '/p/2024\n/p/2024/a\n/p/2025\n' | filter --include "**/2024/**")"
+assert_eq "'**/build/**' keeps a file named build" "a/build" \
+  "$(printf 'a/build\nbuild/f\n' | filter --exclude "**/build/**")"
+mkdir -p "$TMPDIR_TEST/walk/a" "$TMPDIR_TEST/walk/build"
+touch "$TMPDIR_TEST/walk/a/build" "$TMPDIR_TEST/walk/build/f"
+assert_eq "the walk prunes build/ but keeps the file a/build" "$TMPDIR_TEST/walk/a/build" \
+  "$(python3 "$FILTER_PY" --walk "$TMPDIR_TEST/walk" --exclude "**/build/**")"
+assert_eq "'a/**/b' matches a/b" "/a/b /a/x/y/b" \
+  "$(printf '/a/b\n/a/x/y/b\n/a/bc\n' | filter --include "/a/**/b")"
+assert_eq "'**/' inside a segment still needs the '/'" "/p/a/b /p/ax/b" \
+  "$(printf '/p/ab\n/p/a/b\n/p/ax/b\n' | filter --include "/p/a**/b")"
+assert_eq "'*' still matches across directories" "/p/2024/d.txt" \
+  "$(echo "$PATHS" | filter --include "*/2024/*")"
+
+# =========================================
+# Group 3: MIME stage
+# =========================================
+echo ""
+echo "--- Group 3: MIME stage ---"
+
+INPUT="$TMPDIR_TEST/input"
+BIN="$TMPDIR_TEST/bin"
+CLASSIFIED="$TMPDIR_TEST/classified"
+mkdir -p "$INPUT" "$BIN"
+for i in $(seq 1 20); do echo "text $i" > "$INPUT/doc$i.txt"; done
+for i in $(seq 1 5); do echo '{"n": 1}' > "$INPUT/data$i.json"; done
+# `file` wrapper that records every path it is asked to classify
+printf '#!/bin/bash\nif [ "$*" = "-n -b --mime-type -f -" ]; then tee -a %q | %q "$@"; else echo "$@" >> %q; exec %q "$@"; fi\n' \
+  "$CLASSIFIED" "$(command -v file)" "$CLASSIFIED" "$(command -v file)" > "$BIN/file"
+chmod +x "$BIN/file"
+
+if python3 -c 'import magic' 2>/dev/null; then
+  echo "  (libmagic bindings installed: classification count not observable)"
+else
+  result=$(find "$INPUT" -type f | PATH="$BIN:$PATH" python3 "$FILTER_PY" \
+    --include ".json" --include "application/json" | wc -l | tr -d ' ')
+  assert_eq "path and MIME criteria combine" "5" "$result"
+  assert_eq "only paths passing the path stage are classified" "5" \
+    "$(wc -l < "$CLASSIFIED" | tr -d ' ')"
+
+  rm -f "$CLASSIFIED"
+  result=$(find "$INPUT" -type f | PATH="$BIN:$PATH" python3 "$FILTER_PY" \
+    --exclude ".txt" --exclude "text/*" | wc -l | tr -d ' ')
+  assert_eq "MIME exclude with path criteria" "5" "$result"
+  assert_eq "paths the path stage already decides are not classified" "20" \
+    "$(wc -l < "$CLASSIFIED" | tr -d ' ')"
+fi
+
+assert_eq "MIME gate strings still match directly" "image/png" \
+  "$(echo "image/png" | filter --include "image/*" --exclude "image/jpeg")"
+
+# =========================================
+# Group 4: --explain
+# =========================================
+echo ""
+echo "--- Group 4: --explain ---"
+
+explain=$(python3 "$FILTER_PY" --include ".txt,.md" --include "**/2024/**,text/*" \
+  --exclude "image/*" --explain < /dev/null)
+assert_contains "explain lists the extension lookup" "extensions (suffix): .txt .md" "$explain"
+assert_contains "explain shows the combined glob regex" "(?:.*/)?2024/.*" "$explain"
+assert_contains "explain routes MIME criteria to stage 2" "MIME (stage 2): text/*" "$explain"
+assert_contains "explain reports MIME detection" "MIME detection: batched" "$explain"
+assert_contains "explain without MIME criteria" "MIME detection: not needed" \
+  "$(python3 "$FILTER_PY" --include ".txt" --explain)"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
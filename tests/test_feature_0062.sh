@@ -0,0 +1,205 @@
+#!/bin/bash
+# Test suite for FEATURE_0062: Directory walker with subtree pruning
+# Verifies that filter.py --walk lists the same files in the same order as
+# `find -type f | filter.py`, never opens directories whose whole subtree is
+# excluded, supports --follow-symlinks / --one-file-system, and that the
+# process command discovers documents through it.
+# Run from repository root: bash tests/test_feature_0062.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+FILTER_PY="$COMPONENTS_DIR/filter.py"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" needle="$2" haystack="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$haystack" == *"$needle"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $needle"
+    echo "    Actual: $haystack"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0062: Directory walker with subtree pruning"
+echo "============================================"
+echo ""
+
+TMPDIR_TEST=$(mktemp -d)
+TREE="$TMPDIR_TEST/tree"
+mkdir -p "$TREE/docs/2024" "$TREE/docs/temp" "$TREE/.git/objects" \
+  "$TREE/node_modules/pkg/lib" "$TREE/outside"
+for d in docs docs/2024 docs/temp .git/objects node_modules/pkg/lib; do
+  for n in a.txt b.log c.md; do echo "$d $n" > "$TREE/$d/$n"; done
+done
+echo "top" > "$TREE/top.txt"
+echo "target" > "$TMPDIR_TEST/target.txt"
+ln -s "$TMPDIR_TEST/target.txt" "$TREE/link.txt"
+mkdir -p "$TMPDIR_TEST/linked/sub"
+echo "linked" > "$TMPDIR_TEST/linked/sub/l.txt"
+ln -s "$TMPDIR_TEST/linked" "$TREE/linkdir"
+ln -s "$TREE" "$TREE/docs/loop"
+
+# opened_dirs <filter.py args...>: directories os.scandir() opens during --walk
+opened_dirs() {
+  python3 - "$COMPONENTS_DIR" "$@" <<'PY'
+import os, sys
+sys.path.insert(0, sys.argv[1])
+import filter as filter_engine
+opened = []
+real_scandir = os.scandir
+def scandir(path):
+    opened.append(path)
+    return real_scandir(path)
+os.scandir = scandir
+args = sys.argv[2:]
+root = args[args.index("--walk") + 1]
+include = [args[i + 1] for i, a in enumerate(args) if a == "--include"]
+exclude = [args[i + 1] for i, a in enumerate(args) if a == "--exclude"]
+plan = filter_engine.FilterPlan(include, exclude)
+list(filter_engine.walk(root, plan))
+print("\n".join(os.path.relpath(p, root) for p in opened))
+PY
+}
+
+# =========================================
+# Group 1: same result as find | filter.py
+# =========================================
+echo "--- Group 1: find equivalence ---"
+
+for args in "" "--include .txt" "--exclude **/node_modules/**" \
+    "--exclude **/.git/**,**/node_modules/** --include .txt,.md" \
+    "--exclude **/temp/** --exclude .log"; do
+  # shellcheck disable=SC2086
+  expected=$(find "$TREE" -type f | python3 "$FILTER_PY" $args)
+  # shellcheck disable=SC2086
+  actual=$(python3 "$FILTER_PY" --walk "$TREE" $args)
+  assert_eq "walk equals find | filter.py (${args:-no criteria})" "$expected" "$actual"
+done
+assert_eq "a trailing slash on the root is ignored" \
+  "$(find "$TREE" -type f)" "$(python3 "$FILTER_PY" --walk "$TREE/")"
+
+# =========================================
+# Group 2: subtree pruning
+# =========================================
+echo ""
+echo "--- Group 2: subtree pruning ---"
+
+opened=$(opened_dirs --walk "$TREE" --exclude "**/node_modules/**,**/.git/**")
+assert_eq "excluded subtrees are never opened" "" \
+  "$(echo "$opened" | grep -E 'node_modules|\.git')"
+assert_contains "other directories are still opened" "docs/2024" "$opened"
+
+opened=$(opened_dirs --walk "$TREE" --exclude "**/docs*")
+assert_eq "a pattern ending in '*' prunes matching directories" "" \
+  "$(echo "$opened" | grep '^docs')"
+
+opened=$(opened_dirs --walk "$TREE" --exclude "**/temp/**" --exclude ".log")
+assert_contains "AND-ed excludes only prune when every parameter covers the subtree" \
+  "docs/temp" "$opened"
+
+opened=$(opened_dirs --walk "$TREE" --exclude ".txt")
+assert_contains "extension excludes never prune" "node_modules/pkg/lib" "$opened"
+
+explain=$(python3 "$FILTER_PY" --exclude "**/node_modules/**" --explain)
+assert_contains "--explain reports pruning" "prunes subtrees: **/node_modules/**" "$explain"
+
+# =========================================
+# Group 3: symlinks and file systems
+# =========================================
+echo ""
+echo "--- Group 3: symlinks and file systems ---"
+
+plain=$(python3 "$FILTER_PY" --walk "$TREE")
+assert_eq "symlinks are not followed by default" "" \
+  "$(echo "$plain" | grep -E 'link\.txt|linkdir|loop')"
+
+followed=$(python3 "$FILTER_PY" --walk "$TREE" --follow-symlinks 2> "$TMPDIR_TEST/follow.err")
+assert_contains "--follow-symlinks lists symlinked files" "$TREE/link.txt" "$followed"
+assert_contains "--follow-symlinks descends into symlinked directories" \
+  "$TREE/linkdir/sub/l.txt" "$followed"
+assert_contains "loops are detected" "file system loop detected" "$(cat "$TMPDIR_TEST/follow.err")"
+assert_eq "--follow-symlinks matches find -L" "$(find -L "$TREE" -type f 2>/dev/null)" "$followed"
+
+assert_eq "--one-file-system on a single file system lists everything" \
+  "$(find "$TREE" -xdev -type f)" "$(python3 "$FILTER_PY" --walk "$TREE" --one-file-system)"
+if [ -d /dev/shm ] && [ -w /dev/shm ] && [ "$(stat -c %d /dev)" != "$(stat -c %d /dev/shm)" ]; then
+  SHM_FILE=$(mktemp /dev/shm/doc.doc.md-walk-XXXXXX)
+  assert_eq "--one-file-system skips other file systems" "" \
+    "$(python3 "$FILTER_PY" --walk /dev --one-file-system | grep -F "$SHM_FILE")"
+  rm -f "$SHM_FILE"
+fi
+
+# =========================================
+# Group 4: process command
+# =========================================
+echo ""
+echo "--- Group 4: process command ---"
+
+help_out=$(bash "$DOC_DOC_SH" process --help 2>&1)
+assert_contains "help documents --follow-symlinks" "--follow-symlinks" "$help_out"
+assert_contains "help documents --one-file-system" "--one-file-system" "$help_out"
+
+echo "{{fileName}}" > "$TMPDIR_TEST/template.md"
+echo_out=$(bash "$DOC_DOC_SH" process -d "$TREE" --echo --no-progress --engine python \
+  -t "$TMPDIR_TEST/template.md" -e "**/node_modules/**,**/.git/**" --follow-symlinks 2>/dev/null)
+assert_contains "process walks the input directory" "=== docs/2024/a.txt ===" "$echo_out"
+assert_eq "process skips excluded subtrees" "" "$(echo "$echo_out" | grep -E 'node_modules|\.git')"
+assert_contains "process follows symlinks on request" "l.txt" "$echo_out"
+
+echo_out=$(bash "$DOC_DOC_SH" process -d "$TREE" --echo --no-progress --engine bash \
+  -t "$TMPDIR_TEST/template.md" -e "**/node_modules/**,**/.git/**" 2>/dev/null)
+assert_contains "bash engine: process walks the input directory" "=== docs/2024/a.txt ===" "$echo_out"
+assert_eq "bash engine: excluded subtrees and symlinks are skipped" "" \
+  "$(echo "$echo_out" | grep -E 'node_modules|\.git|l\.txt')"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
@@ -0,0 +1,200 @@
+#!/bin/bash
+# Test suite for FEATURE_0063: Streaming file discovery
+# Verifies that discovered paths flow into processing through a bounded
+# queue (PathStream), that the first sidecar is written while discovery is
+# still running, that found/total progress grows with the scan, and that
+# both engines still produce the same output for normal and empty trees.
+# Run from repository root: bash tests/test_feature_0063.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+ENGINE_PY="$COMPONENTS_DIR/process_engine.py"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+ENGINE_PID=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  [ -n "$ENGINE_PID" ] && kill "$ENGINE_PID" 2>/dev/null
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$actual" == *"$expected"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $expected"
+    echo "    Actual: $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0063: Streaming File Discovery"
+echo "============================================"
+
+TMPDIR_TEST="$(mktemp -d)"
+TREE="$TMPDIR_TEST/tree"
+mkdir -p "$TREE/a" "$TREE/b"
+echo "one" > "$TREE/a/one.txt"
+echo "two" > "$TREE/a/two.txt"
+echo "three" > "$TREE/b/three.txt"
+echo "{{fileName}}" > "$TMPDIR_TEST/template.md"
+
+# =========================================
+# Group 1: PathStream
+# =========================================
+echo ""
+echo "--- Group 1: PathStream ---"
+
+stream_out=$(python3 - "$COMPONENTS_DIR" <<'PYEOF'
+import os, sys, threading, time
+sys.path.insert(0, sys.argv[1])
+import process_engine as pe
+
+class Events:
+    def __init__(self):
+        self.seen = []
+    def progress(self, key, value):
+        self.seen.append((key, value))
+
+# Paths arrive one by one; each is yielded before the producer finishes
+r, w = os.pipe()
+reader, writer = os.fdopen(r, "r"), os.fdopen(w, "w", buffering=1)
+events = Events()
+stream = iter(pe.PathStream(reader, events))
+writer.write("/x/first\n")
+print("first", next(stream))
+writer.write("\n/x/second\n")
+print("second", next(stream))
+writer.close()
+print("rest", list(stream))
+print("found", events.seen[-2:])
+
+# The reader stops once the queue is full
+r, w = os.pipe()
+reader, writer = os.fdopen(r, "r"), os.fdopen(w, "w")
+stream = pe.PathStream(reader, Events(), maxsize=3)
+feeder = threading.Thread(
+    target=lambda: (writer.write("".join(f"/p/{i}\n" for i in range(50))), writer.close()),
+    daemon=True)
+feeder.start()
+time.sleep(0.5)
+print("bounded", stream.found <= 4)
+print("drained", len(list(stream)), stream.found)
+PYEOF
+)
+assert_contains "first path is yielded before the producer finishes" "first /x/first" "$stream_out"
+assert_contains "blank lines are skipped" "second /x/second" "$stream_out"
+assert_contains "stream ends at EOF" "rest []" "$stream_out"
+assert_contains "final found/total match the discovered count" "found [('found', 2), ('total', 2)]" "$stream_out"
+assert_contains "reader blocks while the queue is full" "bounded True" "$stream_out"
+assert_contains "every path is delivered once drained" "drained 50 50" "$stream_out"
+
+# =========================================
+# Group 2: process_engine.py processes while discovery runs
+# =========================================
+echo ""
+echo "--- Group 2: processing starts before the scan finishes ---"
+
+OUT="$TMPDIR_TEST/out"
+mkdir -p "$OUT"
+FIFO="$TMPDIR_TEST/paths.fifo"
+mkfifo "$FIFO"
+python3 "$ENGINE_PY" --plugin-dir "$BUILTIN_PLUGIN_DIR" --input-dir "$TREE" \
+  --output-dir "$OUT" --template "$TMPDIR_TEST/template.md" --suppress-json \
+  --jobs 1 --events-fd 3 file < "$FIFO" 3> "$TMPDIR_TEST/events.txt" 2>/dev/null &
+ENGINE_PID=$!
+exec 7> "$FIFO"
+echo "$TREE/a/one.txt" >&7
+
+first_written=false
+for _i in $(seq 1 100); do
+  if [ -f "$OUT/a/one.txt.md" ]; then first_written=true; break; fi
+  sleep 0.1
+done
+assert_eq "first sidecar is written while paths are still arriving" "true" "$first_written"
+assert_eq "engine is still waiting for more paths" "true" \
+  "$(kill -0 "$ENGINE_PID" 2>/dev/null && echo true || echo false)"
+
+echo "$TREE/a/two.txt" >&7
+echo "$TREE/b/three.txt" >&7
+exec 7>&-
+wait "$ENGINE_PID"
+engine_rc=$?
+ENGINE_PID=""
+assert_eq "engine exits 0 after the scan ends" "0" "$engine_rc"
+assert_eq "all sidecars are written" "3" "$(find "$OUT" -type f -name '*.md' | wc -l | tr -d ' ')"
+events=$(cat "$TMPDIR_TEST/events.txt")
+assert_contains "found grows while discovery runs" "progress	found	1" "$events"
+assert_contains "final found count is reported" "progress	found	3" "$events"
+assert_contains "final total count is reported" "progress	total	3" "$events"
+assert_contains "finish reports every document" "finish	3" "$events"
+
+# =========================================
+# Group 3: process command
+# =========================================
+echo ""
+echo "--- Group 3: process command ---"
+
+for engine in python bash; do
+  out_dir="$TMPDIR_TEST/out-$engine"
+  json=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$out_dir" --no-progress \
+    --engine "$engine" -t "$TMPDIR_TEST/template.md" 2>"$TMPDIR_TEST/err-$engine.txt")
+  assert_eq "$engine engine: JSON lists every document" "3" \
+    "$(echo "$json" | jq 'length' 2>/dev/null)"
+  assert_eq "$engine engine: every document is processed once" \
+    "a/one.txt a/two.txt b/three.txt" \
+    "$(echo "$json" | jq -r '[.[].filePath | sub(".*/tree/"; "")] | sort | join(" ")' 2>/dev/null)"
+  assert_contains "$engine engine: summary counts processed documents" \
+    "Processed 3 documents." "$(cat "$TMPDIR_TEST/err-$engine.txt")"
+
+  mkdir -p "$TMPDIR_TEST/empty"
+  json=$(bash "$DOC_DOC_SH" process -d "$TMPDIR_TEST/empty" -o "$TMPDIR_TEST/empty-out-$engine" \
+    --no-progress --engine "$engine" -t "$TMPDIR_TEST/template.md" 2>/dev/null)
+  assert_eq "$engine engine: empty tree prints []" "[]" "$json"
+done
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
@@ -0,0 +1,216 @@
+#!/bin/bash
+# Test suite for FEATURE_0064: In-process MIME gate
+# Verifies the filter.py --gate line protocol, that the bash engine compiles
+# the MIME criteria once per run (one gate coprocess instead of one
+# filter.py per document), that the gate keeps its include/exclude and
+# fail-closed semantics, and that the python engine gates without
+# touching the file system.
+# Run from repository root: bash tests/test_feature_0064.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+FILTER_SCRIPT="$COMPONENTS_DIR/filter.py"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$actual" == *"$expected"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $expected"
+    echo "    Actual: $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0064: In-Process MIME Gate"
+echo "============================================"
+
+TMPDIR_TEST="$(mktemp -d)"
+
+# =========================================
+# Group 1: filter.py --gate
+# =========================================
+echo ""
+echo "--- Group 1: filter.py --gate ---"
+
+gate_out=$(printf 'text/plain\nimage/png\ntext/x-log\napplication/pdf\n\n' | \
+  python3 "$FILTER_SCRIPT" --gate --include "text/*,application/pdf" --exclude "text/x-log")
+assert_eq "one answer per input line" "1 0 0 1 0" "$(echo $gate_out)"
+
+gate_out=$(printf 'text/plain\n' | python3 "$FILTER_SCRIPT" --gate --include ".txt")
+assert_eq "MIME strings are not matched against path criteria" "0" "$gate_out"
+
+coproc GATE { python3 "$FILTER_SCRIPT" --gate --include "image/*"; }
+echo "image/png" >&"${GATE[1]}"
+answer=""
+IFS= read -r -t 10 answer <&"${GATE[0]}"
+assert_eq "each answer is flushed before the next request" "1" "$answer"
+echo "text/plain" >&"${GATE[1]}"
+IFS= read -r -t 10 answer <&"${GATE[0]}"
+assert_eq "the gate answers repeatedly" "0" "$answer"
+_gate_pid=$GATE_PID
+_gate_fd=${GATE[1]}
+exec {_gate_fd}>&-
+wait "$_gate_pid"
+assert_eq "the gate exits 0 at end of input" "0" "$?"
+
+# =========================================
+# Group 2: bash engine gate helpers
+# =========================================
+echo ""
+echo "--- Group 2: mime_gate_* helpers ---"
+
+PLUGINS="$TMPDIR_TEST/plugins"
+make_plugin() {
+  mkdir -p "$PLUGINS/$1"
+  jq -n --arg n "$1" '{name: $n, version: "1.0.0", active: true, commands: {process: {command: "main.sh"}}}' \
+    > "$PLUGINS/$1/descriptor.json"
+  printf '#!/bin/bash\n%s\n' "$2" > "$PLUGINS/$1/main.sh"
+  chmod +x "$PLUGINS/$1/main.sh"
+}
+make_plugin file "jq -c '{mimeType: (if (.filePath | endswith(\".png\")) then \"image/png\" else \"text/plain\" end)}'"
+make_plugin after "jq -c '{after: true}'"
+mkdir -p "$TMPDIR_TEST/in"
+echo "hello" > "$TMPDIR_TEST/in/a.txt"
+echo "png" > "$TMPDIR_TEST/in/b.png"
+
+helper_out=$(
+  log_error() { echo "Error: $*" >&2; }
+  # shellcheck source=/dev/null
+  source "$COMPONENTS_DIR/plugin_execution.sh"
+  PLUGIN_DIR="$PLUGINS"
+  _MIME_INCLUDE_ARGS=("text/*")
+  _MIME_EXCLUDE_ARGS=()
+  mime_gate_start
+  echo "started=$([ -n "${_MIME_GATE_PROC_PID:-}" ] && echo yes || echo no)"
+  echo "txt=$(process_file "$TMPDIR_TEST/in/a.txt" "" file after | jq -c '{mimeType, after}')"
+  echo "png=$(process_file "$TMPDIR_TEST/in/b.png" "" file after)"
+  echo "check=$(mime_gate_check "text/markdown" && echo pass || echo reject)"
+  mime_gate_stop
+  echo "fallback=$(mime_gate_check "image/png" && echo pass || echo reject)"
+
+  make_plugin file "exit 1"
+  echo "failclosed=$(process_file "$TMPDIR_TEST/in/a.txt" "" file after 2>/dev/null)"
+
+  _MIME_INCLUDE_ARGS=()
+  mime_gate_start
+  echo "nocriteria=$([ -n "${_MIME_GATE_PROC_PID:-}" ] && echo yes || echo no)"
+)
+assert_contains "gate coprocess starts when MIME criteria are set" "started=yes" "$helper_out"
+assert_contains "matching documents pass the gate" 'txt={"mimeType":"text/plain","after":true}' "$helper_out"
+assert_contains "rejected documents are skipped" "png=
+" "$helper_out"
+assert_contains "mime_gate_check answers from the coprocess" "check=pass" "$helper_out"
+assert_contains "without a coprocess the one-shot gate is used" "fallback=reject" "$helper_out"
+assert_contains "a failing file plugin still skips the document (fail-closed)" "failclosed=
+" "$helper_out"
+assert_contains "no coprocess without MIME criteria" "nocriteria=no" "$helper_out"
+
+# =========================================
+# Group 3: process command starts one gate per run
+# =========================================
+echo ""
+echo "--- Group 3: process command ---"
+
+TREE="$TMPDIR_TEST/tree"
+mkdir -p "$TREE"
+for i in 1 2 3 4 5; do echo "doc $i" > "$TREE/doc$i.txt"; done
+printf '\x89PNG\r\n\x1a\n\0\0\0\rIHDR\0\0\0\1\0\0\0\1\10\6\0\0\0\x1f\x15\xc4\x89' > "$TREE/pixel.png"
+echo "{{fileName}}" > "$TMPDIR_TEST/template.md"
+
+REAL_PYTHON="$(command -v python3)"
+mkdir -p "$TMPDIR_TEST/bin"
+cat > "$TMPDIR_TEST/bin/python3" <<WRAP
+#!/bin/bash
+printf '%s\n' "\$*" >> "$TMPDIR_TEST/python.log"
+exec "$REAL_PYTHON" "\$@"
+WRAP
+chmod +x "$TMPDIR_TEST/bin/python3"
+
+json=$(PATH="$TMPDIR_TEST/bin:$PATH" bash "$DOC_DOC_SH" process -d "$TREE" \
+  -o "$TMPDIR_TEST/out" --engine bash --no-progress -i "text/*" \
+  -t "$TMPDIR_TEST/template.md" 2>/dev/null)
+assert_eq "text documents are processed" "5" "$(echo "$json" | jq 'length' 2>/dev/null)"
+assert_eq "non-matching MIME types are skipped" "" \
+  "$(echo "$json" | jq -r '.[].filePath' 2>/dev/null | grep pixel.png)"
+assert_eq "one gate process for the whole run" "1" \
+  "$(grep -c 'filter.py --gate' "$TMPDIR_TEST/python.log")"
+assert_eq "no per-document filter.py processes" "0" \
+  "$(grep 'filter.py' "$TMPDIR_TEST/python.log" | grep -vc -e '--gate' -e '--walk')"
+
+# =========================================
+# Group 4: python engine
+# =========================================
+echo ""
+echo "--- Group 4: python engine ---"
+
+plan_out=$(python3 - "$COMPONENTS_DIR" <<'PYEOF'
+import os, sys
+sys.path.insert(0, sys.argv[1])
+import filter as f
+
+def no_stat(*_args):
+    raise AssertionError("MIME gate touched the file system")
+os.path.isfile = no_stat
+
+plan = f.FilterPlan(["text/*,application/pdf"], ["text/x-log"])
+print([plan.passes_mime(m) for m in ("text/plain", "application/pdf", "image/png", "text/x-log")])
+PYEOF
+)
+assert_eq "FilterPlan.passes_mime evaluates MIME strings without stat" \
+  "[True, True, False, False]" "$plan_out"
+
+json=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$TMPDIR_TEST/out-py" --engine python \
+  --no-progress -i "text/*" -t "$TMPDIR_TEST/template.md" 2>/dev/null)
+assert_eq "python engine: same documents pass the gate" "5" "$(echo "$json" | jq 'length' 2>/dev/null)"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
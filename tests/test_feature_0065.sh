@@ -0,0 +1,181 @@
+#!/bin/bash
+# Test suite for FEATURE_0065: Descriptor-declared plugin applicability
+# Verifies commands.process.accepts.mimeTypes / requires.anyOf: the
+# Applicability reader, dependency ordering, that both engines skip
+# non-applicable plugins without starting them, and that the built-in
+# plugins declare their MIME allowlists and text requirements.
+# Run from repository root: bash tests/test_feature_0065.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+PROCESS_ENGINE="$COMPONENTS_DIR/process_engine.py"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+cleanup() {
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0065: Declared Plugin Applicability"
+echo "============================================"
+
+TMPDIR_TEST="$(mktemp -d)"
+INPUT="$TMPDIR_TEST/input"
+OUTPUT="$TMPDIR_TEST/output"
+PLUGINS="$TMPDIR_TEST/plugins"
+CALLS="$TMPDIR_TEST/calls.log"
+TEMPLATE="$TMPDIR_TEST/template.md"
+mkdir -p "$INPUT" "$OUTPUT"
+echo "{{fileName}}" > "$TEMPLATE"
+echo "%PDF-1.4" > "$INPUT/a.pdf"
+echo "hello" > "$INPUT/b.txt"
+echo "png" > "$INPUT/c.png"
+
+# make_plugin <name> <process-json> <script body>; every start is logged
+make_plugin() {
+  mkdir -p "$PLUGINS/$1"
+  jq -n --arg n "$1" --argjson p "$2" \
+    '{name: $n, version: "1.0.0", active: true, commands: {process: ({command: "main.sh"} + $p)}}' \
+    > "$PLUGINS/$1/descriptor.json"
+  printf '#!/bin/bash\necho %s >> "%s"\n%s\n' "$1" "$CALLS" "$3" > "$PLUGINS/$1/main.sh"
+  chmod +x "$PLUGINS/$1/main.sh"
+}
+
+make_plugin file '{"input": {"filePath": {}}, "output": {"mimeType": {}}}' \
+  "jq -c '{mimeType: (.filePath | if endswith(\".pdf\") then \"application/pdf\" elif endswith(\".png\") then \"image/png\" else \"text/plain\" end)}'"
+make_plugin pdfonly '{"accepts": {"mimeTypes": ["application/pdf"]}, "input": {"filePath": {}}, "output": {"pdfText": {}}}' \
+  "jq -c '{pdfText: \"pdf\"}'"
+make_plugin images '{"accepts": {"mimeTypes": ["image/*"]}, "input": {"filePath": {}}, "output": {"imageText": {}}}' \
+  "jq -c '{imageText: \"img\"}'"
+make_plugin needtext '{"requires": {"anyOf": ["pdfText", "imageText"]}, "input": {"filePath": {}, "pdfText": {}, "imageText": {}}, "output": {"counted": {}}}' \
+  "jq -c '{counted: true}'"
+
+# =========================================
+# Group 1: Applicability
+# =========================================
+echo ""
+echo "--- Group 1: plugin_info.Applicability ---"
+
+app_out=$(python3 - "$COMPONENTS_DIR" <<'PYEOF'
+import sys
+sys.path.insert(0, sys.argv[1])
+from plugin_info import Applicability
+
+a = Applicability({"accepts": {"mimeTypes": ["application/pdf", "image/*"]}})
+print("mime", [a.accepts_mime(m) for m in ("application/pdf", "image/png", "text/plain", "")])
+r = Applicability({"requires": {"anyOf": ["textContent", "ocrText"]}})
+print("requires", [r.satisfied_by(c) for c in ({}, {"textContent": ""}, {"ocrText": "x"})])
+n = Applicability({})
+print("none", n.accepts_mime("text/plain"), n.satisfied_by({}), n.fields)
+print("fields", a.fields + r.fields)
+PYEOF
+)
+assert_eq "accepts.mimeTypes matches patterns; unknown type accepted" \
+  "mime [True, True, False, True]" "$(echo "$app_out" | grep '^mime')"
+assert_eq "requires.anyOf needs one non-empty field" \
+  "requires [False, False, True]" "$(echo "$app_out" | grep '^requires')"
+assert_eq "undeclared conditions always hold" "none True True ()" "$(echo "$app_out" | grep '^none')"
+assert_eq "conditions report the fields they read" \
+  "fields ('mimeType', 'textContent', 'ocrText')" "$(echo "$app_out" | grep '^fields')"
+
+levels=$(python3 -c "
+import sys; sys.path.insert(0, '$COMPONENTS_DIR')
+import plugin_info
+print(plugin_info.dependency_levels('$PLUGINS', ['file', 'pdfonly', 'images', 'needtext']))")
+assert_eq "applicability fields order plugins after their producers" \
+  "[['file'], ['pdfonly', 'images'], ['needtext']]" "$levels"
+
+# =========================================
+# Group 2: python engine
+# =========================================
+echo ""
+echo "--- Group 2: python engine ---"
+
+: > "$CALLS"
+result=$(printf '%s\n' "$INPUT/a.pdf" "$INPUT/b.txt" "$INPUT/c.png" | \
+  python3 "$PROCESS_ENGINE" --plugin-dir "$PLUGINS" --input-dir "$INPUT" \
+  --output-dir "$OUTPUT" --template "$TEMPLATE" --jobs 1 \
+  file pdfonly images needtext 2>/dev/null)
+assert_eq "only applicable plugins are started" \
+  "file pdfonly needtext file file images needtext" "$(echo $(cat "$CALLS"))"
+assert_eq "outputs of applicable plugins are merged" \
+  '{"pdf":"pdf","txt":null,"png":"img"}' \
+  "$(echo "$result" | jq -c '{pdf: .[0].pdfText, txt: (.[1].pdfText // .[1].imageText), png: .[2].imageText}')"
+assert_eq "requires.anyOf skips documents without the fields" "true null true" \
+  "$(echo "$result" | jq -r '[.[].counted] | map(tostring) | join(" ")')"
+
+# =========================================
+# Group 3: bash engine
+# =========================================
+echo ""
+echo "--- Group 3: bash engine ---"
+
+bash_out=$(
+  log_error() { echo "Error: $*" >&2; }
+  # shellcheck source=/dev/null
+  source "$COMPONENTS_DIR/plugin_execution.sh"
+  PLUGIN_DIR="$PLUGINS"
+  _MIME_INCLUDE_ARGS=()
+  _MIME_EXCLUDE_ARGS=()
+  plugin_applicability_load file pdfonly images needtext
+  : > "$CALLS"
+  for doc in a.pdf b.txt c.png; do
+    r=$(process_file "$INPUT/$doc" "" file pdfonly images needtext)
+    echo "$r" | jq -c '{pdfText, imageText, counted}'
+  done
+  echo "calls $(echo $(cat "$CALLS"))"
+)
+assert_eq "only applicable plugins are started" \
+  "calls file pdfonly needtext file file images needtext" "$(echo "$bash_out" | grep '^calls')"
+assert_eq "results match the python engine" \
+  '{"pdfText":"pdf","imageText":null,"counted":true} {"pdfText":null,"imageText":null,"counted":null} {"pdfText":null,"imageText":"img","counted":true}' \
+  "$(echo $(echo "$bash_out" | grep -v '^calls'))"
+
+# =========================================
+# Group 4: built-in descriptors
+# =========================================
+echo ""
+echo "--- Group 4: built-in descriptors ---"
+
+assert_eq "markitdown declares its Office MIME types" "6" \
+  "$(jq '.commands.process.accepts.mimeTypes | length' "$BUILTIN_PLUGIN_DIR/markitdown/descriptor.json")"
+assert_eq "markitdown accepts .docx" "true" \
+  "$(jq '.commands.process.accepts.mimeTypes | index("application/vnd.openxmlformats-officedocument.wordprocessingml.document") != null' "$BUILTIN_PLUGIN_DIR/markitdown/descriptor.json")"
+assert_eq "ocrmypdf declares PDF and image types" \
+  "application/pdf image/jpeg image/png image/tiff image/bmp image/gif" \
+  "$(jq -r '.commands.process.accepts.mimeTypes | join(" ")' "$BUILTIN_PLUGIN_DIR/ocrmypdf/descriptor.json")"
+for plugin in wc langid ots crm114; do
+  assert_eq "$plugin requires extracted text" "documentText ocrText textContent" \
+    "$(jq -r '.commands.process.requires.anyOf | sort | join(" ")' "$BUILTIN_PLUGIN_DIR/$plugin/descriptor.json")"
+done
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
@@ -0,0 +1,203 @@
+#!/bin/bash
+# Test suite for FEATURE_0066: Metadata filter predicates (size, mtime, age)
+# Verifies that filter.py understands size/mtime/age predicates in include
+# and exclude criteria, stats each file at most once (reusing the walker's
+# directory entries), rejects malformed predicates, and that the process
+# command applies them before any plugin runs.
+# Run from repository root: bash tests/test_feature_0066.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+FILTER_PY="$COMPONENTS_DIR/filter.py"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" needle="$2" haystack="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$haystack" == *"$needle"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $needle"
+    echo "    Actual: $haystack"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0066: Metadata filter predicates"
+echo "============================================"
+echo ""
+
+TMPDIR_TEST=$(mktemp -d)
+TREE="$TMPDIR_TEST/tree"
+mkdir -p "$TREE/new" "$TREE/old"
+head -c 3000 /dev/zero > "$TREE/new/big.bin"
+echo "small" > "$TREE/new/small.txt"
+echo "old" > "$TREE/old/old.txt"
+head -c 4096 /dev/zero > "$TREE/old/old.bin"
+touch -d "2025-06-01 12:00" "$TREE/old/old.txt" "$TREE/old/old.bin"
+
+# walk_sorted <filter.py args...>: --walk output, sorted
+walk_sorted() {
+  python3 "$FILTER_PY" --walk "$TREE" "$@" | sort
+}
+
+# stat_count <filter.py args...>: os.stat() calls made for the walk (or for
+# stdin paths when --walk is omitted), one line per file
+stat_count() {
+  python3 - "$COMPONENTS_DIR" "$@" <<'PY'
+import collections, os, sys
+sys.path.insert(0, sys.argv[1])
+import filter as filter_engine
+calls = collections.Counter()
+real_stat = os.stat
+def counting_stat(path, *args, **kwargs):
+    calls[os.fspath(path)] += 1
+    return real_stat(path, *args, **kwargs)
+os.stat = counting_stat
+args = sys.argv[2:]
+include = [args[i + 1] for i, a in enumerate(args) if a == "--include"]
+exclude = [args[i + 1] for i, a in enumerate(args) if a == "--exclude"]
+plan = filter_engine.FilterPlan(include, exclude)
+root = args[args.index("--root") + 1]
+for dirpath, _dirs, files in os.walk(root):
+    for name in sorted(files):
+        path = os.path.join(dirpath, name)
+        plan.decide(path, None)
+print(max(calls.values()) if calls else 0)
+PY
+}
+
+# =========================================
+# Group 1: predicate matching
+# =========================================
+echo "--- Group 1: predicate matching ---"
+
+assert_eq "size>2k includes larger files" \
+  "$(printf '%s\n' "$TREE/new/big.bin" "$TREE/old/old.bin")" "$(walk_sorted --include 'size>2k')"
+assert_eq "size=4k matches the exact size" "$TREE/old/old.bin" "$(walk_sorted --include 'size=4k')"
+assert_eq "size<=1KiB accepts IEC suffixes" \
+  "$(printf '%s\n' "$TREE/new/small.txt" "$TREE/old/old.txt")" "$(walk_sorted --include 'size<=1KiB')"
+assert_eq "mtime>=2026-01-01 includes recent files" \
+  "$(printf '%s\n' "$TREE/new/big.bin" "$TREE/new/small.txt")" "$(walk_sorted --include 'mtime>=2026-01-01')"
+assert_eq "mtime<2025-06-01T13:00 compares date and time" \
+  "$(printf '%s\n' "$TREE/old/old.bin" "$TREE/old/old.txt")" "$(walk_sorted --include 'mtime<2025-06-01T13:00')"
+assert_eq "age<7d excludes recent files" \
+  "$(printf '%s\n' "$TREE/old/old.bin" "$TREE/old/old.txt")" "$(walk_sorted --exclude 'age < 7d')"
+assert_eq "predicates are ORed with other criteria of a parameter" \
+  "$(printf '%s\n' "$TREE/new/big.bin" "$TREE/new/small.txt" "$TREE/old/old.bin" "$TREE/old/old.txt")" \
+  "$(walk_sorted --include 'size>2k,.txt')"
+assert_eq "parameters are ANDed" "$TREE/new/big.bin" \
+  "$(walk_sorted --include 'size>2k' --include 'age<1w')"
+assert_eq "stdin input gives the same result as --walk" \
+  "$(walk_sorted --include 'size>2k' --exclude 'age>30d')" \
+  "$(find "$TREE" -type f | python3 "$FILTER_PY" --include 'size>2k' --exclude 'age>30d' | sort)"
+assert_eq "a missing file matches no predicate" "" \
+  "$(echo "$TREE/missing.bin" | python3 "$FILTER_PY" --include 'size<1G')"
+
+# =========================================
+# Group 2: compilation and errors
+# =========================================
+echo ""
+echo "--- Group 2: compilation and errors ---"
+
+explain=$(python3 "$FILTER_PY" --include 'size>=1.5M,.pdf' --exclude 'age>2w' --explain)
+assert_contains "--explain lists include predicates" "metadata (one stat per file): size>=1.5M" "$explain"
+assert_contains "--explain lists exclude predicates" "metadata (one stat per file): age>2w" "$explain"
+
+for bad in 'size>5X' 'age<7' 'mtime>yesterday' 'mtime=2026-01-01'; do
+  err=$(python3 "$FILTER_PY" --include "$bad" --explain 2>&1 >/dev/null)
+  rc=$?
+  assert_eq "malformed predicate '$bad' exits 1" "1" "$rc"
+  assert_contains "malformed predicate '$bad' is reported" "invalid metadata predicate" "$err"
+done
+
+assert_eq "each file is stat'ed at most once" "1" \
+  "$(stat_count --root "$TREE" --include 'size>2k' --include 'age<7d' --exclude 'size>1G,mtime<2000-01-01')"
+assert_eq "no stat when a glob already matched" "0" \
+  "$(stat_count --root "$TREE" --include '**,size>2k')"
+
+walk_stats=$(python3 - "$COMPONENTS_DIR" "$TREE" <<'PY'
+import os, sys
+sys.path.insert(0, sys.argv[1])
+import filter as filter_engine
+calls = []
+real_stat = os.stat
+os.stat = lambda *a, **k: calls.append(a[0]) or real_stat(*a, **k)
+plan = filter_engine.FilterPlan(["size>2k"], [])
+for entry in filter_engine.walk_entries(sys.argv[2], plan):
+    plan.decide(entry.path, None, entry.stat)
+print(len(calls))
+PY
+)
+assert_eq "--walk reuses the directory entries' stat results" "0" "$walk_stats"
+
+# =========================================
+# Group 3: process command
+# =========================================
+echo ""
+echo "--- Group 3: process command ---"
+
+help_out=$(bash "$DOC_DOC_SH" process --help 2>&1)
+assert_contains "help documents metadata predicates" "size>50M" "$help_out"
+
+echo "{{fileName}}" > "$TMPDIR_TEST/template.md"
+for engine in bash python; do
+  echo_out=$(bash "$DOC_DOC_SH" process -d "$TREE" --echo --no-progress --engine "$engine" \
+    -t "$TMPDIR_TEST/template.md" -e 'size>2k' -i 'mtime>=2026-01-01' 2>/dev/null)
+  assert_eq "$engine engine: only matching files are processed" "=== new/small.txt ===" \
+    "$(echo "$echo_out" | grep '^===')"
+done
+
+err=$(bash "$DOC_DOC_SH" process -d "$TREE" --echo --no-progress -i 'size>lots' 2>&1)
+rc=$?
+assert_eq "process rejects a malformed predicate" "1" "$rc"
+assert_contains "process reports the malformed predicate" "invalid metadata predicate 'size>lots'" "$err"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
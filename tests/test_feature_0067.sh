@@ -0,0 +1,234 @@
+#!/bin/bash
+# Test suite for FEATURE_0067: File list input modes (NUL-delimited and NDJSON)
+# Verifies filter.py --null / --ndjson / --root, that both engines take
+# NUL-delimited paths and NDJSON records (record fields seed the context,
+# take precedence over plugin outputs, and plugins whose outputs are all
+# supplied are not started), and process --files-from end to end.
+# Run from repository root: bash tests/test_feature_0067.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+FILTER_PY="$COMPONENTS_DIR/filter.py"
+PROCESS_ENGINE="$COMPONENTS_DIR/process_engine.py"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" needle="$2" haystack="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$haystack" == *"$needle"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $needle"
+    echo "    Actual: $haystack"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0067: File list input modes"
+echo "============================================"
+echo ""
+
+TMPDIR_TEST=$(mktemp -d)
+INPUT="$TMPDIR_TEST/input"
+PLUGINS="$TMPDIR_TEST/plugins"
+CALLS="$TMPDIR_TEST/calls.log"
+TEMPLATE="$TMPDIR_TEST/template.md"
+NL_NAME="new
+line.txt"
+mkdir -p "$INPUT/sub"
+echo "{{fileName}}" > "$TEMPLATE"
+echo "alpha" > "$INPUT/a.txt"
+head -c 3000 /dev/zero > "$INPUT/big.bin"
+echo "newline" > "$INPUT/sub/$NL_NAME"
+
+# make_plugin <name> <process-json> <script body>; every start is logged
+make_plugin() {
+  mkdir -p "$PLUGINS/$1"
+  jq -n --arg n "$1" --argjson p "$2" \
+    '{name: $n, version: "1.0.0", active: true, commands: {process: ({command: "main.sh"} + $p)}}' \
+    > "$PLUGINS/$1/descriptor.json"
+  printf '#!/bin/bash\necho %s >> "%s"\n%s\n' "$1" "$CALLS" "$3" > "$PLUGINS/$1/main.sh"
+  chmod +x "$PLUGINS/$1/main.sh"
+}
+
+make_plugin file '{"input": {"filePath": {}}, "output": {"mimeType": {}}}' \
+  "jq -c '{mimeType: \"text/plain\"}'"
+make_plugin stat '{"input": {"filePath": {}}, "output": {"fileSize": {}, "fileOwner": {}}}' \
+  "jq -c '{fileSize: 1, fileOwner: \"owner\"}'"
+
+RECORDS=$(printf '%s\n' \
+  '{"path": "a.txt", "mimeType": "application/x-custom", "size": 12345}' \
+  '{"path": "big.bin", "mtime": 1000}')
+
+# =========================================
+# Group 1: filter.py input formats
+# =========================================
+echo "--- Group 1: filter.py input formats ---"
+
+walked=$(python3 "$FILTER_PY" --walk "$INPUT" --null | tr '\0' '|')
+assert_contains "--walk --null keeps newlines in names" "|$INPUT/sub/$NL_NAME|" "|$walked"
+assert_eq "--null reads and writes NUL-delimited paths" "$INPUT/sub/$NL_NAME|" \
+  "$(printf '%s\0%s\0' "$INPUT/sub/$NL_NAME" "$INPUT/big.bin" | \
+     python3 "$FILTER_PY" --null --include '.txt' | tr '\0' '|')"
+
+ndjson=$(echo "$RECORDS" | python3 "$FILTER_PY" --ndjson --root "$INPUT")
+assert_eq "--ndjson writes records as normalised document context" \
+  "{\"filePath\":\"$INPUT/a.txt\",\"mimeType\":\"application/x-custom\",\"fileSize\":12345}
+{\"filePath\":\"$INPUT/big.bin\",\"fileModified\":\"1970-01-01T00:16:40Z\"}" "$ndjson"
+
+assert_eq "record size and mtime are trusted by predicates" "$INPUT/a.txt" \
+  "$(echo "$RECORDS" | python3 "$FILTER_PY" --ndjson --root "$INPUT" \
+     --include 'size>10k' --exclude 'age>30d' | jq -r '.filePath')"
+assert_eq "record mimeType is trusted by MIME criteria" "$INPUT/a.txt" \
+  "$(echo "$RECORDS" | python3 "$FILTER_PY" --ndjson --root "$INPUT" \
+     --include 'application/x-custom' | jq -r '.filePath')"
+
+err=$(printf '%s\n' 'not json' '{"size": 1}' '{"path": "../outside.txt"}' '{"path": "gone.txt"}' \
+  '{"path": "a.txt", "size": "big"}' | \
+  python3 "$FILTER_PY" --ndjson --root "$INPUT" 2>&1 >"$TMPDIR_TEST/kept.out")
+assert_contains "invalid JSON lines are reported" "skipping invalid record on line 1" "$err"
+assert_contains "records without a path are reported" "line 2: missing \"path\"" "$err"
+assert_contains "paths outside --root are skipped" "is outside" "$err"
+assert_contains "missing files are skipped" "is not a regular file" "$err"
+assert_contains "invalid optional fields are dropped" "ignoring invalid fileSize" "$err"
+assert_eq "a record with an invalid field is still passed on" "{\"filePath\":\"$INPUT/a.txt\"}" \
+  "$(cat "$TMPDIR_TEST/kept.out")"
+assert_eq "--root resolves plain relative paths" "$INPUT/a.txt" \
+  "$(echo "a.txt" | python3 "$FILTER_PY" --root "$INPUT")"
+python3 "$FILTER_PY" --null --ndjson < /dev/null > /dev/null 2>&1
+assert_eq "--null and --ndjson are mutually exclusive" "2" "$?"
+
+# =========================================
+# Group 2: python engine
+# =========================================
+echo ""
+echo "--- Group 2: python engine ---"
+
+: > "$CALLS"
+result=$(echo "$ndjson" | python3 "$PROCESS_ENGINE" --plugin-dir "$PLUGINS" \
+  --input-dir "$INPUT" --template "$TEMPLATE" --echo --suppress-json --jobs 1 \
+  --input-format ndjson file stat >/dev/null 2>&1; sort "$CALLS")
+assert_eq "plugins whose outputs are all supplied are not started" "file stat stat" "$(echo $result)"
+result=$(echo "$ndjson" | python3 "$PROCESS_ENGINE" --plugin-dir "$PLUGINS" \
+  --input-dir "$INPUT" --template "$TEMPLATE" --jobs 1 --input-format ndjson \
+  --mime-include 'application/*' file stat 2>/dev/null)
+assert_eq "record fields win over plugin outputs; the MIME gate uses them" \
+  '[{"mimeType":"application/x-custom","fileSize":12345,"fileOwner":"owner"}]' \
+  "$(echo "$result" | jq -c 'map({mimeType, fileSize, fileOwner})')"
+result=$(printf '%s\0' "$INPUT/sub/$NL_NAME" | python3 "$PROCESS_ENGINE" --plugin-dir "$PLUGINS" \
+  --input-dir "$INPUT" --template "$TEMPLATE" --jobs 1 --input-format null file 2>/dev/null)
+assert_eq "NUL-delimited input keeps newlines in names" "$INPUT/sub/$NL_NAME" \
+  "$(echo "$result" | jq -r '.[0].filePath')"
+
+# =========================================
+# Group 3: bash engine
+# =========================================
+echo ""
+echo "--- Group 3: bash engine ---"
+
+bash_out=$(
+  log_error() { echo "Error: $*" >&2; }
+  # shellcheck source=/dev/null
+  source "$COMPONENTS_DIR/plugin_execution.sh"
+  PLUGIN_DIR="$PLUGINS"
+  _MIME_INCLUDE_ARGS=()
+  _MIME_EXCLUDE_ARGS=()
+  plugin_applicability_load file stat
+  : > "$CALLS"
+  while IFS= read -r record; do
+    file_path=$(printf '%s' "$record" | jq -j '.filePath')
+    process_file "$file_path" "" --context "$record" file stat | \
+      jq -c '{mimeType, fileSize, fileOwner, fileModified}'
+  done <<< "$ndjson"
+  echo "calls $(echo $(cat "$CALLS"))"
+)
+assert_eq "plugins whose outputs are all supplied are not started" \
+  "calls stat file stat" "$(echo "$bash_out" | grep '^calls')"
+assert_eq "record fields seed the context and win over plugin outputs" \
+  '{"mimeType":"application/x-custom","fileSize":12345,"fileOwner":"owner","fileModified":null} {"mimeType":"text/plain","fileSize":1,"fileOwner":"owner","fileModified":"1970-01-01T00:16:40Z"}' \
+  "$(echo $(echo "$bash_out" | grep -v '^calls'))"
+
+# =========================================
+# Group 4: process --files-from
+# =========================================
+echo ""
+echo "--- Group 4: process --files-from ---"
+
+help_out=$(bash "$DOC_DOC_SH" process --help 2>&1)
+assert_contains "help documents --files-from" "--files-from" "$help_out"
+
+for engine in bash python; do
+  out=$(printf '%s\0' "sub/$NL_NAME" "a.txt" | bash "$DOC_DOC_SH" process -d "$INPUT" --echo \
+    --no-progress --engine "$engine" -t "$TEMPLATE" --files-from - --null 2>/dev/null)
+  assert_eq "$engine engine: --files-from - --null processes the listed files" \
+    "=== sub/new|line.txt ===|=== a.txt ===" "$(echo "$out" | grep -A1 '^=== ' | grep -v -- '^--' | \
+      grep -v '^[a-z]*.txt$' | paste -sd'|')"
+done
+
+echo "$RECORDS" > "$TMPDIR_TEST/changes.ndjson"
+echo '{{mimeType}} {{fileSize}}' > "$TMPDIR_TEST/meta.md"
+for engine in bash python; do
+  out=$(bash "$DOC_DOC_SH" process -d "$INPUT" --echo --no-progress --engine "$engine" \
+    -t "$TMPDIR_TEST/meta.md" --files-from "$TMPDIR_TEST/changes.ndjson" --ndjson \
+    -i 'size>10k' 2>/dev/null)
+  assert_eq "$engine engine: --ndjson metadata is trusted end to end" \
+    "=== a.txt ===|application/x-custom 12345" "$(echo "$out" | grep . | paste -sd'|')"
+done
+
+err=$(bash "$DOC_DOC_SH" process -d "$INPUT" --echo --null 2>&1)
+assert_contains "--null requires --files-from" "--null requires --files-from" "$err"
+err=$(bash "$DOC_DOC_SH" process -d "$INPUT" --echo --files-from - --null --ndjson 2>&1 < /dev/null)
+assert_contains "--null and --ndjson are rejected together" "mutually exclusive" "$err"
+err=$(bash "$DOC_DOC_SH" process -d "$INPUT" --echo --files-from - --follow-symlinks 2>&1 < /dev/null)
+assert_contains "walk options are rejected with --files-from" "cannot be combined with --files-from" "$err"
+err=$(bash "$DOC_DOC_SH" process -d "$INPUT" --echo --files-from "$TMPDIR_TEST/missing.list" 2>&1)
+assert_contains "a missing list file is reported" "File list not found" "$err"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
@@ -0,0 +1,202 @@
+#!/bin/bash
+# Test suite for FEATURE_0068: Long-lived template renderer
+# Verifies the mustache_render.py --batch record protocol, that the bash
+# engine renders every document through one renderer per run (JSON on stdin,
+# not on the command line), that the output matches the one-shot renderer
+# including the derived fileName, and that the template is tokenized once.
+# Run from repository root: bash tests/test_feature_0068.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+RENDER_SCRIPT="$COMPONENTS_DIR/mustache_render.py"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$actual" == *"$expected"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $expected"
+    echo "    Actual: $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0068: Long-Lived Template Renderer"
+echo "============================================"
+
+TMPDIR_TEST="$(mktemp -d)"
+TEMPLATE="$TMPDIR_TEST/template.md"
+printf '# {{fileName}}\n{{#tags}}- {{.}}\n{{/tags}}{{^tags}}no tags\n{{/tags}}{{{raw}}} {{raw}}\n' > "$TEMPLATE"
+JSON_A='{"filePath": "/docs/a.txt", "tags": ["x", "y"], "raw": "<b>"}'
+JSON_B='{"filePath": "sub/b.md", "fileName": "given.md"}'
+
+# =========================================
+# Group 1: mustache_render.py --batch
+# =========================================
+echo ""
+echo "--- Group 1: mustache_render.py --batch ---"
+
+expected_a=$(python3 "$RENDER_SCRIPT" "$TEMPLATE" "$JSON_A")
+expected_b=$(python3 "$RENDER_SCRIPT" "$TEMPLATE" "$JSON_B")
+printf '%s\0%s\0%s\0%s\0' - "$JSON_A" "$TMPDIR_TEST/b.md" "$JSON_B" | \
+  python3 "$RENDER_SCRIPT" --batch "$TEMPLATE" > "$TMPDIR_TEST/a.out"
+assert_eq "stdout destination matches the one-shot renderer" "$expected_a" "$(cat "$TMPDIR_TEST/a.out")"
+assert_eq "file destination matches the one-shot renderer" "$expected_b" "$(cat "$TMPDIR_TEST/b.md")"
+assert_contains "fileName is derived from filePath" "# a.txt" "$expected_a"
+assert_contains "a supplied fileName is kept" "# given.md" "$expected_b"
+
+acks=$(printf '%s\0%s\0%s\0%s\0%s\0%s\0' "$TMPDIR_TEST/c.md" "$JSON_A" - "not json" \
+  "$TMPDIR_TEST/a.out/d.md" "$JSON_A" | \
+  python3 "$RENDER_SCRIPT" --batch "$TEMPLATE" --ack-fd 3 3>&1 >/dev/null)
+assert_eq "one acknowledgement per record" "3" "$(echo "$acks" | wc -l | tr -d ' ')"
+assert_eq "written records are acknowledged" "written" "$(echo "$acks" | sed -n 1p)"
+assert_contains "invalid JSON is reported on the ack line" "error	Invalid JSON" "$(echo "$acks" | sed -n 2p)"
+assert_contains "write errors are reported on the ack line" "error	Cannot resolve sidecar path" "$(echo "$acks" | sed -n 3p)"
+
+printf '{{#open}}\n' > "$TMPDIR_TEST/broken.md"
+err=$(printf '%s\0%s\0' - "$JSON_A" | python3 "$RENDER_SCRIPT" --batch "$TMPDIR_TEST/broken.md" 2>&1)
+assert_contains "an invalid template is rejected before rendering" "Invalid template" "$err"
+
+python3 -c 'import json; print(json.dumps({"filePath": "big.txt", "raw": "x" * 3000000}))' > "$TMPDIR_TEST/big.json"
+big=$(
+  # shellcheck source=/dev/null
+  source "$COMPONENTS_DIR/templates.sh"
+  render_template_json "$TEMPLATE" "$(cat "$TMPDIR_TEST/big.json")" | wc -c
+)
+assert_eq "render_template_json renders JSON larger than ARG_MAX" "6000020" "$(echo $big)"
+
+cache_info=$(cd "$COMPONENTS_DIR" && python3 -c '
+import mustache_render
+template = open("'"$TEMPLATE"'").read()
+for name in ("a", "b", "c"):
+    mustache_render.render_data(template, {"filePath": name})
+print(mustache_render.compile_template.cache_info().misses)')
+assert_eq "render_data tokenizes a template once" "1" "$cache_info"
+
+# =========================================
+# Group 2: bash renderer helpers
+# =========================================
+echo ""
+echo "--- Group 2: template_renderer_* helpers ---"
+
+helper_out=$(
+  # shellcheck source=/dev/null
+  source "$COMPONENTS_DIR/templates.sh"
+  template_renderer_start "$TEMPLATE"
+  pid="${_TEMPLATE_RENDERER_PROC_PID:-}"
+  echo "started=${pid:+yes}"
+  render_template_to "$TEMPLATE" "$JSON_A" "$TMPDIR_TEST/h1.md" && echo "file=ok"
+  echo "=== header ==="
+  render_template_to "$TEMPLATE" "$JSON_B" -
+  echo "=== end ==="
+  render_template_to "$TEMPLATE" "not json" "$TMPDIR_TEST/h2.md" || echo "error=$_TEMPLATE_RENDER_ERROR"
+  [ "${_TEMPLATE_RENDERER_PROC_PID:-}" = "$pid" ] && echo "same=yes"
+  sub=$(render_template_to "$TEMPLATE" "$JSON_A" -)
+  [ "$sub" = "$expected_a" ] && echo "fallback=ok"
+  template_renderer_stop
+  echo "stopped=${_TEMPLATE_RENDERER_PROC_PID:-yes}"
+)
+assert_contains "the renderer coprocess starts" "started=yes" "$helper_out"
+assert_contains "sidecars are written by the renderer" "file=ok" "$helper_out"
+assert_eq "sidecar content matches the one-shot renderer" "$expected_a" "$(cat "$TMPDIR_TEST/h1.md")"
+assert_contains "stdout output stays between the surrounding lines" "=== header ===
+$expected_b
+=== end ===" "$helper_out"
+assert_contains "render errors return 1 and are reported" "error=Invalid JSON" "$helper_out"
+assert_contains "the renderer survives a failed record" "same=yes" "$helper_out"
+assert_contains "subshells fall back to a one-shot render" "fallback=ok" "$helper_out"
+assert_contains "the renderer stops" "stopped=yes" "$helper_out"
+
+# =========================================
+# Group 3: process command renders through one renderer
+# =========================================
+echo ""
+echo "--- Group 3: process command ---"
+
+TREE="$TMPDIR_TEST/tree"
+mkdir -p "$TREE/sub"
+for i in 1 2 3 4; do echo "doc $i" > "$TREE/doc$i.txt"; done
+echo "nested" > "$TREE/sub/nested.txt"
+
+REAL_PYTHON="$(command -v python3)"
+mkdir -p "$TMPDIR_TEST/bin"
+cat > "$TMPDIR_TEST/bin/python3" <<WRAP
+#!/bin/bash
+printf '%s\n' "\$*" >> "$TMPDIR_TEST/python.log"
+exec "$REAL_PYTHON" "\$@"
+WRAP
+chmod +x "$TMPDIR_TEST/bin/python3"
+
+err=$(PATH="$TMPDIR_TEST/bin:$PATH" bash "$DOC_DOC_SH" process -d "$TREE" \
+  -o "$TMPDIR_TEST/out_bash" --engine bash --no-progress -i "text/*" \
+  -t "$TEMPLATE" 2>&1 >/dev/null)
+assert_eq "all sidecars are written" "5" "$(find "$TMPDIR_TEST/out_bash" -type f -name '*.md' | wc -l | tr -d ' ')"
+assert_eq "one renderer process for the whole run" "1" \
+  "$(grep -c 'mustache_render.py --batch' "$TMPDIR_TEST/python.log")"
+assert_eq "no per-document renderer processes" "0" \
+  "$(grep 'mustache_render.py' "$TMPDIR_TEST/python.log" | grep -vc -e '--batch')"
+assert_eq "no coprocess warning next to the MIME gate" "" "$(echo "$err" | grep -i 'coproc')"
+
+bash "$DOC_DOC_SH" process -d "$TREE" -o "$TMPDIR_TEST/out_python" --engine python \
+  --no-progress -i "text/*" -t "$TEMPLATE" >/dev/null 2>&1
+assert_eq "sidecars match the python engine" "" \
+  "$(diff -r -x .doc.doc.md "$TMPDIR_TEST/out_bash" "$TMPDIR_TEST/out_python")"
+assert_eq "nested sidecars use the derived fileName" "# nested.txt" \
+  "$(head -1 "$TMPDIR_TEST/out_bash/sub/nested.txt.md")"
+
+echo_out=$(bash "$DOC_DOC_SH" process -d "$TREE" --echo --engine bash --no-progress \
+  -i "**/sub/**" -t "$TEMPLATE" 2>/dev/null)
+assert_eq "--echo output follows each header" "=== sub/nested.txt ===
+# nested.txt
+no tags" "$(echo "$echo_out" | head -3)"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
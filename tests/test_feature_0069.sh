@@ -0,0 +1,203 @@
+#!/bin/bash
+# Test suite for FEATURE_0069: Write-if-changed, atomic sidecar output
+# Verifies that sidecar_writer.py leaves identical sidecars untouched, writes
+# changed ones atomically (temporary file + rename, permissions kept), checks
+# sidecar directories against the output root once per directory, and that
+# both engines report written/unchanged counts without per-file mkdir.
+# Run from repository root: bash tests/test_feature_0069.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+RENDER_SCRIPT="$COMPONENTS_DIR/mustache_render.py"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$actual" == *"$expected"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $expected"
+    echo "    Actual: $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0069: Write-If-Changed Sidecars"
+echo "============================================"
+
+TMPDIR_TEST="$(mktemp -d)"
+TEMPLATE="$TMPDIR_TEST/template.md"
+printf '# {{fileName}}\n' > "$TEMPLATE"
+
+# =========================================
+# Group 1: sidecar_writer.py
+# =========================================
+echo ""
+echo "--- Group 1: sidecar_writer.py ---"
+
+OUT="$TMPDIR_TEST/unit"
+mkdir -p "$OUT" "$TMPDIR_TEST/elsewhere"
+ln -s "$TMPDIR_TEST/elsewhere" "$OUT/link"
+unit_out=$(cd "$COMPONENTS_DIR" && python3 - "$OUT" <<'PY'
+import os
+import sys
+import sidecar_writer
+
+out = sys.argv[1]
+writer = sidecar_writer.SidecarWriter(out)
+path = os.path.join(out, "deep", "dir", "a.txt.md")
+print("first", writer.write(path, "one\n"))
+before = os.stat(path)
+print("same", writer.write(path, "one\n"))
+after = os.stat(path)
+print("untouched", before.st_ino == after.st_ino and before.st_mtime_ns == after.st_mtime_ns)
+os.chmod(path, 0o640)
+print("changed", writer.write(path, "two\n"))
+changed = os.stat(path)
+print("renamed", changed.st_ino != before.st_ino)
+print("mode", oct(changed.st_mode & 0o777))
+print("content", open(path).read().strip())
+print("counts", writer.summary())
+
+real_replace = os.replace
+def failing_replace(src, dst):
+    raise OSError("disk full")
+os.replace = failing_replace
+try:
+    writer.write(path, "three\n")
+except OSError:
+    print("failed write keeps", open(path).read().strip())
+os.replace = real_replace
+print("leftovers", sorted(name for name in os.listdir(os.path.dirname(path))))
+
+try:
+    writer.write(os.path.join(out, "link", "b.txt.md"), "x")
+except sidecar_writer.SidecarError as exc:
+    print("outside", exc)
+PY
+)
+assert_contains "a new sidecar is written" "first True" "$unit_out"
+assert_contains "identical content is not rewritten" "same False" "$unit_out"
+assert_contains "an unchanged sidecar keeps its inode and mtime" "untouched True" "$unit_out"
+assert_contains "changed content is written" "changed True" "$unit_out"
+assert_contains "changed content replaces the file by rename" "renamed True" "$unit_out"
+assert_contains "the old permissions are kept" "mode 0o640" "$unit_out"
+assert_contains "the new content is in place" "content two" "$unit_out"
+assert_contains "written and unchanged writes are counted" "counts Sidecars: 2 written, 1 unchanged." "$unit_out"
+assert_contains "a failed write leaves the old sidecar intact" "failed write keeps two" "$unit_out"
+assert_contains "no temporary files are left behind" "leftovers ['a.txt.md']" "$unit_out"
+assert_contains "directories outside the output root are rejected" "outside path traversal detected" "$unit_out"
+assert_eq "nothing is written outside the output root" "" "$(ls "$TMPDIR_TEST/elsewhere")"
+
+acks=$(printf '%s\0%s\0%s\0%s\0' "$OUT/r.md" '{"filePath": "r"}' "$OUT/r.md" '{"filePath": "r"}' | \
+  python3 "$RENDER_SCRIPT" --batch "$TEMPLATE" --root "$OUT" --ack-fd 3 3>&1 >/dev/null)
+assert_eq "the renderer acknowledges written and unchanged sidecars" "written unchanged" "$(echo $acks)"
+acks=$(printf '%s\0%s\0' "$OUT/link/r.md" '{"filePath": "r"}' | \
+  python3 "$RENDER_SCRIPT" --batch "$TEMPLATE" --root "$OUT" --ack-fd 3 3>&1 >/dev/null)
+assert_eq "the renderer rejects sidecars outside --root" "error	path traversal detected" "$acks"
+
+# =========================================
+# Group 2: process command
+# =========================================
+echo ""
+echo "--- Group 2: process command ---"
+
+TREE="$TMPDIR_TEST/tree"
+mkdir -p "$TREE/one" "$TREE/two"
+for i in 1 2 3; do echo "doc $i" > "$TREE/one/doc$i.txt"; done
+echo "other" > "$TREE/two/other.txt"
+
+REAL_MKDIR="$(command -v mkdir)"
+mkdir -p "$TMPDIR_TEST/bin"
+cat > "$TMPDIR_TEST/bin/mkdir" <<WRAP
+#!/bin/bash
+printf '%s\n' "\$*" >> "$TMPDIR_TEST/mkdir.log"
+exec "$REAL_MKDIR" "\$@"
+WRAP
+chmod +x "$TMPDIR_TEST/bin/mkdir"
+
+for engine in bash python; do
+  out="$TMPDIR_TEST/out_$engine"
+  : > "$TMPDIR_TEST/mkdir.log"
+  err=$(PATH="$TMPDIR_TEST/bin:$PATH" bash "$DOC_DOC_SH" process -d "$TREE" -o "$out" \
+    --engine "$engine" --no-progress -t "$TEMPLATE" 2>&1 >/dev/null)
+  assert_contains "$engine engine: the first run writes every sidecar" "Sidecars: 4 written, 0 unchanged." "$err"
+  assert_eq "$engine engine: no mkdir per sidecar" "" \
+    "$(grep -v -e '\.doc\.doc\.md' -e "^-p $out\$" "$TMPDIR_TEST/mkdir.log")"
+  before=$(stat -c '%i %Y' "$out/one/doc1.txt.md")
+  sleep 1
+  err=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$out" --engine "$engine" --no-progress \
+    -t "$TEMPLATE" 2>&1 >/dev/null)
+  assert_contains "$engine engine: a repeated run writes nothing" "Sidecars: 0 written, 4 unchanged." "$err"
+  assert_eq "$engine engine: unchanged sidecars keep inode and mtime" "$before" \
+    "$(stat -c '%i %Y' "$out/one/doc1.txt.md")"
+  printf '# {{fileName}}!\n' > "$TMPDIR_TEST/changed.md"
+  err=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$out" --engine "$engine" --no-progress \
+    -t "$TMPDIR_TEST/changed.md" 2>&1 >/dev/null)
+  assert_contains "$engine engine: changed sidecars are rewritten" "Sidecars: 4 written, 0 unchanged." "$err"
+  assert_eq "$engine engine: the new content is in place" "# doc1.txt!" "$(cat "$out/one/doc1.txt.md")"
+  assert_eq "$engine engine: no temporary files are left behind" "" \
+    "$(find "$out" -name '*.tmp')"
+
+  rm -rf "${out:?}/two"
+  ln -s "$TMPDIR_TEST/elsewhere" "$out/two"
+  err=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$out" --engine "$engine" --no-progress \
+    -t "$TEMPLATE" 2>&1 >/dev/null)
+  assert_contains "$engine engine: sidecar directories outside the output are rejected" \
+    "path traversal detected for '$TREE/two/other.txt'" "$err"
+  assert_eq "$engine engine: nothing is written outside the output directory" "" \
+    "$(ls "$TMPDIR_TEST/elsewhere")"
+done
+
+echo_err=$(bash "$DOC_DOC_SH" process -d "$TREE" --echo --no-progress -t "$TEMPLATE" 2>&1 >/dev/null)
+assert_eq "--echo reports no sidecar counts" "" "$(echo "$echo_err" | grep 'Sidecars:')"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
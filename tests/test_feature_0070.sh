@@ -0,0 +1,172 @@
+#!/bin/bash
+# Test suite for FEATURE_0070: NDJSON output mode and field projection
+# Verifies process --format ndjson (one compact object per document, written
+# as soon as the document is done, no array around it) and --fields (only the
+# listed keys on stdout; sidecars keep the full result) in both engines.
+# Run from repository root: bash tests/test_feature_0070.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+PROCESS_ENGINE="$COMPONENTS_DIR/process_engine.py"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$actual" == *"$expected"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $expected"
+    echo "    Actual: $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0070: NDJSON Output Mode"
+echo "============================================"
+TMPDIR_TEST="$(mktemp -d)"
+TEMPLATE="$TMPDIR_TEST/template.md"
+printf '{{fileName}} {{mimeType}}\n' > "$TEMPLATE"
+TREE="$TMPDIR_TEST/tree"
+mkdir -p "$TREE/sub"
+echo "alpha" > "$TREE/a.txt"
+echo "beta" > "$TREE/sub/b.txt"
+echo "gamma" > "$TREE/sub/c.txt"
+
+# =========================================
+# Group 1: options
+# =========================================
+echo ""
+echo "--- Group 1: options ---"
+
+help_out=$(bash "$DOC_DOC_SH" process --help 2>&1)
+assert_contains "help documents --format" "--format <json|ndjson>" "$help_out"
+assert_contains "help documents --fields" "--fields <key,...>" "$help_out"
+err=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$TMPDIR_TEST/o" --format xml 2>&1)
+assert_contains "unknown formats are rejected" "Unknown format 'xml'" "$err"
+err=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$TMPDIR_TEST/o" --fields 'filePath;size' 2>&1)
+assert_contains "malformed field lists are rejected" "Invalid --fields" "$err"
+err=$(bash "$DOC_DOC_SH" process -d "$TREE" --echo --format ndjson 2>&1)
+assert_contains "--format is rejected with --echo" "cannot be combined with --echo" "$err"
+
+# =========================================
+# Group 2: process --format / --fields
+# =========================================
+echo ""
+echo "--- Group 2: process --format / --fields ---"
+
+for engine in bash python; do
+  out="$TMPDIR_TEST/out_$engine"
+  array=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$out" --engine "$engine" \
+    --no-progress -t "$TEMPLATE" 2>/dev/null)
+  lines=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$out" --engine "$engine" \
+    --no-progress -t "$TEMPLATE" --format ndjson 2>/dev/null)
+  assert_eq "$engine engine: one line per document" "3" "$(echo "$lines" | wc -l | tr -d ' ')"
+  assert_eq "$engine engine: every line is one JSON object" "3" \
+    "$(echo "$lines" | jq -c 'objects' 2>/dev/null | wc -l | tr -d ' ')"
+  assert_eq "$engine engine: lines match the array in jq -c layout" \
+    "$(echo "$array" | jq -c '.[]')" "$lines"
+  printf '%s\n' "$lines" > "$TMPDIR_TEST/lines_$engine"
+
+  projected=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$out" --engine "$engine" \
+    --no-progress -t "$TEMPLATE" --format ndjson --fields 'filePath, fileSize,noSuchField' 2>/dev/null)
+  assert_eq "$engine engine: --fields keeps only the listed keys" '["filePath","fileSize"]' \
+    "$(echo "$projected" | jq -c 'keys_unsorted' | sort -u)"
+  assert_eq "$engine engine: sidecars keep the full result" "b.txt text/plain" \
+    "$(cat "$out/sub/b.txt.md")"
+
+  projected=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$out" --engine "$engine" \
+    --no-progress -t "$TEMPLATE" --fields mimeType 2>/dev/null)
+  assert_eq "$engine engine: --fields also applies to the JSON array" \
+    '[{"mimeType":"text/plain"},{"mimeType":"text/plain"},{"mimeType":"text/plain"}]' \
+    "$(echo "$projected" | jq -c '.')"
+
+  empty=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$out" --engine "$engine" \
+    --no-progress -t "$TEMPLATE" --format ndjson -i '.none' 2>/dev/null)
+  assert_eq "$engine engine: no documents, no output" "" "$empty"
+done
+assert_eq "both engines write the same lines" "" \
+  "$(diff "$TMPDIR_TEST/lines_bash" "$TMPDIR_TEST/lines_python")"
+
+# =========================================
+# Group 3: streaming
+# =========================================
+echo ""
+echo "--- Group 3: streaming ---"
+
+PLUGINS="$TMPDIR_TEST/plugins"
+mkdir -p "$PLUGINS/slow"
+cat > "$PLUGINS/slow/descriptor.json" <<'JSON'
+{"name": "slow", "version": "1.0.0", "active": true,
+ "commands": {"process": {"command": "main.sh", "input": {"filePath": {}},
+                          "output": {"slow": {}}}}}
+JSON
+printf '#!/bin/bash\nsleep 1\necho "{\\"slow\\": true}"\n' > "$PLUGINS/slow/main.sh"
+chmod +x "$PLUGINS/slow/main.sh"
+
+find "$TREE" -type f | sort | python3 "$PROCESS_ENGINE" --plugin-dir "$PLUGINS" \
+  --input-dir "$TREE" --template "$TEMPLATE" --jobs 1 --format ndjson slow 2>/dev/null | \
+  while IFS= read -r line; do
+    echo "$(date +%s%N) $line"
+  done > "$TMPDIR_TEST/stream.log"
+end=$(date +%s%N)
+first=$(head -1 "$TMPDIR_TEST/stream.log" | cut -d' ' -f1)
+assert_eq "every document is written" "3" "$(wc -l < "$TMPDIR_TEST/stream.log" | tr -d ' ')"
+TOTAL=$((TOTAL + 1))
+if [ $(( (end - first) / 1000000 )) -ge 1500 ]; then
+  echo "  PASS: the first line arrives while later documents are still processed"
+  PASS=$((PASS + 1))
+else
+  echo "  FAIL: the first line arrives while later documents are still processed"
+  echo "    First line only $(( (end - first) / 1000000 )) ms before the end"
+  FAIL=$((FAIL + 1))
+fi
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
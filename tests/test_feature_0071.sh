@@ -0,0 +1,198 @@
+#!/bin/bash
+# Test suite for FEATURE_0071: SQLite metadata index and query command
+# Verifies process --index (one upserted row per document with indexed field
+# columns in <out>/.doc.doc.md/index.sqlite, pruning of vanished sources) and
+# the query command (predicates, sorting, limits and output formats).
+# Run from repository root: bash tests/test_feature_0071.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+INDEX_SCRIPT="$COMPONENTS_DIR/metadata_index.py"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$actual" == *"$expected"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $expected"
+    echo "    Actual: $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0071: Metadata Index and Query"
+echo "============================================"
+TMPDIR_TEST="$(mktemp -d)"
+TREE="$TMPDIR_TEST/tree"
+OUT="$TMPDIR_TEST/out"
+INDEX="$OUT/.doc.doc.md/index.sqlite"
+mkdir -p "$TREE/sub"
+echo "alpha" > "$TREE/a.txt"
+printf 'beta beta beta beta beta\n' > "$TREE/sub/b.txt"
+echo '{"gamma": 1}' > "$TREE/sub/c.json"
+
+query() {
+  bash "$DOC_DOC_SH" query -o "$OUT" "$@" 2>&1
+}
+
+# =========================================
+# Group 1: options
+# =========================================
+echo ""
+echo "--- Group 1: options ---"
+
+assert_contains "main help lists query" "query        Select documents" "$(bash "$DOC_DOC_SH" --help 2>&1)"
+assert_contains "process help documents --index" "--index        Maintain a SQLite" \
+  "$(bash "$DOC_DOC_SH" process --help 2>&1)"
+assert_contains "query help documents predicates" "-w <predicate>, --where <predicate>" \
+  "$(bash "$DOC_DOC_SH" query --help 2>&1)"
+err=$(bash "$DOC_DOC_SH" process -d "$TREE" --echo --index 2>&1)
+assert_contains "--index is rejected with --echo" "--index requires -o" "$err"
+err=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$OUT" --engine bash --index 2>&1)
+assert_contains "--index requires the python engine" "--index requires --engine python" "$err"
+assert_contains "query requires -o" "Output directory is required" "$(bash "$DOC_DOC_SH" query 2>&1)"
+assert_contains "query rejects unknown formats" "Unknown format 'xml'" "$(query --format xml)"
+assert_contains "query rejects bad limits" "--limit requires a positive integer" "$(query --limit 0)"
+assert_contains "query without an index explains how to build one" "run process --index first" \
+  "$(query --count)"
+
+# =========================================
+# Group 2: process --index
+# =========================================
+echo ""
+echo "--- Group 2: process --index ---"
+
+log=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$OUT" --index --no-progress 2>&1 >/dev/null)
+assert_contains "the run reports the index" "Index: 3 documents, 3 updated, 0 pruned." "$log"
+assert_eq "the index is created in the output directory" "yes" "$([ -f "$INDEX" ] && echo yes)"
+assert_eq "one row per document" "3" "$(query --count)"
+assert_eq "query lists source paths" \
+  "$(printf '%s\n' "$TREE/a.txt" "$TREE/sub/b.txt" "$TREE/sub/c.json")" "$(query)"
+indexes=$(python3 -c "import sqlite3, sys; print(' '.join(r[0] for r in sqlite3.connect(sys.argv[1]).execute(\"SELECT name FROM sqlite_master WHERE type='index' ORDER BY name\")))" "$INDEX")
+assert_contains "field columns are indexed (mimeType)" "idx_mimeType" "$indexes"
+assert_contains "field columns are indexed (fileSize)" "idx_fileSize" "$indexes"
+
+printf 'alpha alpha alpha alpha alpha alpha alpha\n' > "$TREE/a.txt"
+rm "$TREE/sub/c.json"
+log=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$OUT" --index --no-progress 2>&1 >/dev/null)
+assert_contains "re-processing upserts and prunes" "Index: 2 documents, 2 updated, 1 pruned." "$log"
+assert_eq "re-processed rows carry the new values" "42" \
+  "$(query -w 'filePath~*/a.txt' --format ndjson --fields fileSize | jq -r .fileSize)"
+echo '{"gamma": 1}' > "$TREE/sub/c.json"
+bash "$DOC_DOC_SH" process -d "$TREE" -o "$OUT" --index --no-progress >/dev/null 2>&1
+
+# =========================================
+# Group 3: query
+# =========================================
+echo ""
+echo "--- Group 3: query ---"
+
+assert_eq "= compares text" "$TREE/sub/c.json" "$(query -w 'mimeType=application/json')"
+assert_eq "~ matches globs" "2" "$(query -w 'mimeType~text/*' --count)"
+assert_eq "> compares numbers" "$TREE/a.txt" "$(query -w 'fileSize>30')"
+assert_eq "predicates are ANDed" "$TREE/sub/b.txt" \
+  "$(query -w 'mimeType~text/*' -w 'fileSize<=30')"
+assert_eq "!= excludes a value" "2" "$(query -w 'mimeType!=application/json' --count)"
+assert_eq "ISO dates compare as text" "3" "$(query -w 'fileModified>=2000-01-01' --count)"
+assert_eq "field!= matches documents with the field" "3" "$(query -w 'fileSize!=' --count)"
+assert_eq "field= matches documents without the field" "0" "$(query -w 'fileSize=' --count)"
+assert_eq "--sort - orders descending, --limit caps" "$TREE/a.txt" \
+  "$(query --sort -fileSize --limit 1)"
+assert_eq "--format json returns the stored results" '["a.txt","b.txt","c.json"]' \
+  "$(query --format json | jq -c '[.[].filePath | split("/") | last]')"
+assert_eq "--format ndjson with --fields" '{"mimeType":"text/plain","fileSize":25}' \
+  "$(query -w 'filePath~*/b.txt' --format ndjson --fields 'mimeType, fileSize')"
+assert_contains "unknown fields are reported with the indexed ones" \
+  "Unknown field 'nope' (indexed fields: " "$(query -w 'nope=1')"
+assert_contains "malformed predicates are reported" "Invalid predicate 'nope'" "$(query -w nope)"
+
+# =========================================
+# Group 4: MetadataIndex
+# =========================================
+echo ""
+echo "--- Group 4: MetadataIndex ---"
+
+unit=$(python3 - "$COMPONENTS_DIR" "$TMPDIR_TEST/unit" <<'PY'
+import sys
+sys.path.insert(0, sys.argv[1])
+import metadata_index as mi
+
+out = sys.argv[2]
+index = mi.MetadataIndex(out)
+index.upsert("/src/x", out + "/x.md", {
+    "filePath": "/src/x", "languageCode": "de", "ok": True,
+    "categories": ["a", "b"], "documentText": "t" * 5000, "bad-key": 1})
+index.upsert("/src/y", out + "/y.md", {"filePath": "/src/y", "ok": False})
+index.upsert("/src/x", out + "/x.md", {"filePath": "/src/x", "wordCount": 12})
+index.close()
+
+index = mi.MetadataIndex(out, readonly=True)
+print("columns", ",".join(sorted(index.columns)))
+rows = dict(index.select([mi.parse_predicate("wordCount=12")]))
+print("upsert", sorted(rows["/src/x"]), index.count_matching([("languageCode", "=", None)]))
+print("bool", [p for p, _ in index.select([mi.parse_predicate("ok=false")])])
+print("typed", mi.parse_predicate("a>=1.5"), mi.parse_predicate("b=01x"))
+
+index = mi.MetadataIndex(out + "/case")
+index.upsert("/src/z", out + "/z.md", {"MimeType": "x", "mimeType": "text/plain"})
+print("case", index.columns, dict(index.select([mi.parse_predicate("MimeType=x")])).get("/src/z"))
+PY
+)
+assert_contains "columns for scalar, boolean and list fields only" \
+  "columns categories,filePath,languageCode,ok,wordCount" "$unit"
+assert_contains "keys differing only in case share one column, _data keeps both" \
+  "case ['MimeType'] {'MimeType': 'x', 'mimeType': 'text/plain'}" "$unit"
+assert_contains "an upsert replaces the whole row" "upsert ['filePath', 'wordCount'] 2" "$unit"
+assert_contains "booleans compare with true/false" "bool ['/src/y']" "$unit"
+assert_contains "numeric values are typed" "typed ('a', '>=', 1.5) ('b', '=', '01x')" "$unit"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
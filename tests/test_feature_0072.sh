@@ -0,0 +1,231 @@
+#!/bin/bash
+# Test suite for FEATURE_0072: Full-text index and search command
+# Verifies process --fulltext (an FTS5 table in the metadata index, filled
+# from the *Text fields and kept current on re-processing and pruning) and
+# the search command (terms, phrases, prefixes, ranking, predicates).
+# Run from repository root: bash tests/test_feature_0072.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+PROCESS_ENGINE="$COMPONENTS_DIR/process_engine.py"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$actual" == *"$expected"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $expected"
+    echo "    Actual: $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0072: Full-Text Search"
+echo "============================================"
+TMPDIR_TEST="$(mktemp -d)"
+TREE="$TMPDIR_TEST/tree"
+OUT="$TMPDIR_TEST/out"
+TEMPLATE="$TMPDIR_TEST/template.md"
+PLUGINS="$TMPDIR_TEST/plugins"
+printf '# {{fileName}}\n' > "$TEMPLATE"
+mkdir -p "$TREE" "$PLUGINS/extract"
+
+# Text extraction stand-in: documentText is the file content, languageCode
+# the file name prefix (de_/en_).
+cat > "$PLUGINS/extract/descriptor.json" <<'JSON'
+{"name": "extract", "version": "1.0.0", "active": true,
+ "commands": {"process": {"command": "main.sh", "input": {"filePath": {}},
+                          "output": {"documentText": {}, "languageCode": {}}}}}
+JSON
+cat > "$PLUGINS/extract/main.sh" <<'SH'
+#!/bin/bash
+path=$(jq -r .filePath)
+name=$(basename "$path")
+jq -n --rawfile text "$path" --arg lang "${name%%_*}" '{documentText: $text, languageCode: $lang}'
+SH
+chmod +x "$PLUGINS/extract/main.sh"
+
+echo "The annual report shows growth in Zürich." > "$TREE/en_annual.txt"
+echo "Der Jahresbericht zeigt Wachstum. Report, report, report!" > "$TREE/de_bericht.txt"
+echo "Minutes of the board meeting." > "$TREE/en_minutes.txt"
+echo "Holiday pictures from the lake." > "$TREE/en_holiday.txt"
+echo "Einladung zur Versammlung." > "$TREE/de_einladung.txt"
+
+index_run() {
+  find "$TREE" -type f | sort | python3 "$PROCESS_ENGINE" --plugin-dir "$PLUGINS" \
+    --input-dir "$TREE" --output-dir "$OUT" --template "$TEMPLATE" --suppress-json \
+    "$@" extract 2>&1
+}
+search() {
+  bash "$DOC_DOC_SH" search -o "$OUT" "$@" 2>&1
+}
+names() {
+  while IFS= read -r line; do basename "$line"; done | tr '\n' ' ' | sed 's/ $//'
+}
+
+# =========================================
+# Group 1: options
+# =========================================
+echo ""
+echo "--- Group 1: options ---"
+
+assert_contains "main help lists search" "search       Full-text search" "$(bash "$DOC_DOC_SH" --help 2>&1)"
+assert_contains "process help documents --fulltext" "--fulltext     Like --index" \
+  "$(bash "$DOC_DOC_SH" process --help 2>&1)"
+assert_contains "search help documents phrases" "to search for" "$(bash "$DOC_DOC_SH" search --help 2>&1)"
+err=$(bash "$DOC_DOC_SH" process -d "$TREE" --echo --fulltext 2>&1)
+assert_contains "--fulltext is rejected with --echo" "--fulltext requires -o" "$err"
+err=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$OUT" --engine bash --fulltext 2>&1)
+assert_contains "--fulltext requires the python engine" "--fulltext requires --engine python" "$err"
+assert_contains "search requires -o" "Output directory is required" "$(bash "$DOC_DOC_SH" search report 2>&1)"
+assert_contains "search requires a term" "search requires at least one term" "$(search)"
+assert_contains "terms without words are no terms" "search requires at least one term" "$(search '"*')"
+assert_contains "search rejects unknown formats" "Unknown format 'json'" "$(search --format json x)"
+assert_contains "search rejects bad limits" "--limit requires a non-negative integer" "$(search --limit x y)"
+
+index_run --index >/dev/null
+assert_contains "an index without full text explains how to add it" \
+  "run process --fulltext first" "$(search report)"
+
+# =========================================
+# Group 2: process --fulltext
+# =========================================
+echo ""
+echo "--- Group 2: process --fulltext ---"
+
+log=$(index_run --fulltext)
+assert_contains "the run reports the index" "Index: 5 documents, 5 updated, 0 pruned." "$log"
+assert_eq "the full-text table holds the documents with text" "5" \
+  "$(python3 -c "import sqlite3, sys; print(sqlite3.connect(sys.argv[1]).execute('SELECT COUNT(*) FROM fulltext').fetchone()[0])" "$OUT/.doc.doc.md/index.sqlite")"
+assert_eq "extracted text is not a metadata column" "" \
+  "$(bash "$DOC_DOC_SH" query -o "$OUT" -w 'documentText!=' --count 2>&1 | grep -v 'Unknown field')"
+
+# =========================================
+# Group 3: search
+# =========================================
+echo ""
+echo "--- Group 3: search ---"
+
+assert_eq "a term finds documents, most occurrences first" "de_bericht.txt en_annual.txt" \
+  "$(search report | names)"
+assert_eq "matching ignores case and diacritics" "en_annual.txt" "$(search ZURICH | names)"
+assert_eq "a quoted term is a phrase" "en_annual.txt" "$(search 'annual report' | names)"
+assert_eq "a phrase must be contiguous" "" "$(search 'report annual' | names)"
+assert_eq "all terms must occur" "en_annual.txt" "$(search report growth | names)"
+assert_eq "a trailing * matches prefixes" "de_bericht.txt" "$(search 'jahres*' | names)"
+assert_eq "--where narrows by metadata" "de_bericht.txt" "$(search report -w languageCode=de | names)"
+assert_eq "--limit caps the results" "de_bericht.txt" "$(search --limit 1 report | names)"
+line=$(search --format ndjson --limit 1 growth)
+assert_eq "ndjson carries path, score and snippet" '["filePath","score","snippet"]' \
+  "$(echo "$line" | jq -c 'keys')"
+assert_contains "snippets mark the match" "[growth]" "$(echo "$line" | jq -r .snippet)"
+assert_contains "unknown predicate fields are reported" "Unknown field 'nope'" "$(search x -w nope=1)"
+
+# =========================================
+# Group 4: incremental updates
+# =========================================
+echo ""
+echo "--- Group 4: incremental updates ---"
+
+echo "Minutes: the quarterly report was approved." > "$TREE/en_minutes.txt"
+echo "Holiday pictures from the sea." > "$TREE/en_holiday.txt"
+rm "$TREE/de_einladung.txt"
+log=$(index_run --index)
+assert_contains "runs with --index keep the full text current" \
+  "Index: 4 documents, 4 updated, 1 pruned." "$log"
+assert_eq "re-processed text is found" "en_minutes.txt" "$(search quarterly | names)"
+assert_eq "replaced text is gone" "" "$(search lake | names)"
+assert_eq "pruned documents are gone" "" "$(search einladung | names)"
+
+python3 - "$OUT" <<'PY'
+import sqlite3, sys
+db = sqlite3.connect(sys.argv[1] + "/.doc.doc.md/index.sqlite")
+db.execute("PRAGMA user_version=1")
+db.commit()
+PY
+assert_contains "an index of another version is reported" "was written by another version" \
+  "$(search report)"
+index_run --fulltext >/dev/null
+assert_eq "the next run rebuilds it" "de_bericht.txt en_annual.txt en_minutes.txt" \
+  "$(search report | sort | names)"
+
+# =========================================
+# Group 5: backfill
+# =========================================
+echo ""
+echo "--- Group 5: backfill ---"
+
+unit=$(python3 - "$COMPONENTS_DIR" "$TMPDIR_TEST/unit" <<'PY'
+import sys
+sys.path.insert(0, sys.argv[1])
+import metadata_index as mi
+
+out = sys.argv[2]
+index = mi.MetadataIndex(out)
+index.upsert("/src/a", None, {"documentText": "alpha beta", "ocrText": "gamma"})
+index.upsert("/src/b", None, {"summaryText": "beta", "title": "delta"})
+index.close()
+index = mi.MetadataIndex(out, fulltext=True)
+index.close()
+index = mi.MetadataIndex(out, readonly=True)
+for term in ("beta", "gamma", "delta"):
+    print(term, sorted(path for path, _score, _snippet in index.search([term])))
+print("expr", mi.match_expression(['annual report', 'rep"ort*', '*']))
+PY
+)
+assert_contains "enabling full text indexes stored results" "beta ['/src/a', '/src/b']" "$unit"
+assert_contains "all *Text fields are indexed" "gamma ['/src/a']" "$unit"
+assert_contains "other fields are not" "delta []" "$unit"
+assert_contains "terms become quoted FTS5 phrases" \
+  "expr \"annual report\" AND \"rep\"\"ort\"*" "$unit"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
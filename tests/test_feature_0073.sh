@@ -0,0 +1,210 @@
+#!/bin/bash
+# Test suite for FEATURE_0073: Single-archive sidecar sink and extract command
+# Verifies process --sink sqlite (all sidecars in <out>/sidecars.sqlite, both
+# engines, write-if-changed, incremental pruning) and the extract command
+# (listing, glob selection, stdout and directory targets).
+# Run from repository root: bash tests/test_feature_0073.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$actual" == *"$expected"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $expected"
+    echo "    Actual: $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0073: Sidecar Archive"
+TMPDIR_TEST="$(mktemp -d)"
+TREE="$TMPDIR_TEST/tree"
+TEMPLATE="$TMPDIR_TEST/template.md"
+printf '# {{fileName}}\n{{mimeType}} {{fileSize}}\n' > "$TEMPLATE"
+mkdir -p "$TREE/sub/deep"
+echo "alpha" > "$TREE/a.txt"
+echo "beta" > "$TREE/sub/b.txt"
+echo '{"c": 1}' > "$TREE/sub/deep/c.json"
+
+process() {
+  bash "$DOC_DOC_SH" process -d "$TREE" -t "$TEMPLATE" --no-progress "$@" 2>&1 >/dev/null
+}
+extract() {
+  bash "$DOC_DOC_SH" extract "$@" 2>&1
+}
+
+# =========================================
+# Group 1: options
+# =========================================
+echo ""
+echo "--- Group 1: options ---"
+
+assert_contains "main help lists extract" "extract      Materialize sidecars" "$(bash "$DOC_DOC_SH" --help 2>&1)"
+assert_contains "process help documents --sink" "--sink <tree|sqlite>" "$(bash "$DOC_DOC_SH" process --help 2>&1)"
+assert_contains "extract help documents patterns" "A pattern is a glob" "$(extract --help)"
+assert_contains "unknown sinks are rejected" "Unknown sink 'zip'" "$(process -o "$TMPDIR_TEST/o" --sink zip)"
+assert_contains "--sink is rejected with --echo" "--sink cannot be combined with --echo" \
+  "$(bash "$DOC_DOC_SH" process -d "$TREE" --echo --sink sqlite 2>&1)"
+assert_contains "extract requires -o" "Output directory is required" "$(extract --list)"
+assert_contains "--list and --to are exclusive" "--list cannot be combined with --to" \
+  "$(extract -o "$TMPDIR_TEST/o" --list --to x)"
+assert_contains "a missing archive is reported" "No sidecar archive in" "$(extract -o "$TREE" --list)"
+
+# =========================================
+# Group 2: process --sink sqlite
+# =========================================
+echo ""
+echo "--- Group 2: process --sink sqlite ---"
+
+process -o "$TMPDIR_TEST/tree_out" >/dev/null
+for engine in bash python; do
+  out="$TMPDIR_TEST/out_$engine"
+  log=$(process -o "$out" --sink sqlite --engine "$engine")
+  assert_eq "$engine engine: the output directory holds only the archive" "sidecars.sqlite" \
+    "$(ls "$out")"
+  assert_contains "$engine engine: progress names the archive member" \
+    "-> $out/sidecars.sqlite:sub/b.txt.md" "$log"
+  assert_contains "$engine engine: the run reports written sidecars" "Sidecars: 3 written, 0 unchanged." "$log"
+  assert_contains "$engine engine: unchanged sidecars are not rewritten" \
+    "Sidecars: 0 written, 3 unchanged." "$(process -o "$out" --sink sqlite --engine "$engine")"
+  assert_eq "$engine engine: archived sidecars equal the tree sink's" "" \
+    "$(diff <(extract -o "$out" sub/deep/c.json --to -) "$TMPDIR_TEST/tree_out/sub/deep/c.json.md")"
+done
+
+echo "alpha, changed" > "$TREE/a.txt"
+assert_contains "a changed document is rewritten" "Sidecars: 1 written, 2 unchanged." \
+  "$(process -o "$TMPDIR_TEST/out_bash" --sink sqlite)"
+
+# =========================================
+# Group 3: extract
+# =========================================
+echo ""
+echo "--- Group 3: extract ---"
+
+OUT="$TMPDIR_TEST/out_bash"
+assert_eq "--list lists every sidecar" "$(printf '%s\n' a.txt.md sub/b.txt.md sub/deep/c.json.md)" \
+  "$(extract -o "$OUT" --list)"
+assert_eq "patterns match source paths" "sub/b.txt.md" "$(extract -o "$OUT" --list sub/b.txt)"
+assert_eq "patterns match sidecar paths" "sub/deep/c.json.md" "$(extract -o "$OUT" --list '*.json.md')"
+assert_eq "several patterns select their union" "$(printf '%s\n' a.txt.md sub/deep/c.json.md)" \
+  "$(extract -o "$OUT" --list a.txt 'sub/deep/*')"
+assert_eq "--to - prints the content" "$(printf '# a.txt\ntext/plain 15')" \
+  "$(extract -o "$OUT" a.txt --to -)"
+log=$(extract -o "$OUT" 'sub/*' --to "$TMPDIR_TEST/x")
+assert_contains "--to writes below the directory" "Extracted 2 sidecars" "$log"
+assert_eq "extracted files mirror the input tree" "$(printf '%s\n' sub/b.txt.md sub/deep/c.json.md)" \
+  "$(cd "$TMPDIR_TEST/x" && find . -type f | sed 's|^\./||' | sort)"
+assert_contains "re-extracting leaves unchanged files alone" "(0 written, 2 unchanged)" \
+  "$(extract -o "$OUT" 'sub/*' --to "$TMPDIR_TEST/x")"
+extract -o "$OUT" >/dev/null
+assert_eq "without --to sidecars are materialized in the output directory" "yes" \
+  "$([ -f "$OUT/sub/deep/c.json.md" ] && echo yes)"
+
+# =========================================
+# Group 4: incremental runs
+# =========================================
+echo ""
+echo "--- Group 4: incremental runs ---"
+
+OUT="$TMPDIR_TEST/out_incremental"
+process -o "$OUT" --sink sqlite --incremental >/dev/null
+rm "$TREE/sub/b.txt"
+log=$(process -o "$OUT" --sink sqlite --incremental)
+assert_contains "unchanged documents are skipped" "0 processed, 0 re-rendered, 2 unchanged, 1 pruned." "$log"
+assert_eq "pruned sidecars leave the archive" "$(printf '%s\n' a.txt.md sub/deep/c.json.md)" \
+  "$(extract -o "$OUT" --list)"
+python3 - "$OUT/sidecars.sqlite" <<'PY'
+import sqlite3, sys
+db = sqlite3.connect(sys.argv[1])
+db.execute("DELETE FROM sidecars WHERE path = 'a.txt.md'")
+db.commit()
+PY
+log=$(process -o "$OUT" --sink sqlite --incremental)
+assert_contains "a sidecar missing from the archive is re-rendered" "0 processed, 1 re-rendered" "$log"
+
+# =========================================
+# Group 5: SidecarArchive
+# =========================================
+echo ""
+echo "--- Group 5: SidecarArchive ---"
+
+unit=$(python3 - "$COMPONENTS_DIR" "$TMPDIR_TEST/unit" <<'PY'
+import sys
+sys.path.insert(0, sys.argv[1])
+import sidecar_writer as sw
+
+root = sys.argv[2]
+archive = sw.open_sink("sqlite", root)
+for path in (root + "/../escape.md", root):
+    try:
+        archive.write(path, "x")
+        print("accepted", path)
+    except sw.SidecarError as exc:
+        print("rejected", exc)
+archive.write(root + "/./d/../e.md", "e")
+print("normalized", [path for path, _ in archive.members()])
+print("exists", archive.exists(root + "/e.md"), archive.exists(root + "/f.md"))
+archive.remove(root + "/e.md")
+print("removed", archive.exists(root + "/e.md"))
+archive.close()
+PY
+)
+assert_contains "paths outside the output directory are rejected" "rejected path traversal detected" "$unit"
+assert_eq "the output directory itself is not a sidecar" "2" "$(echo "$unit" | grep -c '^rejected')"
+assert_contains "member paths are normalized" "normalized ['e.md']" "$unit"
+assert_contains "exists() checks the archive" "exists True False" "$unit"
+assert_contains "remove() deletes the member" "removed False" "$unit"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
@@ -0,0 +1,208 @@
+#!/bin/bash
+# Test suite for FEATURE_0074: Demand-driven pipeline pruning
+# Verifies that process runs only the plugins whose outputs the template or
+# the --fields of the JSON output consume (plus their dependencies), and that
+# full JSON output, --index, partials and --all-plugins keep every plugin.
+# Run from repository root: bash tests/test_feature_0074.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$actual" == *"$expected"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $expected"
+    echo "    Actual: $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_not_contains() {
+  local test_name="$1" unexpected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$actual" != *"$unexpected"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected not to contain: $unexpected"
+    echo "    Actual: $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+echo "  FEATURE_0074: Pipeline Pruning"
+TMPDIR_TEST="$(mktemp -d)"
+TREE="$TMPDIR_TEST/tree"
+mkdir -p "$TREE/sub"
+echo "alpha beta gamma" > "$TREE/a.txt"
+echo "delta" > "$TREE/sub/b.txt"
+
+template() {
+  printf '%s\n' "$2" > "$TMPDIR_TEST/$1.md"
+  echo "$TMPDIR_TEST/$1.md"
+}
+names() {
+  python3 "$COMPONENTS_DIR/mustache_render.py" --names "$(template names "$1")" 2>&1 | paste -sd' '
+}
+
+# =========================================
+# Group 1: template names
+# =========================================
+echo ""
+echo "--- Group 1: template names ---"
+
+assert_eq "variables of every kind are listed once" "a b c d" "$(names '{{a}} {{{b}}} {{&c}} {{d}} {{a}}')"
+assert_eq "sections and inverted sections are listed" "items missing name" \
+  "$(names '{{#items}}{{name}}{{.}}{{/items}}{{^missing}}-{{/missing}}')"
+assert_eq "dotted names reference their top-level key" "author" "$(names '{{author.name}} {{author.mail}}')"
+assert_eq "comments and changed delimiters are handled" "x" "$(names '{{! y }}{{=<% %>=}}<% x %>')"
+assert_eq "partials may reference anything" "*" "$(names '{{> header}}')"
+assert_eq "a template without tags references nothing" "" "$(names 'plain text')"
+assert_contains "invalid templates are rejected" "Invalid template" "$(names '{{#open}}')"
+
+# =========================================
+# Group 2: required plugins
+# =========================================
+echo ""
+echo "--- Group 2: required plugins ---"
+
+PLUGINS="$TMPDIR_TEST/plugins"
+plugin() {
+  mkdir -p "$PLUGINS/$1"
+  echo "{\"name\": \"$1\", \"version\": \"1.0.0\", \"active\": true, \"commands\": {\"process\": $2}}" \
+    > "$PLUGINS/$1/descriptor.json"
+}
+plugin file '{"input": {"filePath": {}}, "output": {"mimeType": {}}}'
+plugin text '{"input": {"filePath": {}, "mimeType": {}}, "output": {"documentText": {}}}'
+plugin count '{"input": {"documentTextFile": {}}, "output": {"wordCount": {}}}'
+plugin cover '{"input": {"wordCount": {}}, "output": {"coverage": {}}}'
+plugin size '{"input": {"filePath": {}}, "output": {"fileSize": {}}}'
+plugin lang '{"input": {"filePath": {}}, "requires": {"anyOf": ["documentText"]}, "output": {"language": {}}}'
+plugin dump '{"output": {"dump": {}}}'
+ORDER="file size text count cover lang dump"
+
+needs() {
+  # shellcheck disable=SC2086
+  python3 "$COMPONENTS_DIR/plugin_info.py" needs "$PLUGINS" "$1" $ORDER | paste -sd' '
+}
+assert_eq "a field needs its producer only" "size" "$(needs fileSize)"
+assert_eq "dependencies are followed upstream" "file text count cover" "$(needs coverage)"
+assert_eq "<key>File inputs depend on the <key> producer" "file text count" "$(needs wordCount)"
+assert_eq "applicability fields are dependencies" "file text lang" "$(needs language)"
+assert_eq "full-context plugins need every earlier plugin" "$ORDER" "$(needs dump)"
+assert_eq "fields no plugin produces need nothing" "" "$(needs filePath,fileName,unknown)"
+assert_eq "the result follows the given order" "file size text" "$(needs documentText,fileSize)"
+
+# =========================================
+# Group 3: process
+# =========================================
+echo ""
+echo "--- Group 3: process ---"
+
+ACTIVE=$(python3 "$COMPONENTS_DIR/plugin_info.py" topo "$BUILTIN_PLUGIN_DIR" | paste -sd' ')
+NAME_ONLY=$(template name_only '# {{fileName}} ({{mimeType}})')
+SIZE=$(template size '# {{fileName}} {{fileSize}}')
+
+process() {
+  bash "$DOC_DOC_SH" process -d "$TREE" --no-progress "$@"
+}
+
+skipped=$(python3 - "$ACTIVE" <<'PY'
+import sys
+print(", ".join(name for name in sys.argv[1].split() if name != "file"))
+PY
+)
+log=$(process -o "$TMPDIR_TEST/o1" -t "$NAME_ONLY" --fields filePath 2>&1 >"$TMPDIR_TEST/o1.json")
+if [ -n "$skipped" ]; then
+  assert_contains "plugins nobody consumes are skipped" \
+    "Skipping plugins not used by the template or output: $skipped" "$log"
+fi
+assert_eq "the sidecar is rendered from the pruned pipeline" "# a.txt (text/plain)" "$(cat "$TMPDIR_TEST/o1/a.txt.md")"
+assert_eq "the --fields output is unchanged" '[{"filePath":"'"$TREE"'/a.txt"},{"filePath":"'"$TREE"'/sub/b.txt"}]' \
+  "$(jq -c 'sort_by(.filePath)' "$TMPDIR_TEST/o1.json")"
+
+for engine in bash python; do
+  process -o "$TMPDIR_TEST/size_$engine" -t "$SIZE" --fields filePath --engine "$engine" >/dev/null 2>&1
+  assert_eq "$engine engine: plugins of template fields still run" "# b.txt 6" \
+    "$(cat "$TMPDIR_TEST/size_$engine/sub/b.txt.md")"
+done
+assert_eq "--fields keeps its producers" "6" \
+  "$(process -o "$TMPDIR_TEST/o2" -t "$NAME_ONLY" --fields filePath,fileSize 2>/dev/null | jq '.[] | select(.filePath | endswith("b.txt")) | .fileSize')"
+assert_eq "--echo renders from the pruned pipeline" "# b.txt 6" \
+  "$(bash "$DOC_DOC_SH" process -d "$TREE/sub" --echo -t "$SIZE" 2>/dev/null | grep '^# ')"
+
+nothing_skipped() {
+  assert_not_contains "$1" "Skipping plugins" "$(process "${@:2}" 2>&1 >/dev/null)"
+}
+nothing_skipped "full JSON output keeps every plugin" -o "$TMPDIR_TEST/o3" -t "$NAME_ONLY"
+nothing_skipped "--all-plugins keeps every plugin" -o "$TMPDIR_TEST/o3" -t "$NAME_ONLY" --fields filePath --all-plugins
+nothing_skipped "--index keeps every plugin" -o "$TMPDIR_TEST/o4" -t "$NAME_ONLY" --fields filePath --index
+nothing_skipped "templates with partials keep every plugin" -o "$TMPDIR_TEST/o3" \
+  -t "$(template partial '{{> header}}')" --fields filePath
+assert_contains "--all-plugins is documented" "--all-plugins" "$(bash "$DOC_DOC_SH" process --help 2>&1)"
+
+# =========================================
+# Group 4: incremental runs
+# =========================================
+echo ""
+echo "--- Group 4: incremental runs ---"
+
+OUT="$TMPDIR_TEST/incremental"
+process -o "$OUT" -t "$NAME_ONLY" --fields filePath --incremental >/dev/null 2>&1
+process -o "$OUT" -t "$SIZE" --fields filePath --incremental >/dev/null 2>&1
+assert_eq "a template that needs more plugins re-processes the documents" "# b.txt 6" \
+  "$(cat "$OUT/sub/b.txt.md")"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0
@@ -0,0 +1,223 @@
+#!/bin/bash
+# Test suite for FEATURE_0075: Multi-template rendering in one pass
+# Verifies process -t <file>[:<suffix>] (repeatable): every document's result
+# is rendered with each template after one plugin run, in both engines, with
+# write-if-changed counts, incremental re-rendering and pruning, the sidecar
+# archive and demand-driven pruning across all templates.
+# Run from repository root: bash tests/test_feature_0075.sh
+
+set -u
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+DOC_DOC_SH="$REPO_ROOT/doc.doc.sh"
+COMPONENTS_DIR="$REPO_ROOT/doc.doc.md/components"
+BUILTIN_PLUGIN_DIR="$REPO_ROOT/doc.doc.md/plugins"
+
+PASS=0
+FAIL=0
+TOTAL=0
+
+TMPDIR_TEST=""
+
+source "$SCRIPT_DIR/plugin_sandbox.sh"
+
+cleanup() {
+  sandbox_cleanup
+  [ -n "$TMPDIR_TEST" ] && [ -d "$TMPDIR_TEST" ] && rm -rf "$TMPDIR_TEST"
+}
+trap cleanup EXIT
+
+# Run 'process' from a sandbox install in which active plugins whose
+# dependencies are not installed are deactivated (non-interactive runs).
+sandbox_install
+DOC_DOC_SH="$SANDBOX_DOC_DOC_SH"
+BUILTIN_PLUGIN_DIR="$SANDBOX_PLUGIN_DIR"
+
+assert_eq() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [ "$expected" = "$actual" ]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected: $expected"
+    echo "    Actual:   $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_contains() {
+  local test_name="$1" expected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$actual" == *"$expected"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected to contain: $expected"
+    echo "    Actual: $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+assert_not_contains() {
+  local test_name="$1" unexpected="$2" actual="$3"
+  TOTAL=$((TOTAL + 1))
+  if [[ "$actual" != *"$unexpected"* ]]; then
+    echo "  PASS: $test_name"
+    PASS=$((PASS + 1))
+  else
+    echo "  FAIL: $test_name"
+    echo "    Expected not to contain: $unexpected"
+    echo "    Actual: $actual"
+    FAIL=$((FAIL + 1))
+  fi
+}
+
+echo "============================================"
+TMPDIR_TEST="$(mktemp -d)"
+TREE="$TMPDIR_TEST/tree"
+mkdir -p "$TREE/sub"
+echo "alpha" > "$TREE/a.txt"
+echo "beta" > "$TREE/sub/b.txt"
+MD="$TMPDIR_TEST/page.md"
+CARD="$TMPDIR_TEST/card.html"
+SUMMARY="$TMPDIR_TEST/summary.json"
+printf '# {{fileName}}\n' > "$MD"
+printf '<h1>{{fileName}}</h1><p>{{fileSize}} bytes</p>\n' > "$CARD"
+printf '{"name": "{{fileName}}", "mimeType": "{{{mimeType}}}"}\n' > "$SUMMARY"
+
+process() {
+  bash "$DOC_DOC_SH" process -d "$TREE" --no-progress "$@"
+}
+files() {
+  (cd "$1" && find . -path ./.doc.doc.md -prune -o -type f -print | sed 's|^\./||' | sort | paste -sd' ')
+}
+
+# =========================================
+# Group 1: options
+# =========================================
+echo ""
+echo "--- Group 1: options ---"
+
+assert_contains "process help documents -t <file>:<suffix>" "<file>[:<suffix>]" \
+  "$(bash "$DOC_DOC_SH" process --help 2>&1)"
+assert_contains "missing templates are reported" "Template file not found: $TMPDIR_TEST/none.md" \
+  "$(process -o "$TMPDIR_TEST/o" -t "$MD" -t "$TMPDIR_TEST/none.md:.txt" 2>&1)"
+assert_contains "suffixes must be distinct" "Templates need distinct suffixes ('.md' is used twice" \
+  "$(process -o "$TMPDIR_TEST/o" -t "$MD" -t "$CARD" 2>&1)"
+assert_contains "--echo takes a single template" "--echo renders a single template" \
+  "$(process --echo -t "$MD" -t "$CARD:html" 2>&1)"
+printf '# colon {{fileName}}\n' > "$TMPDIR_TEST/a:b.md"
+process --echo -t "$TMPDIR_TEST/a:b.md" > "$TMPDIR_TEST/colon.out" 2>&1
+assert_contains "a template path with a colon still works" "# colon a.txt" "$(cat "$TMPDIR_TEST/colon.out")"
+
+# =========================================
+# Group 2: rendering
+# =========================================
+echo ""
+echo "--- Group 2: rendering ---"
+
+for engine in bash python; do
+  out="$TMPDIR_TEST/out_$engine"
+  log=$(process -o "$out" -t "$MD" -t "$CARD:html" -t "$SUMMARY:.json" --engine "$engine" 2>&1 >/dev/null)
+  assert_eq "$engine engine: every template is rendered per document" \
+    "a.txt.html a.txt.json a.txt.md sub/b.txt.html sub/b.txt.json sub/b.txt.md" "$(files "$out")"
+  assert_eq "$engine engine: each output uses its template" "<h1>b.txt</h1><p>5 bytes</p>" \
+    "$(cat "$out/sub/b.txt.html")"
+  assert_eq "$engine engine: JSON outputs are valid" "text/plain" "$(jq -r .mimeType "$out/a.txt.json")"
+  assert_contains "$engine engine: progress names the first template's output" \
+    "-> $out/sub/b.txt.md" "$log"
+  assert_contains "$engine engine: every output is counted" "Sidecars: 6 written, 0 unchanged." "$log"
+  assert_contains "$engine engine: unchanged outputs are left alone" "Sidecars: 0 written, 6 unchanged." \
+    "$(process -o "$out" -t "$MD" -t "$CARD:html" -t "$SUMMARY:.json" --engine "$engine" 2>&1 >/dev/null)"
+done
+assert_eq "both engines write the same outputs" "" "$(diff -r "$TMPDIR_TEST/out_bash" "$TMPDIR_TEST/out_python")"
+
+process -o "$TMPDIR_TEST/single" -t "$CARD:.html" >/dev/null 2>&1
+assert_eq "the first template's suffix replaces .md" "a.txt.html sub/b.txt.html" "$(files "$TMPDIR_TEST/single")"
+
+process -o "$TMPDIR_TEST/archive" -t "$MD" -t "$CARD:html" --sink sqlite >/dev/null 2>&1
+assert_eq "the sidecar archive holds every output" "a.txt.html a.txt.md sub/b.txt.html sub/b.txt.md" \
+  "$(bash "$DOC_DOC_SH" extract -o "$TMPDIR_TEST/archive" --list | paste -sd' ')"
+
+# =========================================
+# Group 3: one plugin run
+# =========================================
+echo ""
+echo "--- Group 3: one plugin run ---"
+
+PLUGINS="$TMPDIR_TEST/plugins"
+mkdir -p "$PLUGINS/counter"
+cat > "$PLUGINS/counter/descriptor.json" <<'JSON'
+{"name": "counter", "version": "1.0.0", "active": true,
+ "commands": {"process": {"command": "main.sh", "input": {"filePath": {}},
+                          "output": {"runs": {}}}}}
+JSON
+cat > "$PLUGINS/counter/main.sh" <<SH
+#!/bin/bash
+echo x >> "$TMPDIR_TEST/runs.log"
+echo '{"runs": 1}'
+SH
+chmod +x "$PLUGINS/counter/main.sh"
+find "$TREE" -type f | python3 "$COMPONENTS_DIR/process_engine.py" --plugin-dir "$PLUGINS" \
+  --input-dir "$TREE" --output-dir "$TMPDIR_TEST/engine" --input-format lines \
+  --template "$MD" --template "$CARD:html" --template "$SUMMARY:json" counter >/dev/null 2>&1
+assert_eq "plugins run once per document, not once per template" "2" "$(wc -l < "$TMPDIR_TEST/runs.log" | tr -d ' ')"
+assert_eq "the engine writes every template's output" \
+  "a.txt.html a.txt.json a.txt.md sub/b.txt.html sub/b.txt.json sub/b.txt.md" "$(files "$TMPDIR_TEST/engine")"
+assert_eq "templates are tokenized once per run" "2" "$(python3 - "$COMPONENTS_DIR" "$MD" "$CARD" <<'PY'
+import sys
+sys.path.insert(0, sys.argv[1])
+import mustache_render
+templates = [open(path).read() for path in sys.argv[2:]]
+for name in ("a", "b", "c"):
+    for template in templates:
+        mustache_render.render_data(template, {"filePath": name})
+print(mustache_render.compile_template.cache_info().misses)
+PY
+)"
+
+log=$(bash "$DOC_DOC_SH" process -d "$TREE" -o "$TMPDIR_TEST/pruned" -t "$MD" -t "$CARD:html" \
+  --fields filePath --no-progress 2>&1 >/dev/null)
+assert_not_contains "fields of every template keep their plugins" "stat" \
+  "$(echo "$log" | grep "Skipping plugins")"
+assert_eq "the second template sees those fields" "<h1>a.txt</h1><p>6 bytes</p>" \
+  "$(cat "$TMPDIR_TEST/pruned/a.txt.html")"
+
+# =========================================
+# Group 4: incremental runs
+# =========================================
+echo ""
+echo "--- Group 4: incremental runs ---"
+
+OUT="$TMPDIR_TEST/incremental"
+process -o "$OUT" -t "$MD" -t "$CARD:html" --incremental >/dev/null 2>&1
+log=$(process -o "$OUT" -t "$MD" -t "$CARD:html" -t "$SUMMARY:json" --incremental 2>&1 >/dev/null)
+assert_contains "an added template re-renders from stored results" "0 processed, 2 re-rendered" "$log"
+assert_eq "the added template's outputs exist" "yes" "$([ -f "$OUT/sub/b.txt.json" ] && echo yes)"
+rm "$OUT/a.txt.html"
+log=$(process -o "$OUT" -t "$MD" -t "$CARD:html" -t "$SUMMARY:json" --incremental 2>&1 >/dev/null)
+assert_contains "a missing output is re-rendered" "0 processed, 1 re-rendered, 1 unchanged" "$log"
+rm "$TREE/sub/b.txt"
+process -o "$OUT" -t "$MD" -t "$CARD:html" -t "$SUMMARY:json" --incremental >/dev/null 2>&1
+assert_eq "pruning removes every output of a deleted source" "a.txt.html a.txt.json a.txt.md" "$(files "$OUT")"
+
+assert_eq "single-template runs keep their manifest digest" "True" "$(python3 - "$COMPONENTS_DIR" <<'PY'
+import hashlib, sys
+sys.path.insert(0, sys.argv[1])
+import run_manifest
+signature = run_manifest.pipeline_signature("/nonexistent", [], [("# {{x}}", ".md")], "")
+print(signature["template"] == hashlib.sha256(b"# {{x}}").hexdigest())
+PY
+)"
+
+echo ""
+echo "============================================"
+echo "  Results: $PASS passed, $FAIL failed (total: $TOTAL)"
+echo "============================================"
+
+if [ "$FAIL" -gt 0 ]; then exit 1; fi
+exit 0